@@ -20,13 +20,14 @@ from datetime import datetime, timedelta  # noqa: E402
 from typing import Any, Optional, TypedDict  # noqa: E402, Optional
 
 import psutil  # noqa: E402
-from fastapi import APIRouter, Depends, HTTPException, status  # noqa: E402
+from fastapi import APIRouter, Depends, HTTPException, Query, status  # noqa: E402
 from fastapi.responses import Response, StreamingResponse  # noqa: E402
 
 # Import auth
 from backend.auth import get_current_user  # noqa: E402
 from backend.auth.dependencies import auth_deps  # noqa: E402
 from backend.config import settings  # noqa: E402
+from backend.services.data_validation_service import DataValidationService  # noqa: E402
 from backend.services.system_report_service import SystemReportService  # noqa: E402
 from backend.sql_server_connector import sql_connector  # noqa: E402
 from backend.utils.port_detector import PortDetector  # noqa: E402
@@ -40,6 +41,9 @@ logger = logging.getLogger(__name__)
 admin_control_router = APIRouter(prefix="/api/admin/control", tags=["Admin Control"])
 
 BACKEND_PORTS = [8000, 8001, 8002, 8003, 8004, 8005]
+
+# Owns the audit worker process so repeated starts can be refused
+_data_validation_service: Optional[DataValidationService] = None
 FRONTEND_PORTS = [8081, 19000, 19001]
 
 
@@ -941,3 +945,44 @@ async def get_system_stats(current_user: dict = Depends(require_admin)):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get system stats: {str(e)}",
         )
+
+
+def _get_data_validation_service() -> DataValidationService:
+    global _data_validation_service
+    if _data_validation_service is None:
+        from backend.db.runtime import get_db
+
+        _data_validation_service = DataValidationService(get_db())
+    return _data_validation_service
+
+
+@admin_control_router.post("/data-validation/start")
+async def start_data_validation(
+    batch_size: int = Query(5000, ge=100, le=50000),
+    current_user: dict = Depends(require_admin),
+):
+    """Audit erp_items, sessions and count_lines in a background worker process"""
+    service = _get_data_validation_service()
+    try:
+        worker = service.start_full_validation(batch_size=batch_size)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return {"success": True, "data": worker}
+
+
+@admin_control_router.get("/data-validation/progress")
+async def get_data_validation_progress(current_user: dict = Depends(require_admin)):
+    """Per-collection checkpoint of the running (or last) data audit"""
+    service = _get_data_validation_service()
+    try:
+        progress = await service.get_validation_progress()
+    except Exception as e:
+        logger.error(f"Error getting data validation progress: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get data validation progress: {str(e)}",
+        )
+    return {
+        "success": True,
+        "data": {"running": service.is_full_validation_running(), "collections": progress},
+    }
@@ -11,6 +11,14 @@ from backend.api.schemas import CountLineCreate
 from backend.auth.dependencies import get_current_user
 from backend.db.runtime import get_db
 from backend.services.activity_log import ActivityLogService
+from backend.services.ai_variance import ai_variance_service
+from backend.services.media_store import get_media_service
+from backend.utils.pagination import (
+    InvalidCursorError,
+    count_total,
+    cursor_paginate_mongo,
+    offset_pagination,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -256,7 +264,12 @@ async def create_count_line(
         "verified_by": None,
     }
 
+    # Keep photos out of the document; only media references are stored
+    await get_media_service(db).externalize_count_line(
+        count_line, uploaded_by=current_user["username"]
+    )
     await db.count_lines.insert_one(count_line)
+    await ai_variance_service.invalidate_sessions(db, [line_data.session_id])
 
     # Update session stats atomically using aggregation
     try:
@@ -327,6 +340,8 @@ async def verify_stock(
     if update_result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Count line not found")
 
+    await ai_variance_service.invalidate_count_line(db_client, {"id": line_id})
+
     if _activity_log_service:
         await _activity_log_service.log_activity(
             user=current_user["username"],
@@ -359,6 +374,8 @@ async def unverify_stock(
     if update_result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Count line not found")
 
+    await ai_variance_service.invalidate_count_line(db_client, {"id": line_id})
+
     if _activity_log_service:
         await _activity_log_service.log_activity(
             user=current_user["username"],
@@ -379,18 +396,64 @@ async def get_count_lines(
     page: int = 1,
     page_size: int = 50,
     verified: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
     *,
     db_override=None,
 ):
     """Get count lines with pagination. Shared between routes and tests."""
-    skip = (page - 1) * page_size
     filter_query: dict[str, Any] = {"session_id": session_id}
 
     if verified is not None:
         filter_query["verified"] = verified
 
-    db_client = _get_db_client(db_override)
-    total = await db_client.count_lines.count_documents(filter_query)
+    return await paginate_count_lines(
+        _get_db_client(db_override),
+        filter_query,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total,
+    )
+
+
+async def paginate_count_lines(
+    db_client,
+    filter_query: dict[str, Any],
+    *,
+    page: int = 1,
+    page_size: int = 50,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
+) -> dict[str, Any]:
+    """
+    Page through count lines newest first.
+
+    ``cursor`` (an empty string for the first page) switches to keyset
+    pagination on (counted_at, _id), where the total is only counted when
+    ``include_total`` is set. Without a cursor the legacy page/page_size
+    offsets are used and the total is counted unless ``include_total=False``.
+    """
+    if cursor is not None:
+        try:
+            result = await cursor_paginate_mongo(
+                db_client.count_lines,
+                filter_query,
+                sort_field="counted_at",
+                direction=-1,
+                limit=page_size,
+                cursor=cursor,
+                projection={"_id": 0},
+                include_total=bool(include_total),
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"items": result.items, "pagination": result.pagination()}
+
+    skip = (page - 1) * page_size
+    total = None
+    if include_total is not False:
+        total = await count_total(db_client.count_lines, filter_query)
     lines_cursor = (
         db_client.count_lines.find(filter_query, {"_id": 0})
         .sort("counted_at", -1)
@@ -401,14 +464,7 @@ async def get_count_lines(
 
     return {
         "items": lines,
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "total_pages": (total + page_size - 1) // page_size,
-            "has_next": skip + page_size < total,
-            "has_prev": page > 1,
-        },
+        "pagination": offset_pagination(page, page_size, total, len(lines)),
     }
 
 
@@ -446,6 +502,8 @@ async def approve_count_line(
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Count line not found")
 
+        await ai_variance_service.invalidate_count_line(db, query)
+
         return {"success": True, "message": "Count line approved"}
     except Exception as e:
         logger.error(f"Error approving count line {line_id}: {str(e)}")
@@ -484,6 +542,8 @@ async def reject_count_line(
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Count line not found")
 
+        await ai_variance_service.invalidate_count_line(db, query)
+
         return {"success": True, "message": "Count line rejected"}
     except Exception as e:
         logger.error(f"Error rejecting count line {line_id}: {str(e)}")
@@ -520,6 +580,13 @@ async def get_count_lines_route(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
     verified: Optional[bool] = Query(None, description="Filter by verification status"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from a previous page; pass an empty value to start",
+    ),
+    include_total: Optional[bool] = Query(
+        None, description="Count all matching lines (default: offset mode only)"
+    ),
 ):
     return await get_count_lines(
         session_id,
@@ -527,6 +594,8 @@ async def get_count_lines_route(
         page=page,
         page_size=page_size,
         verified=verified,
+        cursor=cursor,
+        include_total=include_total,
     )
 
 
@@ -607,6 +676,8 @@ async def delete_count_line(
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Count line not found")
 
+        await ai_variance_service.invalidate_sessions(db, [count_line.get("session_id")])
+
         await _recalculate_session_stats(db, count_line["session_id"])
         await _log_delete_activity(count_line, line_id, current_user, request)
 
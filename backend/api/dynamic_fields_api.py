@@ -371,6 +371,7 @@ async def get_items_with_fields(
     field_value: Optional[str] = None,
     limit: int = 100,
     skip: int = 0,
+    after: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
     service: DynamicFieldsService = Depends(get_dynamic_fields_service),
 ):
@@ -382,6 +383,7 @@ async def get_items_with_fields(
     - field_value: Filter by specific field value
     - limit: Maximum results (default: 100)
     - skip: Skip results (default: 0)
+    - after: Item code to continue after (use `next_after` from the previous page)
 
     **Example:** `/api/dynamic-fields/items?field_name=warranty_period&field_value=2 years`
     """
@@ -391,10 +393,15 @@ async def get_items_with_fields(
             field_filters = {field_name: field_value}
 
         items = await service.get_items_with_fields(
-            field_filters=field_filters, limit=limit, skip=skip
+            field_filters=field_filters, limit=limit, skip=skip, after=after
         )
 
-        return {"success": True, "count": len(items), "items": items}
+        return {
+            "success": True,
+            "count": len(items),
+            "items": items,
+            "next_after": items[-1]["item_code"] if len(items) == limit else None,
+        }
 
     except Exception as e:
         logger.error(f"Error getting items with fields: {str(e)}")
@@ -13,6 +13,7 @@ from pydantic import BaseModel, Field
 
 from backend.auth import get_current_user
 from backend.services.dynamic_report_service import DynamicReportService
+from backend.services.reporting.report_jobs import get_report_job_queue, report_job
 
 logger = logging.getLogger(__name__)
 
@@ -239,6 +240,54 @@ async def generate_report(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@report_job("dynamic_report")
+async def run_dynamic_report_job(db, params: dict[str, Any], job) -> dict[str, Any]:
+    """Background version of POST /generate"""
+    report = await DynamicReportService(db).generate_report(**params, job=job)
+    report_id = str(report.pop("_id"))
+    return {
+        "report": {
+            **report,
+            "id": report_id,
+            "download_url": f"/api/reports/{report_id}/download",
+        }
+    }
+
+
+@dynamic_reports_router.post("/generate/jobs", status_code=202)
+async def submit_report_job(
+    generation_data: ReportGeneration,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Generate a report in the background
+
+    Takes the same body as `/generate`. Returns the job at once; poll
+    `GET /api/reports/jobs/{job_id}` until `status` is `completed`, then
+    use `result.report.download_url`.
+    """
+    from server import db
+
+    template_dict = None
+    if generation_data.template_data:
+        template_dict = generation_data.template_data.model_dump(mode="json")
+
+    try:
+        return await get_report_job_queue(db).submit(
+            "dynamic_report",
+            {
+                "template_id": generation_data.template_id,
+                "template_data": template_dict,
+                "runtime_filters": generation_data.runtime_filters,
+                "generated_by": current_user.get("username"),
+            },
+            created_by=current_user.get("username"),
+        )
+    except TypeError as e:
+        # Parameters must be JSON-serialisable to be cache-keyed
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @dynamic_reports_router.get("/history")
 async def get_generated_reports(
     limit: int = 50,
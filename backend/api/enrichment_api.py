@@ -307,6 +307,57 @@ async def bulk_import_enrichments_endpoint(
         raise HTTPException(status_code=500, detail=f"Bulk import failed: {str(e)}")
 
 
+@enrichment_router.post("/bulk/jobs", status_code=202)
+async def start_bulk_import_job(
+    request: BulkEnrichmentRequest, current_user: dict = Depends(get_current_user)
+):
+    """
+    Start a bulk import in the background (large Excel sheets)
+    Poll GET /bulk/jobs/{job_id} for progress and per-row errors
+    """
+    if not enrichment_service:
+        raise HTTPException(
+            status_code=500, detail="Enrichment service not initialized"
+        )
+
+    if current_user.get("role") not in ["admin", "supervisor"]:
+        raise HTTPException(
+            status_code=403, detail="Only admin/supervisor can perform bulk import"
+        )
+
+    try:
+        job_id = await enrichment_service.start_bulk_import(
+            enrichments=[e.dict() for e in request.enrichments],
+            user_id=current_user["_id"],
+            username=current_user["username"],
+        )
+
+        return {"success": True, "job_id": job_id, "total": len(request.enrichments)}
+
+    except Exception as e:
+        logger.error(f"Bulk import job error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Bulk import failed: {str(e)}")
+
+
+@enrichment_router.get("/bulk/jobs/{job_id}")
+async def get_bulk_import_job(
+    job_id: str, current_user: dict = Depends(get_current_user)
+):
+    """
+    Get bulk import progress (processed/total) and, once completed, results
+    """
+    if not enrichment_service:
+        raise HTTPException(
+            status_code=500, detail="Enrichment service not initialized"
+        )
+
+    job = await enrichment_service.get_import_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    return {"success": True, "job": job}
+
+
 @enrichment_router.post("/validate")
 async def validate_enrichment_data_endpoint(
     request: EnrichmentRequest, current_user: dict = Depends(get_current_user)
@@ -520,7 +520,22 @@ async def apply_retention_policies(
     if not governance_service:
         raise HTTPException(503, "Data governance service not available")
 
-    return await governance_service.apply_retention_policies()
+    try:
+        return await governance_service.apply_retention_policies()
+    except RuntimeError as e:
+        raise HTTPException(409, str(e))
+
+
+@enterprise_router.get("/governance/retention-status")
+async def get_retention_status(
+    request: Request, current_user: dict = Depends(require_admin)
+) -> dict[str, Any]:
+    """Get per-collection retention progress and checkpoints"""
+    governance_service = request.app.state.data_governance
+    if not governance_service:
+        raise HTTPException(503, "Data governance service not available")
+
+    return {"collections": await governance_service.get_retention_status()}
 
 
 # GDPR Data Subject Requests
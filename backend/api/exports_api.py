@@ -7,10 +7,12 @@ from datetime import datetime
 from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from backend.auth.permissions import Permission, require_permission
 from backend.services.scheduled_export_service import (
+    ExportAlreadyRunning,
     ExportFormat,
     ExportFrequency,
     ScheduledExportService,
@@ -233,7 +235,16 @@ async def execute_export_schedule(
         )
 
     # Execute export
-    result = await export_service.execute_export(schedule)
+    try:
+        result = await export_service.execute_export(schedule)
+    except ExportAlreadyRunning as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "success": False,
+                "error": {"message": str(e), "code": "EXPORT_RUNNING"},
+            },
+        ) from e
 
     if not result["success"]:
         raise HTTPException(
@@ -269,10 +280,15 @@ async def list_export_results(
     )
     results = await cursor.to_list(length=limit)
 
-    # Remove file_content from list (too large)
+    # Remove file_content from list (too large; only older results have it)
     for result in results:
         result["id"] = str(result.pop("_id"))
-        result["has_content"] = bool(result.get("file_content"))
+        if isinstance(result.get("schedule_id"), ObjectId):
+            result["schedule_id"] = str(result["schedule_id"])
+        result["has_content"] = bool(
+            result.get("file_content")
+            or (result.get("storage_key") and result.get("status") == "completed")
+        )
         result.pop("file_content", None)
 
     return {"success": True, "data": {"results": results, "total": len(results)}}
@@ -303,7 +319,6 @@ async def download_export_result(
             },
         )
 
-    file_content = result.get("file_content", "")
     file_extension = result.get("file_extension", "csv")
     schedule_name = result.get("schedule_name", "export")
     created_at = result.get("created_at", datetime.utcnow())
@@ -315,8 +330,26 @@ async def download_export_result(
     # Determine content type
     content_type = "text/csv" if file_extension == "csv" else "application/json"
 
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    if result.get("storage_key"):
+        if result.get("status") != "completed":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "success": False,
+                    "error": {
+                        "message": f"Export is {result.get('status')}",
+                        "code": "RESULT_NOT_READY",
+                    },
+                },
+            )
+        return StreamingResponse(
+            export_service.open_result(result), media_type=content_type, headers=headers
+        )
+
     return Response(
-        content=file_content,
+        content=result.get("file_content", ""),
         media_type=content_type,
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        headers=headers,
     )
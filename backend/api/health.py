@@ -312,29 +312,64 @@ async def health_check() -> dict[str, Any]:
     }
 
 
+def _startup_state() -> Optional[dict[str, Any]]:
+    """Startup orchestrator report (None when startup is not orchestrated)"""
+    from backend.core.startup import get_startup_orchestrator
+
+    orchestrator = get_startup_orchestrator()
+    return orchestrator.report() if orchestrator is not None else None
+
+
 @health_router.get("/live", status_code=status.HTTP_200_OK)
 async def liveness_check() -> dict[str, Any]:
     """
     Kubernetes liveness probe
     Returns 200 if application is alive (not deadlocked)
+    Never waits on dependencies; reports whether startup is still warming up
 
     Usage: k8s livenessProbe
     Failure action: Restart container
     """
-    return {"alive": True, "timestamp": datetime.utcnow().isoformat()}
+    startup = _startup_state()
+    return {
+        "alive": True,
+        "serving": startup["serving"] if startup else True,
+        "warmed": startup["warmed"] if startup else True,
+        "timestamp": datetime.utcnow().isoformat(),
+    }
 
 
 @health_router.get("/ready", status_code=status.HTTP_200_OK)
-async def readiness_check() -> dict[str, Any]:
+async def readiness_check(
+    require_warm: bool = Query(
+        False, description="Also require background services (SQL, AI, enterprise) to be up"
+    ),
+) -> dict[str, Any]:
     """
     Kubernetes readiness probe
     Returns 200 if application is ready to serve traffic
-    Checks: Database connections, critical services, connection pools
+    Checks: Startup phases, database connections, critical services, connection pools
 
     Usage: k8s readinessProbe
     Failure action: Remove from load balancer
     """
+    startup = _startup_state()
+    if startup is not None and (
+        not startup["serving"] or (require_warm and not startup["warmed"])
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "ready": False,
+                "serving": startup["serving"],
+                "warmed": startup["warmed"],
+                "message": "Startup in progress",
+            },
+        )
+
     checks = await _build_readiness_checks()
+    if startup is not None:
+        checks["startup"] = {"serving": startup["serving"], "warmed": startup["warmed"]}
 
     # Determine overall readiness - MongoDB is required, SQL Server is optional
     all_ready = checks["mongodb"]  # Only MongoDB is required
@@ -374,18 +409,29 @@ async def startup_check() -> dict[str, Any]:
     Failure action: Restart container after failureThreshold
     """
     startup_checks = await _build_startup_checks()
+    startup = _startup_state()
+    if startup is not None and "migrations" in startup["phases"]:
+        startup_checks["migrations"] = startup["phases"]["migrations"]["status"] == "ok"
 
     # MongoDB is required, SQL Server is optional
     startup_complete = startup_checks["mongodb"] and startup_checks["migrations"]
+    if startup is not None:
+        startup_complete = startup_complete and startup["serving"]
 
     if not startup_complete:
         return {
             "started": False,
             "checks": startup_checks,
+            "startup": startup,
             "message": "Startup in progress",
         }
 
-    return {"started": True, "checks": startup_checks, "message": "Startup complete"}
+    return {
+        "started": True,
+        "checks": startup_checks,
+        "startup": startup,
+        "message": "Startup complete" if not startup or startup["warmed"] else "Serving, warming up",
+    }
 
 
 @health_router.get("/detailed", status_code=status.HTTP_200_OK)
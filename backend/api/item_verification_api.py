@@ -17,6 +17,12 @@ from pydantic import BaseModel
 
 from backend.auth.dependencies import get_current_user_async as get_current_user
 from backend.api.count_schemas import SaveCountRequest, CountType
+from backend.services.log_sink import write_log
+from backend.utils.pagination import (
+    InvalidCursorError,
+    count_total,
+    cursor_paginate_mongo,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -247,7 +253,8 @@ async def update_item_master(
             await cache_service.delete_async("items", f"enhanced_{item_code}")
 
         # Log the change
-        await db.audit_logs.insert_one(
+        await write_log(
+            db.audit_logs,
             {
                 "action": "MASTER_UPDATE",
                 "item_code": item_code,
@@ -394,7 +401,7 @@ async def verify_item(
             request, current_user, item, variance, is_serialized_from_update
         )
 
-        await db.verification_logs.insert_one(verification_log)
+        await write_log(db.verification_logs, verification_log)
 
         if variance is not None and variance != 0:
             await db.item_variances.insert_one(verification_log)
@@ -428,6 +435,13 @@ async def get_filtered_items(
     search: Optional[str] = Query(None, description="Search in item name/code"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum results"),
     skip: int = Query(0, ge=0, description="Skip results"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from a previous page; pass an empty value to start",
+    ),
+    include_total: Optional[bool] = Query(
+        None, description="Compute totals/statistics (default: offset mode only)"
+    ),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -445,49 +459,89 @@ async def get_filtered_items(
             search=search,
         )
 
-        verified_filter = deepcopy(filter_query)
-        verified_filter["verified"] = True
+        if cursor is not None:
+            return await _get_filtered_items_page(
+                filter_query, limit, cursor, bool(include_total)
+            )
 
-        items_task = (
-            db.erp_items.find(
-                filter_query, {"_id": 0}
-            )  # Added projection to exclude _id
+        # Same _id order as cursor mode, so both modes page consistently
+        items = await (
+            db.erp_items.find(filter_query, {"_id": 0})
+            .sort("_id", 1)
             .skip(skip)
             .limit(limit)
             .to_list(length=limit)
         )
-        total_count_task = db.erp_items.count_documents(filter_query)
-        verified_count_task = db.erp_items.count_documents(verified_filter)
-
-        items, total_count, verified_count = await asyncio.gather(
-            items_task, total_count_task, verified_count_task
-        )
-
         items = [serialize_item_document(item) for item in items]
-        total_qty = sum(item.get("stock_qty", 0.0) for item in items)
-
-        return {
+        response: dict[str, Any] = {
             "success": True,
             "items": items,
             "pagination": {
-                "total": total_count,
+                "total": None,
+                "total_accuracy": None,
                 "limit": limit,
                 "skip": skip,
                 "returned": len(items),
             },
-            "statistics": {
-                "total_items": total_count,
-                "verified_items": verified_count,
-                "unverified_items": total_count - verified_count,
-                "total_qty": total_qty,
-            },
         }
+        if include_total is not False:
+            await _add_filtered_item_totals(response, filter_query, items)
+        return response
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting filtered items: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get items: {str(e)}")
 
 
+async def _get_filtered_items_page(
+    filter_query: dict[str, Any], limit: int, cursor: str, include_total: bool
+) -> dict[str, Any]:
+    """Keyset page of filtered items in _id order; counts only on request."""
+    result = await cursor_paginate_mongo(
+        db.erp_items,
+        filter_query,
+        sort_field="_id",
+        direction=1,
+        limit=limit,
+        cursor=cursor,
+        projection={"_id": 0},
+    )
+    items = [serialize_item_document(item) for item in result.items]
+    response: dict[str, Any] = {
+        "success": True,
+        "items": items,
+        "pagination": result.pagination(),
+    }
+    if include_total:
+        await _add_filtered_item_totals(response, filter_query, items)
+        response["pagination"]["total_is_estimate"] = (
+            response["pagination"]["total_accuracy"] == "estimated"
+        )
+    return response
+
+
+async def _add_filtered_item_totals(
+    response: dict[str, Any], filter_query: dict[str, Any], items: list[dict[str, Any]]
+) -> None:
+    """Fill in the total and the verified/unverified statistics for a page."""
+    verified_filter = deepcopy(filter_query)
+    verified_filter["verified"] = True
+    total, verified = await asyncio.gather(
+        count_total(db.erp_items, filter_query),
+        count_total(db.erp_items, verified_filter),
+    )
+    response["pagination"]["total"] = total.value
+    response["pagination"]["total_accuracy"] = total.accuracy
+    response["statistics"] = {
+        "total_items": total.value,
+        "verified_items": verified.value,
+        "unverified_items": total.value - verified.value,
+        "total_qty": sum(item.get("stock_qty", 0.0) for item in items),
+    }
+
+
 @verification_router.get("/export/csv")
 async def export_items_csv(
     category: Optional[str] = Query(None),
@@ -613,6 +667,15 @@ async def export_items_csv(
         raise HTTPException(status_code=500, detail=f"CSV export failed: {str(e)}")
 
 
+def _serialize_variances(variances: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    # Convert ObjectId to string
+    for variance in variances:
+        variance["_id"] = str(variance["_id"])
+        if isinstance(variance.get("verified_at"), datetime):
+            variance["verified_at"] = variance["verified_at"].isoformat()
+    return variances
+
+
 @verification_router.get("/variances")
 async def get_variances(
     category: Optional[str] = Query(None),
@@ -621,6 +684,13 @@ async def get_variances(
     warehouse: Optional[str] = Query(None),
     limit: int = Query(100, ge=1, le=1000),
     skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from a previous page; pass an empty value to start",
+    ),
+    include_total: Optional[bool] = Query(
+        None, description="Count all variances (default: offset mode only)"
+    ),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -644,35 +714,50 @@ async def get_variances(
         # Only get variances (non-zero)
         filter_query["variance"] = {"$ne": 0}
 
+        if cursor is not None:
+            result = await cursor_paginate_mongo(
+                db.item_variances,
+                filter_query,
+                sort_field="verified_at",
+                direction=-1,
+                limit=limit,
+                cursor=cursor,
+                include_total=bool(include_total),
+            )
+            return {
+                "success": True,
+                "variances": _serialize_variances(result.items),
+                "pagination": result.pagination(),
+            }
+
         # Get total count
-        total_count = await db.item_variances.count_documents(filter_query)
+        total = None
+        if include_total is not False:
+            total = await count_total(db.item_variances, filter_query)
 
         # Get variances
-        cursor = (
+        variances_cursor = (
             db.item_variances.find(filter_query)
             .sort("verified_at", -1)
             .skip(skip)
             .limit(limit)
         )
-        variances = await cursor.to_list(length=limit)
-
-        # Convert ObjectId to string
-        for variance in variances:
-            variance["_id"] = str(variance["_id"])
-            if isinstance(variance.get("verified_at"), datetime):
-                variance["verified_at"] = variance["verified_at"].isoformat()
+        variances = await variances_cursor.to_list(length=limit)
 
         return {
             "success": True,
-            "variances": variances,
+            "variances": _serialize_variances(variances),
             "pagination": {
-                "total": total_count,
+                "total": total.value if total else None,
+                "total_accuracy": total.accuracy if total else None,
                 "limit": limit,
                 "skip": skip,
                 "returned": len(variances),
             },
         }
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting variances: {str(e)}")
         raise HTTPException(
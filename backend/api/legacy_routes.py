@@ -27,6 +27,7 @@ if str(project_root) not in sys.path:
 # New feature API routers
 # Phase 1-3: New Upgrade APIs
 # New feature services
+from backend.api.count_lines_api import paginate_count_lines  # noqa: E402
 from backend.api.schemas import (  # noqa: E402
     ApiResponse,
     CountLineCreate,
@@ -40,6 +41,8 @@ from backend.error_messages import get_error_message  # noqa: E402
 # Service type imports
 # Production services
 # from backend.services.connection_pool import SQLServerConnectionPool  # Legacy pool removed
+from backend.db.event_listeners import mongo_event_listeners  # noqa: E402
+from backend.services.ai_variance import ai_variance_service  # noqa: E402
 from backend.services.database_optimizer import DatabaseOptimizer  # noqa: E402
 from backend.services.errors import (  # noqa: E402
     AuthenticationError,
@@ -49,6 +52,7 @@ from backend.services.errors import (  # noqa: E402
     RateLimitExceededError,
     ValidationError,
 )
+from backend.services.media_store import get_media_service  # noqa: E402
 
 # Global service instances (injected by main.py)
 db: Any = None
@@ -174,6 +178,8 @@ mongo_client_options: dict[str, Any] = {
     "socketTimeoutMS": 20000,
     "retryWrites": True,
     "retryReads": True,
+    # Count cache invalidation and per-request Mongo time
+    "event_listeners": mongo_event_listeners(),
 }
 
 client: AsyncIOMotorClient = AsyncIOMotorClient(
@@ -1277,7 +1283,12 @@ async def create_count_line(
         "verified_by": None,
     }
 
+    # Keep photos out of the document; only media references are stored
+    await get_media_service(db).externalize_count_line(
+        count_line, uploaded_by=current_user["username"]
+    )
     await db.count_lines.insert_one(count_line)
+    await ai_variance_service.invalidate_sessions(db, [line_data.session_id])
 
     # Update session stats atomically using aggregation
     try:
@@ -1361,6 +1372,8 @@ async def verify_stock(
     if update_result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Count line not found")
 
+    await ai_variance_service.invalidate_count_line(db_client, {"id": line_id})
+
     if activity_log_service:
         await activity_log_service.log_activity(
             user=current_user["username"],
@@ -1393,6 +1406,8 @@ async def unverify_stock(
     if update_result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Count line not found")
 
+    await ai_variance_service.invalidate_count_line(db_client, {"id": line_id})
+
     if activity_log_service:
         await activity_log_service.log_activity(
             user=current_user["username"],
@@ -1413,37 +1428,25 @@ async def get_count_lines(
     page: int = 1,
     page_size: int = 50,
     verified: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
     *,
     db_override=None,
 ):
     """Get count lines with pagination. Shared between routes and tests."""
-    skip = (page - 1) * page_size
     filter_query: dict[str, Any] = {"session_id": session_id}
 
     if verified is not None:
         filter_query["verified"] = verified
 
-    db_client = _get_db_client(db_override)
-    total = await db_client.count_lines.count_documents(filter_query)
-    lines_cursor = (
-        db_client.count_lines.find(filter_query, {"_id": 0})
-        .sort("counted_at", -1)
-        .skip(skip)
-        .limit(page_size)
+    return await paginate_count_lines(
+        _get_db_client(db_override),
+        filter_query,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total,
     )
-    lines = await lines_cursor.to_list(page_size)
-
-    return {
-        "items": lines,
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "total_pages": (total + page_size - 1) // page_size,
-            "has_next": skip + page_size < total,
-            "has_prev": page > 1,
-        },
-    }
 
 
 @api_router.put("/count-lines/{line_id}/approve")
@@ -1474,6 +1477,8 @@ async def approve_count_line(
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Count line not found")
 
+        await ai_variance_service.invalidate_count_line(db, {"_id": ObjectId(line_id)})
+
         return {"success": True, "message": "Count line approved"}
     except Exception as e:
         logger.error(f"Error approving count line {line_id}: {str(e)}")
@@ -1506,6 +1511,8 @@ async def reject_count_line(
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Count line not found")
 
+        await ai_variance_service.invalidate_count_line(db, {"_id": ObjectId(line_id)})
+
         return {"success": True, "message": "Count line rejected"}
     except Exception as e:
         logger.error(f"Error rejecting count line {line_id}: {str(e)}")
@@ -1541,6 +1548,13 @@ async def get_count_lines_route(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
     verified: Optional[bool] = Query(None, description="Filter by verification status"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from a previous page; pass an empty value to start",
+    ),
+    include_total: Optional[bool] = Query(
+        None, description="Count all matching lines (default: offset mode only)"
+    ),
 ):
     return await get_count_lines(
         session_id,
@@ -1548,6 +1562,8 @@ async def get_count_lines_route(
         page=page,
         page_size=page_size,
         verified=verified,
+        cursor=cursor,
+        include_total=include_total,
     )
 
 
@@ -9,6 +9,9 @@ from pydantic import BaseModel
 
 from backend.auth.dependencies import auth_deps, require_admin, require_permissions
 from backend.auth.permissions import Permission
+from backend.services.activity_log import ActivityLogService
+from backend.services.error_log import ErrorLogService
+from backend.utils.pagination import InvalidCursorError
 
 logger = logging.getLogger(__name__)
 
@@ -87,43 +90,35 @@ async def get_error_logs(
     resolved: Optional[bool] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from a previous page; pass an empty value to start",
+    ),
+    include_total: Optional[bool] = Query(
+        None, description="Count all matching errors (default: offset mode only)"
+    ),
     current_user: dict = Depends(require_permissions([Permission.ERROR_LOG_READ])),
 ):
-    query: dict[str, Any] = {}
-    if severity:
-        query["severity"] = severity
-    if error_type:
-        query["error_type"] = {"$regex": error_type, "$options": "i"}
-    if endpoint:
-        query["endpoint"] = {"$regex": endpoint, "$options": "i"}
-    if resolved is not None:
-        query["resolved"] = resolved
-
     date_query = build_date_query(start_date, end_date)
-    if date_query:
-        query["timestamp"] = date_query
-
-    total = await auth_deps.db.error_logs.count_documents(query)
-    cursor = (
-        auth_deps.db.error_logs.find(query)
-        .sort("timestamp", -1)
-        .skip((page - 1) * page_size)
-        .limit(page_size)
-    )
-
-    items = []
-    async for doc in cursor:
-        doc["id"] = str(doc.pop("_id"))
-        items.append(ErrorLogModel(**doc))
+    try:
+        result = await ErrorLogService(auth_deps.db).get_errors(
+            severity=severity,
+            error_type=error_type,
+            endpoint=endpoint,
+            resolved=resolved,
+            start_date=date_query.get("$gte"),
+            end_date=date_query.get("$lte"),
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
-        "errors": items,
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "has_next": (page * page_size) < total,
-        },
+        "errors": [ErrorLogModel(**doc) for doc in result["errors"]],
+        "pagination": result["pagination"],
     }
 
 
@@ -225,41 +220,34 @@ async def get_activity_logs(
     status_filter: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from a previous page; pass an empty value to start",
+    ),
+    include_total: Optional[bool] = Query(
+        None, description="Count all matching activities (default: offset mode only)"
+    ),
     current_user: dict = Depends(require_permissions([Permission.ACTIVITY_LOG_READ])),
 ):
-    query: dict[str, Any] = {}
-    if user:
-        query["user"] = {"$regex": user, "$options": "i"}
-    if action:
-        query["action"] = {"$regex": action, "$options": "i"}
-    if status_filter:
-        query["status"] = status_filter
-
     date_query = build_date_query(start_date, end_date)
-    if date_query:
-        query["timestamp"] = date_query
-
-    total = await auth_deps.db.activity_logs.count_documents(query)
-    cursor = (
-        auth_deps.db.activity_logs.find(query)
-        .sort("timestamp", -1)
-        .skip((page - 1) * page_size)
-        .limit(page_size)
-    )
-
-    items = []
-    async for doc in cursor:
-        doc["id"] = str(doc.pop("_id"))
-        items.append(ActivityLogModel(**doc))
+    try:
+        result = await ActivityLogService(auth_deps.db).get_activities(
+            user=user,
+            action=action,
+            status=status_filter,
+            start_date=date_query.get("$gte"),
+            end_date=date_query.get("$lte"),
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
-        "activities": items,
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "has_next": (page * page_size) < total,
-        },
+        "activities": [ActivityLogModel(**doc) for doc in result["activities"]],
+        "pagination": result["pagination"],
     }
 
 
@@ -0,0 +1,103 @@
+"""
+Media API
+Photo upload and streaming with ETag and Range support
+"""
+
+import re
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from fastapi.responses import Response, StreamingResponse
+
+from backend.auth.dependencies import get_current_user
+from backend.db.runtime import get_db
+from backend.services.media_store import MediaError, get_media_service
+
+media_router = APIRouter(prefix="/api/media", tags=["media"])
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Content never changes for a given hash
+_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+def _parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """(start, end) for a single ``bytes=`` range; raises 416 if unsatisfiable."""
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        raise HTTPException(416, "Only single byte ranges are supported")
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise HTTPException(416, "Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+async def _serve(request: Request, media_id: str, thumbnail: bool) -> Response:
+    service = get_media_service(get_db())
+    doc = await service.get(media_id)
+    if doc is None:
+        raise HTTPException(404, "Media not found")
+
+    size = doc["thumbnail_size"] if thumbnail else doc["size"]
+    content_type = "image/jpeg" if thumbnail else doc["content_type"]
+    etag = f'"{media_id}{"-thumb" if thumbnail else ""}"'
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL, "Accept-Ranges": "bytes"}
+
+    if etag in (request.headers.get("if-none-match") or ""):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range == etag:
+        byte_range = _parse_range(request.headers.get("range"), size)
+
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    status_code = 200
+    if byte_range:
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        service.stream(media_id, start, end, thumbnail=thumbnail),
+        status_code=status_code,
+        media_type=content_type,
+        headers=headers,
+    )
+
+
+@media_router.post("")
+async def upload_media(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user),
+) -> dict[str, Any]:
+    """Upload a photo; returns its reference (deduplicated by content)"""
+    service = get_media_service(get_db())
+    data = await file.read(service.max_bytes + 1)
+    try:
+        reference = await service.ingest(data, uploaded_by=current_user.get("username"))
+    except MediaError as e:
+        raise HTTPException(400, str(e))
+    return {"success": True, "data": reference}
+
+
+@media_router.get("/{media_id}", response_model=None)
+async def get_media(
+    media_id: str, request: Request, current_user: dict = Depends(get_current_user)
+) -> Response:
+    """Stream a photo"""
+    return await _serve(request, media_id, thumbnail=False)
+
+
+@media_router.get("/{media_id}/thumbnail", response_model=None)
+async def get_media_thumbnail(
+    media_id: str, request: Request, current_user: dict = Depends(get_current_user)
+) -> Response:
+    """Stream a photo's thumbnail (JPEG)"""
+    return await _serve(request, media_id, thumbnail=True)
@@ -3,7 +3,11 @@ Metrics API
 Prometheus-compatible metrics endpoint
 """
 
-from fastapi import APIRouter, Response
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from backend.auth.dependencies import require_admin
 
 metrics_router = APIRouter(prefix="/metrics", tags=["metrics"])
 
@@ -30,7 +34,12 @@ async def get_prometheus_metrics():
             media_type="text/plain; version=0.0.4",
         )
 
+    from backend.services.query_monitor import query_monitor
+
     metrics_text = _monitoring_service.get_prometheus_metrics()
+    query_lines = query_monitor.prometheus_lines()
+    if query_lines:
+        metrics_text = metrics_text.rstrip("\n") + "\n" + "\n".join(query_lines) + "\n"
 
     return Response(content=metrics_text, media_type="text/plain; version=0.0.4")
 
@@ -52,6 +61,124 @@ async def get_metrics_json():
     return {"success": True, "data": metrics}
 
 
+@metrics_router.get("/ai")
+async def get_ai_inference_metrics():
+    """Get semantic model load time, queue depth and inference latency"""
+    from backend.services.ai_search import ai_search_service
+
+    return {"success": True, "data": ai_search_service.get_stats()}
+
+
+@metrics_router.get("/log-sink")
+async def get_log_sink_metrics():
+    """Get log sink queue depth, flush latency and overflow counters"""
+    from backend.services.log_sink import get_log_sink
+
+    sink = get_log_sink()
+    if sink is None:
+        return {"success": True, "data": {"running": False}}
+    return {"success": True, "data": sink.get_metrics()}
+
+
+@metrics_router.get("/profiler")
+async def get_profiler_summary(current_user: dict = Depends(require_admin)):
+    """Get per-route wall/Mongo/CPU breakdown and recent request profiles"""
+    from backend.services.profiler import profiler
+
+    return {"success": True, "data": profiler.get_summary()}
+
+
+@metrics_router.get("/profiler/flamegraph", response_model=None)
+async def get_profiler_flamegraph(
+    route: Optional[str] = Query(None, description='Route key, e.g. "GET /api/count-lines"'),
+    profile_id: Optional[int] = Query(None, ge=1),
+    current_user: dict = Depends(require_admin),
+):
+    """Get collapsed stacks (flamegraph.pl / speedscope input) for a route or request"""
+    from backend.services.profiler import profiler
+
+    if profile_id is not None:
+        profile = profiler.get_profile(profile_id)
+        collapsed = profile.samples.collapsed() if profile else None
+    elif route:
+        collapsed = profiler.route_collapsed(route)
+    else:
+        raise HTTPException(status_code=400, detail="Pass route or profile_id")
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail="No profile found")
+    return Response(content=collapsed + "\n", media_type="text/plain")
+
+
+@metrics_router.get("/profiler/requests/{profile_id}")
+async def get_request_profile(profile_id: int, current_user: dict = Depends(require_admin)):
+    """Get one detailed request profile"""
+    from backend.services.profiler import profiler
+
+    profile = profiler.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return {"success": True, "data": profile.to_dict(include_stacks=True)}
+
+
+@metrics_router.post("/profiler/arm")
+async def arm_profiler(
+    path_prefix: str = Query(..., min_length=1),
+    count: int = Query(1, ge=1, le=100),
+    current_user: dict = Depends(require_admin),
+):
+    """Profile the next N requests whose path starts with path_prefix"""
+    from backend.services.profiler import profiler
+
+    profiler.arm(path_prefix, count)
+    return {"success": True, "data": profiler.get_summary()["armed"]}
+
+
+@metrics_router.post("/profiler/continuous")
+async def set_profiler_continuous(
+    enabled: bool = Query(...), current_user: dict = Depends(require_admin)
+):
+    """Turn the continuous low-rate sampler on or off"""
+    from backend.services.profiler import profiler
+
+    profiler.set_continuous(enabled)
+    return {"success": True, "data": {"continuous": profiler.continuous}}
+
+
+@metrics_router.delete("/profiler")
+async def reset_profiler(current_user: dict = Depends(require_admin)):
+    """Discard collected profiles"""
+    from backend.services.profiler import profiler
+
+    profiler.reset()
+    return {"success": True}
+
+
+@metrics_router.get("/queries")
+async def get_query_shape_metrics(
+    limit: int = Query(20, ge=1, le=200),
+    sort: str = Query("total_ms", pattern="^(total_ms|count|max_ms|docs_returned)$"),
+    explain: bool = Query(False, description="Sample explain for the top shapes"),
+    current_user: dict = Depends(require_admin),
+):
+    """Get MongoDB latency per (collection, command, query shape)"""
+    from backend.services.query_monitor import query_monitor
+
+    if explain:
+        from backend.db.runtime import get_db
+
+        await query_monitor.explain_top(get_db(), limit=min(limit, 10))
+    return {"success": True, "data": query_monitor.get_stats(limit=limit, sort=sort)}
+
+
+@metrics_router.delete("/queries")
+async def reset_query_shape_metrics(current_user: dict = Depends(require_admin)):
+    """Discard collected query shape stats"""
+    from backend.services.query_monitor import query_monitor
+
+    query_monitor.reset()
+    return {"success": True}
+
+
 @metrics_router.get("/health")
 async def get_health_metrics():
     """Get health status metrics with database status"""
@@ -17,18 +17,24 @@ from fastapi import (
     WebSocket,
     WebSocketDisconnect,
 )
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 
 from backend.auth.dependencies import get_current_user, require_role
 from backend.db.runtime import get_db
 from backend.services.advanced_report_service import (
     AdvancedReportService,
-    ColumnConfig,
     ReportConfig,
     ReportFilters,
     SortOrder,
 )
+from backend.services.reporting.streaming_export import (
+    XLSX_MEDIA_TYPE,
+    log_progress,
+    stream_csv,
+    write_xlsx_file,
+)
 from backend.utils.tracing import trace_dashboard_query, trace_span
 
 logger = logging.getLogger(__name__)
@@ -611,29 +617,21 @@ async def websocket_endpoint(websocket: WebSocket, token: str):
 # ==========================================
 
 
-@realtime_dashboard_router.post("/export/csv")
-async def export_dashboard_csv(
-    config: DashboardConfig,
-    current_user: dict = Depends(require_role("supervisor", "admin")),
-):
-    """Export current dashboard view as CSV."""
-    db = get_db()
-    service = AdvancedReportService(db)
-
-    # Get all data (no pagination for export)
-    report_config = ReportConfig(
+def _export_report_config(config: DashboardConfig) -> ReportConfig:
+    return ReportConfig(
         report_type="verified_items",
         filters=parse_filters(config.filters),
-        page=1,
-        page_size=10000,  # Max export
         sort_by=config.sort_by,
         sort_order=(
             SortOrder(config.sort_order) if config.sort_order else SortOrder.DESC
         ),
     )
 
-    result = await service.generate_verified_items_report(report_config)
-    columns = [ColumnConfig(**col) for col in result["columns"]]
+
+def _export_columns(
+    service: AdvancedReportService, config: DashboardConfig
+) -> list[tuple[str, str]]:
+    columns = [col.model_copy() for col in service.get_column_config("verified_items")]
 
     # Apply visibility from config
     if config.columns:
@@ -642,10 +640,26 @@ async def export_dashboard_csv(
             if col.field in visibility_map:
                 col.visible = visibility_map[col.field]
 
-    csv_content = await service.export_to_csv(result["data"], columns)
+    return service.export_columns(columns)
+
+
+@realtime_dashboard_router.post("/export/csv")
+async def export_dashboard_csv(
+    config: DashboardConfig,
+    current_user: dict = Depends(require_role("supervisor", "admin")),
+):
+    """Export current dashboard view as CSV (streamed straight from the cursor)."""
+    db = get_db()
+    service = AdvancedReportService(db)
+
+    rows = service.iter_verified_items(_export_report_config(config))
 
     return StreamingResponse(
-        iter([csv_content]),
+        stream_csv(
+            rows,
+            _export_columns(service, config),
+            on_progress=log_progress("Dashboard CSV export"),
+        ),
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename=dashboard_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
@@ -658,36 +672,20 @@ async def export_dashboard_xlsx(
     config: DashboardConfig,
     current_user: dict = Depends(require_role("supervisor", "admin")),
 ):
-    """Export current dashboard view as Excel."""
+    """Export current dashboard view as Excel (write-only workbook on disk)."""
     db = get_db()
     service = AdvancedReportService(db)
 
-    report_config = ReportConfig(
-        report_type="verified_items",
-        filters=parse_filters(config.filters),
-        page=1,
-        page_size=10000,
-        sort_by=config.sort_by,
-        sort_order=(
-            SortOrder(config.sort_order) if config.sort_order else SortOrder.DESC
-        ),
+    rows = service.iter_verified_items(_export_report_config(config))
+    path = await write_xlsx_file(
+        rows,
+        _export_columns(service, config),
+        on_progress=log_progress("Dashboard XLSX export"),
     )
 
-    result = await service.generate_verified_items_report(report_config)
-    columns = [ColumnConfig(**col) for col in result["columns"]]
-
-    if config.columns:
-        visibility_map = {pref.field: pref.visible for pref in config.columns}
-        for col in columns:
-            if col.field in visibility_map:
-                col.visible = visibility_map[col.field]
-
-    xlsx_content = await service.export_to_xlsx(result["data"], columns)
-
-    return StreamingResponse(
-        iter([xlsx_content]),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f"attachment; filename=dashboard_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        },
+    return FileResponse(
+        path,
+        media_type=XLSX_MEDIA_TYPE,
+        filename=f"dashboard_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+        background=BackgroundTask(path.unlink, missing_ok=True),
     )
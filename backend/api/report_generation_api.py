@@ -10,12 +10,19 @@ import logging
 from datetime import date, datetime
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 
 from backend.auth.dependencies import get_current_user, require_role
 from backend.db.runtime import get_db
+from backend.services.reporting.report_jobs import get_report_job_queue, report_job
+from backend.services.reporting.streaming_export import (
+    XLSX_MEDIA_TYPE,
+    stream_csv,
+    write_xlsx_file,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -425,6 +432,35 @@ REPORT_GENERATORS = {
 }
 
 
+@report_job("report_generation")
+async def run_report_generation_job(db, params: dict[str, Any], job) -> dict[str, Any]:
+    """Background version of POST /reports/generate"""
+    filters = ReportFilter(**params.get("filters", {}))
+    await job.progress(5, "Querying")
+    data = await REPORT_GENERATORS[params["report_type"]](db, filters)
+    await job.progress(90, f"Storing {len(data)} rows")
+
+    summary = ReportSummary(
+        total_records=len(data),
+        generated_at=datetime.utcnow().isoformat(),
+        filters_applied={k: v for k, v in params.get("filters", {}).items() if v is not None},
+        report_type=params["report_type"],
+        report_name=REPORT_TYPES[params["report_type"]]["name"],
+    )
+    return {"summary": summary.dict(), "rows": data}
+
+
+async def _get_visible_job(job_id: str, current_user: dict) -> dict[str, Any]:
+    job = await get_report_job_queue(get_db()).get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report job not found")
+    if job.get("created_by") != current_user.get("username") and current_user.get(
+        "role"
+    ) not in ("admin", "supervisor"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    return job
+
+
 # API Endpoints
 @report_generation_router.get("/types")
 async def get_report_types(current_user: dict = Depends(get_current_user)):
@@ -480,6 +516,107 @@ async def generate_report(
     return ReportResponse(summary=summary, data=data)
 
 
+@report_generation_router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_report_job(
+    request: ReportRequest,
+    current_user: dict = Depends(require_role("admin", "supervisor")),
+):
+    """
+    Generate a report in the background.
+    Returns the job at once; poll GET /reports/jobs/{job_id} for progress, then
+    page the rows or download them as CSV/XLSX. An identical request made while
+    the job runs or shortly after it finishes returns the same job.
+    """
+    if request.report_type not in REPORT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid report type. Valid types: {list(REPORT_TYPES.keys())}",
+        )
+
+    filters = json.loads((request.filters or ReportFilter()).json())
+    return await get_report_job_queue(get_db()).submit(
+        "report_generation",
+        {"report_type": request.report_type, "filters": filters},
+        created_by=current_user.get("username"),
+    )
+
+
+@report_generation_router.get("/jobs/{job_id}")
+async def get_report_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Get a report job's status, progress and result summary."""
+    return await _get_visible_job(job_id, current_user)
+
+
+@report_generation_router.post("/jobs/{job_id}/cancel")
+async def cancel_report_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Cancel a queued or running report job."""
+    await _get_visible_job(job_id, current_user)
+    return await get_report_job_queue(get_db()).cancel(job_id)
+
+
+@report_generation_router.get("/jobs/{job_id}/rows")
+async def get_report_job_rows(
+    job_id: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user),
+):
+    """Page through a completed job's result rows."""
+    job = await _get_visible_job(job_id, current_user)
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=f"Report job is {job['status']}"
+        )
+
+    queue = get_report_job_queue(get_db())
+    rows = [row async for row in queue.iter_rows(job, skip=skip, limit=limit)]
+    return {
+        "job_id": job_id,
+        "rows": rows,
+        "pagination": {
+            "skip": skip,
+            "limit": limit,
+            "total": job.get("row_count", 0),
+            "has_more": (skip + limit) < job.get("row_count", 0),
+        },
+    }
+
+
+@report_generation_router.get("/jobs/{job_id}/download")
+async def download_report_job(
+    job_id: str,
+    format: str = Query("csv", pattern="^(csv|xlsx)$"),
+    current_user: dict = Depends(get_current_user),
+):
+    """Download a completed job's rows as CSV or XLSX."""
+    job = await _get_visible_job(job_id, current_user)
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=f"Report job is {job['status']}"
+        )
+
+    queue = get_report_job_queue(get_db())
+    rows = queue.iter_rows(job)
+    name = job.get("params", {}).get("report_type") or job["kind"]
+    filename = f"{name}_{job['created_at'].strftime('%Y%m%d_%H%M%S')}.{format}"
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+
+    if format == "csv":
+        return StreamingResponse(
+            stream_csv(rows, total_rows=job.get("row_count")),
+            media_type="text/csv",
+            headers=headers,
+        )
+
+    path = await write_xlsx_file(rows, total_rows=job.get("row_count"))
+    return FileResponse(
+        path,
+        media_type=XLSX_MEDIA_TYPE,
+        headers=headers,
+        background=BackgroundTask(path.unlink, missing_ok=True),
+    )
+
+
 @report_generation_router.post("/export/csv")
 async def export_report_csv(
     request: ReportRequest,
@@ -7,13 +7,17 @@ import logging
 from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 
 from backend.auth.dependencies import get_current_user_async as get_current_user
 from backend.services.reporting.compare_engine import CompareEngine
 from backend.services.reporting.export_engine import ExportEngine
 from backend.services.reporting.query_builder import QueryBuilder
+from backend.services.reporting.report_jobs import get_report_job_queue, report_job
 from backend.services.reporting.snapshot_engine import SnapshotEngine
+from backend.services.reporting.streaming_export import XLSX_MEDIA_TYPE
 
 logger = logging.getLogger(__name__)
 
@@ -119,6 +123,42 @@ async def create_snapshot(
     return snapshot
 
 
+@report_job("snapshot")
+async def run_snapshot_job(db, params: dict[str, Any], job) -> dict[str, Any]:
+    """Background version of POST /snapshots"""
+    await job.progress(5, "Running query")
+    snapshot = await SnapshotEngine(db).create_snapshot(**params)
+    snapshot.pop("_id", None)
+    return {"snapshot": snapshot}
+
+
+@router.post("/snapshots/jobs", status_code=202)
+async def submit_snapshot_job(
+    request: CreateSnapshotRequest,
+    current_user: dict[str, Any] = Depends(get_current_user),
+) -> dict[str, Any]:
+    """
+    Create a snapshot in the background
+
+    Poll GET /api/reports/jobs/{job_id}; the finished job's result holds the
+    snapshot. The same request repeated while it runs reuses the job.
+    """
+    from backend.server import db
+
+    return await get_report_job_queue(db).submit(
+        "snapshot",
+        {
+            "name": request.name,
+            "description": request.description,
+            "query_spec": request.query_spec.dict(),
+            "created_by": current_user["username"],
+            "snapshot_type": request.snapshot_type,
+            "tags": request.tags,
+        },
+        created_by=current_user["username"],
+    )
+
+
 @router.get("/snapshots")
 async def list_snapshots(
     created_by: Optional[str] = Query(None),
@@ -240,28 +280,35 @@ async def export_snapshot(
     if not snapshot:
         raise HTTPException(status_code=404, detail="Snapshot not found")
 
+    # Generate filename
+    filename = export_engine.get_export_filename(snapshot, format)
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    rows = snapshot_engine.iter_rows(snapshot)
+
     # Export
     if format == "csv":
-        content = export_engine.export_to_csv(snapshot)
-        media_type = "text/csv"
+        return StreamingResponse(
+            export_engine.stream_csv(snapshot, rows),
+            media_type="text/csv",
+            headers=headers,
+        )
     elif format == "xlsx":
-        content = export_engine.export_to_xlsx(snapshot)
-        media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        path = await export_engine.export_to_xlsx_file(snapshot, rows)
+        return FileResponse(
+            path,
+            media_type=XLSX_MEDIA_TYPE,
+            headers=headers,
+            background=BackgroundTask(path.unlink, missing_ok=True),
+        )
     elif format == "json":
-        content = export_engine.export_to_json(snapshot)
-        media_type = "application/json"
+        return StreamingResponse(
+            export_engine.stream_json(snapshot, rows),
+            media_type="application/json",
+            headers=headers,
+        )
     else:
         raise HTTPException(status_code=400, detail="Invalid format")
 
-    # Generate filename
-    filename = export_engine.get_export_filename(snapshot, format)
-
-    return Response(
-        content=content,
-        media_type=media_type,
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
-
 
 @router.post("/compare")
 async def compare_snapshots(
@@ -305,6 +352,36 @@ async def get_comparison(
     return comparison
 
 
+@router.get("/compare/{job_id}/diffs")
+async def get_comparison_diffs(
+    job_id: str,
+    change_type: str = Query(..., pattern="^(added|removed|changed)$"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: dict[str, Any] = Depends(get_current_user),
+) -> dict[str, Any]:
+    """
+    Page through the full added/removed/changed rows of a comparison
+    """
+    from backend.server import db
+
+    compare_engine = CompareEngine(db)
+
+    entries = await compare_engine.get_comparison_diffs(
+        job_id, change_type, skip=skip, limit=limit
+    )
+
+    if entries is None:
+        raise HTTPException(status_code=404, detail="Comparison not found")
+
+    return {
+        "job_id": job_id,
+        "change_type": change_type,
+        "entries": entries,
+        "pagination": {"skip": skip, "limit": limit, "count": len(entries)},
+    }
+
+
 @router.get("/compare")
 async def list_comparisons(
     created_by: Optional[str] = Query(None),
@@ -2,6 +2,7 @@
 Service Logs API - Real-time log viewing for all services
 """
 
+import asyncio
 import logging
 import os
 import platform
@@ -11,6 +12,8 @@ from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
+from backend.utils.log_tail import TailResult, read_since, tail_lines
+
 try:
     from backend.auth.jwt import get_current_user
 except ImportError:
@@ -61,33 +64,41 @@ def _parse_log_file(
     log_file: Path,
     lines: int,
     level: Optional[str] = None,
-) -> list[dict]:
-    """Parse a log file and return structured log entries."""
-    logs: list[dict[str, Any]] = []
+    since: Optional[int] = None,
+) -> tuple[list[dict], TailResult]:
+    """
+    Parse the tail of a log file into structured log entries.
+
+    Reads backwards from the end of the file (or forwards from byte offset
+    ``since``) and applies the level filter while streaming, so only the
+    returned lines are held in memory.
+    """
     if not log_file.exists():
-        return logs
+        return [], TailResult()
 
-    with open(log_file, encoding="utf-8", errors="ignore") as f:
-        all_lines = f.readlines()
-        recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
+    def _matches(line: str) -> bool:
+        return _detect_log_level(line) == level
 
-    for line in recent_lines:
-        line = line.strip()
-        if not line:
-            continue
+    match = _matches if level else None
+    if since is None:
+        tail = tail_lines(log_file, lines, match)
+    else:
+        tail = read_since(log_file, since, lines, match)
 
-        log_level = _detect_log_level(line)
-        if level and log_level != level:
-            continue
+    logs: list[dict[str, Any]] = [
+        {
+            "timestamp": datetime.now().isoformat(),
+            "level": _detect_log_level(line),
+            "message": line,
+        }
+        for line in tail.lines
+    ]
+    return logs, tail
 
-        logs.append(
-            {
-                "timestamp": datetime.now().isoformat(),
-                "level": log_level,
-                "message": line,
-            }
-        )
-    return logs
+
+def _tail_fields(tail: TailResult) -> dict[str, Any]:
+    """Offsets the admin UI passes back as ``since`` to poll incrementally."""
+    return {"offset": tail.offset, "reset": tail.reset, "truncated": tail.truncated}
 
 
 def _find_log_file(*candidates: Path) -> Optional[Path]:
@@ -102,6 +113,9 @@ def _find_log_file(*candidates: Path) -> Optional[Path]:
 async def get_backend_logs(
     lines: int = Query(100, ge=1, le=1000),
     level: Optional[str] = Query(None, regex="^(INFO|WARN|ERROR|DEBUG)$"),
+    since: Optional[int] = Query(
+        None, ge=0, description="Byte offset from a previous response; only newer lines"
+    ),
     current_user: dict = Depends(require_admin),
 ):
     """Get backend server logs"""
@@ -112,8 +126,9 @@ async def get_backend_logs(
             base_dir / "backend.log",
         )
 
+        tail = TailResult()
         if log_file:
-            logs = _parse_log_file(log_file, lines, level)
+            logs, tail = await asyncio.to_thread(_parse_log_file, log_file, lines, level, since)
         else:
             logs = [
                 {
@@ -125,7 +140,12 @@ async def get_backend_logs(
 
         return {
             "success": True,
-            "data": {"logs": logs, "count": len(logs), "service": "backend"},
+            "data": {
+                "logs": logs,
+                "count": len(logs),
+                "service": "backend",
+                **_tail_fields(tail),
+            },
         }
     except Exception as e:
         logger.error(f"Error getting backend logs: {e}")
@@ -172,6 +192,9 @@ async def get_frontend_logs(
 async def get_mongodb_logs(
     lines: int = Query(100, ge=1, le=1000),
     level: Optional[str] = Query(None, regex="^(INFO|WARN|ERROR|DEBUG)$"),
+    since: Optional[int] = Query(
+        None, ge=0, description="Byte offset from a previous response; only newer lines"
+    ),
     current_user: dict = Depends(require_admin),
 ):
     """Get MongoDB logs"""
@@ -189,8 +212,9 @@ async def get_mongodb_logs(
             ]
 
         log_file = _find_log_file(*log_paths)
+        tail = TailResult()
         if log_file:
-            logs = _parse_log_file(log_file, lines, level)
+            logs, tail = await asyncio.to_thread(_parse_log_file, log_file, lines, level, since)
         else:
             logs = [
                 {
@@ -206,6 +230,7 @@ async def get_mongodb_logs(
                 "logs": logs,
                 "count": len(logs),
                 "service": "mongodb",
+                **_tail_fields(tail),
             },
         }
     except Exception as e:
@@ -220,6 +245,9 @@ async def get_mongodb_logs(
 async def get_system_logs(
     lines: int = Query(100, ge=1, le=1000),
     level: Optional[str] = Query(None, regex="^(INFO|WARN|ERROR|DEBUG)$"),
+    since: Optional[int] = Query(
+        None, ge=0, description="Byte offset from a previous response; only newer lines"
+    ),
     current_user: dict = Depends(require_admin),
 ):
     """Get system/application logs"""
@@ -230,11 +258,19 @@ async def get_system_logs(
             base_dir / "app.log",
         )
 
-        logs = _parse_log_file(log_file, lines, level) if log_file else []
+        logs: list[dict] = []
+        tail = TailResult()
+        if log_file:
+            logs, tail = await asyncio.to_thread(_parse_log_file, log_file, lines, level, since)
 
         return {
             "success": True,
-            "data": {"logs": logs, "count": len(logs), "service": "system"},
+            "data": {
+                "logs": logs,
+                "count": len(logs),
+                "service": "system",
+                **_tail_fields(tail),
+            },
         }
     except Exception as e:
         logger.error(f"Error getting system logs: {e}")
@@ -8,6 +8,12 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from backend.api.schemas import Session, SessionCreate
 from backend.auth.dependencies import get_current_user
 from backend.services.activity_log import ActivityLogService
+from backend.services.reporting.report_jobs import get_report_job_queue, report_job
+from backend.utils.pagination import (
+    InvalidCursorError,
+    count_total,
+    cursor_paginate_mongo,
+)
 
 # Debug: uncomment to verify import
 # print(f"DEBUG: session_api imported get_current_user: {get_current_user}")
@@ -116,23 +122,69 @@ async def get_sessions(
     current_user: dict[str, Any] = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from a previous page; pass an empty value to start",
+    ),
+    include_total: Optional[bool] = Query(
+        None, description="Count all sessions (default: offset mode only)"
+    ),
 ) -> dict[str, Any]:
     """Get sessions with pagination"""
     if not _db:
         raise HTTPException(status_code=503, detail="Service not initialized")
 
+    # Direct (non-HTTP) callers leave the Query() defaults in place
+    if not isinstance(cursor, str):
+        cursor = None
+    if not isinstance(include_total, bool):
+        include_total = None
+
+    if current_user["role"] == "supervisor":
+        filter_query: dict[str, Any] = {}
+        projection: Optional[dict[str, Any]] = None
+    else:
+        filter_query = {"staff_user": current_user["username"]}
+        projection = {"_id": 0}
+
+    if cursor is not None:
+        try:
+            result = await cursor_paginate_mongo(
+                _db.sessions,
+                filter_query,
+                sort_field="started_at",
+                direction=-1,
+                limit=page_size,
+                cursor=cursor,
+                projection=projection,
+                include_total=bool(include_total),
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {
+            "items": [_to_session(session) for session in result.items],
+            "total": result.total,
+            "page_size": page_size,
+            "has_next": result.has_more,
+            "next_cursor": result.next_cursor,
+            "pagination": result.pagination(),
+        }
+
     skip = (page - 1) * page_size
 
+    total: Optional[int] = None
+    total_accuracy: Optional[str] = None
+    if include_total is not False:
+        # Exact even when unfiltered: the page count drives the client pager
+        counted = await count_total(_db.sessions, filter_query, exact=True)
+        total, total_accuracy = counted.value, counted.accuracy
+
     if current_user["role"] == "supervisor":
-        total = await _db.sessions.count_documents({})
         sessions_cursor = (
             _db.sessions.find().sort("started_at", -1).skip(skip).limit(page_size)
         )
     else:
-        filter_query = {"staff_user": current_user["username"]}
-        total = await _db.sessions.count_documents(filter_query)
         # Optimize query with projection and batch size
-        projection = {"_id": 0}
         sessions_cursor = (
             _db.sessions.find(filter_query, projection)
             .sort("started_at", -1)
@@ -142,14 +194,14 @@ async def get_sessions(
         sessions_cursor.batch_size(min(page_size, 100))
 
     sessions = await sessions_cursor.to_list(page_size)
-    session_items = []
-    for session in sessions:
-        normalized = dict(session)
-        normalized.pop("_id", None)
-        session_items.append(Session(**normalized))
+    session_items = [_to_session(session) for session in sessions]
 
-    total_pages = (total + page_size - 1) // page_size if total else 0
-    has_next = (skip + len(session_items)) < total
+    if total is None:
+        total_pages = None
+        has_next = len(session_items) == page_size
+    else:
+        total_pages = (total + page_size - 1) // page_size if total else 0
+        has_next = (skip + len(session_items)) < total
 
     has_previous = page > 1
 
@@ -160,6 +212,7 @@ async def get_sessions(
         "total_pages": total_pages,
         "has_next": has_next,
         "has_prev": has_previous,
+        "total_accuracy": total_accuracy,
     }
 
     return {
@@ -170,10 +223,17 @@ async def get_sessions(
         "total_pages": total_pages,
         "has_next": has_next,
         "has_previous": has_previous,
+        "total_accuracy": total_accuracy,
         "pagination": legacy_pagination,
     }
 
 
+def _to_session(document: dict[str, Any]) -> Session:
+    normalized = dict(document)
+    normalized.pop("_id", None)
+    return Session(**normalized)
+
+
 # Bulk session operations
 @router.post("/sessions/bulk/close")
 async def bulk_close_sessions(
@@ -324,6 +384,72 @@ async def bulk_export_sessions(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@report_job("session_export")
+async def run_session_export_job(db, params: dict[str, Any], job) -> dict[str, Any]:
+    """Background version of /sessions/bulk/export: one query, rows stored with the job"""
+    session_ids = params["session_ids"]
+    found = {}
+    async for session in db.sessions.find({"id": {"$in": session_ids}}, {"_id": 0}):
+        found[session["id"]] = session
+    await job.progress(90, "Sessions loaded")
+    rows = [found[session_id] for session_id in session_ids if session_id in found]
+    return {
+        "exported_count": len(rows),
+        "total": len(session_ids),
+        "format": params.get("format"),
+        "rows": rows,
+    }
+
+
+async def submit_session_export_job(
+    db, activity_log_service, session_ids: list[str], format: str, current_user: dict
+) -> dict[str, Any]:
+    job = await get_report_job_queue(db).submit(
+        "session_export",
+        {"session_ids": session_ids, "format": format},
+        created_by=current_user["username"],
+    )
+    await activity_log_service.log_activity(
+        user=current_user["username"],
+        role=current_user["role"],
+        action="bulk_export_sessions",
+        entity_type="session",
+        entity_id=None,
+        details={
+            "operation": "bulk_export",
+            "count": len(session_ids),
+            "format": format,
+            "job_id": job["job_id"],
+        },
+        ip_address=None,
+        user_agent=None,
+    )
+    return job
+
+
+@router.post("/sessions/bulk/export/jobs", status_code=202)
+async def bulk_export_sessions_job(
+    session_ids: list[str],
+    format: str = "excel",
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Bulk export sessions in the background (supervisor only)
+
+    Poll `GET /api/reports/jobs/{job_id}`; rows are served from
+    `/api/reports/jobs/{job_id}/rows` and `/download`.
+    """
+    if not _db or not _activity_log_service:
+        raise HTTPException(status_code=503, detail="Service not initialized")
+
+    if current_user["role"] not in ["supervisor", "admin"]:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+
+    return await submit_session_export_job(
+        _db, _activity_log_service, session_ids, format, current_user
+    )
+
+
 @router.get("/sessions/analytics")
 async def get_sessions_analytics(current_user: dict = Depends(get_current_user)):
     """Get aggregated session analytics (supervisor only)"""
@@ -7,6 +7,8 @@ from pydantic import BaseModel
 
 from backend.auth.dependencies import get_current_user
 from backend.db.runtime import get_db
+from backend.services.ai_variance import ai_variance_service
+from backend.services.media_store import get_media_service
 
 logger = logging.getLogger(__name__)
 
@@ -116,7 +118,12 @@ async def sync_batch(
                 line_data["synced_at"] = datetime.utcnow()
                 line_data["counted_by"] = current_user["username"]
 
+                # Keep photos out of the document; only media references are stored
+                await get_media_service(db).externalize_count_line(
+                    line_data, uploaded_by=current_user["username"]
+                )
                 await db.count_lines.insert_one(line_data)
+                await ai_variance_service.invalidate_sessions(db, [line_data.get("session_id")])
 
                 result.success = True
                 result.message = "Count line synced"
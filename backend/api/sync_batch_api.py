@@ -18,8 +18,10 @@ from pydantic import BaseModel, ConfigDict, Field
 from backend.api.schemas import Session
 from backend.auth.dependencies import get_current_user_async as get_current_user
 from backend.middleware.security import batch_rate_limiter
+from backend.services.ai_variance import ai_variance_service
 from backend.services.circuit_breaker import get_circuit_breaker
 from backend.services.lock_manager import LockManager, get_lock_manager
+from backend.services.media_store import get_media_service
 from backend.services.redis_service import get_redis
 from backend.services.sync_conflicts_service import SyncConflictsService
 
@@ -242,7 +244,10 @@ async def sync_single_record(
             "subcategory": record.subcategory,
             "item_condition": record.item_condition,
             "condition_details": record.condition_details,
-            "evidence_photos": record.evidence_photos,
+            # Inline photos are stored as media; only their URLs are kept
+            "evidence_photos": await get_media_service(db).externalize_urls(
+                record.evidence_photos, uploaded_by=user_id
+            ),
             "status": record.status,
             "created_at": record.created_at,
             "updated_at": record.updated_at,
@@ -526,7 +531,12 @@ async def _process_count_line_op(
     line_data.setdefault("counted_by", current_user.get("username"))
     line_data.setdefault("counted_at", datetime.utcnow())
     line_data.setdefault("synced_at", datetime.utcnow())
+    # Keep photos out of the document; only media references are stored
+    await get_media_service(db).externalize_count_line(
+        line_data, uploaded_by=line_data.get("counted_by")
+    )
     await db.count_lines.insert_one(line_data)
+    await ai_variance_service.invalidate_sessions(db, [line_data.get("session_id")])
     return "Count line synced"
 
 
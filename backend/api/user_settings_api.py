@@ -212,6 +212,7 @@ async def reset_user_settings(
                 resource_type="user_settings",
                 resource_id=user_id,
                 details={"action": "reset_to_defaults"},
+                durable=True,
             )
 
             logger.info(f"Settings reset to defaults for user {username}")
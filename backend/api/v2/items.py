@@ -171,27 +171,25 @@ async def search_items_semantic(
     Uses sentence-transformers to find items by meaning/context.
     """
     try:
-        # 1. Fetch a broad set of candidates (e.g., all active items or recent ones)
-        # In a real vector DB, we'd query the vector index.
-        # Here, we'll fetch items and rely on the service to rerank/filter.
-        # For performance, we might limit to top 500 or use a text index if available.
-
-        # Fetching top 500 items for re-ranking context
-        # This is a compromise for "Local AI" without a Vector DB
-        items_cursor = db.erp_items.find({}).limit(500)
-        candidates = await items_cursor.to_list(length=500)
-
-        if not candidates:
-            return ApiResponse.success_response(
-                data=PaginatedResponse.create([], 0, 1, limit),
-                message="No items available for semantic search",
-            )
+        # 1. Search precomputed catalogue embeddings
+        results = await ai_search_service.semantic_search(db, query, top_k=limit)
+
+        if results is None:
+            # Embedding store not built yet: rerank a bounded candidate set
+            items_cursor = db.erp_items.find({}).limit(500)
+            candidates = await items_cursor.to_list(length=500)
+
+            if not candidates:
+                return ApiResponse.success_response(
+                    data=PaginatedResponse.create([], 0, 1, limit),
+                    message="No items available for semantic search",
+                )
 
-        # 2. Perform Semantic Reranking
-        # The service will encode the query and candidates, then sort by similarity
-        results = ai_search_service.search_rerank(query, candidates, top_k=limit)
+            results = await ai_search_service.search_rerank_async(
+                query, candidates, top_k=limit
+            )
 
-        # 3. Convert to Response
+        # 2. Convert to Response
         item_responses = [
             ItemResponse(
                 id=str(item["_id"]),
@@ -308,7 +306,9 @@ async def identify_item(
         items_cursor = db.erp_items.find({}).limit(200)
         candidates = await items_cursor.to_list(length=200)
 
-        results = ai_search_service.search_rerank(mock_query, candidates, top_k=5)
+        results = await ai_search_service.search_rerank_async(
+            mock_query, candidates, top_k=5
+        )
 
         # Convert to response
         item_responses = [
@@ -51,3 +51,41 @@ async def get_session_predictions(
             error_code="PREDICTION_ERROR",
             error_message=f"Failed to generate predictions: {str(e)}",
         )
+
+
+@router.get(
+    "/predictions/warehouse", response_model=ApiResponse[list[RiskPrediction]]
+)
+async def get_warehouse_predictions(
+    warehouse: str = Query(..., description="Warehouse to score"),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Score every item in a warehouse so supervisors can pre-plan recounts.
+    """
+    if current_user.get("role", "staff") not in ["supervisor", "admin"]:
+        return ApiResponse.error_response(
+            error_code="FORBIDDEN",
+            error_message="Supervisor access required",
+        )
+
+    try:
+        from backend.server import db
+
+        predictions_data = await ai_variance_service.predict_warehouse_risks(
+            db, warehouse, limit
+        )
+
+        predictions = [RiskPrediction(**p) for p in predictions_data]
+
+        return ApiResponse.success_response(
+            data=predictions,
+            message=f"Generated {len(predictions)} risk predictions for warehouse {warehouse}",
+        )
+
+    except Exception as e:
+        return ApiResponse.error_response(
+            error_code="PREDICTION_ERROR",
+            error_message=f"Failed to generate predictions: {str(e)}",
+        )
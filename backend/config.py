@@ -313,6 +313,197 @@ class Settings(PydanticBaseSettings):
         60, ge=10, le=3600, description="Health check interval in seconds"
     )
 
+    # Semantic search embedding store
+    EMBEDDINGS_DIR: Optional[str] = Field(
+        default=None,
+        description="Directory for precomputed item embeddings (default: backend/data/embeddings)",
+    )
+    EMBEDDINGS_DTYPE: str = Field(
+        default="float16",
+        description="Storage dtype for item embeddings (float16 or float32)",
+    )
+    EMBEDDINGS_REFRESH_ON_SYNC: bool = Field(
+        default=True,
+        description="Re-embed changed items after each SQL quantity sync",
+    )
+
+    # Semantic model lifecycle
+    AI_MODEL_PRELOAD: bool = Field(
+        default=False,
+        description="Load the semantic search model in the background at startup",
+    )
+    AI_ENCODE_QUEUE_SIZE: int = Field(
+        64, ge=1, description="Max queued encode requests"
+    )
+    AI_ENCODE_MAX_BATCH: int = Field(
+        32, ge=1, description="Max queries per encode call"
+    )
+    AI_ENCODE_BATCH_WINDOW_MS: int = Field(
+        5, ge=0, description="How long to wait for more queries before encoding"
+    )
+
+    # Startup / import cost
+    LAZY_ROUTERS: bool = Field(
+        default=True,
+        description="Import rarely used admin/reporting routers on first request",
+    )
+    IMPORT_TIME_BUDGET_MS: int = Field(
+        4000,
+        ge=1,
+        description="Cold import budget for backend.server (import-time benchmark)",
+    )
+
+    # Report snapshots
+    SNAPSHOT_ROWS_PER_CHUNK: int = Field(
+        1000, ge=1, description="Rows per compressed chunk in report_snapshot_rows"
+    )
+    COMPARE_PARTITION_ROWS: int = Field(
+        100_000, ge=1, description="Rows per hash partition when comparing snapshots"
+    )
+
+    # Background report jobs
+    REPORT_JOB_WORKERS: int = Field(
+        2, ge=1, le=32, description="Report jobs run at once per process"
+    )
+    REPORT_JOB_PROCESS_WORKERS: int = Field(
+        0,
+        ge=0,
+        le=16,
+        description="Process pool for openpyxl/pandas work (0 = threads)",
+    )
+    REPORT_JOB_CACHE_TTL_SECONDS: int = Field(
+        900,
+        ge=0,
+        description="How long a finished report job is reused for identical requests",
+    )
+    REPORT_JOB_HEARTBEAT_SECONDS: int = Field(
+        15, ge=1, description="How often workers mark their active report jobs alive"
+    )
+    REPORT_JOB_RETENTION_SECONDS: int = Field(
+        86400,
+        ge=60,
+        description="Finished report jobs and their rows are purged after this",
+    )
+
+    # Keyset pagination
+    PAGINATION_CURSOR_SECRET: Optional[str] = Field(
+        default=None,
+        description="HMAC key for signing pagination cursors (defaults to JWT_SECRET)",
+    )
+    COUNT_CACHE_TTL_SECONDS: float = Field(
+        30.0, ge=0, description="TTL for memoised filtered counts (0 disables)"
+    )
+    COUNT_CACHE_MAX_ENTRIES: int = Field(
+        2048, ge=1, description="Maximum memoised counts kept per process"
+    )
+
+    # Log sink (batched activity/audit/error log writes)
+    LOG_SINK_ENABLED: bool = Field(
+        True, description="Write log entries through the batching sink"
+    )
+    LOG_SINK_MAX_QUEUE: int = Field(
+        10000, ge=1, description="Maximum queued log entries"
+    )
+    LOG_SINK_BATCH_SIZE: int = Field(
+        500, ge=1, description="Entries per insert_many batch"
+    )
+    LOG_SINK_FLUSH_INTERVAL_MS: int = Field(
+        250, ge=10, description="Maximum time an entry waits before being flushed"
+    )
+    LOG_SINK_OVERFLOW: str = Field(
+        "block",
+        description="Overflow policy when the queue is full: block, drop or spill",
+    )
+    LOG_SINK_SPILL_DIR: Optional[str] = Field(
+        None,
+        description="Directory for spilled log entries (spill policy and shutdown)",
+    )
+
+    # Sampling profiler (admin-armed, X-Profile header or continuous)
+    PROFILER_ENABLED: bool = Field(True, description="Install the profiling middleware")
+    PROFILER_ALLOW_HEADER: bool = Field(
+        False, description="Profile requests that send X-Profile: 1"
+    )
+    PROFILER_CONTINUOUS: bool = Field(
+        False, description="Sample every request into per-route profiles"
+    )
+    PROFILER_SAMPLE_INTERVAL_MS: float = Field(
+        5.0, gt=0, description="Sampling interval for per-request profiles"
+    )
+    PROFILER_CONTINUOUS_INTERVAL_MS: float = Field(
+        20.0, gt=0, description="Sampling interval in continuous mode"
+    )
+    PROFILER_MAX_PROFILES: int = Field(
+        50, ge=1, description="Detailed request profiles kept in memory"
+    )
+
+    # Per-query-shape MongoDB command monitoring
+    QUERY_MONITOR_ENABLED: bool = Field(
+        True, description="Record MongoDB command latency per query shape"
+    )
+    QUERY_MONITOR_SLOW_MS: float = Field(
+        100.0, ge=0, description="Commands slower than this keep a slow sample"
+    )
+    QUERY_MONITOR_MAX_SHAPES: int = Field(
+        1000,
+        ge=1,
+        description="Distinct query shapes tracked before folding into (other)",
+    )
+
+    # Retention (DataGovernanceService.apply_retention_policies)
+    RETENTION_ARCHIVE_DIR: Optional[str] = Field(
+        None,
+        description="Archive segment directory (default: backend/data/retention_archive)",
+    )
+    RETENTION_ARCHIVE_FORMAT: str = Field(
+        "jsonl", description="Segment format: jsonl (gzip) or parquet (needs pyarrow)"
+    )
+    RETENTION_CHUNK_SIZE: int = Field(
+        1000, ge=1, le=50000, description="Documents archived and deleted per chunk"
+    )
+    RETENTION_MAX_DOCS_PER_SECOND: float = Field(
+        2000.0, ge=0, description="Retention throughput limit (0 = unthrottled)"
+    )
+    RETENTION_LEASE_SECONDS: int = Field(
+        300, ge=10, description="Per-collection retention lease, renewed every chunk"
+    )
+
+    @validator("RETENTION_ARCHIVE_FORMAT")
+    def validate_retention_archive_format(cls, v):
+        if v.lower() not in ("jsonl", "parquet"):
+            raise ValueError("RETENTION_ARCHIVE_FORMAT must be jsonl or parquet")
+        return v.lower()
+
+    # Photo/evidence media store
+    MEDIA_STORE: str = Field(
+        "local", description="Media backend: local (MEDIA_DIR) or gridfs"
+    )
+    MEDIA_DIR: Optional[str] = Field(
+        None, description="Local media directory (default: backend/data/media)"
+    )
+    MEDIA_MAX_BYTES: int = Field(
+        10 * 1024 * 1024, ge=1024, description="Largest accepted photo upload"
+    )
+    MEDIA_THUMBNAIL_SIZE: int = Field(
+        256, ge=32, le=1024, description="Thumbnail bounding box in pixels"
+    )
+
+    # Scheduled exports
+    EXPORT_STORE: str = Field(
+        "local", description="Export file backend: local (EXPORT_DIR) or gridfs"
+    )
+    EXPORT_DIR: Optional[str] = Field(
+        None, description="Local export directory (default: backend/data/exports)"
+    )
+    EXPORT_MAX_CONCURRENCY: int = Field(
+        2, ge=1, le=16, description="Scheduled exports run at once per worker"
+    )
+    EXPORT_LEASE_SECONDS: int = Field(
+        600,
+        ge=30,
+        description="How long a worker holds a claimed schedule without renewing",
+    )
+
     # Memvid AI Agent Memory Settings
     MEMVID_ENABLED: bool = Field(
         default=True,
@@ -5,6 +5,7 @@ from typing import Any
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from backend.config import settings
+from backend.db.event_listeners import mongo_event_listeners
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,8 @@ mongo_client_options: dict[str, Any] = {
     "socketTimeoutMS": 20000,
     "retryWrites": True,
     "retryReads": True,
+    # Count cache invalidation and per-request Mongo time
+    "event_listeners": mongo_event_listeners(),
 }
 
 logger.info(f"🔌 Connecting to MongoDB at: {mongo_url}")
@@ -0,0 +1,134 @@
+"""
+Lazy Router Registration
+Rarely used routers (admin, reporting) are imported on the first request
+under their path prefix instead of at application import time.
+
+A placeholder route claims the prefix; on first match it imports the
+router module(s), splices the real routes in at the placeholder's position
+(so route precedence is unchanged) and re-dispatches the request.
+"""
+
+import importlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LazyRouterSpec:
+    """``module:attribute`` of an APIRouter plus ``include_router`` kwargs."""
+
+    target: str
+    include_kwargs: dict[str, Any] = field(default_factory=dict)
+
+    def load(self):
+        module_name, _, attr = self.target.partition(":")
+        module = importlib.import_module(module_name)
+        return getattr(module, attr)
+
+
+class LazyRouterPlaceholder(BaseRoute):
+    """Route that matches a path prefix and loads the real routers on demand."""
+
+    def __init__(self, app: FastAPI, prefix: str, specs: list[LazyRouterSpec]):
+        self.app = app
+        self.prefix = prefix.rstrip("/")
+        self.specs = specs
+        self.loaded = False
+
+    @property
+    def path(self) -> str:
+        return f"{self.prefix}/*"
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if self.loaded or scope["type"] != "http":
+            return Match.NONE, {}
+        path = scope["path"]
+        if path == self.prefix or path.startswith(self.prefix + "/"):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        raise NoMatchFound(name, path_params)
+
+    def load(self) -> None:
+        """Import the routers and replace this placeholder with their routes."""
+        if self.loaded:
+            return
+        routes = self.app.router.routes
+        position = routes.index(self) if self in routes else len(routes)
+        before = len(routes)
+
+        for spec in self.specs:
+            try:
+                self.app.include_router(spec.load(), **spec.include_kwargs)
+            except Exception as e:
+                logger.error(f"Failed to load router {spec.target}: {e}")
+
+        new_routes = routes[before:]
+        del routes[before:]
+        if self in routes:
+            routes.remove(self)
+        routes[position:position] = new_routes
+        self.loaded = True
+        self.app.openapi_schema = None
+        logger.info(f"✓ Lazy routers loaded for {self.prefix} ({len(new_routes)} routes)")
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.load()
+        # Re-dispatch through the router now that the real routes exist
+        await self.app.router(scope, receive, send)
+
+
+class LazyRouterRegistry:
+    """Collects lazy routers per path prefix for one application."""
+
+    def __init__(self, app: FastAPI, enabled: bool = True):
+        self.app = app
+        self.enabled = enabled
+        self._placeholders: dict[str, LazyRouterPlaceholder] = {}
+        self._openapi = app.openapi
+        app.openapi = self.openapi  # type: ignore[method-assign]
+
+    def include(self, path_prefix: str, target: str, **include_kwargs: Any) -> None:
+        """
+        Register ``target`` (``"package.module:router"``) to be loaded on the
+        first request whose path starts with ``path_prefix``.
+        ``include_kwargs`` go to ``include_router`` (including its own
+        ``prefix``).
+
+        When the registry is disabled the router is included immediately.
+        """
+        spec = LazyRouterSpec(target=target, include_kwargs=include_kwargs)
+        if not self.enabled:
+            self.app.include_router(spec.load(), **include_kwargs)
+            return
+
+        placeholder = self._placeholders.get(path_prefix)
+        if placeholder is None:
+            placeholder = LazyRouterPlaceholder(self.app, path_prefix, [spec])
+            self._placeholders[path_prefix] = placeholder
+            self.app.router.routes.append(placeholder)
+        else:
+            placeholder.specs.append(spec)
+
+    def load_all(self) -> int:
+        """Load every pending router. Returns the number of prefixes loaded."""
+        pending = [p for p in self._placeholders.values() if not p.loaded]
+        for placeholder in pending:
+            placeholder.load()
+        return len(pending)
+
+    def openapi(self) -> dict[str, Any]:
+        # The schema must describe every route, so load everything first
+        self.load_all()
+        return self._openapi()
+
+    def status(self) -> dict[str, bool]:
+        return {prefix: p.loaded for prefix, p in self._placeholders.items()}
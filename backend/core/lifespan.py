@@ -1,6 +1,7 @@
 # ruff: noqa: E402
 # flake8: noqa: E402
 
+import asyncio
 import logging
 import os
 import sys
@@ -34,6 +35,8 @@ from backend.api.sync_status_api import set_auto_sync_manager
 from backend.auth.dependencies import init_auth_dependencies
 from backend.config import settings
 from backend.core import globals as g
+from backend.core.startup import build_app_startup, set_startup_orchestrator
+from backend.db.event_listeners import mongo_event_listeners
 from backend.db.indexes import create_indexes
 from backend.db.initialization import init_default_users
 from backend.db.migrations import MigrationManager
@@ -53,13 +56,17 @@ from backend.services.errors import (
     DatabaseError,
 )
 from backend.services.lock_manager import get_lock_manager
+from backend.services.log_sink import start_log_sink, stop_log_sink
 from backend.services.monitoring_service import MonitoringService
 from backend.services.pubsub_service import get_pubsub_service
 from backend.services.rate_limiter import ConcurrentRequestHandler, RateLimiter
 from backend.services.redis_service import close_redis, init_redis
 from backend.services.refresh_token import RefreshTokenService
 from backend.services.runtime import set_cache_service, set_refresh_token_service
-from backend.services.scheduled_export_service import ScheduledExportService
+from backend.services.scheduled_export_service import (
+    ScheduledExportService,
+    build_export_store,
+)
 from backend.services.sync_conflicts_service import SyncConflictsService
 from backend.sql_server_connector import SQLServerConnector
 
@@ -172,6 +179,8 @@ mongo_client_options: dict[str, Any] = {
     "socketTimeoutMS": 20000,
     "retryWrites": True,
     "retryReads": True,
+    # Count cache invalidation and per-request Mongo time
+    "event_listeners": mongo_event_listeners(),
 }
 
 client: AsyncIOMotorClient = AsyncIOMotorClient(
@@ -350,342 +359,392 @@ async def lifespan(app: FastAPI):  # noqa: C901
     set_cache_service(cache_service)
     set_refresh_token_service(refresh_token_service)
 
-    # Phase 1: Initialize Redis and related services
-    redis_service = None
-    pubsub_service = None
-    try:
-        logger.info("📦 Phase 1: Initializing Redis services...")
-        redis_service = await init_redis()
-        logger.info("✓ Redis service initialized")
+    # Startup phases run as a dependency graph (see backend.core.startup)
+    state: dict[str, Any] = {"pubsub_service": None}
+    app.state.enterprise_audit = None
+    app.state.enterprise_security = None
+    app.state.feature_flags = None
+    app.state.data_governance = None
 
-        # Start Pub/Sub service
-        pubsub_service = get_pubsub_service(redis_service)
-        await pubsub_service.start()
-        logger.info("✓ Pub/Sub service started")
+    async def init_redis_services():
+        try:
+            logger.info("📦 Initializing Redis services...")
+            redis_service = await init_redis()
+            logger.info("✓ Redis service initialized")
 
-        # Initialize lock manager (will be used by APIs)
-        get_lock_manager(redis_service)
-        logger.info("✓ Lock manager initialized")
+            # Start Pub/Sub service
+            pubsub_service = get_pubsub_service(redis_service)
+            await pubsub_service.start()
+            state["pubsub_service"] = pubsub_service
+            logger.info("✓ Pub/Sub service started")
 
-    except Exception as e:
-        logger.warning(f"⚠️ Redis services not available: {str(e)}")
-        logger.warning("Multi-user locking and real-time updates will be disabled")
+            # Initialize lock manager (will be used by APIs)
+            get_lock_manager(redis_service)
+            logger.info("✓ Lock manager initialized")
 
-    # Create MongoDB indexes
-    try:
-        logger.info("📊 Creating MongoDB indexes...")
-        index_results = await create_indexes(db)
-        total_indexes = sum(index_results.values())
-        logger.info(
-            f"✓ MongoDB indexes created: {total_indexes} total across {len(index_results)} collections"
-        )
-    except Exception as e:
-        logger.warning(f"⚠️ Index creation warning: {str(e)}")
+        except Exception as e:
+            logger.warning(f"⚠️ Redis services not available: {str(e)}")
+            logger.warning("Multi-user locking and real-time updates will be disabled")
+            raise
 
-    # Initialize SQL Server connection if credentials are available
-    try:
-        sql_host = getattr(settings, "SQL_SERVER_HOST", None)
-        sql_port = getattr(settings, "SQL_SERVER_PORT", 1433)
-        sql_database = getattr(settings, "SQL_SERVER_DATABASE", None)
-        sql_user = getattr(settings, "SQL_SERVER_USER", None)
-        sql_password = getattr(settings, "SQL_SERVER_PASSWORD", None)
+    development = os.getenv("ENVIRONMENT", "development").lower() in ["development", "dev"]
 
-        if sql_host and sql_database:
+    async def verify_mongodb():
+        # CRITICAL: Verify MongoDB is available (required)
+        try:
+            await db.command("ping")
             logger.info(
-                f"Attempting to connect to SQL Server at {sql_host}:{sql_port}/{sql_database}..."
+                "✅ MongoDB connection verified - MongoDB is required and available"
             )
-            try:
-                sql_connector.connect(
-                    sql_host, sql_port, sql_database, sql_user, sql_password
-                )
-                logger.info("OK: SQL Server connection established")
-            except (ConnectionError, TimeoutError, OSError) as e:
-                logger.warning(
-                    f"SQL Server connection failed (network/system error): {str(e)}"
-                )
+        except Exception as e:
+            # MongoDB connection failed - check if we're in development mode
+            error_type = type(e).__name__
+            logger.error(f"❌ MongoDB is required but unavailable ({error_type}): {e}")
+
+            # In development, allow app to run without MongoDB (phase recorded as failed)
+            if development:
                 logger.warning(
-                    "ERP sync will be disabled until SQL Server is configured"
+                    "⚠️ Running in DEVELOPMENT mode without MongoDB - some features may be limited"
                 )
-            except Exception as e:
-                # Catch-all for other SQL Server connection errors (authentication, database not found, etc.)
-                logger.warning(f"SQL Server connection failed: {str(e)}")
-                logger.warning(
-                    "ERP sync will be disabled until SQL Server is configured"
+                raise
+            else:
+                logger.error(
+                    "Application cannot start without MongoDB. Please ensure MongoDB is running."
                 )
-        else:
+                raise SystemExit(
+                    f"MongoDB is required but unavailable ({error_type}). Please start MongoDB and try again."
+                ) from e
+
+    async def create_mongo_indexes():
+        try:
+            logger.info("📊 Creating MongoDB indexes...")
+            index_results = await create_indexes(db)
+            total_indexes = sum(index_results.values())
+            logger.info(
+                f"✓ MongoDB indexes created: {total_indexes} total across {len(index_results)} collections"
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Index creation warning: {str(e)}")
+            raise
+
+    def connect_sql_server():
+        # Initialize SQL Server connection; raises so the phase is recorded as failed
+        sql_host = getattr(settings, "SQL_SERVER_HOST", None)
+        sql_port = getattr(settings, "SQL_SERVER_PORT", 1433)
+        sql_database = getattr(settings, "SQL_SERVER_DATABASE", None)
+        sql_user = getattr(settings, "SQL_SERVER_USER", None)
+        sql_password = getattr(settings, "SQL_SERVER_PASSWORD", None)
+
+        if not (sql_host and sql_database):
             logger.warning(
                 "SQL Server credentials not configured. Set SQL_SERVER_HOST and SQL_SERVER_DATABASE in .env"
             )
-    except (ValueError, AttributeError) as e:
-        # Configuration errors - invalid settings
-        logger.warning(
-            f"Error initializing SQL Server connection (configuration error): {str(e)}"
-        )
-    except Exception as e:
-        # Other unexpected errors during initialization
-        logger.warning(f"Unexpected error initializing SQL Server connection: {str(e)}")
+            raise RuntimeError("SQL Server credentials not configured")
 
-    # CRITICAL: Verify MongoDB is available (required)
-    try:
-        await db.command("ping")
         logger.info(
-            "✅ MongoDB connection verified - MongoDB is required and available"
+            f"Attempting to connect to SQL Server at {sql_host}:{sql_port}/{sql_database}..."
         )
-    except Exception as e:
-        # MongoDB connection failed - check if we're in development mode
-        error_type = type(e).__name__
-        logger.error(f"❌ MongoDB is required but unavailable ({error_type}): {e}")
+        try:
+            sql_connector.connect(sql_host, sql_port, sql_database, sql_user, sql_password)
+            logger.info("OK: SQL Server connection established")
+        except (ConnectionError, TimeoutError, OSError) as e:
+            logger.warning(f"SQL Server connection failed (network/system error): {str(e)}")
+            logger.warning("ERP sync will be disabled until SQL Server is configured")
+            raise
+        except Exception as e:
+            # Other SQL Server connection errors (authentication, database not found, etc.)
+            logger.warning(f"SQL Server connection failed: {str(e)}")
+            logger.warning("ERP sync will be disabled until SQL Server is configured")
+            raise
 
-        # In development, allow app to run without MongoDB
-        if os.getenv("ENVIRONMENT", "development").lower() in ["development", "dev"]:
+    async def connect_sql_server_off_loop():
+        # Blocking driver calls (several auth methods) must not stall the event loop
+        await asyncio.to_thread(connect_sql_server)
+
+    async def init_default_users_safe():
+        try:
+            await init_default_users(db)
+            logger.info("OK: Default users initialized")
+        except Exception as e:
             logger.warning(
-                "⚠️ Running in DEVELOPMENT mode without MongoDB - some features may be limited"
+                f"Could not initialize default users (may be due to MongoDB unavailability): {str(e)}"
             )
-        else:
-            logger.error(
-                "Application cannot start without MongoDB. Please ensure MongoDB is running."
+            raise
+
+    async def run_migrations():
+        try:
+            await migration_manager.ensure_indexes()
+            await migration_manager.run_migrations()
+            logger.info("OK: Migrations completed")
+        except DatabaseError as e:
+            logger.warning(
+                f"Database error during migrations (may be due to MongoDB unavailability): {str(e)}"
             )
-            raise SystemExit(
-                f"MongoDB is required but unavailable ({error_type}). Please start MongoDB and try again."
-            ) from e
+            raise
+        except Exception as e:
+            # Catch-all for migration errors (index creation failures, etc.)
+            logger.warning(
+                f"Migration error (may be due to MongoDB unavailability): {str(e)}"
+            )
+            raise
 
-    # Initialize default users
-    try:
-        await init_default_users(db)
-        logger.info("OK: Default users initialized")
-    except Exception as e:
-        logger.warning(
-            f"Could not initialize default users (may be due to MongoDB unavailability): {str(e)}"
-        )
+    async def init_auto_sync_manager():
+        # Initialize auto-sync manager (monitors SQL Server and auto-syncs when available)
+        global auto_sync_manager
+        try:
+            sql_configured = bool(getattr(sql_connector, "config", None))
+            auto_sync_manager = AutoSyncManager(
+                sql_connector=sql_connector,
+                mongo_db=db,
+                sync_interval=getattr(settings, "ERP_SYNC_INTERVAL", 3600),
+                check_interval=30,  # Check connection every 30 seconds
+                enabled=sql_configured,
+            )
 
-    # Run migrations
-    try:
-        await migration_manager.ensure_indexes()
-        await migration_manager.run_migrations()
-        logger.info("OK: Migrations completed")
-    except DatabaseError as e:
-        logger.warning(
-            f"Database error during migrations (may be due to MongoDB unavailability): {str(e)}"
-        )
-    except Exception as e:
-        # Catch-all for migration errors (index creation failures, etc.)
-        logger.warning(
-            f"Migration error (may be due to MongoDB unavailability): {str(e)}"
-        )
+            if sql_configured:
+                # Set callbacks for admin notifications
+                async def on_connection_restored():
+                    logger.info(
+                        "📢 SQL Server connection restored - sync will start automatically"
+                    )
 
-    # Initialize auto-sync manager (monitors SQL Server and auto-syncs when available)
-    global auto_sync_manager
-    try:
-        sql_configured = bool(getattr(sql_connector, "config", None))
-        auto_sync_manager = AutoSyncManager(
-            sql_connector=sql_connector,
-            mongo_db=db,
-            sync_interval=getattr(settings, "ERP_SYNC_INTERVAL", 3600),
-            check_interval=30,  # Check connection every 30 seconds
-            enabled=sql_configured,
-        )
+                async def on_connection_lost():
+                    logger.warning("📢 SQL Server connection lost - sync paused")
 
-        if sql_configured:
-            # Set callbacks for admin notifications
-            async def on_connection_restored():
-                logger.info(
-                    "📢 SQL Server connection restored - sync will start automatically"
+                async def on_sync_complete():
+                    logger.info("📢 Sync completed successfully")
+
+                auto_sync_manager.set_callbacks(
+                    on_connection_restored=on_connection_restored,
+                    on_connection_lost=on_connection_lost,
+                    on_sync_complete=on_sync_complete,
                 )
-                # Could send notification to admin panel here
 
-            async def on_connection_lost():
-                logger.warning("📢 SQL Server connection lost - sync paused")
-                # Could send notification to admin panel here
+                await auto_sync_manager.start()
+                logger.info("✅ Auto-sync manager started")
+            else:
+                logger.info("Auto-sync manager disabled: SQL Server not configured")
 
-            async def on_sync_complete():
-                logger.info("📢 Sync completed successfully")
-                # Could send notification to admin panel here
+            # Register with API router
+            set_auto_sync_manager(auto_sync_manager)
+        except Exception as e:
+            logger.warning(f"Auto-sync manager initialization failed: {str(e)}")
+            auto_sync_manager = None
+            raise
+        finally:
+            g.auto_sync_manager = auto_sync_manager
+            legacy_routes.auto_sync_manager = auto_sync_manager
+
+    async def start_db_health_monitoring():
+        try:
+            database_health_service.start()
+            logger.info("OK: Database health monitoring started")
+        except Exception as e:
+            logger.error(f"Failed to start database health monitoring: {str(e)}")
+            raise
 
-            auto_sync_manager.set_callbacks(
-                on_connection_restored=on_connection_restored,
-                on_connection_lost=on_connection_lost,
-                on_sync_complete=on_sync_complete,
+    async def init_cache():
+        try:
+            await cache_service.initialize()
+            cache_stats = await cache_service.get_stats()
+            logger.info(
+                f"OK: Cache service initialized: {cache_stats.get('backend', 'unknown')}"
             )
+        except Exception as e:
+            logger.warning(f"Cache service error: {str(e)}")
+            raise
 
-            await auto_sync_manager.start()
-            logger.info("✅ Auto-sync manager started")
-        else:
-            logger.info("Auto-sync manager disabled: SQL Server not configured")
-
-        # Register with API router
-        set_auto_sync_manager(auto_sync_manager)
-    except Exception as e:
-        logger.warning(f"Auto-sync manager initialization failed: {str(e)}")
-        auto_sync_manager = None
-
-    # Start ERP sync service (full sync) - legacy, kept for backward compatibility
-    # if erp_sync_service:
-    #     try:
-    #         erp_sync_service.start()
-    #         logger.info("✓ ERP sync service started")
-    #     except Exception as e:
-    #         logger.error(f"Failed to start ERP sync service: {str(e)}")
-
-    # Change detection sync service is fully disabled for testing
-
-    # Start database health monitoring
-    try:
-        database_health_service.start()
-        logger.info("OK: Database health monitoring started")
-    except Exception as e:
-        logger.error(f"Failed to start database health monitoring: {str(e)}")
-
-    # Initialize cache
-    try:
-        await cache_service.initialize()
-        cache_stats = await cache_service.get_stats()
-        logger.info(
-            f"OK: Cache service initialized: {cache_stats.get('backend', 'unknown')}"
-        )
-    except Exception as e:
-        logger.warning(f"Cache service error: {str(e)}")
-
-    # Initialize auth dependencies for routers (avoid circular imports)
-    try:
-        init_auth_dependencies(db, SECRET_KEY, ALGORITHM)
-        logger.info("OK: Auth dependencies initialized")
-    except Exception as e:
-        logger.error(f"Failed to initialize auth dependencies: {str(e)}")
+    async def init_auth():
+        # Initialize auth dependencies for routers (avoid circular imports)
+        try:
+            init_auth_dependencies(db, SECRET_KEY, ALGORITHM)
+            logger.info("OK: Auth dependencies initialized")
+        except Exception as e:
+            logger.error(f"Failed to initialize auth dependencies: {str(e)}")
+            raise
 
-    # Initialize new feature services
-    global scheduled_export_service, sync_conflicts_service
-    try:
-        # Scheduled export service
-        scheduled_export_service = ScheduledExportService(db)
-        scheduled_export_service.start()
-        logger.info("✓ Scheduled export service started")
-    except Exception as e:
-        logger.error(f"Failed to start scheduled export service: {str(e)}")
+    async def init_scheduled_export():
+        global scheduled_export_service
+        try:
+            scheduled_export_service = ScheduledExportService(
+                db,
+                store=build_export_store(db),
+                max_concurrency=settings.EXPORT_MAX_CONCURRENCY,
+                lease_seconds=settings.EXPORT_LEASE_SECONDS,
+            )
+            scheduled_export_service.start()
+            logger.info("✓ Scheduled export service started")
+        except Exception as e:
+            logger.error(f"Failed to start scheduled export service: {str(e)}")
+            raise
 
-    # Initialize enrichment service
-    if EnrichmentService is not None and init_enrichment_api is not None:
+    async def init_enrichment():
+        if EnrichmentService is None or init_enrichment_api is None:
+            return
         try:
             enrichment_svc = EnrichmentService(db)
             init_enrichment_api(enrichment_svc)
             logger.info("✓ Enrichment service initialized")
         except Exception as e:
             logger.error(f"Failed to initialize enrichment service: {str(e)}")
+            raise
 
-    # Initialize enterprise services
-    if g.ENTERPRISE_AVAILABLE:
+    async def init_sync_conflicts():
+        global sync_conflicts_service
         try:
-            # Enterprise Audit Service
-            app.state.enterprise_audit = EnterpriseAuditService(db)
-            await app.state.enterprise_audit.initialize()
-            logger.info("✓ Enterprise audit service initialized")
+            sync_conflicts_service = SyncConflictsService(db)
+            logger.info("✓ Sync conflicts service initialized")
         except Exception as e:
-            app.state.enterprise_audit = None
-            logger.warning(f"Enterprise audit service not available: {str(e)}")
+            logger.error(f"Failed to initialize sync conflicts service: {str(e)}")
+            raise
 
+    async def connect_monitoring():
         try:
-            # Enterprise Security Service
-            app.state.enterprise_security = EnterpriseSecurityService(db)
-            await app.state.enterprise_security.initialize()
-            logger.info("✓ Enterprise security service initialized")
+            # Set monitoring service for metrics API
+            set_monitoring_service(monitoring_service)
+            logger.info("✓ Monitoring service connected to metrics API")
         except Exception as e:
-            app.state.enterprise_security = None
-            logger.warning(f"Enterprise security service not available: {str(e)}")
+            logger.error(f"Failed to set monitoring service: {str(e)}")
+            raise
 
+    async def init_enterprise_service(attr: str, service_cls, label: str):
         try:
-            # Feature Flags Service
-            app.state.feature_flags = FeatureFlagService(db)
-            await app.state.feature_flags.initialize()
-            logger.info("✓ Feature flags service initialized")
+            service = service_cls(db)
+            await service.initialize()
+            # Only expose the service once it is fully initialized
+            setattr(app.state, attr, service)
+            logger.info(f"✓ {label} initialized")
         except Exception as e:
-            app.state.feature_flags = None
-            logger.warning(f"Feature flags service not available: {str(e)}")
+            setattr(app.state, attr, None)
+            logger.warning(f"{label} not available: {str(e)}")
+            raise
+
+    async def init_enterprise_services():
+        if not g.ENTERPRISE_AVAILABLE:
+            return
+
+        # Start all four even if one fails, then surface the first failure
+        results = await asyncio.gather(
+            init_enterprise_service(
+                "enterprise_audit", EnterpriseAuditService, "Enterprise audit service"
+            ),
+            init_enterprise_service(
+                "enterprise_security", EnterpriseSecurityService, "Enterprise security service"
+            ),
+            init_enterprise_service("feature_flags", FeatureFlagService, "Feature flags service"),
+            init_enterprise_service(
+                "data_governance", DataGovernanceService, "Data governance service"
+            ),
+            return_exceptions=True,
+        )
 
+        g.enterprise_audit_service = app.state.enterprise_audit
+        legacy_routes.enterprise_audit_service = g.enterprise_audit_service
+        g.enterprise_security_service = app.state.enterprise_security
+        legacy_routes.enterprise_security_service = g.enterprise_security_service
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def init_domain_apis():
+        # Initialize every API even if one fails, then report all failures
+        failed = []
         try:
-            # Data Governance Service
-            app.state.data_governance = DataGovernanceService(db)
-            await app.state.data_governance.initialize()
-            logger.info("✓ Data governance service initialized")
+            # Initialize ERP API
+            init_erp_api(db, cache_service)
+            logger.info("✓ ERP API initialized")
         except Exception as e:
-            app.state.data_governance = None
-            logger.warning(f"Data governance service not available: {str(e)}")
-    else:
-        # Set None for enterprise services if not available
-        app.state.enterprise_audit = None
-        app.state.enterprise_security = None
-        app.state.feature_flags = None
-        app.state.data_governance = None
+            logger.error(f"Failed to initialize ERP API: {str(e)}")
+            failed.append("erp")
 
-    try:
-        # Sync conflicts service
-        sync_conflicts_service = SyncConflictsService(db)
-        logger.info("✓ Sync conflicts service initialized")
-    except Exception as e:
-        logger.error(f"Failed to initialize sync conflicts service: {str(e)}")
+        try:
+            # Initialize Enhanced Item API
+            init_enhanced_api(db, cache_service, monitoring_service)
+            logger.info("✓ Enhanced Item API initialized")
+        except Exception as e:
+            logger.error(f"Failed to initialize Enhanced Item API: {str(e)}")
+            failed.append("enhanced_item")
 
-    try:
-        # Set monitoring service for metrics API
-        set_monitoring_service(monitoring_service)
-        logger.info("✓ Monitoring service connected to metrics API")
-    except Exception as e:
-        logger.error(f"Failed to set monitoring service: {str(e)}")
+        try:
+            # Initialize verification API
+            init_verification_api(db)
+            logger.info("✓ Item verification API initialized")
+        except Exception as e:
+            logger.error(f"Failed to initialize verification API: {str(e)}")
+            failed.append("verification")
 
-    try:
-        # Initialize ERP API
-        init_erp_api(db, cache_service)
-        logger.info("✓ ERP API initialized")
-    except Exception as e:
-        logger.error(f"Failed to initialize ERP API: {str(e)}")
+        if failed:
+            raise RuntimeError(f"Domain APIs failed to initialize: {', '.join(failed)}")
 
-    try:
-        # Initialize Enhanced Item API
-        init_enhanced_api(db, cache_service, monitoring_service)
-        logger.info("✓ Enhanced Item API initialized")
-    except Exception as e:
-        logger.error(f"Failed to initialize Enhanced Item API: {str(e)}")
+    async def init_search_service():
+        try:
+            from backend.services.search_service import init_search_service
 
-    try:
-        # Initialize verification API
-        init_verification_api(db)
-        logger.info("✓ Item verification API initialized")
-    except Exception as e:
-        logger.error(f"Failed to initialize verification API: {str(e)}")
+            init_search_service(db)
+            logger.info("✓ Search service initialized successfully")
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize search service: {e}")
+            raise
+
+    async def init_log_sink():
+        # Batch activity/audit/error log writes; failures fall back to inline writes
+        try:
+            await start_log_sink(db)
+        except Exception as e:
+            logger.error(f"Failed to start log sink: {str(e)}")
+            raise
+
+    async def warm_ai_model():
+        # Preload the semantic search model (optional)
+        if not getattr(settings, "AI_MODEL_PRELOAD", False):
+            return
+        from backend.services.ai_search import ai_search_service
+
+        if not await ai_search_service.warm_up():
+            logger.warning("Semantic search model not available after warm-up")
+            raise RuntimeError("Semantic search model not available after warm-up")
+        logger.info("✓ Semantic search model warmed up")
+
+    # The graph itself lives in backend.core.startup, shared with backend.server
+    orchestrator = build_app_startup(
+        {
+            "redis": init_redis_services,
+            "mongodb": verify_mongodb,
+            "indexes": create_mongo_indexes,
+            "default_users": init_default_users_safe,
+            "migrations": run_migrations,
+            "db_health_monitoring": start_db_health_monitoring,
+            "cache": init_cache,
+            "auth": init_auth,
+            "log_sink": init_log_sink,
+            "scheduled_export": init_scheduled_export,
+            "enrichment": init_enrichment,
+            "sync_conflicts": init_sync_conflicts,
+            "monitoring": connect_monitoring,
+            "domain_apis": init_domain_apis,
+            "search_service": init_search_service,
+            "sql_server": connect_sql_server_off_loop,
+            "auto_sync": init_auto_sync_manager,
+            "enterprise": init_enterprise_services,
+            "ai_model": warm_ai_model,
+        },
+        # In development the app runs without MongoDB (phase recorded as failed)
+        mongodb_critical=not development,
+    )
+
+    app.state.startup = orchestrator
+    set_startup_orchestrator(orchestrator)
+    startup_report = await orchestrator.run()
 
     # Startup checklist verification
     startup_checklist = {
-        "mongodb": False,
-        "sql_server": False,
-        "cache": False,
+        "mongodb": startup_report["phases"]["mongodb"]["status"] == "ok",
+        "sql_server": startup_report["phases"]["sql_server"]["status"] == "ok",
+        "cache": startup_report["phases"]["cache"]["status"] == "ok",
         "auth": False,
         "services": False,
     }
 
-    # Verify MongoDB
-    try:
-        await db.command("ping")
-        startup_checklist["mongodb"] = True
-        logger.info("✓ Startup Check: MongoDB connected")
-    except Exception as e:
-        logger.warning(f"⚠️  Startup Check: MongoDB not connected - {str(e)}")
-
-    # Verify SQL Server (optional)
-    try:
-        if sql_connector and sql_connector.test_connection():
-            startup_checklist["sql_server"] = True
-            logger.info("✓ Startup Check: SQL Server connected")
-        else:
-            logger.info("ℹ️  Startup Check: SQL Server not configured (optional)")
-    except Exception as e:
-        logger.info(f"ℹ️  Startup Check: SQL Server not available - {str(e)}")
-
-    # Verify Cache
-    try:
-        cache_stats = await cache_service.get_stats()
-        logger.info(
-            f"✓ Startup Check: Cache initialized ({cache_stats.get('backend', 'unknown')})"
-        )
-    except Exception as e:
-        logger.warning(f"⚠️ Startup Check: Cache service warning: {str(e)}")
-
     # Verify Auth
     try:
         from backend.auth.dependencies import auth_deps
@@ -696,10 +755,16 @@ async def lifespan(app: FastAPI):  # noqa: C901
     except Exception as e:
         logger.warning(f"⚠️  Startup Check: Auth error - {str(e)}")
 
+    # SQL Server (optional) connects in the background
+    sql_status = orchestrator.phase_status("sql_server")
+    if sql_status in ("failed", "skipped"):
+        error = orchestrator.phases["sql_server"].error
+        logger.warning(f"⚠️  Startup Check: SQL Server unavailable (optional) - {error}")
+    elif sql_status != "ok":
+        logger.info("ℹ️  Startup Check: SQL Server connecting in background (optional)")
+
     # Verify Services
     services_running = []
-    # if erp_sync_service:
-    #     services_running.append("ERP Sync")
     if scheduled_export_service:
         services_running.append("Scheduled Export")
     if sync_conflicts_service:
@@ -771,6 +836,8 @@ async def lifespan(app: FastAPI):  # noqa: C901
     g.database_health_service = database_health_service
     legacy_routes.database_health_service = database_health_service
 
+    # Auto-sync manager and enterprise services are injected by their
+    # background startup phases once they are ready
     g.auto_sync_manager = auto_sync_manager
     legacy_routes.auto_sync_manager = auto_sync_manager
 
@@ -790,6 +857,8 @@ async def lifespan(app: FastAPI):  # noqa: C901
     shutdown_start = time.time()
     shutdown_timeout = 30  # 30 seconds max for graceful shutdown
 
+    await orchestrator.shutdown()
+
     shutdown_tasks = []
 
     # Stop sync services
@@ -840,6 +909,7 @@ async def lifespan(app: FastAPI):  # noqa: C901
 
     # Phase 1: Stop Pub/Sub and Redis services
     async def stop_redis_services():
+        pubsub_service = state["pubsub_service"]
         try:
             if pubsub_service:
                 await pubsub_service.stop()
@@ -852,10 +922,34 @@ async def lifespan(app: FastAPI):  # noqa: C901
 
     shutdown_tasks.append(stop_redis_services())
 
+    # Stop semantic search inference (only if it was ever used)
+    async def stop_ai_inference():
+        ai_search = sys.modules.get("backend.services.ai_search")
+        if ai_search is None:
+            return
+        try:
+            ai_search.ai_search_service.shutdown()
+            logger.info("✓ Semantic search inference stopped")
+        except Exception as e:
+            logger.error(f"Error stopping semantic search inference: {str(e)}")
+
+    shutdown_tasks.append(stop_ai_inference())
+
+    # Stop report job workers (only if a report job was ever submitted)
+    async def stop_report_jobs():
+        report_jobs = sys.modules.get("backend.services.reporting.report_jobs")
+        if report_jobs is None:
+            return
+        try:
+            await report_jobs.shutdown_report_job_queue()
+            logger.info("✓ Report job workers stopped")
+        except Exception as e:
+            logger.error(f"Error stopping report job workers: {str(e)}")
+
+    shutdown_tasks.append(stop_report_jobs())
+
     # Execute shutdown tasks with timeout
     try:
-        import asyncio
-
         await asyncio.wait_for(
             asyncio.gather(*shutdown_tasks, return_exceptions=True),
             timeout=shutdown_timeout,
@@ -867,6 +961,12 @@ async def lifespan(app: FastAPI):  # noqa: C901
     except Exception as e:
         logger.error(f"Error during shutdown: {str(e)}")
 
+    # Flush queued log entries while MongoDB is still connected
+    try:
+        await stop_log_sink()
+    except Exception as e:
+        logger.error(f"Error flushing log sink: {str(e)}")
+
     # Close connection pool (blocking operation)
     if connection_pool:
         try:
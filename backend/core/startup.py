@@ -0,0 +1,352 @@
+"""
+Startup Orchestrator
+Runs application startup phases as a dependency graph.
+
+Each phase declares the phases it depends on; phases whose dependencies are
+satisfied run concurrently. A phase whose dependency failed is skipped;
+``after`` only orders phases without making them depend on each other's
+success. Foreground phases gate readiness ("serving"), background phases
+(SQL Server, AI model, enterprise services) keep warming up after the
+application starts accepting requests ("warmed").
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Iterable
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+PhaseFunc = Callable[[], Awaitable[Any]]
+
+PENDING = "pending"
+RUNNING = "running"
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass
+class StartupPhase:
+    """A unit of startup work and its dependencies."""
+
+    name: str
+    func: PhaseFunc
+    depends_on: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+    background: bool = False
+    critical: bool = False
+    timeout: Optional[float] = None
+    status: str = PENDING
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return round((end - self.started_at) * 1000, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "status": self.status,
+            "background": self.background,
+            "critical": self.critical,
+            "depends_on": list(self.depends_on),
+            "after": list(self.after),
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+        }
+
+
+class StartupOrchestrator:
+    """Dependency-aware, concurrent application startup."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, StartupPhase] = {}
+        self._started_at: Optional[float] = None
+        self._serving_at: Optional[float] = None
+        self._warmed_at: Optional[float] = None
+        self._background_tasks: list[asyncio.Task] = []
+        self._warm_task: Optional[asyncio.Task] = None
+
+    def add(
+        self,
+        name: str,
+        func: PhaseFunc,
+        depends_on: Iterable[str] = (),
+        background: bool = False,
+        critical: bool = False,
+        timeout: Optional[float] = None,
+        after: Iterable[str] = (),
+    ) -> None:
+        """
+        Register a phase.
+
+        Args:
+            name: Unique phase name
+            func: Async callable doing the work
+            depends_on: Phases that must succeed first (skipped otherwise)
+            background: Do not wait for this phase before serving
+            critical: Abort startup if the phase raises
+            timeout: Optional per-phase timeout in seconds
+            after: Phases that must finish first, whether or not they succeed
+        """
+        if name in self.phases:
+            raise ValueError(f"Startup phase already registered: {name}")
+        self.phases[name] = StartupPhase(
+            name=name,
+            func=func,
+            depends_on=tuple(depends_on),
+            after=tuple(after),
+            background=background,
+            critical=critical,
+            timeout=timeout,
+        )
+
+    def _validate(self) -> None:
+        for phase in self.phases.values():
+            for dep in phase.depends_on + phase.after:
+                if dep not in self.phases:
+                    raise ValueError(f"Startup phase {phase.name} depends on unknown {dep}")
+                if self.phases[dep].background and not phase.background:
+                    raise ValueError(
+                        f"Foreground phase {phase.name} cannot depend on background phase {dep}"
+                    )
+
+        # Cycle detection (depth-first)
+        visiting: set[str] = set()
+        visited: set[str] = set()
+
+        def _visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Startup dependency cycle at {name}")
+            visiting.add(name)
+            phase = self.phases[name]
+            for dep in phase.depends_on + phase.after:
+                _visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.phases:
+            _visit(name)
+
+    async def _run_phase(self, phase: StartupPhase) -> None:
+        try:
+            for dep in phase.depends_on + phase.after:
+                await self.phases[dep].done.wait()
+
+            failed_deps = [
+                dep for dep in phase.depends_on if self.phases[dep].status != OK
+            ]
+            if failed_deps:
+                phase.status = SKIPPED
+                phase.error = f"dependency failed: {', '.join(failed_deps)}"
+                logger.warning(f"⚠️ Startup phase {phase.name} skipped: {phase.error}")
+                return
+
+            phase.status = RUNNING
+            phase.started_at = time.perf_counter()
+            try:
+                if phase.timeout:
+                    await asyncio.wait_for(phase.func(), timeout=phase.timeout)
+                else:
+                    await phase.func()
+                phase.status = OK
+            except asyncio.CancelledError:
+                phase.status = FAILED
+                phase.error = "cancelled"
+                raise
+            except BaseException as e:
+                phase.status = FAILED
+                phase.error = f"{type(e).__name__}: {e}"
+                if phase.critical:
+                    raise
+                logger.warning(f"⚠️ Startup phase {phase.name} failed: {phase.error}")
+            finally:
+                phase.finished_at = time.perf_counter()
+        finally:
+            phase.done.set()
+
+    async def run(self) -> dict[str, Any]:
+        """
+        Run all foreground phases (concurrently where possible) and schedule
+        background phases. Returns once the application can serve requests.
+
+        Raises the original exception if a critical phase fails.
+        """
+        self._validate()
+        self._started_at = time.perf_counter()
+
+        foreground = [p for p in self.phases.values() if not p.background]
+        background = [p for p in self.phases.values() if p.background]
+
+        self._background_tasks = [
+            asyncio.create_task(self._run_phase(p), name=f"startup:{p.name}")
+            for p in background
+        ]
+        if self._background_tasks:
+            self._warm_task = asyncio.create_task(self._mark_warmed())
+
+        fg_tasks = [
+            asyncio.create_task(self._run_phase(p), name=f"startup:{p.name}")
+            for p in foreground
+        ]
+        try:
+            await asyncio.gather(*fg_tasks)
+        except BaseException:
+            for task in fg_tasks + self._background_tasks:
+                task.cancel()
+            raise
+
+        self._serving_at = time.perf_counter()
+        if not self._background_tasks:
+            self._warmed_at = self._serving_at
+
+        report = self.report()
+        logger.info(
+            f"✓ Startup phases complete in {report['serving_after_ms']}ms "
+            f"({len(background)} still warming in background)"
+        )
+        for name, info in report["phases"].items():
+            if not info["background"]:
+                logger.info(f"  {name}: {info['status']} ({info['duration_ms']}ms)")
+        return report
+
+    async def _mark_warmed(self) -> None:
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        self._warmed_at = time.perf_counter()
+        for phase in self.phases.values():
+            if phase.background:
+                logger.info(
+                    f"✓ Background startup phase {phase.name}: {phase.status} "
+                    f"({phase.duration_ms}ms)"
+                )
+
+    async def shutdown(self, timeout: float = 5.0) -> None:
+        """Cancel background phases that are still running."""
+        pending = [t for t in self._background_tasks if not t.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+
+    def phase_status(self, name: str) -> Optional[str]:
+        phase = self.phases.get(name)
+        return phase.status if phase else None
+
+    @property
+    def is_serving(self) -> bool:
+        return self._serving_at is not None
+
+    @property
+    def is_warmed(self) -> bool:
+        return self._warmed_at is not None
+
+    def report(self) -> dict[str, Any]:
+        """Readiness state plus per-phase timings."""
+
+        def _since_start(ts: Optional[float]) -> Optional[float]:
+            if ts is None or self._started_at is None:
+                return None
+            return round((ts - self._started_at) * 1000, 1)
+
+        return {
+            "serving": self.is_serving,
+            "warmed": self.is_warmed,
+            "serving_after_ms": _since_start(self._serving_at),
+            "warmed_after_ms": _since_start(self._warmed_at),
+            "phases": {name: p.as_dict() for name, p in self.phases.items()},
+        }
+
+
+@dataclass(frozen=True)
+class PhaseSpec:
+    """Where a phase sits in the application startup graph."""
+
+    name: str
+    depends_on: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+    background: bool = False
+
+
+# The application startup graph, shared by every entry point
+APP_STARTUP_PHASES: tuple[PhaseSpec, ...] = (
+    # Foreground: required before the app serves traffic
+    PhaseSpec("redis"),
+    PhaseSpec("mongodb"),
+    PhaseSpec("indexes", depends_on=("mongodb",)),
+    PhaseSpec("default_users", depends_on=("mongodb",)),
+    PhaseSpec("migrations", depends_on=("mongodb",), after=("indexes", "default_users")),
+    PhaseSpec("db_health_monitoring"),
+    PhaseSpec("cache"),
+    PhaseSpec("auth"),
+    PhaseSpec("log_sink", depends_on=("mongodb",)),
+    PhaseSpec("scheduled_export", depends_on=("mongodb",)),
+    PhaseSpec("enrichment", depends_on=("mongodb",)),
+    PhaseSpec("sync_conflicts"),
+    PhaseSpec("monitoring"),
+    # APIs fall back to uncached reads, so a failed cache only orders them
+    PhaseSpec("domain_apis", after=("cache",)),
+    PhaseSpec("search_service"),
+    # Background: slow, optional services that warm up while serving
+    PhaseSpec("sql_server", background=True),
+    # Auto-sync waits for SQL Server to come back, so it starts even if the first connect failed
+    PhaseSpec("auto_sync", depends_on=("migrations",), after=("sql_server",), background=True),
+    PhaseSpec("enterprise", depends_on=("mongodb",), after=("log_sink",), background=True),
+    PhaseSpec("ai_model", background=True),
+)
+
+
+def build_app_startup(
+    phases: dict[str, PhaseFunc], mongodb_critical: bool = True
+) -> StartupOrchestrator:
+    """
+    Wire an entry point's phase functions into ``APP_STARTUP_PHASES``.
+
+    Args:
+        phases: Phase function for every phase in the graph, keyed by name
+        mongodb_critical: Abort startup if MongoDB is unavailable
+
+    Raises:
+        ValueError: If a phase is missing or not part of the graph
+    """
+    names = {spec.name for spec in APP_STARTUP_PHASES}
+    missing = names - phases.keys()
+    unknown = phases.keys() - names
+    if missing or unknown:
+        raise ValueError(
+            f"Startup phases do not match the graph (missing: {sorted(missing)}, "
+            f"unknown: {sorted(unknown)})"
+        )
+
+    orchestrator = StartupOrchestrator()
+    for spec in APP_STARTUP_PHASES:
+        orchestrator.add(
+            spec.name,
+            phases[spec.name],
+            depends_on=spec.depends_on,
+            after=spec.after,
+            background=spec.background,
+            critical=mongodb_critical and spec.name == "mongodb",
+        )
+    return orchestrator
+
+
+_startup_orchestrator: Optional[StartupOrchestrator] = None
+
+
+def set_startup_orchestrator(orchestrator: Optional[StartupOrchestrator]) -> None:
+    global _startup_orchestrator
+    _startup_orchestrator = orchestrator
+
+
+def get_startup_orchestrator() -> Optional[StartupOrchestrator]:
+    return _startup_orchestrator
@@ -0,0 +1,24 @@
+"""Command listeners attached to every Motor client this process creates."""
+
+from __future__ import annotations
+
+from pymongo import monitoring
+
+from backend.services.count_service import count_invalidation_listener
+from backend.services.profiler import profiler_command_listener
+from backend.services.query_monitor import query_monitor_listener
+
+
+def mongo_event_listeners() -> list[monitoring.CommandListener]:
+    """Listeners for ``AsyncIOMotorClient(event_listeners=...)``."""
+    listeners = [
+        # Drop cached counts when this process writes to a collection
+        count_invalidation_listener(),
+        # Attribute command time to the profiled request that issued it
+        profiler_command_listener(),
+    ]
+    # Latency, docs returned and slow samples per query shape
+    shape_listener = query_monitor_listener()
+    if shape_listener is not None:
+        listeners.append(shape_listener)
+    return listeners
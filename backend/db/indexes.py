@@ -95,6 +95,10 @@ INDEXES: dict[str, list[tuple[list[tuple[str, Union[int, str]]], dict]]] = {
         # Query hash for deduplication
         ([("query_hash", 1)], {"name": "idx_query_hash", "sparse": True}),
     ],
+    # Report Snapshot Rows Collection (chunked row data)
+    "report_snapshot_rows": [
+        ([("snapshot_id", 1), ("seq", 1)], {"unique": True, "name": "idx_snapshot_chunk"}),
+    ],
     # Report Compare Jobs Collection
     "report_compare_jobs": [
         # Job ID
@@ -106,6 +110,31 @@ INDEXES: dict[str, list[tuple[list[tuple[str, Union[int, str]]], dict]]] = {
         # Snapshot references
         ([("snapshot_a_id", 1), ("snapshot_b_id", 1)], {"name": "idx_snapshots"}),
     ],
+    # Report Jobs Collection (background report generation)
+    "report_jobs": [
+        ([("job_id", 1)], {"unique": True, "name": "idx_job_id"}),
+        # Cache lookups for identical requests
+        ([("cache_key", 1), ("status", 1), ("finished_at", -1)], {"name": "idx_cache_key"}),
+        ([("created_by", 1), ("created_at", -1)], {"name": "idx_user_jobs"}),
+        # Heartbeats, orphan recovery and retention purge
+        ([("worker_id", 1), ("status", 1)], {"name": "idx_worker_status"}),
+        ([("status", 1), ("heartbeat_at", 1)], {"name": "idx_status_heartbeat"}),
+        ([("status", 1), ("finished_at", 1)], {"name": "idx_status_finished"}),
+    ],
+    "report_job_rows": [
+        ([("snapshot_id", 1), ("seq", 1)], {"unique": True, "name": "idx_job_chunk"}),
+    ],
+    # Report Compare Diffs Collection (paged full diffs)
+    "report_compare_diffs": [
+        (
+            [("job_id", 1), ("change_type", 1), ("seq", 1)],
+            {"unique": True, "name": "idx_diff_page"},
+        ),
+    ],
+    # AI variance session invalidation stamps; only needed for the 300s cache TTL
+    "ai_variance_invalidations": [
+        ([("changed_at", 1)], {"name": "idx_changed_ttl", "expireAfterSeconds": 3600}),
+    ],
     # Count Lines Collection (existing)
     "count_lines": [
         # Session count lines
@@ -116,6 +145,11 @@ INDEXES: dict[str, list[tuple[list[tuple[str, Union[int, str]]], dict]]] = {
         ([("verified", 1), ("session_id", 1)], {"name": "idx_verified"}),
         # Rack count lines
         ([("rack_id", 1), ("session_id", 1)], {"name": "idx_rack_counts"}),
+        # Keyset pagination (newest first)
+        (
+            [("session_id", 1), ("counted_at", -1), ("_id", -1)],
+            {"name": "idx_session_counted_keyset"},
+        ),
     ],
     # Sessions Collection (existing)
     "sessions": [
@@ -127,6 +161,12 @@ INDEXES: dict[str, list[tuple[list[tuple[str, Union[int, str]]], dict]]] = {
         ([("status", 1), ("created_at", -1)], {"name": "idx_status"}),
         # Warehouse
         ([("warehouse", 1), ("status", 1)], {"name": "idx_warehouse_status"}),
+        # Keyset pagination (supervisor list / staff list)
+        ([("started_at", -1), ("_id", -1)], {"name": "idx_started_keyset"}),
+        (
+            [("staff_user", 1), ("started_at", -1), ("_id", -1)],
+            {"name": "idx_staff_started_keyset"},
+        ),
     ],
     # ERP Items Collection (existing)
     "erp_items": [
@@ -145,6 +185,21 @@ INDEXES: dict[str, list[tuple[list[tuple[str, Union[int, str]]], dict]]] = {
         ([("floor", 1), ("rack", 1)], {"name": "idx_location"}),
         # Text search
         ([("item_name", "text"), ("description", "text")], {"name": "idx_text_search"}),
+        # Dynamic field filters (any dynamic_fields.<name>)
+        ([("dynamic_fields.$**", 1)], {"name": "idx_dynamic_fields"}),
+        # Items carrying dynamic fields, in item_code order (keyset pages)
+        (
+            [("item_code", 1), ("_id", 1)],
+            {
+                "name": "idx_dynamic_fields_items",
+                "partialFilterExpression": {"dynamic_fields": {"$exists": True}},
+            },
+        ),
+    ],
+    # Item Variances Collection
+    "item_variances": [
+        # Keyset pagination of variance listings
+        ([("verified_at", -1), ("_id", -1)], {"name": "idx_verified_at_keyset"}),
     ],
     # Activity Logs Collection
     "activity_logs": [
@@ -156,6 +211,8 @@ INDEXES: dict[str, list[tuple[list[tuple[str, Union[int, str]]], dict]]] = {
         ([("status", 1), ("timestamp", -1)], {"name": "idx_status_activity"}),
         # Date range queries
         ([("timestamp", -1)], {"name": "idx_timestamp"}),
+        # Keyset pagination tie-break
+        ([("timestamp", -1), ("_id", -1)], {"name": "idx_timestamp_keyset"}),
     ],
     # Error Logs Collection
     "error_logs": [
@@ -167,6 +224,8 @@ INDEXES: dict[str, list[tuple[list[tuple[str, Union[int, str]]], dict]]] = {
         ([("endpoint", 1), ("timestamp", -1)], {"name": "idx_endpoint"}),
         # Resolution status
         ([("resolved", 1), ("timestamp", -1)], {"name": "idx_resolved"}),
+        # Keyset pagination tie-break
+        ([("timestamp", -1), ("_id", -1)], {"name": "idx_timestamp_keyset"}),
     ],
 }
 
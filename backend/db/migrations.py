@@ -161,8 +161,24 @@ class MigrationManager:
             await self.db.erp_items.create_index(idx)
 
         await self._ensure_text_index()
+        await self._ensure_dynamic_fields_indexes()
         logger.info("✓ ERP items indexes created")
 
+    async def _ensure_dynamic_fields_indexes(self) -> None:
+        """Create indexes for the denormalised erp_items.dynamic_fields."""
+        try:
+            await self.db.erp_items.create_index(
+                [("dynamic_fields.$**", 1)], name="idx_dynamic_fields"
+            )
+            await self.db.erp_items.create_index(
+                [("item_code", 1), ("_id", 1)],
+                name="idx_dynamic_fields_items",
+                partialFilterExpression={"dynamic_fields": {"$exists": True}},
+            )
+        except Exception as e:
+            # Wildcard indexes need MongoDB 4.2+
+            logger.warning(f"Error creating dynamic fields indexes: {str(e)}")
+
     async def _ensure_text_index(self) -> None:
         """Create text index on item_name if not exists."""
         try:
@@ -266,6 +282,12 @@ class MigrationManager:
                 "description": "Create initial database indexes",
                 "func": self.ensure_indexes,
             },
+            {
+                "name": "denormalize_dynamic_fields_v1",
+                "version": 2,
+                "description": "Copy dynamic field values onto erp_items.dynamic_fields",
+                "func": self._backfill_dynamic_fields,
+            },
             # Add more migrations here as needed
         ]
 
@@ -278,6 +300,13 @@ class MigrationManager:
 
         return sorted(pending, key=lambda x: x["version"])
 
+    async def _backfill_dynamic_fields(self):
+        """Populate erp_items.dynamic_fields from dynamic_field_values"""
+        from backend.services.dynamic_fields_service import DynamicFieldsService
+
+        await self._ensure_dynamic_fields_indexes()
+        await DynamicFieldsService(self.db).backfill_item_fields()
+
     async def _run_migration(self, migration: dict[str, Any]):
         """Run a single migration"""
         logger.info(f"Running migration: {migration['name']}")
@@ -2,11 +2,8 @@ from fastapi import FastAPI
 
 # Router imports
 from backend.api import auth, supervisor_pin
-from backend.api.admin_control_api import admin_control_router
-from backend.api.admin_dashboard_api import admin_dashboard_router
 from backend.api.auth import router as auth_router
 from backend.api.dynamic_fields_api import dynamic_fields_router
-from backend.api.dynamic_reports_api import dynamic_reports_router
 from backend.api.enhanced_item_api import enhanced_item_router as items_router
 from backend.api.erp_api import router as erp_router
 from backend.api.exports_api import exports_router
@@ -18,8 +15,6 @@ from backend.api.mapping_api import router as mapping_router
 from backend.api.metrics_api import metrics_router
 from backend.api.permissions_api import permissions_router
 from backend.api.rack_api import router as rack_router
-from backend.api.report_generation_api import report_generation_router
-from backend.api.reporting_api import router as reporting_router
 from backend.api.security_api import security_router
 from backend.api.self_diagnosis_api import self_diagnosis_router
 from backend.api.session_management_api import router as session_mgmt_router
@@ -29,6 +24,7 @@ from backend.api.sync_management_api import sync_management_router
 from backend.api.sync_status_api import sync_router
 from backend.api.variance_api import router as variance_router
 from backend.config import settings
+from backend.core.lazy_routers import LazyRouterRegistry
 from backend.core.lifespan import lifespan
 from backend.middleware.setup import setup_middleware
 from backend.utils.tracing import instrument_fastapi_app
@@ -50,6 +46,9 @@ except Exception:
 # Setup Middleware
 setup_middleware(app)
 
+# Rarely used admin/reporting routers are imported on first request
+lazy_routers = LazyRouterRegistry(app, enabled=getattr(settings, "LAZY_ROUTERS", True))
+
 # Register routers
 app.include_router(health_router)  # Health check endpoints at /health/*
 app.include_router(health_router, prefix="/api")  # Alias for frontend compatibility
@@ -70,18 +69,31 @@ app.include_router(security_router)  # Security dashboard (has its own prefix)
 app.include_router(verification_router)
 app.include_router(erp_router, prefix="/api")  # ERP endpoints
 app.include_router(variance_router, prefix="/api")  # Variance reasons and trends
-app.include_router(admin_control_router)  # Admin control endpoints
+lazy_routers.include(
+    "/api/admin/control", "backend.api.admin_control_api:admin_control_router"
+)  # Admin control endpoints
 app.include_router(dynamic_fields_router)  # Dynamic fields management
-app.include_router(dynamic_reports_router)  # Dynamic reports
+lazy_routers.include(
+    "/api/dynamic-reports", "backend.api.dynamic_reports_api:dynamic_reports_router"
+)  # Dynamic reports
 
 app.include_router(logs_router, prefix="/api")  # Error and Activity logs
 
 app.include_router(sync_batch_router)  # Batch sync API (has prefix /api/sync)
+lazy_routers.include(
+    "/api/media", "backend.api.media_api:media_router"
+)  # Photo upload/streaming (has prefix /api/media)
 app.include_router(rack_router)  # Rack management (has prefix /api/racks)
 app.include_router(session_mgmt_router)  # Session management (has prefix /api/sessions)
-app.include_router(reporting_router)  # Reporting API (has prefix /api/reports)
-app.include_router(admin_dashboard_router, prefix="/api")  # Admin Dashboard API
-app.include_router(report_generation_router, prefix="/api")  # Report Generation API
+lazy_routers.include(
+    "/api/reports", "backend.api.reporting_api:router"
+)  # Reporting API (has prefix /api/reports)
+lazy_routers.include(
+    "/api/admin/dashboard", "backend.api.admin_dashboard_api:admin_dashboard_router", prefix="/api"
+)  # Admin Dashboard API
+lazy_routers.include(
+    "/api/reports", "backend.api.report_generation_api:report_generation_router", prefix="/api"
+)  # Report Generation API
 
 app.include_router(sync_conflicts_router, prefix="/api")  # Sync conflicts feature
 
@@ -44,6 +44,10 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
             # Calculate duration
             duration = time.time() - start_time
 
+            # Track by route template so /items/{id} is one series, not one per id
+            route = request.scope.get("route")
+            endpoint = getattr(route, "path", None) or endpoint
+
             # Track request
             self.monitoring.track_request(
                 endpoint=endpoint,
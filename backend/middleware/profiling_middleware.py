@@ -0,0 +1,42 @@
+"""
+Profiling Middleware - Attach sampled CPU/Mongo profiles to requests
+"""
+
+import logging
+from collections.abc import Callable
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp
+
+from backend.services.profiler import SamplingProfiler
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """Profile requests selected by header, admin arm or continuous mode"""
+
+    def __init__(self, app: ASGIApp, profiler: SamplingProfiler):
+        super().__init__(app)
+        self.profiler = profiler
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        detailed = self.profiler.wants(request.url.path, request.headers.get(PROFILE_HEADER))
+        if detailed is None:
+            return await call_next(request)
+
+        profile = self.profiler.begin(request.method, request.url.path, detailed)
+        status_code = None
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            route = getattr(request.scope.get("route"), "path", None)
+            self.profiler.end(profile, route, status_code)
+
+        if detailed:
+            response.headers["X-Profile-ID"] = str(profile.id)
+        return response
@@ -111,9 +111,21 @@ def _setup_security_headers(app: FastAPI) -> None:
         logger.warning(f"Failed to add SecurityHeadersMiddleware: {str(e)}")
 
 
+def _setup_profiling(app: FastAPI) -> None:
+    """Add the sampling profiler middleware (idle until armed)."""
+    if not getattr(settings, "PROFILER_ENABLED", True):
+        return
+    from backend.middleware.profiling_middleware import ProfilingMiddleware
+    from backend.services.profiler import profiler
+
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    logger.info("✓ Profiling middleware enabled")
+
+
 def setup_middleware(app: FastAPI) -> None:
     """Configure all middleware for the application."""
     _setup_gzip(app)
     _setup_trusted_hosts(app)
     _setup_cors(app)
     _setup_security_headers(app)
+    _setup_profiling(app)
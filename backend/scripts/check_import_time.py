@@ -0,0 +1,107 @@
+"""
+Import Time Check
+Measures the cold import cost of a module with ``python -X importtime`` and
+fails when it exceeds a budget.
+
+Usage:
+    python backend/scripts/check_import_time.py [--module backend.server] [--budget-ms 4000]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Heavy libraries that must not be imported just by loading the app
+DEFAULT_FORBIDDEN = ("pandas", "reportlab", "numpy")
+
+
+@dataclass
+class ImportTimeResult:
+    module: str
+    returncode: int
+    total_ms: Optional[float] = None
+    # top-level package -> cumulative ms
+    packages: dict[str, float] = field(default_factory=dict)
+    stderr_tail: str = ""
+
+    def slowest(self, n: int = 15) -> list[tuple[str, float]]:
+        return sorted(self.packages.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+def parse_importtime(output: str) -> dict[str, float]:
+    """Map each imported module name to its cumulative import time in ms."""
+    cumulative: dict[str, float] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cum_us = int(parts[1].strip())
+        except ValueError:
+            continue  # header line
+        name = parts[2].strip()
+        cumulative[name] = max(cumulative.get(name, 0.0), cum_us / 1000.0)
+    return cumulative
+
+
+def measure_import_time(module: str = "backend.server", timeout: float = 300) -> ImportTimeResult:
+    """Import ``module`` in a fresh interpreter with ``-X importtime``."""
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    times = parse_importtime(proc.stderr)
+    result = ImportTimeResult(
+        module=module,
+        returncode=proc.returncode,
+        total_ms=times.get(module),
+        stderr_tail="\n".join(
+            line for line in proc.stderr.splitlines()[-20:] if not line.startswith("import time:")
+        ),
+    )
+    for name, ms in times.items():
+        top = name.split(".")[0]
+        result.packages[top] = max(result.packages.get(top, 0.0), ms)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="backend.server")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("IMPORT_TIME_BUDGET_MS", "4000")),
+    )
+    args = parser.parse_args()
+
+    result = measure_import_time(args.module)
+    if result.returncode != 0 or result.total_ms is None:
+        print(f"Import of {args.module} failed:\n{result.stderr_tail}")
+        return 2
+
+    print(f"{args.module}: {result.total_ms:.0f}ms (budget {args.budget_ms:.0f}ms)")
+    for name, ms in result.slowest():
+        print(f"  {name:<30} {ms:8.1f}ms")
+
+    loaded = [name for name in DEFAULT_FORBIDDEN if name in result.packages]
+    if loaded:
+        print(f"Heavy modules imported eagerly: {', '.join(loaded)}")
+    return 1 if result.total_ms > args.budget_ms else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
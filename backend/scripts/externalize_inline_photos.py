@@ -0,0 +1,91 @@
+"""
+Externalize Inline Photos Script
+Moves base64 photos out of count_lines and verification_records into the media store
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.services.media_store import (  # noqa: E402
+    DEFAULT_MEDIA_DIR,
+    GridFSMediaBackend,
+    LocalMediaBackend,
+    MediaService,
+)
+from dotenv import load_dotenv  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def _externalize_count_lines(db, media: MediaService) -> int:
+    query = {
+        "$or": [
+            {"photo_base64": {"$nin": [None, ""]}},
+            {"photo_proofs.url": {"$regex": "^data:"}},
+        ]
+    }
+    projection = {"photo_base64": 1, "photo_proofs": 1, "counted_by": 1}
+    updated = 0
+    async for line in db.count_lines.find(query, projection).batch_size(100):
+        await media.externalize_count_line(line, uploaded_by=line.get("counted_by"))
+        changes = {k: line[k] for k in ("photo", "photo_base64", "photo_proofs") if k in line}
+        await db.count_lines.update_one({"_id": line["_id"]}, {"$set": changes})
+        updated += 1
+        if updated % 500 == 0:
+            logger.info(f"  count_lines: {updated} updated")
+    return updated
+
+
+async def _externalize_verification_records(db, media: MediaService) -> int:
+    query = {"evidence_photos": {"$elemMatch": {"$regex": "^(data:|[A-Za-z0-9+/=]{256})"}}}
+    updated = 0
+    async for record in db.verification_records.find(query, {"evidence_photos": 1, "synced_by": 1}).batch_size(100):
+        photos = await media.externalize_urls(record["evidence_photos"], uploaded_by=record.get("synced_by"))
+        if photos != record["evidence_photos"]:
+            await db.verification_records.update_one({"_id": record["_id"]}, {"$set": {"evidence_photos": photos}})
+            updated += 1
+    return updated
+
+
+async def externalize_inline_photos():
+    """Store inline photos as media and keep only references in documents"""
+    MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+    DB_NAME = os.getenv("DB_NAME", "stock_verify")
+
+    client = AsyncIOMotorClient(MONGO_URL)
+    db = client[DB_NAME]
+    if os.getenv("MEDIA_STORE", "local") == "gridfs":
+        backend = GridFSMediaBackend(db)
+    else:
+        backend = LocalMediaBackend(Path(os.getenv("MEDIA_DIR") or DEFAULT_MEDIA_DIR))
+    media = MediaService(db, backend)
+
+    try:
+        await db.command("ping")
+        logger.info("✓ Database connection successful")
+
+        lines = await _externalize_count_lines(db, media)
+        logger.info(f"✓ count_lines: {lines} documents updated")
+
+        records = await _externalize_verification_records(db, media)
+        logger.info(f"✓ verification_records: {records} documents updated")
+
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(externalize_inline_photos())
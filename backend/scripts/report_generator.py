@@ -6,10 +6,14 @@ Generates comprehensive reports in multiple formats (Excel, CSV, PDF)
 import io
 import logging
 
-import pandas as pd
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Font, PatternFill
 
+from backend.utils.lazy_import import lazy_module
+
+# pandas is only needed for the CSV exports
+pd = lazy_module("pandas")
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,11 +30,9 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from backend.api import auth, supervisor_pin  # noqa: E402
-from backend.api.admin_control_api import admin_control_router  # noqa: E402
-from backend.api.admin_dashboard_api import admin_dashboard_router  # noqa: E402
 from backend.api.auth import router as auth_router  # noqa: E402
+from backend.api.count_lines_api import paginate_count_lines  # noqa: E402
 from backend.api.dynamic_fields_api import dynamic_fields_router  # noqa: E402
-from backend.api.dynamic_reports_api import dynamic_reports_router  # noqa: E402
 from backend.api.enhanced_item_api import (  # noqa: E402
     enhanced_item_router as items_router,
 )
@@ -57,8 +55,6 @@ from backend.api.metrics_api import metrics_router, set_monitoring_service  # no
 from backend.api.permissions_api import permissions_router  # noqa: E402
 from backend.api.preferences_api import router as preferences_router  # noqa: E402
 from backend.api.rack_api import router as rack_router  # noqa: E402
-from backend.api.report_generation_api import report_generation_router  # noqa: E402
-from backend.api.reporting_api import router as reporting_router  # noqa: E402
 from backend.api.schemas import (  # noqa: E402
     ApiResponse,
     CountLineCreate,
@@ -88,11 +84,20 @@ from backend.api.variance_api import router as variance_router  # noqa: E402
 from backend.api.websocket_api import router as websocket_router  # noqa: E402
 from backend.auth.dependencies import init_auth_dependencies  # noqa: E402
 from backend.config import settings  # noqa: E402
+from backend.core.lazy_routers import LazyRouterRegistry  # noqa: E402
+from backend.core.startup import (  # noqa: E402
+    StartupOrchestrator,
+    build_app_startup,
+    get_startup_orchestrator,
+    set_startup_orchestrator,
+)
+from backend.db.event_listeners import mongo_event_listeners  # noqa: E402
 from backend.db.indexes import create_indexes  # noqa: E402
 from backend.db.migrations import MigrationManager  # noqa: E402
 from backend.db.runtime import set_client, set_db  # noqa: E402
 from backend.error_messages import get_error_message  # noqa: E402
 from backend.services.activity_log import ActivityLogService  # noqa: E402
+from backend.services.ai_variance import ai_variance_service  # noqa: E402
 from backend.services.batch_operations import BatchOperationsService  # noqa: E402
 from backend.services.cache_service import CacheService  # noqa: E402
 
@@ -108,6 +113,8 @@ from backend.services.errors import (  # noqa: E402
     ValidationError,
 )
 from backend.services.lock_manager import get_lock_manager  # noqa: E402
+from backend.services.log_sink import start_log_sink, stop_log_sink  # noqa: E402
+from backend.services.media_store import get_media_service  # noqa: E402
 from backend.services.monitoring_service import MonitoringService  # noqa: E402
 from backend.services.pubsub_service import get_pubsub_service  # noqa: E402
 from backend.services.rate_limiter import (  # noqa: E402
@@ -124,6 +131,7 @@ from backend.services.runtime import (  # noqa: E402
 )
 from backend.services.scheduled_export_service import (  # noqa: E402
     ScheduledExportService,
+    build_export_store,
 )
 from backend.services.sync_conflicts_service import SyncConflictsService  # noqa: E402
 from backend.sql_server_connector import SQLServerConnector  # noqa: E402
@@ -149,6 +157,8 @@ try:
     from backend.services.enrichment_service import EnrichmentService
 except ImportError:
     EnrichmentService = None  # type: ignore
+    init_enrichment_api = None  # type: ignore
+    enrichment_router = None  # type: ignore
 
 # Import enterprise services (optional - for enterprise features)
 try:
@@ -260,6 +270,8 @@ mongo_client_options: dict[str, Any] = {
     "socketTimeoutMS": 20000,
     "retryWrites": True,
     "retryReads": True,
+    # Count cache invalidation and per-request Mongo time
+    "event_listeners": mongo_event_listeners(),
 }
 
 client: AsyncIOMotorClient = AsyncIOMotorClient(
@@ -436,6 +448,7 @@ async def _startup_init_redis_services():
     except Exception as e:
         logger.warning(f"⚠️ Redis services not available: {str(e)}")
         logger.warning("Multi-user locking and real-time updates will be disabled")
+        raise
 
     return pubsub_service
 
@@ -450,47 +463,45 @@ async def _startup_create_mongo_indexes() -> None:
         )
     except Exception as e:
         logger.warning(f"⚠️ Index creation warning: {str(e)}")
+        raise
 
 
 def _startup_try_sql_connect() -> None:
-    try:
-        sql_host = getattr(settings, "SQL_SERVER_HOST", None)
-        sql_port = getattr(settings, "SQL_SERVER_PORT", 1433)
-        sql_database = getattr(settings, "SQL_SERVER_DATABASE", None)
-        sql_user = getattr(settings, "SQL_SERVER_USER", None)
-        sql_password = getattr(settings, "SQL_SERVER_PASSWORD", None)
+    sql_host = getattr(settings, "SQL_SERVER_HOST", None)
+    sql_port = getattr(settings, "SQL_SERVER_PORT", 1433)
+    sql_database = getattr(settings, "SQL_SERVER_DATABASE", None)
+    sql_user = getattr(settings, "SQL_SERVER_USER", None)
+    sql_password = getattr(settings, "SQL_SERVER_PASSWORD", None)
 
-        if sql_host and sql_database:
-            logger.info(
-                f"Attempting to connect to SQL Server at {sql_host}:{sql_port}/{sql_database}..."
-            )
-            try:
-                sql_connector.connect(
-                    sql_host, sql_port, sql_database, sql_user, sql_password
-                )
-                logger.info("OK: SQL Server connection established")
-            except OSError as e:
-                logger.warning(
-                    f"SQL Server connection failed (network/system error): {str(e)}"
-                )
-                logger.warning(
-                    "ERP sync will be disabled until SQL Server is configured"
-                )
-            except Exception as e:
-                logger.warning(f"SQL Server connection failed: {str(e)}")
-                logger.warning(
-                    "ERP sync will be disabled until SQL Server is configured"
-                )
-        else:
-            logger.warning(
-                "SQL Server credentials not configured. Set SQL_SERVER_HOST and SQL_SERVER_DATABASE in .env"
-            )
-    except (ValueError, AttributeError) as e:
+    if not (sql_host and sql_database):
         logger.warning(
-            f"Error initializing SQL Server connection (configuration error): {str(e)}"
+            "SQL Server credentials not configured. Set SQL_SERVER_HOST and SQL_SERVER_DATABASE in .env"
         )
+        raise RuntimeError("SQL Server credentials not configured")
+
+    logger.info(
+        f"Attempting to connect to SQL Server at {sql_host}:{sql_port}/{sql_database}..."
+    )
+    try:
+        sql_connector.connect(sql_host, sql_port, sql_database, sql_user, sql_password)
+        logger.info("OK: SQL Server connection established")
+    except OSError as e:
+        logger.warning(f"SQL Server connection failed (network/system error): {str(e)}")
+        logger.warning("ERP sync will be disabled until SQL Server is configured")
+        raise
     except Exception as e:
-        logger.warning(f"Unexpected error initializing SQL Server connection: {str(e)}")
+        logger.warning(f"SQL Server connection failed: {str(e)}")
+        logger.warning("ERP sync will be disabled until SQL Server is configured")
+        raise
+
+
+async def _startup_connect_sql_server() -> None:
+    # The connector tries several auth methods with blocking drivers
+    await asyncio.to_thread(_startup_try_sql_connect)
+
+
+def _is_development() -> bool:
+    return os.getenv("ENVIRONMENT", "development").lower() in ["development", "dev"]
 
 
 async def _startup_verify_mongo_required() -> None:
@@ -503,11 +514,11 @@ async def _startup_verify_mongo_required() -> None:
         error_type = type(e).__name__
         logger.error(f"❌ MongoDB is required but unavailable ({error_type}): {e}")
 
-        if os.getenv("ENVIRONMENT", "development").lower() in ["development", "dev"]:
+        if _is_development():
             logger.warning(
                 "⚠️ Running in DEVELOPMENT mode without MongoDB - some features may be limited"
             )
-            return
+            raise
 
         logger.error(
             "Application cannot start without MongoDB. Please ensure MongoDB is running."
@@ -525,6 +536,7 @@ async def _startup_init_default_users_safe() -> None:
         logger.warning(
             f"Could not initialize default users (may be due to MongoDB unavailability): {str(e)}"
         )
+        raise
 
 
 async def _startup_run_migrations_safe() -> None:
@@ -536,10 +548,12 @@ async def _startup_run_migrations_safe() -> None:
         logger.warning(
             f"Database error during migrations (may be due to MongoDB unavailability): {str(e)}"
         )
+        raise
     except Exception as e:
         logger.warning(
             f"Migration error (may be due to MongoDB unavailability): {str(e)}"
         )
+        raise
 
 
 async def _startup_init_auto_sync_manager() -> None:
@@ -585,6 +599,7 @@ async def _startup_init_auto_sync_manager() -> None:
     except Exception:
         logger.warning("Auto-sync manager initialization failed", exc_info=True)
         auto_sync_manager = None
+        raise
 
 
 def _startup_start_db_health_monitoring_safe() -> None:
@@ -593,6 +608,7 @@ def _startup_start_db_health_monitoring_safe() -> None:
         logger.info("OK: Database health monitoring started")
     except Exception:
         logger.exception("Failed to start database health monitoring")
+        raise
 
 
 async def _startup_init_cache_safe() -> None:
@@ -604,6 +620,7 @@ async def _startup_init_cache_safe() -> None:
         )
     except Exception:
         logger.warning("Cache service error", exc_info=True)
+        raise
 
 
 def _startup_init_auth_deps_safe() -> None:
@@ -612,16 +629,34 @@ def _startup_init_auth_deps_safe() -> None:
         logger.info("OK: Auth dependencies initialized")
     except Exception:
         logger.exception("Failed to initialize auth dependencies")
+        raise
 
 
 def _startup_init_scheduled_export_safe() -> None:
     global scheduled_export_service
     try:
-        scheduled_export_service = ScheduledExportService(db)
+        scheduled_export_service = ScheduledExportService(
+            db,
+            store=build_export_store(db),
+            max_concurrency=settings.EXPORT_MAX_CONCURRENCY,
+            lease_seconds=settings.EXPORT_LEASE_SECONDS,
+        )
         scheduled_export_service.start()
         logger.info("✓ Scheduled export service started")
     except Exception:
         logger.exception("Failed to start scheduled export service")
+        raise
+
+
+def _startup_init_enrichment_safe() -> None:
+    if EnrichmentService is None or init_enrichment_api is None:
+        return
+    try:
+        init_enrichment_api(EnrichmentService(db))
+        logger.info("✓ Enrichment service initialized")
+    except Exception:
+        logger.exception("Failed to initialize enrichment service")
+        raise
 
 
 def _startup_init_sync_conflicts_safe() -> None:
@@ -631,6 +666,7 @@ def _startup_init_sync_conflicts_safe() -> None:
         logger.info("✓ Sync conflicts service initialized")
     except Exception:
         logger.exception("Failed to initialize sync conflicts service")
+        raise
 
 
 def _startup_connect_monitoring_service_safe() -> None:
@@ -639,26 +675,35 @@ def _startup_connect_monitoring_service_safe() -> None:
         logger.info("✓ Monitoring service connected to metrics API")
     except Exception:
         logger.exception("Failed to set monitoring service")
+        raise
 
 
 def _startup_init_domain_apis_safe() -> None:
+    # Initialize every API even if one fails, then report all failures
+    failed = []
     try:
         init_erp_api(db, cache_service, sql_connector)
         logger.info("✓ ERP API initialized with SQL connector")
     except Exception as e:
         logger.error(f"Failed to initialize ERP API: {str(e)}")
+        failed.append("erp")
 
     try:
         init_enhanced_api(db, cache_service, monitoring_service)
         logger.info("✓ Enhanced Item API initialized")
     except Exception as e:
         logger.error(f"Failed to initialize Enhanced Item API: {str(e)}")
+        failed.append("enhanced_item")
 
     try:
         init_verification_api(db, cache_service)
         logger.info("✓ Item verification API initialized")
     except Exception as e:
         logger.error(f"Failed to initialize verification API: {str(e)}")
+        failed.append("verification")
+
+    if failed:
+        raise RuntimeError(f"Domain APIs failed to initialize: {', '.join(failed)}")
 
 
 def _startup_init_search_service_safe() -> None:
@@ -671,70 +716,126 @@ def _startup_init_search_service_safe() -> None:
         logger.info("✓ Search service initialized successfully")
     except Exception as e:
         logger.error(f"❌ Failed to initialize search service: {e}")
+        raise
 
 
-async def _startup_init_enterprise_services(app: FastAPI) -> None:
-    if not ENTERPRISE_AVAILABLE:
-        app.state.enterprise_audit = None
-        app.state.enterprise_security = None
-        app.state.feature_flags = None
-        app.state.data_governance = None
+async def _startup_warm_ai_model() -> None:
+    if not getattr(settings, "AI_MODEL_PRELOAD", False):
         return
+    from backend.services.ai_search import ai_search_service
 
-    try:
-        app.state.enterprise_audit = EnterpriseAuditService(db)
-        await app.state.enterprise_audit.initialize()
-        logger.info("✓ Enterprise audit service initialized")
-    except Exception:
-        app.state.enterprise_audit = None
-        logger.warning("Enterprise audit service not available", exc_info=True)
+    if not await ai_search_service.warm_up():
+        logger.warning("Semantic search model not available after warm-up")
+        raise RuntimeError("Semantic search model not available after warm-up")
+    logger.info("✓ Semantic search model warmed up")
 
-    try:
-        app.state.enterprise_security = EnterpriseSecurityService(db)
-        await app.state.enterprise_security.initialize()
-        logger.info("✓ Enterprise security service initialized")
-    except Exception:
-        app.state.enterprise_security = None
-        logger.warning("Enterprise security service not available", exc_info=True)
 
+async def _startup_init_enterprise_service(app: FastAPI, attr: str, service_cls, label: str) -> None:
     try:
-        app.state.feature_flags = FeatureFlagService(db)
-        await app.state.feature_flags.initialize()
-        logger.info("✓ Feature flags service initialized")
+        service = service_cls(db)
+        await service.initialize()
+        # Only expose the service once it is fully initialized
+        setattr(app.state, attr, service)
+        logger.info(f"✓ {label} initialized")
     except Exception:
-        app.state.feature_flags = None
-        logger.warning("Feature flags service not available", exc_info=True)
+        setattr(app.state, attr, None)
+        logger.warning(f"{label} not available", exc_info=True)
+        raise
+
+
+async def _startup_init_enterprise_services(app: FastAPI) -> None:
+    app.state.enterprise_audit = None
+    app.state.enterprise_security = None
+    app.state.feature_flags = None
+    app.state.data_governance = None
+    if not ENTERPRISE_AVAILABLE:
+        return
+
+    # Start all four even if one fails, then surface the first failure
+    results = await asyncio.gather(
+        _startup_init_enterprise_service(
+            app, "enterprise_audit", EnterpriseAuditService, "Enterprise audit service"
+        ),
+        _startup_init_enterprise_service(
+            app, "enterprise_security", EnterpriseSecurityService, "Enterprise security service"
+        ),
+        _startup_init_enterprise_service(
+            app, "feature_flags", FeatureFlagService, "Feature flags service"
+        ),
+        _startup_init_enterprise_service(
+            app, "data_governance", DataGovernanceService, "Data governance service"
+        ),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
 
+async def _startup_init_log_sink_safe() -> None:
     try:
-        app.state.data_governance = DataGovernanceService(db)
-        await app.state.data_governance.initialize()
-        logger.info("✓ Data governance service initialized")
-    except Exception:
-        app.state.data_governance = None
-        logger.warning("Data governance service not available", exc_info=True)
+        await start_log_sink(db)
+    except Exception as e:
+        logger.error(f"Failed to start log sink: {str(e)}")
+        raise
+
+
+def _as_phase(func) -> Any:
+    """Wrap a synchronous startup helper as an async phase."""
+
+    async def _phase() -> None:
+        func()
+
+    return _phase
+
+
+def _build_startup_orchestrator(app: FastAPI, state: dict[str, Any]) -> StartupOrchestrator:
+    async def _redis_phase() -> None:
+        state["pubsub_service"] = await _startup_init_redis_services()
+
+    async def _enterprise_phase() -> None:
+        await _startup_init_enterprise_services(app)
+
+    # The graph itself lives in backend.core.startup, shared with backend.core.lifespan
+    return build_app_startup(
+        {
+            "redis": _redis_phase,
+            "mongodb": _startup_verify_mongo_required,
+            "indexes": _startup_create_mongo_indexes,
+            "default_users": _startup_init_default_users_safe,
+            "migrations": _startup_run_migrations_safe,
+            "db_health_monitoring": _as_phase(_startup_start_db_health_monitoring_safe),
+            "cache": _startup_init_cache_safe,
+            "auth": _as_phase(_startup_init_auth_deps_safe),
+            "log_sink": _startup_init_log_sink_safe,
+            "scheduled_export": _as_phase(_startup_init_scheduled_export_safe),
+            "enrichment": _as_phase(_startup_init_enrichment_safe),
+            "sync_conflicts": _as_phase(_startup_init_sync_conflicts_safe),
+            "monitoring": _as_phase(_startup_connect_monitoring_service_safe),
+            "domain_apis": _as_phase(_startup_init_domain_apis_safe),
+            "search_service": _as_phase(_startup_init_search_service_safe),
+            "sql_server": _startup_connect_sql_server,
+            "auto_sync": _startup_init_auto_sync_manager,
+            "enterprise": _enterprise_phase,
+            "ai_model": _startup_warm_ai_model,
+        },
+        # Development runs without MongoDB; the phase is then recorded as failed
+        mongodb_critical=not _is_development(),
+    )
 
 
 async def _do_startup(app: FastAPI):
     logger.info("🚀 Starting StockVerify application...")
     _startup_set_runtime_globals()
-    pubsub_service = await _startup_init_redis_services()
-    await _startup_create_mongo_indexes()
-    _startup_try_sql_connect()
-    await _startup_verify_mongo_required()
-    await _startup_init_default_users_safe()
-    await _startup_run_migrations_safe()
-    await _startup_init_auto_sync_manager()
-    _startup_start_db_health_monitoring_safe()
-    await _startup_init_cache_safe()
-    _startup_init_auth_deps_safe()
-    _startup_init_scheduled_export_safe()
-    _startup_init_sync_conflicts_safe()
-    _startup_connect_monitoring_service_safe()
-    _startup_init_domain_apis_safe()
-    await _startup_init_enterprise_services(app)
-    _startup_init_search_service_safe()
+
+    state: dict[str, Any] = {"pubsub_service": None}
+    orchestrator = _build_startup_orchestrator(app, state)
+    app.state.startup = orchestrator
+    set_startup_orchestrator(orchestrator)
+
+    await orchestrator.run()
     logger.info("OK: Application startup complete")
-    return pubsub_service
+    return state
 
 
 async def _shutdown_task_stop_export(service) -> None:
@@ -776,12 +877,36 @@ async def _shutdown_task_stop_redis(pubsub_service) -> None:
         logger.error(f"Error stopping Redis services: {str(e)}")
 
 
+async def _shutdown_task_stop_ai_inference() -> None:
+    ai_search = sys.modules.get("backend.services.ai_search")
+    if ai_search is None:
+        return
+    try:
+        ai_search.ai_search_service.shutdown()
+        logger.info("✓ Semantic search inference stopped")
+    except Exception as e:
+        logger.error(f"Error stopping semantic search inference: {str(e)}")
+
+
+async def _shutdown_task_stop_report_jobs() -> None:
+    report_jobs = sys.modules.get("backend.services.reporting.report_jobs")
+    if report_jobs is None:
+        return
+    try:
+        await report_jobs.shutdown_report_job_queue()
+        logger.info("✓ Report job workers stopped")
+    except Exception as e:
+        logger.error(f"Error stopping report job workers: {str(e)}")
+
+
 async def _shutdown_stop_services(pubsub_service) -> None:
     shutdown_timeout = 30
     shutdown_tasks: list[Any] = [
         _shutdown_task_stop_health_monitoring(),
         _shutdown_task_stop_auto_sync(),
         _shutdown_task_stop_redis(pubsub_service),
+        _shutdown_task_stop_ai_inference(),
+        _shutdown_task_stop_report_jobs(),
     ]
     if scheduled_export_service:
         shutdown_tasks.append(_shutdown_task_stop_export(scheduled_export_service))
@@ -808,6 +933,13 @@ def _shutdown_close_pool_safe() -> None:
             logger.error(f"Error closing connection pool: {str(e)}")
 
 
+async def _shutdown_flush_log_sink_safe() -> None:
+    try:
+        await stop_log_sink()
+    except Exception as e:
+        logger.error(f"Error flushing log sink: {str(e)}")
+
+
 def _shutdown_close_mongo_safe() -> None:
     try:
         client.close()
@@ -816,10 +948,14 @@ def _shutdown_close_mongo_safe() -> None:
         logger.error(f"Error closing MongoDB connection: {str(e)}")
 
 
-async def _do_shutdown(pubsub_service) -> None:
+async def _do_shutdown(startup_state: dict[str, Any]) -> None:
     logger.info("🛑 Shutting down application...")
     shutdown_start = time.time()
-    await _shutdown_stop_services(pubsub_service)
+    orchestrator = get_startup_orchestrator()
+    if orchestrator is not None:
+        await orchestrator.shutdown()
+    await _shutdown_stop_services(startup_state.get("pubsub_service"))
+    await _shutdown_flush_log_sink_safe()
     _shutdown_close_pool_safe()
     _shutdown_close_mongo_safe()
     shutdown_duration = time.time() - shutdown_start
@@ -829,11 +965,11 @@ async def _do_shutdown(pubsub_service) -> None:
 # Create the main app with lifespan
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    pubsub_service = await _do_startup(app)
+    startup_state = await _do_startup(app)
     try:
         yield
     finally:
-        await _do_shutdown(pubsub_service)
+        await _do_shutdown(startup_state)
 
     # NOTE: Startup checklist logging was removed here to keep lifecycle handlers small.
 
@@ -920,9 +1056,19 @@ try:
 except Exception as e:
     logger.warning(f"Security headers middleware not available: {str(e)}")
 
+# Sampling profiler (idle unless armed by an admin, X-Profile header or continuous mode)
+if getattr(settings, "PROFILER_ENABLED", True):
+    from backend.middleware.profiling_middleware import ProfilingMiddleware
+    from backend.services.profiler import profiler
+
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
 # Create API router
 api_router = APIRouter()
 
+# Rarely used admin/reporting routers are imported on first request
+lazy_routers = LazyRouterRegistry(app, enabled=getattr(settings, "LAZY_ROUTERS", True))
+
 # Register all routers with the app
 app.include_router(health_router)  # Health check endpoints at /health/*
 app.include_router(health_router, prefix="/api")  # Alias for frontend compatibility
@@ -949,10 +1095,12 @@ app.include_router(
     inventory_router, prefix="/api"
 )  # Inventory management (expiry, stock, batch priority)
 app.include_router(variance_router, prefix="/api")  # Variance reasons and trendspoints
-app.include_router(admin_control_router)  # Admin control endpoints
+lazy_routers.include(
+    "/api/admin/control", "backend.api.admin_control_api:admin_control_router"
+)  # Admin control endpoints
 app.include_router(dynamic_fields_router)  # Dynamic fields management
-app.include_router(
-    dynamic_reports_router
+lazy_routers.include(
+    "/api/dynamic-reports", "backend.api.dynamic_reports_api:dynamic_reports_router"
 )  # Dynamic reports (has prefix /api/dynamic-reports)
 app.include_router(logs_router, prefix="/api")  # Error and Activity logs
 app.include_router(locations_router)  # Locations (Zones/Warehouses)
@@ -966,9 +1114,18 @@ app.include_router(user_settings_router)  # User settings (has prefix /api/user)
 app.include_router(
     preferences_router, prefix="/api"
 )  # User preferences (has prefix /api/users/me/preferences)
-app.include_router(reporting_router)  # Reporting API (has prefix /api/reports)
-app.include_router(admin_dashboard_router, prefix="/api")  # Admin Dashboard API
-app.include_router(report_generation_router, prefix="/api")  # Report Generation API
+lazy_routers.include(
+    "/api/media", "backend.api.media_api:media_router"
+)  # Photo upload/streaming (has prefix /api/media)
+lazy_routers.include(
+    "/api/reports", "backend.api.reporting_api:router"
+)  # Reporting API (has prefix /api/reports)
+lazy_routers.include(
+    "/api/admin/dashboard", "backend.api.admin_dashboard_api:admin_dashboard_router", prefix="/api"
+)  # Admin Dashboard API
+lazy_routers.include(
+    "/api/reports", "backend.api.report_generation_api:report_generation_router", prefix="/api"
+)  # Report Generation API
 app.include_router(websocket_router)  # WebSocket updates (endpoint at /ws/updates)
 logger.info("✓ Phase 1-3 upgrade routers registered")
 logger.info("✓ Admin Dashboard, Report Generation, and Dynamic Reports APIs registered")
@@ -1636,6 +1793,24 @@ async def bulk_export_sessions(
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@api_router.post("/sessions/bulk/export/jobs", status_code=202)
+async def bulk_export_sessions_job(
+    session_ids: list[str],
+    format: str = "excel",
+    current_user: dict = Depends(get_current_user),
+):
+    """Bulk export sessions in the background (supervisor only)"""
+    if current_user["role"] not in ["supervisor", "admin"]:
+        raise HTTPException(status_code=403, detail=DETAIL_INSUFFICIENT_PERMISSIONS)
+
+    # Importing session_api registers the "session_export" job handler
+    from backend.api.session_api import submit_session_export_job
+
+    return await submit_session_export_job(
+        db, activity_log_service, session_ids, format, current_user
+    )
+
+
 @api_router.get("/sessions/analytics")
 async def get_sessions_analytics(current_user: dict = Depends(get_current_user)):
     """Get aggregated session analytics (supervisor only)"""
@@ -1984,7 +2159,12 @@ async def create_count_line(
         "verified_by": None,
     }
 
+    # Keep photos out of the document; only media references are stored
+    await get_media_service(db).externalize_count_line(
+        count_line, uploaded_by=current_user["username"]
+    )
     await db.count_lines.insert_one(count_line)
+    await ai_variance_service.invalidate_sessions(db, [line_data.session_id])
 
     await _update_session_stats_safe(line_data.session_id)
     await _log_high_risk_safe(
@@ -2037,6 +2217,8 @@ async def verify_stock(
     if update_result.modified_count == 0:
         raise HTTPException(status_code=404, detail=DETAIL_COUNT_LINE_NOT_FOUND)
 
+    await ai_variance_service.invalidate_count_line(db_client, {"id": line_id})
+
     if activity_log_service:
         await activity_log_service.log_activity(
             user=current_user["username"],
@@ -2069,6 +2251,8 @@ async def unverify_stock(
     if update_result.modified_count == 0:
         raise HTTPException(status_code=404, detail=DETAIL_COUNT_LINE_NOT_FOUND)
 
+    await ai_variance_service.invalidate_count_line(db_client, {"id": line_id})
+
     if activity_log_service:
         await activity_log_service.log_activity(
             user=current_user["username"],
@@ -2089,38 +2273,26 @@ async def get_count_lines(
     page: int = 1,
     page_size: int = 50,
     verified: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
     *,
     db_override=None,
 ):
     """Get count lines with pagination. Shared between routes and tests."""
     del current_user
-    skip = (page - 1) * page_size
     filter_query: dict[str, Any] = {"session_id": session_id}
 
     if verified is not None:
         filter_query["verified"] = verified
 
-    db_client = _get_db_client(db_override)
-    total = await db_client.count_lines.count_documents(filter_query)
-    lines_cursor = (
-        db_client.count_lines.find(filter_query, {"_id": 0})
-        .sort("counted_at", -1)
-        .skip(skip)
-        .limit(page_size)
+    return await paginate_count_lines(
+        _get_db_client(db_override),
+        filter_query,
+        page=page,
+        page_size=page_size,
+        cursor=cursor,
+        include_total=include_total,
     )
-    lines = await lines_cursor.to_list(page_size)
-
-    return {
-        "items": lines,
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "total_pages": (total + page_size - 1) // page_size,
-            "has_next": skip + page_size < total,
-            "has_prev": page > 1,
-        },
-    }
 
 
 @api_router.put("/count-lines/{line_id}/approve")
@@ -2151,6 +2323,8 @@ async def approve_count_line(
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail=DETAIL_COUNT_LINE_NOT_FOUND)
 
+        await ai_variance_service.invalidate_count_line(db, {"_id": ObjectId(line_id)})
+
         return {"success": True, "message": "Count line approved"}
     except Exception as e:
         logger.error(f"Error approving count line {line_id}: {str(e)}")
@@ -2183,6 +2357,8 @@ async def reject_count_line(
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail=DETAIL_COUNT_LINE_NOT_FOUND)
 
+        await ai_variance_service.invalidate_count_line(db, {"_id": ObjectId(line_id)})
+
         return {"success": True, "message": "Count line rejected"}
     except Exception as e:
         logger.error(f"Error rejecting count line {line_id}: {str(e)}")
@@ -2218,6 +2394,13 @@ async def get_count_lines_route(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
     verified: Optional[bool] = Query(None, description="Filter by verification status"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from a previous page; pass an empty value to start",
+    ),
+    include_total: Optional[bool] = Query(
+        None, description="Count all matching lines (default: offset mode only)"
+    ),
 ):
     return await get_count_lines(
         session_id,
@@ -2225,6 +2408,8 @@ async def get_count_lines_route(
         page=page,
         page_size=page_size,
         verified=verified,
+        cursor=cursor,
+        include_total=include_total,
     )
 
 
@@ -10,6 +10,13 @@ from typing import Any, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel
 
+from backend.services.log_sink import write_log
+from backend.utils.pagination import (
+    count_total,
+    cursor_paginate_mongo,
+    offset_pagination,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,12 +32,13 @@ def _build_activity_filter(
     """Build MongoDB filter query for activity logs."""
     filter_query: dict[str, Any] = {}
 
+    # Free-text fields match case-insensitively, as the activity log endpoint does
     if user:
-        filter_query["user"] = user
+        filter_query["user"] = {"$regex": user, "$options": "i"}
     if role:
         filter_query["role"] = role
     if action:
-        filter_query["action"] = action
+        filter_query["action"] = {"$regex": action, "$options": "i"}
     if entity_type:
         filter_query["entity_type"] = entity_type
     if status:
@@ -116,11 +124,12 @@ class ActivityLogService:
                 "error_message": error_message,
             }
 
-            result = await self.collection.insert_one(log_entry)
-            log_entry["id"] = str(result.inserted_id)
+            # The sink may hold the dict until it flushes; queue a copy
+            entry_id = await write_log(self.collection, dict(log_entry))
+            log_entry["id"] = entry_id
 
             logger.debug(f"Activity logged: {user} - {action} - {status}")
-            return str(result.inserted_id)
+            return entry_id
         except Exception as e:
             logger.error(f"Failed to log activity: {str(e)}")
             # Don't raise - logging failures shouldn't break the app
@@ -137,20 +146,24 @@ class ActivityLogService:
         end_date: Optional[datetime] = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: Optional[str] = None,
+        include_total: Optional[bool] = None,
     ) -> dict[str, Any]:
         """
         Retrieve activity logs with filtering and pagination
 
         Args:
-            user: Filter by username
+            user: Filter by username (case-insensitive pattern)
             role: Filter by role
-            action: Filter by action type
+            action: Filter by action type (case-insensitive pattern)
             entity_type: Filter by entity type
             status: Filter by status
             start_date: Filter by start date
             end_date: Filter by end date
             page: Page number
             page_size: Items per page
+            cursor: Keyset cursor ("" for the first page); replaces page offsets
+            include_total: Count matching entries (default: offset mode only)
 
         Returns:
             Dictionary with activities and pagination info
@@ -160,16 +173,34 @@ class ActivityLogService:
                 user, role, action, entity_type, status, start_date, end_date
             )
 
-            total = await self.collection.count_documents(filter_query)
+            if cursor is not None:
+                result = await cursor_paginate_mongo(
+                    self.collection,
+                    filter_query,
+                    sort_field="timestamp",
+                    direction=-1,
+                    limit=page_size,
+                    cursor=cursor,
+                    include_total=bool(include_total),
+                )
+                activities = result.items
+                for activity in activities:
+                    activity["id"] = str(activity["_id"])
+                    del activity["_id"]
+                return {"activities": activities, "pagination": result.pagination()}
+
+            total = None
+            if include_total is not False:
+                total = await count_total(self.collection, filter_query)
             skip = (page - 1) * page_size
 
-            cursor = (
+            db_cursor = (
                 self.collection.find(filter_query)
                 .sort("timestamp", -1)
                 .skip(skip)
                 .limit(page_size)
             )
-            activities = await cursor.to_list(page_size)
+            activities = await db_cursor.to_list(page_size)
 
             for activity in activities:
                 activity["id"] = str(activity["_id"])
@@ -177,14 +208,9 @@ class ActivityLogService:
 
             return {
                 "activities": activities,
-                "pagination": {
-                    "page": page,
-                    "page_size": page_size,
-                    "total": total,
-                    "total_pages": (total + page_size - 1) // page_size,
-                    "has_next": skip + page_size < total,
-                    "has_prev": page > 1,
-                },
+                "pagination": offset_pagination(
+                    page, page_size, total, len(activities)
+                ),
             }
         except Exception as e:
             logger.error(f"Failed to retrieve activities: {str(e)}")
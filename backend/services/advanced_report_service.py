@@ -3,16 +3,17 @@ Advanced Report Service
 Comprehensive report generation with real-time data, aggregations, and advanced filtering
 """
 
-import csv
-import io
-import json
+import asyncio
 import logging
+from collections.abc import AsyncIterator
 from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
+from backend.services.count_service import CountResult, count_service
+from backend.services.reporting.streaming_export import write_csv_bytes, write_xlsx_bytes
 from backend.utils.tracing import trace_report_generation, trace_span
 
 logger = logging.getLogger(__name__)
@@ -91,6 +92,9 @@ class ReportSummary(BaseModel):
 
     total_records: int
     filtered_records: int
+    # "exact", "cached" (memoised exact count) or "estimated" (collection metadata)
+    total_records_accuracy: str = "exact"
+    filtered_records_accuracy: str = "exact"
     aggregations: dict[str, Any]
     generated_at: datetime
     generation_time_ms: float
@@ -312,6 +316,44 @@ class AdvancedReportService:
             "approval_status": 1,
         }
 
+    def _build_verified_items_query(self, filters: ReportFilters) -> dict[str, Any]:
+        """Build the count_lines query for the verified items report."""
+        query = self._build_base_query(filters)
+        self._add_search_filter(query, filters.search_query)
+        self._add_date_filter(query, filters.date_from, filters.date_to)
+        self._add_variance_filter(query, filters.variance_min, filters.variance_max)
+        return query
+
+    @staticmethod
+    async def _count_records(
+        collection, total_query: dict[str, Any], filtered_query: dict[str, Any]
+    ) -> tuple[CountResult, CountResult]:
+        """Summary totals via the shared count cache (estimated when unfiltered)."""
+        return await asyncio.gather(
+            count_service.count(collection, total_query),
+            count_service.count(collection, filtered_query),
+        )
+
+    async def iter_verified_items(
+        self, config: ReportConfig, batch_size: int = 1000
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream every verified-items row matching the report filters (no paging)."""
+        filters = config.filters or ReportFilters()
+        query = self._build_verified_items_query(filters)
+        sort_field = config.sort_by or "counted_at"
+        sort_direction = -1 if config.sort_order == SortOrder.DESC else 1
+
+        pipeline = [
+            {"$match": query},
+            {"$sort": {sort_field: sort_direction, "_id": sort_direction}},
+            {"$project": self._get_items_projection()},
+        ]
+        cursor = self.db.count_lines.aggregate(
+            pipeline, allowDiskUse=True, batchSize=batch_size
+        )
+        async for row in cursor:
+            yield row
+
     @trace_report_generation("verified_items")
     async def generate_verified_items_report(
         self, config: ReportConfig
@@ -321,14 +363,11 @@ class AdvancedReportService:
         filters = config.filters or ReportFilters()
 
         # Build query using helpers
-        query = self._build_base_query(filters)
-        self._add_search_filter(query, filters.search_query)
-        self._add_date_filter(query, filters.date_from, filters.date_to)
-        self._add_variance_filter(query, filters.variance_min, filters.variance_max)
+        query = self._build_verified_items_query(filters)
 
         # Get counts
-        total_records = await self.db.count_lines.count_documents({})
-        filtered_records = await self.db.count_lines.count_documents(query)
+        total_count, filtered_count = await self._count_records(self.db.count_lines, {}, query)
+        total_records, filtered_records = total_count.value, filtered_count.value
 
         # Build sort
         sort_field = config.sort_by or "counted_at"
@@ -415,6 +454,8 @@ class AdvancedReportService:
             "summary": ReportSummary(
                 total_records=total_records,
                 filtered_records=filtered_records,
+                total_records_accuracy=total_count.accuracy,
+                filtered_records_accuracy=filtered_count.accuracy,
                 aggregations=aggregations,
                 generated_at=end_time,
                 generation_time_ms=generation_time_ms,
@@ -459,8 +500,8 @@ class AdvancedReportService:
                 date_filter["$lte"] = filters.date_to
             query["started_at"] = date_filter
 
-        total_records = await self.db.sessions.count_documents({})
-        filtered_records = await self.db.sessions.count_documents(query)
+        total_count, filtered_count = await self._count_records(self.db.sessions, {}, query)
+        total_records, filtered_records = total_count.value, filtered_count.value
 
         sort_field = config.sort_by or "started_at"
         sort_direction = -1 if config.sort_order == SortOrder.DESC else 1
@@ -543,6 +584,8 @@ class AdvancedReportService:
             "summary": ReportSummary(
                 total_records=total_records,
                 filtered_records=filtered_records,
+                total_records_accuracy=total_count.accuracy,
+                filtered_records_accuracy=filtered_count.accuracy,
                 aggregations={},
                 generated_at=end_time,
                 generation_time_ms=generation_time_ms,
@@ -585,10 +628,10 @@ class AdvancedReportService:
                 date_filter["$lte"] = filters.date_to
             query["counted_at"] = date_filter
 
-        total_records = await self.db.count_lines.count_documents(
-            {"variance": {"$ne": 0}}
+        total_count, filtered_count = await self._count_records(
+            self.db.count_lines, {"variance": {"$ne": 0}}, query
         )
-        filtered_records = await self.db.count_lines.count_documents(query)
+        total_records, filtered_records = total_count.value, filtered_count.value
 
         sort_field = config.sort_by or "variance"
         sort_direction = -1 if config.sort_order == SortOrder.DESC else 1
@@ -740,6 +783,8 @@ class AdvancedReportService:
             "summary": ReportSummary(
                 total_records=total_records,
                 filtered_records=filtered_records,
+                total_records_accuracy=total_count.accuracy,
+                filtered_records_accuracy=filtered_count.accuracy,
                 aggregations=aggregations,
                 generated_at=end_time,
                 generation_time_ms=generation_time_ms,
@@ -757,62 +802,20 @@ class AdvancedReportService:
             },
         }
 
+    @staticmethod
+    def export_columns(columns: list[ColumnConfig]) -> list[tuple[str, str]]:
+        """(field, label) pairs for the visible columns, as used by the export writers."""
+        return [(col.field, col.label) for col in columns if col.visible]
+
     async def export_to_csv(self, data: list[dict], columns: list[ColumnConfig]) -> str:
         """Export data to CSV format."""
-        output = io.StringIO()
-        visible_columns = [col for col in columns if col.visible]
-        fieldnames = [col.field for col in visible_columns]
-        headers = {col.field: col.label for col in visible_columns}
-
-        writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction="ignore")
-        writer.writerow(headers)
-
-        for row in data:
-            sanitized_row = {}
-            for field in fieldnames:
-                value = row.get(field, "")
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value)
-                elif isinstance(value, datetime):
-                    value = value.isoformat()
-                sanitized_row[field] = value
-            writer.writerow(sanitized_row)
-
-        return output.getvalue()
+        return write_csv_bytes(data, self.export_columns(columns)).decode("utf-8")
 
     async def export_to_xlsx(
         self, data: list[dict], columns: list[ColumnConfig]
     ) -> bytes:
         """Export data to XLSX format."""
-        try:
-            import openpyxl
-        except ImportError:
-            raise ImportError("openpyxl required for Excel export")
-
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        if ws is None:
-            ws = wb.create_sheet("Report")
-
-        visible_columns = [col for col in columns if col.visible]
-
-        # Write headers
-        for col_idx, col in enumerate(visible_columns, 1):
-            ws.cell(row=1, column=col_idx, value=col.label)
-
-        # Write data
-        for row_idx, row in enumerate(data, 2):
-            for col_idx, col in enumerate(visible_columns, 1):
-                value = row.get(col.field, "")
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value)
-                elif isinstance(value, datetime):
-                    value = value.isoformat()
-                ws.cell(row=row_idx, column=col_idx, value=value)
-
-        output = io.BytesIO()
-        wb.save(output)
-        return output.getvalue()
+        return write_xlsx_bytes(data, self.export_columns(columns))
 
 
 # Report type dispatcher
@@ -3,25 +3,72 @@ AI Search Service
 Handles semantic search using sentence-transformers.
 """
 
+from __future__ import annotations
+
+import asyncio
 import logging
-from typing import Any, Optional
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from backend.utils.lazy_import import lazy_module
+
+if TYPE_CHECKING:
+    from backend.services.embedding_store import ItemEmbeddingStore
 
-import numpy as np
+# numpy (and the embedding store built on it) load on first semantic search
+np = lazy_module("numpy")
 
 # Configure logging
 logger = logging.getLogger("ai_search")
 
+DEFAULT_EMBEDDINGS_DIR = Path(__file__).resolve().parent.parent / "data" / "embeddings"
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+class InferenceQueueFullError(RuntimeError):
+    """Raised when the encode queue is saturated; callers should retry later."""
+
 
 class AISearchService:
     _instance = None
     _model = None
-    _embeddings_cache: dict[str, np.ndarray] = {}
+    _embedding_store: Optional[ItemEmbeddingStore] = None
+    _embeddings_reconciled = False
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._init_inference()
         return cls._instance
 
+    def _init_inference(self) -> None:
+        """Set up the dedicated encode executor, queue limits and metrics."""
+        from backend.config import settings
+
+        self.max_queue_size = getattr(settings, "AI_ENCODE_QUEUE_SIZE", 64)
+        self.max_batch_size = getattr(settings, "AI_ENCODE_MAX_BATCH", 32)
+        self.batch_window = getattr(settings, "AI_ENCODE_BATCH_WINDOW_MS", 5) / 1000.0
+
+        # One worker: torch parallelises internally, and this keeps encode
+        # calls serialised off the event loop.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-encode")
+        self._model_lock = threading.Lock()
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+
+        self._model_load_seconds: Optional[float] = None
+        self._latencies_ms: deque[float] = deque(maxlen=1000)
+        self._inference_batches = 0
+        self._inference_items = 0
+        self._rejected = 0
+
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
@@ -35,21 +82,54 @@ class AISearchService:
         if self._model is not None:
             return
 
-        try:
-            from sentence_transformers import SentenceTransformer
-
-            logger.info("Loading semantic search model (all-MiniLM-L6-v2)...")
-            # fast, lightweight model
-            self._model = SentenceTransformer("all-MiniLM-L6-v2")
-            logger.info("Semantic search model loaded successfully.")
-        except ImportError:
-            logger.error(
-                "sentence-transformers not installed. Semantic search disabled."
-            )
-            self._model = None
-        except Exception as e:
-            logger.error(f"Failed to load semantic model: {e}")
-            self._model = None
+        with self._model_lock:
+            if self._model is not None:
+                return
+            try:
+                from sentence_transformers import SentenceTransformer
+
+                logger.info(f"Loading semantic search model ({MODEL_NAME})...")
+                start = time.perf_counter()
+                # fast, lightweight model
+                AISearchService._model = SentenceTransformer(MODEL_NAME)
+                self._model_load_seconds = time.perf_counter() - start
+                logger.info(
+                    f"Semantic search model loaded in {self._model_load_seconds:.2f}s."
+                )
+            except ImportError:
+                logger.error(
+                    "sentence-transformers not installed. Semantic search disabled."
+                )
+                AISearchService._model = None
+            except Exception as e:
+                logger.error(f"Failed to load semantic model: {e}")
+                AISearchService._model = None
+
+    async def warm_up(self) -> bool:
+        """
+        Load the model on the encode executor. Returns True if it is available.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.initialize_model)
+        return self._model is not None
+
+    def start_warmup(self) -> asyncio.Task:
+        """
+        Preload the model in the background (e.g. from application startup).
+        """
+        if self._warmup_task is None or self._warmup_task.done():
+            self._warmup_task = asyncio.create_task(self.warm_up())
+        return self._warmup_task
+
+    def shutdown(self) -> None:
+        """Stop the micro-batcher and release the encode executor."""
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            self._batch_task = None
+        self._queue = None
+        self._loop = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-encode")
 
     def encode(self, text: str) -> Optional[np.ndarray]:
         """
@@ -60,11 +140,202 @@ class AISearchService:
             return None
 
         try:
-            return self._model.encode(text, convert_to_numpy=True)
+            with self._model_lock:
+                return self._model.encode(text, convert_to_numpy=True)
         except Exception as e:
             logger.error(f"Encoding error: {e}")
             return None
 
+    async def encode_async(self, text: str) -> Optional[np.ndarray]:
+        """
+        Encode a query off the event loop.
+
+        Concurrent calls are micro-batched into a single model call. Raises
+        ``InferenceQueueFullError`` when the bounded queue is saturated.
+        """
+        vectors = await self._submit([text])
+        return None if vectors is None else vectors[0]
+
+    async def _submit(self, texts: list[str]) -> Optional[np.ndarray]:
+        """Queue ``texts`` for the micro-batcher and wait for their embeddings."""
+        queue = self._ensure_batcher()
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        try:
+            queue.put_nowait((texts, future))
+        except asyncio.QueueFull:
+            self._rejected += 1
+            raise InferenceQueueFullError("Semantic encoder is busy, try again shortly")
+        return await future
+
+    def _ensure_batcher(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop or self._batch_task is None:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._batch_task = loop.create_task(self._batch_loop(self._queue))
+        return self._queue
+
+    async def _batch_loop(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.batch_window
+            while size < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(entry)
+                size += len(entry[0])
+
+            texts = [text for entry_texts, _ in batch for text in entry_texts]
+            start = time.perf_counter()
+            try:
+                vectors = await loop.run_in_executor(
+                    self._executor, self._encode_texts, texts
+                )
+            except Exception as e:
+                logger.error(f"Batched encoding error: {e}")
+                vectors = None
+            self._record_inference(len(texts), (time.perf_counter() - start) * 1000)
+
+            offset = 0
+            for entry_texts, future in batch:
+                end = offset + len(entry_texts)
+                if not future.done():
+                    future.set_result(None if vectors is None else vectors[offset:end])
+                offset = end
+
+    def _encode_texts(self, texts: list[str]) -> Optional[np.ndarray]:
+        self.initialize_model()
+        if self._model is None:
+            return None
+        with self._model_lock:
+            return self._model.encode(texts, convert_to_numpy=True)
+
+    def _record_inference(self, items: int, elapsed_ms: float) -> None:
+        self._inference_batches += 1
+        self._inference_items += items
+        self._latencies_ms.append(elapsed_ms)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Model lifecycle and inference latency statistics.
+        """
+        latencies = sorted(self._latencies_ms)
+
+        def _pct(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 2)
+
+        return {
+            "model": MODEL_NAME,
+            "model_loaded": self._model is not None,
+            "model_load_seconds": (
+                round(self._model_load_seconds, 3)
+                if self._model_load_seconds is not None
+                else None
+            ),
+            "warming_up": self._warmup_task is not None and not self._warmup_task.done(),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self.max_queue_size,
+            "rejected": self._rejected,
+            "inference_batches": self._inference_batches,
+            "inference_items": self._inference_items,
+            "avg_batch_size": (
+                round(self._inference_items / self._inference_batches, 2)
+                if self._inference_batches
+                else 0
+            ),
+            "latency_ms": {"p50": _pct(0.5), "p95": _pct(0.95), "p99": _pct(0.99)},
+        }
+
+    def encode_batch(
+        self, texts: list[str], batch_size: int = 256
+    ) -> Optional[np.ndarray]:
+        """
+        Generate normalised embeddings for a batch of strings.
+        """
+        self.initialize_model()
+        if self._model is None:
+            return None
+
+        try:
+            with self._model_lock:
+                return self._model.encode(
+                    texts,
+                    batch_size=batch_size,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                ).astype(np.float32)
+        except Exception as e:
+            logger.error(f"Batch encoding error: {e}")
+            return None
+
+    @property
+    def embedding_store(self) -> ItemEmbeddingStore:
+        """Precomputed item embeddings (created on first access)."""
+        if self._embedding_store is None:
+            from backend.config import settings
+            from backend.services.embedding_store import ItemEmbeddingStore
+
+            directory = getattr(settings, "EMBEDDINGS_DIR", None) or DEFAULT_EMBEDDINGS_DIR
+            dtype = getattr(settings, "EMBEDDINGS_DTYPE", "float16")
+            AISearchService._embedding_store = ItemEmbeddingStore(directory, dtype=dtype)
+        return self._embedding_store
+
+    async def refresh_item_embeddings(
+        self, db, item_codes: Optional[Iterable[str]] = None
+    ) -> dict[str, Any]:
+        """
+        Encode new/changed catalogue items into the embedding store.
+
+        ``item_codes`` limits the refresh to items a sync touched. The first
+        refresh in a process always reconciles the whole catalogue so edits
+        made while it was down are picked up.
+        """
+        if not self._embeddings_reconciled:
+            item_codes = None
+        stats = await self.embedding_store.refresh(
+            db, self.encode_batch, item_codes=item_codes
+        )
+        if item_codes is None and not stats.get("skipped"):
+            AISearchService._embeddings_reconciled = True
+        return stats
+
+    async def semantic_search(
+        self, db, query: str, top_k: int = 20
+    ) -> Optional[list[dict[str, Any]]]:
+        """
+        Search the full catalogue using precomputed item embeddings.
+
+        Returns None when the embedding store or model is unavailable so callers
+        can fall back to ``search_rerank``.
+        """
+        store = self.embedding_store
+        if not store.is_available():
+            return None
+
+        query_embedding = await self.encode_async(query)
+        if query_embedding is None:
+            return None
+
+        hits = await asyncio.to_thread(store.search, query_embedding, top_k)
+        codes = [code for code, _ in hits]
+        if not codes:
+            return []
+
+        docs = await db.erp_items.find({"item_code": {"$in": codes}}).to_list(
+            length=len(codes)
+        )
+        by_code = {doc.get("item_code"): doc for doc in docs}
+        return [by_code[code] for code in codes if code in by_code]
+
     def search_rerank(
         self, query: str, candidates: list[dict[str, Any]], top_k: int = 20
     ) -> list[dict[str, Any]]:
@@ -78,27 +349,25 @@ class AISearchService:
         try:
             from sentence_transformers import util
 
-            # 1. Encode Query
-            query_embedding = self._model.encode(query, convert_to_tensor=True)
+            from backend.services.embedding_store import item_embedding_text
 
-            # 2. Prepare Candidate Texts
+            # 1. Prepare Candidate Texts
             # Combine name + category for better context
-            candidate_texts = [
-                f"{item.get('item_name', '')} {item.get('category', '')} {item.get('subcategory', '')}"
-                for item in candidates
-            ]
-
-            # 3. Encode Candidates (in batch)
-            # Ideally we'd cache these, but for "reranking" small sets (e.g. 50-100), live encoding is OK.
-            # For larger sets, we need pre-computed embeddings.
-            candidate_embeddings = self._model.encode(
-                candidate_texts, convert_to_tensor=True
-            )
-
-            # 4. Calculate Cosine Similarity
+            candidate_texts = [item_embedding_text(item) for item in candidates]
+
+            # 2. Encode Query and Candidates (in batch)
+            # Live encoding is only for small candidate sets; full-catalogue
+            # search goes through the precomputed embedding store.
+            with self._model_lock:
+                query_embedding = self._model.encode(query, convert_to_tensor=True)
+                candidate_embeddings = self._model.encode(
+                    candidate_texts, convert_to_tensor=True
+                )
+
+            # 3. Calculate Cosine Similarity
             scores = util.cos_sim(query_embedding, candidate_embeddings)[0]
 
-            # 5. Zip and Sort
+            # 4. Zip and Sort
             scored_candidates = []
             for idx, score in enumerate(scores):
                 scored_candidates.append((score.item(), candidates[idx]))
@@ -113,6 +382,33 @@ class AISearchService:
             logger.error(f"Semantic reranking failed: {e}")
             return candidates[:top_k]
 
+    async def search_rerank_async(
+        self, query: str, candidates: list[dict[str, Any]], top_k: int = 20
+    ) -> list[dict[str, Any]]:
+        """
+        Rerank candidates with embeddings from the inference queue.
+
+        The query and candidate texts share the micro-batcher (and its queue
+        limit and metrics) with ``encode_async``. Raises
+        ``InferenceQueueFullError`` when the queue is saturated.
+        """
+        if not candidates:
+            return []
+
+        from backend.services.embedding_store import item_embedding_text
+
+        texts = [query] + [item_embedding_text(item) for item in candidates]
+        vectors = await self._submit(texts)
+        if vectors is None:
+            return candidates[:top_k]
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1)
+        norms[norms == 0] = 1.0
+        scores = (vectors[1:] @ vectors[0]) / (norms[1:] * norms[0])
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return [candidates[i] for i in order]
+
 
 # Global instance
 ai_search_service = AISearchService.get_instance()
@@ -1,8 +1,23 @@
+from __future__ import annotations
+
 import logging
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import datetime
 from typing import Any, Optional
 
+from backend.utils.lazy_import import lazy_module
+
+# numpy loads on the first risk prediction, not at application import
+np = lazy_module("numpy")
+
 logger = logging.getLogger(__name__)
 
+# session_id -> time its count lines last changed; lets every process drop
+# cached session risks, not only the one that handled the write
+INVALIDATIONS_COLLECTION = "ai_variance_invalidations"
+
 
 def _build_item_risk_pipeline(item_codes: list[str]) -> list[dict[str, Any]]:
     """Build MongoDB aggregation pipeline for item risk calculation."""
@@ -46,41 +61,49 @@ def _calculate_hybrid_risk(
     return (heuristic * 0.4) + (historical * 0.6)
 
 
-def _build_risk_item(
-    item: dict[str, Any],
-    item_risk: float,
-    cat_risk: float,
-    category_heuristics: dict[str, float],
-) -> Optional[dict[str, Any]]:
-    """Build a high-risk item dict if risk exceeds threshold."""
-    category = item.get("category", "General")
+_RISK_PROJECTION = {
+    "_id": 0,
+    "item_code": 1,
+    "item_name": 1,
+    "category": 1,
+    "variance_reason": 1,
+}
+
+
+def _lookup_array(keys: np.ndarray, mapping: dict[str, float], default: float) -> np.ndarray:
+    """Map an object array of keys to floats, resolving each distinct key once."""
+    uniques, inverse = np.unique(keys, return_inverse=True)
+    values = np.array([mapping.get(k, default) for k in uniques], dtype=np.float64)
+    return values[inverse]
+
+
+def _score_risk_arrays(
+    item_risk: np.ndarray,
+    cat_risk: np.ndarray,
+    cat_known: np.ndarray,
+    has_variance: np.ndarray,
+    threshold: float = 0.4,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorised hybrid item/category risk.
 
-    # Skip items with existing variance
-    if item.get("variance_reason"):
-        return None
+    Returns the total risk per row and a mask of rows that exceed ``threshold``.
+    Rows with an existing variance are never flagged.
+    """
+    category_only = (item_risk == 0.0) & cat_known
+    total = np.where(category_only, cat_risk, (item_risk * 0.7) + (cat_risk * 0.3))
+    flagged = (total > threshold) & ~has_variance
+    return total, flagged
 
-    # Calculate total risk
-    if item_risk == 0.0 and category in category_heuristics:
-        total_risk = cat_risk
-    else:
-        total_risk = (item_risk * 0.7) + (cat_risk * 0.3)
 
-    if total_risk <= 0.4:
-        return None
+class _RiskCacheEntry:
+    """Scored rows for one session/warehouse, kept until TTL or invalidation."""
 
-    reason = (
-        "Historical variance pattern"
-        if item_risk > cat_risk
-        else f"High-risk category: {category}"
-    )
+    __slots__ = ("created_at", "computed_at", "results")
 
-    return {
-        "item_code": item.get("item_code"),
-        "item_name": item.get("item_name", "Unknown Item"),
-        "category": category,
-        "risk_score": round(total_risk, 2),
-        "reason": reason,
-    }
+    def __init__(self, results: list[dict[str, Any]], computed_at: Optional[datetime] = None):
+        self.created_at = time.monotonic()
+        self.computed_at = computed_at or datetime.utcnow()
+        self.results = results
 
 
 class AIVarianceService:
@@ -111,8 +134,75 @@ class AIVarianceService:
 
         # Default risk for unknown categories
         self.default_risk = 0.2
+
+        # Scored results per session/warehouse (LRU, bounded)
+        self.cache_ttl_seconds = 300
+        self.max_cache_entries = 256
+        self._risk_cache: OrderedDict[str, _RiskCacheEntry] = OrderedDict()
         self.initialized = True
 
+    def _get_cached(self, key: str) -> Optional[list[dict[str, Any]]]:
+        entry = self._risk_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.created_at > self.cache_ttl_seconds:
+            self._risk_cache.pop(key, None)
+            return None
+        self._risk_cache.move_to_end(key)
+        return entry.results
+
+    def _put_cached(
+        self, key: str, results: list[dict[str, Any]], computed_at: Optional[datetime] = None
+    ) -> None:
+        self._risk_cache[key] = _RiskCacheEntry(results, computed_at)
+        self._risk_cache.move_to_end(key)
+        while len(self._risk_cache) > self.max_cache_entries:
+            self._risk_cache.popitem(last=False)
+
+    def invalidate_session(self, session_id: Optional[str]) -> None:
+        """Drop cached risks for a session in this process only."""
+        if session_id is not None:
+            self._risk_cache.pop(f"session:{session_id}", None)
+
+    async def invalidate_sessions(self, db, session_ids: Iterable[Optional[str]]) -> None:
+        """
+        Drop cached risks for sessions whose count lines changed
+
+        Call after every count_lines insert, update or delete. Other processes
+        see the change stamp on their next cache hit. Never raises: a failed
+        stamp only leaves other processes on the cache TTL.
+        """
+        changed_at = datetime.utcnow()
+        for session_id in {sid for sid in session_ids if sid is not None}:
+            self.invalidate_session(session_id)
+            try:
+                await db[INVALIDATIONS_COLLECTION].update_one(
+                    {"_id": session_id}, {"$set": {"changed_at": changed_at}}, upsert=True
+                )
+            except Exception as e:
+                logger.warning(f"Could not stamp AI variance invalidation for {session_id}: {e}")
+
+    async def invalidate_count_line(self, db, line_filter: dict[str, Any]) -> None:
+        """``invalidate_sessions`` for the session of the count line matching ``line_filter``."""
+        try:
+            line = await db.count_lines.find_one(line_filter, {"session_id": 1})
+        except Exception as e:
+            logger.warning(f"Could not resolve count line session for invalidation: {e}")
+            return
+        if line:
+            await self.invalidate_sessions(db, [line.get("session_id")])
+
+    async def _changed_since(self, db, session_id: str, since: datetime) -> bool:
+        try:
+            stamp = await db[INVALIDATIONS_COLLECTION].find_one({"_id": session_id})
+        except Exception as e:
+            logger.debug(f"AI variance invalidation lookup failed for {session_id}: {e}")
+            return False
+        return bool(stamp) and stamp.get("changed_at") is not None and stamp["changed_at"] >= since
+
+    def clear_cache(self) -> None:
+        self._risk_cache.clear()
+
     async def get_historical_risk(self, db, item_code: str) -> float:
         """
         Calculate risk based on historical variance frequency for a specific item.
@@ -198,62 +288,117 @@ class AIVarianceService:
     ) -> list[dict[str, Any]]:
         """
         Analyze all items in a session and predict which are most likely to have variances.
+
+        Results are cached per session until the session is invalidated (in
+        any process, see ``invalidate_sessions``) or the cache TTL expires.
         """
+        cache_key = f"session:{session_id}"
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            entry = self._risk_cache[cache_key]
+            if not await self._changed_since(db, session_id, entry.computed_at):
+                return cached[:limit]
+            self.invalidate_session(session_id)
+
         try:
-            # 1. Get all counted items in this session
+            computed_at = datetime.utcnow()
+            # 1. Get all counted items in this session (only the scoring fields)
             counted_items = await db.count_lines.find(
-                {"session_id": session_id}
-            ).to_list(length=1000)
+                {"session_id": session_id}, _RISK_PROJECTION
+            ).to_list(length=None)
 
             if not counted_items:
                 return []
 
-            # 2. Extract unique item codes and categories for bulk lookup
-            item_codes = list(
-                {
-                    item.get("item_code")
-                    for item in counted_items
-                    if item.get("item_code")
-                }
-            )
-            categories = list(
-                {item.get("category") for item in counted_items if item.get("category")}
-            )
+            high_risk_items = await self._score_rows(db, counted_items)
+            self._put_cached(cache_key, high_risk_items, computed_at)
+            return high_risk_items[:limit]
 
-            # 3. Bulk calculate historical item risks
-            item_risk_map = await self._calculate_item_risks(db, item_codes)
+        except Exception as e:
+            logger.error(f"Error predicting session risks for {session_id}: {e}")
+            return []
 
-            # 4. Bulk calculate category risks
-            cat_risk_map = await self._calculate_category_risks(db, categories)
+    async def predict_warehouse_risks(
+        self, db, warehouse: str, limit: int = 100, batch_size: int = 5000
+    ) -> list[dict[str, Any]]:
+        """
+        Score every ERP item in a warehouse so supervisors can pre-plan recounts.
 
-            # 5. Process items with pre-calculated risks
-            high_risk_items = self._process_items_for_risks(
-                counted_items, item_risk_map, cat_risk_map
-            )
+        Items are streamed from ``erp_items`` in batches and scored with the
+        same vectorised model as sessions; only flagged items are retained.
+        """
+        cache_key = f"warehouse:{warehouse}"
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached[:limit]
+
+        try:
+            cursor = db.erp_items.find({"warehouse": warehouse}, _RISK_PROJECTION)
+            cat_risk_map: dict[str, float] = {}
+            high_risk_items: list[dict[str, Any]] = []
+            batch: list[dict[str, Any]] = []
+
+            async for item in cursor.batch_size(batch_size):
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    high_risk_items.extend(
+                        await self._score_rows(db, batch, cat_risk_map, sort=False)
+                    )
+                    batch = []
+            if batch:
+                high_risk_items.extend(
+                    await self._score_rows(db, batch, cat_risk_map, sort=False)
+                )
 
             high_risk_items.sort(key=lambda x: x["risk_score"], reverse=True)
+            self._put_cached(cache_key, high_risk_items)
             return high_risk_items[:limit]
 
         except Exception as e:
-            logger.error(f"Error predicting session risks for {session_id}: {e}")
+            logger.error(f"Error predicting warehouse risks for {warehouse}: {e}")
             return []
 
+    async def _score_rows(
+        self,
+        db,
+        rows: list[dict[str, Any]],
+        cat_risk_map: Optional[dict[str, float]] = None,
+        sort: bool = True,
+    ) -> list[dict[str, Any]]:
+        """Fetch historical risks for ``rows`` and return the flagged ones."""
+        item_codes = list(
+            {row.get("item_code") for row in rows if isinstance(row.get("item_code"), str)}
+        )
+        categories = list({row.get("category") for row in rows if row.get("category")})
+
+        item_risk_map = await self._calculate_item_risks(db, item_codes)
+
+        if cat_risk_map is None:
+            cat_risk_map = {}
+        missing = [c for c in categories if c not in cat_risk_map]
+        if missing:
+            cat_risk_map.update(await self._calculate_category_risks(db, missing))
+
+        high_risk_items = self._process_items_for_risks(rows, item_risk_map, cat_risk_map)
+        if sort:
+            high_risk_items.sort(key=lambda x: x["risk_score"], reverse=True)
+        return high_risk_items
+
     async def _calculate_item_risks(
-        self, db, item_codes: list[str]
+        self, db, item_codes: list[str], chunk_size: int = 5000
     ) -> dict[str, float]:
         """Calculate item risk scores from historical variances."""
-        if not item_codes:
-            return {}
-
-        pipeline = _build_item_risk_pipeline(item_codes)
-        results = await db.variances.aggregate(pipeline).to_list(length=len(item_codes))
-
-        risk_map = {}
-        for res in results:
-            if res["total_counts"] > 0:
-                risk_map[res["_id"]] = (
-                    float(res["variance_count"]) / res["total_counts"]
-                )
+        risk_map: dict[str, float] = {}
+        for start in range(0, len(item_codes), chunk_size):
+            chunk = item_codes[start : start + chunk_size]
+            pipeline = _build_item_risk_pipeline(chunk)
+            results = await db.variances.aggregate(pipeline).to_list(length=len(chunk))
+
+            for res in results:
+                if res["total_counts"] > 0:
+                    risk_map[res["_id"]] = (
+                        float(res["variance_count"]) / res["total_counts"]
+                    )
         return risk_map
 
     async def _calculate_category_risks(
@@ -285,25 +430,48 @@ class AIVarianceService:
         item_risk_map: dict[str, float],
         cat_risk_map: dict[str, float],
     ) -> list[dict[str, Any]]:
-        """Process counted items and build high-risk items list."""
+        """Score counted items as NumPy arrays and build the high-risk items list."""
+        rows = [item for item in counted_items if isinstance(item.get("item_code"), str)]
+        if not rows:
+            return []
+
+        codes = np.array([row["item_code"] for row in rows], dtype=object)
+        categories = np.array(
+            [str(row.get("category", "General")) for row in rows], dtype=object
+        )
+
+        item_risk = _lookup_array(codes, item_risk_map, 0.0)
+        cat_risk = _lookup_array(
+            categories, {**self.category_heuristics, **cat_risk_map}, self.default_risk
+        )
+        cat_known = _lookup_array(
+            categories, {c: 1.0 for c in self.category_heuristics}, 0.0
+        ).astype(bool)
+        has_variance = np.fromiter(
+            (bool(row.get("variance_reason")) for row in rows),
+            dtype=bool,
+            count=len(rows),
+        )
+
+        total, flagged = _score_risk_arrays(item_risk, cat_risk, cat_known, has_variance)
+
         high_risk_items = []
-        for item in counted_items:
-            item_code_val = item.get("item_code")
-            if not isinstance(item_code_val, str):
-                continue
-            item_code = item_code_val
-            category = str(item.get("category", "General"))
-
-            item_risk = item_risk_map.get(item_code, 0.0)
-            cat_risk = cat_risk_map.get(
-                category, self.category_heuristics.get(category, self.default_risk)
+        for idx in np.flatnonzero(flagged):
+            category = categories[idx]
+            reason = (
+                "Historical variance pattern"
+                if item_risk[idx] > cat_risk[idx]
+                else f"High-risk category: {category}"
             )
-
-            risk_item = _build_risk_item(
-                item, item_risk, cat_risk, self.category_heuristics
+            high_risk_items.append(
+                {
+                    "item_code": codes[idx],
+                    "item_name": rows[idx].get("item_name", "Unknown Item"),
+                    "category": category,
+                    "risk_score": round(float(total[idx]), 2),
+                    "reason": reason,
+                }
             )
-            if risk_item:
-                high_risk_items.append(risk_item)
 
         return high_risk_items
 
@@ -10,6 +10,7 @@ from typing import Any, Optional
 
 from backend.core.schemas.audit_log import AuditAction
 from backend.db.runtime import get_db
+from backend.services.log_sink import write_log
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +32,7 @@ class AuditService:
         details: Optional[dict[str, Any]] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
+        durable: bool = False,
     ) -> Optional[str]:
         """
         Create an audit log entry.
@@ -44,6 +46,7 @@ class AuditService:
             details: Additional action details
             ip_address: IP address of the request
             user_agent: User agent string
+            durable: Write synchronously instead of through the log sink
 
         Returns:
             ID of the created audit log entry, or None on failure
@@ -63,14 +66,14 @@ class AuditService:
                 "timestamp": datetime.utcnow(),
             }
 
-            result = await db[cls.COLLECTION_NAME].insert_one(log_entry)
+            entry_id = await write_log(db[cls.COLLECTION_NAME], log_entry, durable=durable)
 
             logger.info(
                 f"Audit log created: {action.value} by {username} "
                 f"(resource: {resource_type}/{resource_id})"
             )
 
-            return str(result.inserted_id)
+            return entry_id
 
         except Exception as e:
             logger.error(f"Failed to create audit log: {e}")
@@ -119,6 +122,8 @@ class AuditService:
             details=details,
             ip_address=ip_address,
             user_agent=user_agent,
+            # Audit trail entries must not wait in the log sink queue
+            durable=True,
         )
 
     @classmethod
@@ -163,6 +168,7 @@ class AuditService:
             details=details,
             ip_address=ip_address,
             user_agent=user_agent,
+            durable=True,
         )
 
     @classmethod
@@ -207,6 +213,7 @@ class AuditService:
             details=details,
             ip_address=ip_address,
             user_agent=user_agent,
+            durable=True,
         )
 
     @classmethod
@@ -241,6 +248,7 @@ class AuditService:
             details={"changed_fields": changed_fields},
             ip_address=ip_address,
             user_agent=user_agent,
+            durable=True,
         )
 
     @classmethod
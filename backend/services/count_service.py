@@ -0,0 +1,244 @@
+"""
+Count Service
+Memoised document counts for list endpoints and report summaries.
+
+Filtered counts are cached per (collection, normalised filter hash) for a
+short TTL and dropped as soon as this process writes to the collection (via
+a pymongo CommandListener). Unfiltered totals use the collection metadata
+(``estimated_document_count``) instead of scanning. Every result says
+whether it is exact, served from cache or estimated.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from bson import json_util
+from bson.json_util import JSONMode, JSONOptions
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+EXACT = "exact"
+CACHED = "cached"
+ESTIMATED = "estimated"
+
+# Commands that change a collection's document count
+_WRITE_COMMANDS = frozenset({"insert", "update", "delete", "findAndModify", "drop"})
+
+_FILTER_JSON_OPTIONS = JSONOptions(json_mode=JSONMode.CANONICAL, tz_aware=False)
+
+
+def normalize_filter(query: Optional[dict]) -> str:
+    """Hash a filter so logically identical dicts (any key order) share a key."""
+    canonical = json_util.dumps(
+        query or {}, sort_keys=True, json_options=_FILTER_JSON_OPTIONS
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass
+class CountResult:
+    """A document count and how it was obtained."""
+
+    value: int
+    accuracy: str = EXACT
+    age_seconds: float = 0.0
+
+    @property
+    def is_estimate(self) -> bool:
+        return self.accuracy == ESTIMATED
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "total": self.value,
+            "total_accuracy": self.accuracy,
+            "total_is_estimate": self.is_estimate,
+        }
+
+
+@dataclass
+class _CacheEntry:
+    value: int
+    accuracy: str
+    stored_at: float
+
+
+def _collection_key(collection) -> Optional[tuple[str, str]]:
+    """(database, collection) for real Motor/pymongo collections, else None."""
+    name = getattr(collection, "name", None)
+    database = getattr(collection, "database", None)
+    db_name = getattr(database, "name", None)
+    if isinstance(name, str) and isinstance(db_name, str):
+        return db_name, name
+    return None
+
+
+class CountService:
+    """TTL-memoised counts with write invalidation and request coalescing."""
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 2048):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str, str, bool], _CacheEntry] = (
+            OrderedDict()
+        )
+        # Bumped on every write; counts started before a write are not cached
+        self._generations: dict[tuple[str, str], int] = {}
+        self._inflight: dict[tuple[str, str, str, bool], asyncio.Future] = {}
+        # Invalidation arrives on pymongo/motor worker threads
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "estimated": 0, "invalidations": 0}
+
+    async def count(
+        self,
+        collection,
+        query: Optional[dict] = None,
+        *,
+        exact: bool = False,
+        ttl_seconds: Optional[float] = None,
+    ) -> CountResult:
+        """
+        Count documents in ``collection`` matching ``query``.
+
+        Args:
+            collection: Motor collection
+            query: Filter; empty/None means the whole collection
+            exact: Use ``count_documents({})`` for unfiltered totals instead
+                of the metadata estimate
+            ttl_seconds: Override the cache TTL for this call (0 disables)
+        """
+        coll_key = _collection_key(collection)
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if coll_key is None or ttl <= 0:
+            # Unknown collection type (tests, wrappers) - nothing to key on
+            return await self._compute(collection, query, exact)
+
+        key = (*coll_key, normalize_filter(query), exact)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.stored_at < ttl:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                accuracy = ESTIMATED if entry.accuracy == ESTIMATED else CACHED
+                return CountResult(entry.value, accuracy, round(now - entry.stored_at, 3))
+            generation = self._generations.setdefault(coll_key, 0)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            value, accuracy = await asyncio.shield(inflight)
+            return CountResult(value, accuracy)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._compute(collection, query, exact)
+            future.set_result((result.value, result.accuracy))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure does not warn
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        with self._lock:
+            self.stats["misses"] += 1
+            if self._generations.get(coll_key, 0) == generation:
+                self._entries[key] = _CacheEntry(
+                    result.value, result.accuracy, time.monotonic()
+                )
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return result
+
+    async def _compute(self, collection, query: Optional[dict], exact: bool) -> CountResult:
+        if not query and not exact:
+            self.stats["estimated"] += 1
+            return CountResult(await collection.estimated_document_count(), ESTIMATED)
+        return CountResult(await collection.count_documents(query or {}), EXACT)
+
+    def invalidate(self, collection: str, database: Optional[str] = None) -> None:
+        """Drop cached counts for a collection (in every database if not given)."""
+        with self._lock:
+            self.stats["invalidations"] += 1
+            targets = [
+                key
+                for key in self._generations
+                if key[1] == collection and (database is None or key[0] == database)
+            ]
+            if database is not None and (database, collection) not in targets:
+                targets.append((database, collection))
+            for key in targets:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            for key in [k for k in self._entries if (k[0], k[1]) in targets]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries), "ttl_seconds": self.ttl_seconds}
+
+
+class CountInvalidationListener(monitoring.CommandListener):
+    """Invalidates cached counts when this process writes to a collection."""
+
+    def __init__(self, service: CountService):
+        self.service = service
+        self._pending: dict[tuple[Any, int], tuple[str, str]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name not in _WRITE_COMMANDS:
+            return
+        collection = event.command.get(event.command_name)
+        if isinstance(collection, str):
+            self._pending[(event.connection_id, event.request_id)] = (
+                event.database_name,
+                collection,
+            )
+
+    def _finish(self, event) -> None:
+        target = self._pending.pop((event.connection_id, event.request_id), None)
+        if target is not None:
+            self.service.invalidate(target[1], database=target[0])
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        # A failed write may still have applied partially
+        self._finish(event)
+
+
+def _build_count_service() -> CountService:
+    try:
+        from backend.config import settings
+
+        return CountService(
+            ttl_seconds=getattr(settings, "COUNT_CACHE_TTL_SECONDS", 30.0),
+            max_entries=getattr(settings, "COUNT_CACHE_MAX_ENTRIES", 2048),
+        )
+    except Exception:
+        return CountService()
+
+
+count_service = _build_count_service()
+
+
+def count_invalidation_listener() -> CountInvalidationListener:
+    """Listener for ``AsyncIOMotorClient(event_listeners=[...])``."""
+    return CountInvalidationListener(count_service)
@@ -3,6 +3,7 @@ Data Governance Service
 Data retention, GDPR compliance, and data lifecycle management
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from enum import Enum
@@ -11,8 +12,14 @@ from typing import Any, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel, Field
 
+from backend.services.enterprise_audit import EnterpriseAuditService
+from backend.services.retention_engine import RetentionEngine, build_retention_engine
+
 logger = logging.getLogger(__name__)
 
+# Sealed in Merkle blocks; retention goes through EnterpriseAuditService
+AUDIT_COLLECTION = "enterprise_audit_logs"
+
 
 class DataCategory(str, Enum):
     """Data categories for governance"""
@@ -63,7 +70,7 @@ class DataGovernanceService:
     DEFAULT_POLICIES = [
         RetentionPolicy(
             category=DataCategory.AUDIT,
-            collection_name="enterprise_audit_logs",
+            collection_name=AUDIT_COLLECTION,
             retention_days=365,
             archive_before_delete=True,
             description="Audit logs retained for 1 year for compliance",
@@ -95,7 +102,9 @@ class DataGovernanceService:
         self.db = mongo_db
         self.policies_collection = mongo_db.data_retention_policies
         self.requests_collection = mongo_db.data_subject_requests
+        # Legacy Mongo archive; new archives are segment files on disk
         self.archive_collection = mongo_db.data_archive
+        self._retention_lock = asyncio.Lock()
 
     async def initialize(self):
         """Initialize governance service"""
@@ -145,69 +154,81 @@ class DataGovernanceService:
             return False
 
     async def apply_retention_policies(self) -> dict[str, Any]:
-        """Apply all retention policies (delete expired data)"""
-        results: dict[str, Any] = {}
+        """Apply all retention policies (delete expired data)
 
-        async for policy_doc in self.policies_collection.find():
-            policy = RetentionPolicy(
-                **{k: v for k, v in policy_doc.items() if k != "_id"}
-            )
-
-            cutoff_date = datetime.utcnow() - timedelta(days=policy.retention_days)
-            collection = self.db[policy.collection_name]
+        Expired documents are archived to compressed segment files and deleted
+        in throttled chunks; see ``RetentionEngine``. An interrupted run for a
+        collection resumes from its checkpoint on the next call.
+        """
+        results: dict[str, Any] = {}
+        if self._retention_lock.locked():
+            raise RuntimeError("Retention is already running")
+
+        async with self._retention_lock:
+            engine = build_retention_engine(self.db)
+            async for policy_doc in self.policies_collection.find():
+                policy = RetentionPolicy(
+                    **{k: v for k, v in policy_doc.items() if k != "_id"}
+                )
+                cutoff_date = datetime.utcnow() - timedelta(days=policy.retention_days)
 
-            try:
-                # Find documents to delete
-                query = {"timestamp": {"$lt": cutoff_date}}
-                count = await collection.count_documents(query)
-
-                if count == 0:
-                    results[policy.collection_name] = {"deleted": 0, "archived": 0}
-                    continue
-
-                archived = 0
-                if policy.archive_before_delete:
-                    # Archive before deletion
-                    cursor = collection.find(query)
-                    archive_docs = []
-                    async for doc in cursor:
-                        archive_docs.append(
-                            {
-                                "source_collection": policy.collection_name,
-                                "archived_at": datetime.utcnow(),
-                                "original_id": str(doc.pop("_id")),
-                                "data": doc,
-                            }
+                try:
+                    if policy.collection_name == AUDIT_COLLECTION:
+                        result = await self._apply_audit_retention(
+                            engine, cutoff_date, policy.archive_before_delete
                         )
-                        if len(archive_docs) >= 1000:
-                            await self.archive_collection.insert_many(archive_docs)
-                            archived += len(archive_docs)
-                            archive_docs = []
+                    else:
+                        result = await engine.run(
+                            policy.collection_name, cutoff_date, policy.archive_before_delete
+                        )
+                    results[policy.collection_name] = result
 
-                    if archive_docs:
-                        await self.archive_collection.insert_many(archive_docs)
-                        archived += len(archive_docs)
+                    logger.info(
+                        f"Retention policy applied to {policy.collection_name}: "
+                        f"deleted={result['deleted']}, archived={result['archived']}, "
+                        f"chunks={result['chunks']}"
+                    )
 
-                # Delete expired documents
-                result = await collection.delete_many(query)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to apply retention for {policy.collection_name}: {e}"
+                    )
+                    results[policy.collection_name] = {"error": str(e)}
 
-                results[policy.collection_name] = {
-                    "deleted": result.deleted_count,
-                    "archived": archived,
-                }
+        return results
 
-                logger.info(
-                    f"Retention policy applied to {policy.collection_name}: "
-                    f"deleted={result.deleted_count}, archived={archived}"
-                )
+    async def _apply_audit_retention(
+        self, engine: RetentionEngine, cutoff: datetime, archive: bool
+    ) -> dict[str, Any]:
+        """Retention for the sealed audit trail, which must go a whole block at a time
 
-            except Exception as e:
-                logger.error(
-                    f"Failed to apply retention for {policy.collection_name}: {e}"
-                )
-                results[policy.collection_name] = {"error": str(e)}
+        Deleting audit entries by timestamp would leave their Merkle blocks
+        behind and make every later integrity check report tampering.
+        """
+        result = await EnterpriseAuditService(self.db).apply_retention_policy(
+            cutoff=cutoff,
+            archive_writer=engine.writer if archive else None,
+            chunk_size=engine.chunk_size,
+        )
+        return {
+            "deleted": result["deleted_count"],
+            "archived": result["archived"],
+            "chunks": result["segments"],
+            "deleted_blocks": result["deleted_blocks"],
+            "run_id": result["run_id"],
+            "archive_dir": str(engine.writer.root / AUDIT_COLLECTION) if archive else None,
+        }
 
-        return results
+    async def get_retention_status(self) -> list[dict[str, Any]]:
+        """Checkpoint of the last (or current) retention run per collection"""
+        status = []
+        async for doc in self.db["retention_checkpoints"].find():
+            doc["collection_name"] = doc.pop("_id")
+            pending = doc.pop("pending", None)
+            doc["pending_chunk"] = pending["seq"] if pending else None
+            doc["last_id"] = str(doc["last_id"]) if doc.get("last_id") is not None else None
+            status.append(doc)
+        return status
 
     # =========================================================================
     # GDPR DATA SUBJECT REQUESTS
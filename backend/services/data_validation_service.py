@@ -9,6 +9,12 @@ from typing import Any
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from backend.services.validation_engine import (
+    DEFAULT_JOBS,
+    StreamingValidator,
+    start_validation_worker,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +32,7 @@ class DataValidationService:
             "failed_validations": 0,
             "last_validation": None,
         }
+        self._worker = None
 
     def _define_validation_rules(self) -> dict[str, dict]:
         """Define validation rules for different data types"""
@@ -174,6 +181,25 @@ class DataValidationService:
                     )
         return errors
 
+    def validate_document(self, data: dict[str, Any], data_type: str) -> list[str]:
+        """
+        Check one document against the rules for ``data_type`` without touching
+        stats. Values of the wrong type are converted in place, as in validate_data.
+        """
+        rules = self.validation_rules[data_type]
+        errors: list[str] = []
+
+        # Check required fields
+        errors.extend(self._check_required_fields(data, rules))
+
+        # Check field types
+        errors.extend(self._check_field_types(data, rules))
+
+        # Check field constraints
+        errors.extend(self._check_field_constraints(data, rules))
+
+        return errors
+
     async def validate_data(
         self, data: dict[str, Any], data_type: str
     ) -> tuple[bool, list[str]]:
@@ -191,16 +217,7 @@ class DataValidationService:
                 self.validation_stats["failed_validations"] += 1
             return False, errors
 
-        rules = self.validation_rules[data_type]
-
-        # Check required fields
-        errors.extend(self._check_required_fields(data, rules))
-
-        # Check field types
-        errors.extend(self._check_field_types(data, rules))
-
-        # Check field constraints
-        errors.extend(self._check_field_constraints(data, rules))
+        errors.extend(self.validate_document(data, data_type))
 
         # Update stats
         is_valid = len(errors) == 0
@@ -272,7 +289,7 @@ class DataValidationService:
     async def _validate_collection(
         self, collection_name: str, data_type: str
     ) -> dict[str, Any]:
-        """Validate a specific collection"""
+        """Validate every document of a collection (streamed, checkpointed)"""
         report: dict[str, Any] = {
             "collection": collection_name,
             "documents_checked": 0,
@@ -281,31 +298,49 @@ class DataValidationService:
         }
 
         try:
-            # Sample validation (check first 1000 documents)
-            async for document in self.mongo_db[collection_name].find().limit(1000):
-                report["documents_checked"] += 1
-
-                # Remove MongoDB internal fields for validation
-                clean_doc = {k: v for k, v in document.items() if not k.startswith("_")}
-
-                is_valid, errors = await self.validate_data(clean_doc, data_type)
-
-                if not is_valid:
-                    report["validation_errors"].extend(
-                        [
-                            f"{collection_name} document {document.get('_id')}: {error}"
-                            for error in errors
-                        ]
-                    )
-                    report["invalid_documents"].append(
-                        {"_id": str(document["_id"]), "errors": errors}
-                    )
+            result = await StreamingValidator(self.mongo_db, self).run(
+                collection_name, data_type
+            )
+            report.update(result)
+            # Full violation list is in validation_violations; report samples
+            report["validation_errors"] = [
+                f"{collection_name} document {doc['_id']}: {error}"
+                for doc in result["invalid_documents"]
+                for error in doc["errors"]
+            ]
+            self._record_batch_stats(result["documents_checked"], result["invalid_count"])
 
         except Exception as e:
             report["error"] = str(e)
 
         return report
 
+    def _record_batch_stats(self, checked: int, invalid: int) -> None:
+        checked = max(checked, invalid)
+        self.validation_stats["total_validations"] += checked
+        self.validation_stats["passed_validations"] += checked - invalid
+        self.validation_stats["failed_validations"] += invalid
+        self.validation_stats["last_validation"] = datetime.utcnow()
+
+    def start_full_validation(self, batch_size: int = 5000) -> dict[str, Any]:
+        """Audit erp_items, sessions and count_lines in a worker process"""
+        if self.is_full_validation_running():
+            raise RuntimeError("Data validation is already running")
+        self._worker = start_validation_worker(batch_size=batch_size)
+        return {"pid": self._worker.pid, "collections": [c for c, _ in DEFAULT_JOBS]}
+
+    def is_full_validation_running(self) -> bool:
+        return self._worker is not None and self._worker.is_alive()
+
+    async def get_validation_progress(self) -> list[dict[str, Any]]:
+        """Checkpoint of the last (or running) audit per collection"""
+        progress = []
+        async for doc in self.mongo_db["validation_checkpoints"].find():
+            doc["collection"] = doc.pop("_id")
+            doc["last_id"] = str(doc["last_id"]) if doc.get("last_id") is not None else None
+            progress.append(doc)
+        return progress
+
     async def _check_orphaned_data(self) -> dict[str, Any]:
         """Check for orphaned references and inconsistent data"""
         cleanup_report: dict[str, Any] = {"cleanup_actions": []}
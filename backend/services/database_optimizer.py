@@ -202,9 +202,13 @@ class DatabaseOptimizer:
 
     def get_query_stats(self) -> dict[str, Any]:
         """Get query performance statistics"""
+        from backend.services.query_monitor import query_monitor
+
         return {
             "queries": self._query_stats,
             "slow_query_threshold": self._slow_query_threshold,
+            # Driver-level stats for every command, not just decorated calls
+            "shapes": query_monitor.get_stats(limit=20),
         }
 
     def reset_stats(self):
@@ -8,9 +8,13 @@ from datetime import datetime
 from typing import Any, Optional
 
 from bson import ObjectId
+from pymongo import UpdateOne
 
 logger = logging.getLogger(__name__)
 
+# Items written per bulk_write when rebuilding erp_items.dynamic_fields
+BACKFILL_BATCH_SIZE = 1000
+
 
 class DynamicFieldsService:
     """
@@ -80,6 +84,10 @@ class DynamicFieldsService:
                     f"Invalid field type. Must be one of: {', '.join(valid_types)}"
                 )
 
+            # Values are stored under erp_items.dynamic_fields.<field_name>
+            if "." in field_name or field_name.startswith("$"):
+                raise ValueError("Field name cannot contain '.' or start with '$'")
+
             # Check if field name already exists
             existing = await self.field_definitions.find_one({"field_name": field_name})
             if existing:
@@ -163,14 +171,19 @@ class DynamicFieldsService:
             raise
 
     async def delete_field_definition(self, field_id: str) -> bool:
-        """Delete a field definition (soft delete)"""
+        """Delete a field definition (soft delete) and drop its values from items"""
         try:
-            result = await self.field_definitions.update_one(
-                {"_id": ObjectId(field_id)},
+            field_def = await self.field_definitions.find_one_and_update(
+                {"_id": ObjectId(field_id), "enabled": True},
                 {"$set": {"enabled": False, "deleted_at": datetime.utcnow()}},
             )
+            if not field_def:
+                return False
 
-            return result.modified_count > 0
+            # The denormalised copy would otherwise keep serving the deleted field
+            path = f"dynamic_fields.{field_def['field_name']}"
+            await self.db.erp_items.update_many({path: {"$exists": True}}, {"$unset": {path: ""}})
+            return True
 
         except Exception as e:
             logger.error(f"Error deleting field definition: {str(e)}")
@@ -227,6 +240,7 @@ class DynamicFieldsService:
                     },
                     return_document=True,
                 )
+                await self._set_item_field(item_code, field_name, validated_value)
                 return result
             else:
                 # Create new value
@@ -250,12 +264,20 @@ class DynamicFieldsService:
                         item_code, field_def["db_mapping"], validated_value
                     )
 
+                await self._set_item_field(item_code, field_name, validated_value)
                 return field_value
 
         except Exception as e:
             logger.error(f"Error setting field value: {str(e)}")
             raise
 
+    async def _set_item_field(self, item_code: str, field_name: str, value: Any):
+        """Mirror a field value onto erp_items.dynamic_fields for join-free reads"""
+        await self.db.erp_items.update_one(
+            {"item_code": item_code},
+            {"$set": {f"dynamic_fields.{field_name}": value}},
+        )
+
     async def get_item_field_values(self, item_code: str) -> dict[str, Any]:
         """Get all dynamic field values for an item"""
         try:
@@ -283,73 +305,98 @@ class DynamicFieldsService:
         field_filters: dict[str, Optional[Any]] = None,
         limit: int = 100,
         skip: int = 0,
+        after: Optional[str] = None,
     ) -> list[dict[str, Any]]:
         """
         Get items with their dynamic field values
 
+        Reads the ``dynamic_fields`` sub-document kept on ``erp_items`` by
+        ``set_field_value``, so this is one indexed query: field filters use
+        the ``dynamic_fields.$**`` wildcard index, the unfiltered listing the
+        partial ``item_code`` index. Pass the last ``item_code`` of a page as
+        ``after`` to fetch the next page without skipping.
+
         Args:
             field_filters: Filter by field values (e.g., {"warranty_period": "2 years"})
             limit: Maximum number of results
-            skip: Number of results to skip
+            skip: Number of results to skip (ignored when ``after`` is given)
+            after: Return items with item_code greater than this
 
         Returns:
-            List of items with field values
+            List of items with field values, ordered by item_code
         """
         try:
-            # Build aggregation pipeline
-            pipeline = []
+            query: dict[str, Any] = {"dynamic_fields": {"$exists": True}}
 
-            # Match field filters if provided
+            # Items matching any of the filters
             if field_filters:
-                match_conditions = []
-                for field_name, value in field_filters.items():
-                    match_conditions.append({"field_name": field_name, "value": value})
-
-                if match_conditions:
-                    pipeline.append({"$match": {"$or": match_conditions}})
-
-            # Group by item_code
-            pipeline.extend(
-                [
-                    {
-                        "$group": {
-                            "_id": "$item_code",
-                            "fields": {
-                                "$push": {
-                                    "field_name": "$field_name",
-                                    "value": "$value",
-                                    "field_type": "$field_type",
-                                }
-                            },
-                        }
-                    },
-                    {"$skip": skip},
-                    {"$limit": limit},
+                query["$or"] = [
+                    {f"dynamic_fields.{field_name}": value}
+                    for field_name, value in field_filters.items()
                 ]
-            )
 
-            cursor = self.field_values.aggregate(pipeline)
-            results = await cursor.to_list(length=None)
+            if after is not None:
+                query["item_code"] = {"$gt": after}
 
-            # Get item details from main items collection
-            items = []
-            for result in results:
-                item_code = result["_id"]
-                item = await self.db.items.find_one({"item_code": item_code})
-
-                if item:
-                    item["dynamic_fields"] = {
-                        field["field_name"]: field["value"]
-                        for field in result["fields"]
-                    }
-                    items.append(item)
+            cursor = self.db.erp_items.find(query, {"enrichment_history": 0}).sort(
+                "item_code", 1
+            )
+            if skip and after is None:
+                cursor = cursor.skip(skip)
 
-            return items
+            return await cursor.limit(limit).to_list(length=limit)
 
         except Exception as e:
             logger.error(f"Error getting items with fields: {str(e)}")
             raise
 
+    async def backfill_item_fields(self) -> int:
+        """
+        Rebuild ``erp_items.dynamic_fields`` from ``field_values``
+
+        For values written before items carried the denormalised copy.
+
+        Returns:
+            Number of items updated
+        """
+        updated = 0
+        batch: list[UpdateOne] = []
+        current_code: Optional[str] = None
+        current: dict[str, Any] = {}
+
+        async def flush() -> None:
+            nonlocal updated, batch
+            if batch:
+                await self.db.erp_items.bulk_write(batch, ordered=False)
+                updated += len(batch)
+                batch = []
+
+        # Values of deleted (disabled) definitions are not carried onto items
+        enabled = [
+            field["field_name"]
+            async for field in self.field_definitions.find({"enabled": True}, {"field_name": 1})
+        ]
+        cursor = self.field_values.find(
+            {"field_name": {"$in": enabled}}, {"item_code": 1, "field_name": 1, "value": 1}
+        ).sort("item_code", 1)
+        async for value in cursor:
+            if value["item_code"] != current_code:
+                if current_code is not None:
+                    batch.append(
+                        UpdateOne({"item_code": current_code}, {"$set": {"dynamic_fields": current}})
+                    )
+                    if len(batch) >= BACKFILL_BATCH_SIZE:
+                        await flush()
+                current_code, current = value["item_code"], {}
+            current[value["field_name"]] = value["value"]
+
+        if current_code is not None:
+            batch.append(UpdateOne({"item_code": current_code}, {"$set": {"dynamic_fields": current}}))
+        await flush()
+
+        logger.info(f"Backfilled dynamic fields on {updated} items")
+        return updated
+
     def _validate_number(self, value: Any, validation_rules: dict) -> float:
         try:
             val = float(value)
@@ -404,9 +451,9 @@ class DynamicFieldsService:
         return value
 
     async def _update_db_mapping(self, item_code: str, db_field: str, value: Any):
-        """Update mapped database field in items collection"""
+        """Update mapped database field in erp_items collection"""
         try:
-            await self.db.items.update_one(
+            await self.db.erp_items.update_one(
                 {"item_code": item_code}, {"$set": {db_field: value}}
             )
             logger.info(f"Updated DB mapping {db_field} for item {item_code}")
@@ -3,17 +3,34 @@ Dynamic Report Generation Service
 Generate custom reports with user-defined fields and filters
 """
 
-import io
+import asyncio
 import json
 import logging
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Any, Optional
 
-import pandas as pd
 from bson import ObjectId
 
+from backend.services.reporting.streaming_export import (
+    XLSX_MEDIA_TYPE,
+    stream_csv,
+    write_csv_bytes,
+    write_xlsx_bytes,
+    write_xlsx_file,
+)
+from backend.utils.lazy_import import lazy_module
+
+# pandas is only needed for grouped aggregations
+pd = lazy_module("pandas")
+
 logger = logging.getLogger(__name__)
 
+# Row cap per report (as before streaming; the writers no longer need it)
+MAX_REPORT_ROWS = 10000
+# Formats written straight from the cursor when no grouped aggregation is needed
+STREAMED_FORMATS = ("excel", "csv")
+
 
 class DynamicReportService:
     """
@@ -108,6 +125,7 @@ class DynamicReportService:
         template_data: dict[str, Optional[Any]] = None,
         runtime_filters: dict[str, Optional[Any]] = None,
         generated_by: Optional[str] = None,
+        job=None,
     ) -> dict[str, Any]:
         """
         Generate a report from template or custom data
@@ -117,6 +135,8 @@ class DynamicReportService:
             template_data: Custom template data (if not using saved template)
             runtime_filters: Additional filters to apply at runtime
             generated_by: Username of generator
+            job: ReportJobContext when run as a background report job; used
+                for progress and to build Excel files off the event loop
 
         Returns:
             Generated report info with download link
@@ -137,28 +157,53 @@ class DynamicReportService:
             # Merge runtime filters with template filters
             filters = {**template.get("filters", {}), **(runtime_filters or {})}
 
-            # Fetch data based on report type
-            data = await self._fetch_report_data(
-                report_type=template["report_type"],
-                fields=template["fields"],
-                filters=filters,
-                grouping=template.get("grouping", []),
-                sorting=template.get("sorting", []),
-            )
-
-            # Apply aggregations
-            if template.get("aggregations"):
-                data = self._apply_aggregations(
-                    data, template["aggregations"], template.get("grouping", [])
+            report_format = template.get("format", "excel")
+            grouped = bool(template.get("aggregations") and template.get("grouping"))
+            if job:
+                await job.progress(5, "Fetching data")
+
+            if report_format in STREAMED_FORMATS and not grouped:
+                # Rows go from the cursor straight into the CSV/XLSX writer
+                rows = self._iter_report_data(
+                    template["report_type"],
+                    template["fields"],
+                    filters,
+                    template.get("sorting", []),
+                )
+                file_data, file_name, mime_type, record_count = (
+                    await self._generate_streamed_file(
+                        rows,
+                        format=report_format,
+                        template_name=template.get("name", "report"),
+                        fields=template["fields"],
+                    )
+                )
+            else:
+                data = await self._fetch_report_data(
+                    report_type=template["report_type"],
+                    fields=template["fields"],
+                    filters=filters,
+                    grouping=template.get("grouping", []),
+                    sorting=template.get("sorting", []),
                 )
 
-            # Generate file in specified format
-            file_data, file_name, mime_type = await self._generate_file(
-                data=data,
-                format=template.get("format", "excel"),
-                template_name=template.get("name", "report"),
-                fields=template["fields"],
-            )
+                # Apply aggregations
+                if template.get("aggregations"):
+                    data = self._apply_aggregations(
+                        data, template["aggregations"], template.get("grouping", [])
+                    )
+
+                # Generate file in specified format
+                if job:
+                    await job.progress(60, "Building file")
+                file_data, file_name, mime_type = await self._generate_file(
+                    data=data,
+                    format=report_format,
+                    template_name=template.get("name", "report"),
+                    fields=template["fields"],
+                    run_blocking=job.run_blocking if job else None,
+                )
+                record_count = len(data) if isinstance(data, list) else 0
 
             # Save report record
             report_record = {
@@ -166,7 +211,7 @@ class DynamicReportService:
                 "template_name": template.get("name", "Custom Report"),
                 "report_type": template["report_type"],
                 "filters_applied": filters,
-                "record_count": len(data) if isinstance(data, list) else 0,
+                "record_count": record_count,
                 "file_name": file_name,
                 "file_size": len(file_data) if file_data else 0,
                 "mime_type": mime_type,
@@ -211,197 +256,152 @@ class DynamicReportService:
         grouping: list[str],
         sorting: list[dict[str, str]],
     ) -> list[dict[str, Any]]:
-        """Fetch data for report based on type and configuration"""
-        try:
-            if report_type == "items":
-                return await self._fetch_items_data(fields, filters, sorting)
-            elif report_type == "sessions":
-                return await self._fetch_sessions_data(fields, filters, sorting)
-            elif report_type == "variance":
-                return await self._fetch_variance_data(fields, filters, sorting)
-            elif report_type == "audit":
-                return await self._fetch_audit_data(fields, filters, sorting)
-            elif report_type == "custom":
-                return await self._fetch_custom_data(fields, filters, sorting)
-            else:
-                raise ValueError(f"Unknown report type: {report_type}")
+        """Fetch all data for a report (aggregated, JSON and PDF reports)"""
+        return [
+            row
+            async for row in self._iter_report_data(
+                report_type, fields, filters, sorting
+            )
+        ]
+
+    async def _iter_report_data(
+        self,
+        report_type: str,
+        fields: list[dict[str, Any]],
+        filters: dict[str, Any],
+        sorting: list[dict[str, str]],
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream report rows based on type and configuration"""
+        sources = {
+            "items": self._iter_items_data,
+            "sessions": self._iter_sessions_data,
+            "variance": self._iter_variance_data,
+            "audit": self._iter_audit_data,
+            "custom": self._iter_custom_data,
+        }
+        if report_type not in sources:
+            raise ValueError(f"Unknown report type: {report_type}")
 
+        try:
+            async for row in sources[report_type](fields, filters, sorting):
+                yield row
         except Exception as e:
             logger.error(f"Error fetching report data: {str(e)}")
             raise
 
-    async def _fetch_items_data(
+    @staticmethod
+    def _sorted(cursor, sorting: list[dict[str, str]]):
+        for sort_field in sorting or []:
+            cursor = cursor.sort(
+                sort_field["field"], 1 if sort_field["order"] == "asc" else -1
+            )
+        return cursor.limit(MAX_REPORT_ROWS)
+
+    async def _iter_items_data(
         self,
         fields: list[dict[str, Any]],
         filters: dict[str, Any],
         sorting: list[dict[str, str]],
-    ) -> list[dict[str, Any]]:
-        """Fetch items data with dynamic fields"""
-        try:
-            # Build MongoDB query
-            query = self._build_mongo_query(filters)
-
-            # Build projection
-            projection = {}
-            field_names = [f["name"] for f in fields if f.get("source") != "dynamic"]
-            for field_name in field_names:
-                projection[field_name] = 1
-
-            # Fetch items
-            cursor = self.db.items.find(query, projection)
-
-            # Apply sorting
-            if sorting:
-                for sort_field in sorting:
-                    cursor = cursor.sort(
-                        sort_field["field"], 1 if sort_field["order"] == "asc" else -1
-                    )
-
-            items = await cursor.to_list(length=10000)
-
-            # Add dynamic fields
-            dynamic_fields = [f for f in fields if f.get("source") == "dynamic"]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Items with dynamic fields"""
+        query = self._build_mongo_query(filters)
+        projection = {f["name"]: 1 for f in fields if f.get("source") != "dynamic"}
+        cursor = self._sorted(self.db.items.find(query, projection), sorting)
+
+        dynamic_fields = [f for f in fields if f.get("source") == "dynamic"]
+        async for item in cursor:
             if dynamic_fields:
-                for item in items:
-                    dynamic_values = await self.db.dynamic_field_values.find(
-                        {"item_code": item.get("item_code")}
-                    ).to_list(length=None)
-
-                    for dv in dynamic_values:
-                        item[dv["field_name"]] = dv["value"]
+                dynamic_values = await self.db.dynamic_field_values.find(
+                    {"item_code": item.get("item_code")}
+                ).to_list(length=None)
 
-            return items
+                for dv in dynamic_values:
+                    item[dv["field_name"]] = dv["value"]
+            yield item
 
-        except Exception as e:
-            logger.error(f"Error fetching items data: {str(e)}")
-            raise
-
-    async def _fetch_sessions_data(
+    async def _iter_sessions_data(
         self,
         fields: list[dict[str, Any]],
         filters: dict[str, Any],
         sorting: list[dict[str, str]],
-    ) -> list[dict[str, Any]]:
-        """Fetch sessions data"""
-        try:
-            query = self._build_mongo_query(filters)
-
-            cursor = self.db.sessions.find(query)
-
-            if sorting:
-                for sort_field in sorting:
-                    cursor = cursor.sort(
-                        sort_field["field"], 1 if sort_field["order"] == "asc" else -1
-                    )
-
-            sessions = await cursor.to_list(length=10000)
-
-            # Enrich with related data if needed
-            for session in sessions:
-                # Add item details if requested
-                if any(f["name"].startswith("items.") for f in fields):
-                    items = await self.db.session_items.find(
-                        {"session_id": session["_id"]}
-                    ).to_list(length=None)
-                    session["items"] = items
-
-            return sessions
-
-        except Exception as e:
-            logger.error(f"Error fetching sessions data: {str(e)}")
-            raise
-
-    async def _fetch_variance_data(
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Sessions, with their items when an items.* field is requested"""
+        query = self._build_mongo_query(filters)
+        cursor = self._sorted(self.db.sessions.find(query), sorting)
+        with_items = any(f["name"].startswith("items.") for f in fields)
+
+        async for session in cursor:
+            if with_items:
+                session["items"] = await self.db.session_items.find(
+                    {"session_id": session["_id"]}
+                ).to_list(length=None)
+            yield session
+
+    async def _iter_variance_data(
         self,
         fields: list[dict[str, Any]],
         filters: dict[str, Any],
         sorting: list[dict[str, str]],
-    ) -> list[dict[str, Any]]:
-        """Fetch variance analysis data"""
-        try:
-            # Aggregate variance from sessions and items
-            pipeline = [
-                {"$match": self._build_mongo_query(filters)},
-                {
-                    "$lookup": {
-                        "from": "session_items",
-                        "localField": "_id",
-                        "foreignField": "session_id",
-                        "as": "items",
-                    }
-                },
-                {"$unwind": "$items"},
-                {
-                    "$group": {
-                        "_id": {
-                            "session_id": "$_id",
-                            "warehouse": "$warehouse",
-                            "item_code": "$items.item_code",
-                        },
-                        "expected_quantity": {"$first": "$items.expected_quantity"},
-                        "counted_quantity": {"$first": "$items.counted_quantity"},
-                        "variance": {"$first": "$items.variance"},
-                        "session_date": {"$first": "$started_at"},
-                    }
-                },
-            ]
-
-            cursor = self.db.sessions.aggregate(pipeline)
-            data = await cursor.to_list(length=10000)
-
-            # Flatten the grouped data
-            flattened = []
-            for record in data:
-                flattened.append(
-                    {
-                        **record["_id"],
-                        "expected_quantity": record["expected_quantity"],
-                        "counted_quantity": record["counted_quantity"],
-                        "variance": record["variance"],
-                        "session_date": record["session_date"],
-                    }
-                )
-
-            return flattened
-
-        except Exception as e:
-            logger.error(f"Error fetching variance data: {str(e)}")
-            raise
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Variance analysis rows from sessions and their items"""
+        pipeline = [
+            {"$match": self._build_mongo_query(filters)},
+            {
+                "$lookup": {
+                    "from": "session_items",
+                    "localField": "_id",
+                    "foreignField": "session_id",
+                    "as": "items",
+                }
+            },
+            {"$unwind": "$items"},
+            {
+                "$group": {
+                    "_id": {
+                        "session_id": "$_id",
+                        "warehouse": "$warehouse",
+                        "item_code": "$items.item_code",
+                    },
+                    "expected_quantity": {"$first": "$items.expected_quantity"},
+                    "counted_quantity": {"$first": "$items.counted_quantity"},
+                    "variance": {"$first": "$items.variance"},
+                    "session_date": {"$first": "$started_at"},
+                }
+            },
+            {"$limit": MAX_REPORT_ROWS},
+        ]
+
+        # Flatten the grouped data
+        async for record in self.db.sessions.aggregate(pipeline, allowDiskUse=True):
+            yield {
+                **record["_id"],
+                "expected_quantity": record["expected_quantity"],
+                "counted_quantity": record["counted_quantity"],
+                "variance": record["variance"],
+                "session_date": record["session_date"],
+            }
 
-    async def _fetch_audit_data(
+    async def _iter_audit_data(
         self,
         fields: list[dict[str, Any]],
         filters: dict[str, Any],
         sorting: list[dict[str, str]],
-    ) -> list[dict[str, Any]]:
-        """Fetch audit log data"""
-        try:
-            query = self._build_mongo_query(filters)
-
-            cursor = self.db.activity_logs.find(query)
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Audit log rows"""
+        query = self._build_mongo_query(filters)
+        async for log in self._sorted(self.db.activity_logs.find(query), sorting):
+            yield log
 
-            if sorting:
-                for sort_field in sorting:
-                    cursor = cursor.sort(
-                        sort_field["field"], 1 if sort_field["order"] == "asc" else -1
-                    )
-
-            logs = await cursor.to_list(length=10000)
-            return logs
-
-        except Exception as e:
-            logger.error(f"Error fetching audit data: {str(e)}")
-            raise
-
-    async def _fetch_custom_data(
+    async def _iter_custom_data(
         self,
         fields: list[dict[str, Any]],
         filters: dict[str, Any],
         sorting: list[dict[str, str]],
-    ) -> list[dict[str, Any]]:
-        """Fetch custom aggregated data"""
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Custom aggregated data"""
         # Custom aggregation logic based on fields configuration
-        return []
+        return
+        yield
 
     def _build_mongo_query(self, filters: dict[str, Any]) -> dict[str, Any]:
         """Build MongoDB query from filter configuration"""
@@ -451,11 +451,18 @@ class DynamicReportService:
         format: str,
         template_name: str,
         fields: list[dict[str, Any]],
+        run_blocking=None,
     ) -> tuple:
         """Generate report file in specified format"""
         try:
             timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
 
+            if format == "excel" and run_blocking is not None:
+                # openpyxl is the slow part; write_xlsx_bytes is picklable for a process pool
+                file_data = await run_blocking(
+                    write_xlsx_bytes, data, self._export_columns(data, fields)
+                )
+                return file_data, f"{template_name}_{timestamp}.xlsx", XLSX_MEDIA_TYPE
             if format == "excel":
                 return self._generate_excel(data, template_name, timestamp, fields)
             elif format == "csv":
@@ -471,6 +478,69 @@ class DynamicReportService:
             logger.error(f"Error generating file: {str(e)}")
             raise
 
+    async def _generate_streamed_file(
+        self,
+        rows: AsyncIterator[dict[str, Any]],
+        format: str,
+        template_name: str,
+        fields: list[dict[str, Any]],
+    ) -> tuple:
+        """
+        Write a CSV/XLSX report from a row stream
+
+        Columns come from the template fields (inferred from the first row
+        when there are none). Returns (file_data, file_name, mime_type, rows).
+        """
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        columns = [(f["name"], f.get("label", f["name"])) for f in fields] or None
+        count = 0
+
+        async def counted() -> AsyncIterator[dict[str, Any]]:
+            nonlocal count
+            async for row in rows:
+                count += 1
+                yield row
+
+        try:
+            if format == "excel":
+                path = await write_xlsx_file(counted(), columns)
+                try:
+                    file_data = await asyncio.to_thread(path.read_bytes)
+                finally:
+                    path.unlink(missing_ok=True)
+                return (
+                    file_data,
+                    f"{template_name}_{timestamp}.xlsx",
+                    XLSX_MEDIA_TYPE,
+                    count,
+                )
+
+            file_data = b"".join(
+                [chunk async for chunk in stream_csv(counted(), columns)]
+            )
+            return file_data, f"{template_name}_{timestamp}.csv", "text/csv", count
+
+        except Exception as e:
+            logger.error(f"Error generating file: {str(e)}")
+            raise
+
+    @staticmethod
+    def _export_columns(
+        data: list[dict[str, Any]], fields: list[dict[str, Any]]
+    ) -> list[tuple[str, str]]:
+        """(name, label) pairs in field order, limited to keys present in the data"""
+        present: dict[str, None] = {}
+        for row in data:
+            present.update(dict.fromkeys(row))
+
+        if not fields:
+            return [(name, name) for name in present]
+        return [
+            (f["name"], f.get("label", f["name"]))
+            for f in fields
+            if f["name"] in present
+        ]
+
     def _generate_excel(
         self,
         data: list[dict[str, Any]],
@@ -479,34 +549,9 @@ class DynamicReportService:
         fields: list[dict[str, Any]],
     ) -> tuple:
         """Generate Excel file"""
-        df = pd.DataFrame(data)
-
-        # Reorder columns based on fields configuration
-        if fields:
-            ordered_columns = [f["name"] for f in fields if f["name"] in df.columns]
-            df = df[ordered_columns]
-
-        # Rename columns based on display labels
-        if fields:
-            rename_map = {f["name"]: f.get("label", f["name"]) for f in fields}
-            df = df.rename(columns=rename_map)
-
-        # Generate Excel file
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="Report")
-
-            # Auto-adjust column widths
-            worksheet = writer.sheets["Report"]
-            for idx, col in enumerate(df.columns):
-                max_length = max(df[col].astype(str).apply(len).max(), len(str(col)))
-                worksheet.column_dimensions[chr(65 + idx)].width = min(
-                    max_length + 2, 50
-                )
-
-        file_data = output.getvalue()
+        file_data = write_xlsx_bytes(data, self._export_columns(data, fields))
         file_name = f"{template_name}_{timestamp}.xlsx"
-        mime_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        mime_type = XLSX_MEDIA_TYPE
 
         return file_data, file_name, mime_type
 
@@ -518,16 +563,7 @@ class DynamicReportService:
         fields: list[dict[str, Any]],
     ) -> tuple:
         """Generate CSV file"""
-        df = pd.DataFrame(data)
-
-        # Reorder and rename columns
-        if fields:
-            ordered_columns = [f["name"] for f in fields if f["name"] in df.columns]
-            df = df[ordered_columns]
-            rename_map = {f["name"]: f.get("label", f["name"]) for f in fields}
-            df = df.rename(columns=rename_map)
-
-        file_data = df.to_csv(index=False).encode("utf-8")
+        file_data = write_csv_bytes(data, self._export_columns(data, fields))
         file_name = f"{template_name}_{timestamp}.csv"
         mime_type = "text/csv"
 
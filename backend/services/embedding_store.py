@@ -0,0 +1,332 @@
+"""
+Item Embedding Store
+Precomputed, memory-mapped item embeddings for semantic search.
+
+Embeddings are encoded once (at sync time) and stored as a float matrix in
+``item_embeddings.<generation>.npy`` next to an index file mapping each row to
+an ``item_code`` and a hash of the text it was encoded from. The index names
+the matrix generation it describes, so replacing the index is the single step
+that publishes a new matrix and its metadata together. Refreshes only
+re-encode items whose text changed and, when given the item codes a sync
+touched, only read those items; searches are a brute-force dot product over
+the memory-mapped matrix.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import uuid
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ITEM_TEXT_FIELDS = ("item_name", "category", "subcategory")
+
+_ITEM_PROJECTION = {"_id": 0, "item_code": 1, **{f: 1 for f in ITEM_TEXT_FIELDS}}
+
+# Rows scored per chunk during search (keeps float16 -> float32 upcasts small)
+_SEARCH_CHUNK_ROWS = 16384
+
+EncodeBatchFn = Callable[[list[str]], Optional[np.ndarray]]
+
+
+def item_embedding_text(item: dict[str, Any]) -> str:
+    """Text used to embed an item: name + category + subcategory."""
+    return " ".join(str(item.get(f) or "") for f in ITEM_TEXT_FIELDS).strip()
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class ItemEmbeddingStore:
+    """Memory-mapped embedding matrix keyed by item_code."""
+
+    MATRIX_PREFIX = "item_embeddings"
+    INDEX_FILE = "item_embeddings_index.json"
+
+    def __init__(self, directory: str | Path, dtype: str = "float16"):
+        self.directory = Path(directory)
+        self.dtype = np.dtype(dtype)
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: list[str] = []
+        self._hashes: list[str] = []
+        self._matrix_file: Optional[str] = None
+        self._loaded_mtime: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / self.INDEX_FILE
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def is_available(self) -> bool:
+        """True when a non-empty embedding matrix is on disk."""
+        self._maybe_reload()
+        return self._matrix is not None and len(self._ids) > 0
+
+    def load(self) -> bool:
+        """Load (memory-map) the store from disk. Returns False if missing/invalid."""
+        if not self.index_path.exists():
+            return False
+        try:
+            mtime = self.index_path.stat().st_mtime
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            matrix_file = index.get("matrix")
+            if not matrix_file:
+                return False
+            matrix = np.load(self.directory / matrix_file, mmap_mode="r")
+            ids = index.get("ids", [])
+            hashes = index.get("hashes", [])
+            if matrix.ndim != 2 or matrix.shape[0] != len(ids) or len(ids) != len(hashes):
+                logger.warning("Item embedding store is inconsistent; ignoring it")
+                return False
+        except Exception as e:
+            logger.error(f"Failed to load item embedding store: {e}")
+            return False
+
+        self._matrix = matrix
+        self._ids = ids
+        self._hashes = hashes
+        self._matrix_file = matrix_file
+        self._loaded_mtime = mtime
+        return True
+
+    def _maybe_reload(self) -> None:
+        """Pick up a store rewritten by another worker or a previous refresh."""
+        try:
+            mtime = self.index_path.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._loaded_mtime:
+            self.load()
+
+    def search(self, query_vector: np.ndarray, top_k: int = 20) -> list[tuple[str, float]]:
+        """Return the ``top_k`` (item_code, cosine score) pairs for a query embedding."""
+        self._maybe_reload()
+        matrix, ids = self._matrix, self._ids
+        if matrix is None or not ids or top_k <= 0:
+            return []
+
+        query = _normalize_rows(query_vector)[0]
+        if query.shape[0] != matrix.shape[1]:
+            logger.warning("Query embedding dimension does not match item embedding store")
+            return []
+
+        scores = np.empty(matrix.shape[0], dtype=np.float32)
+        for start in range(0, matrix.shape[0], _SEARCH_CHUNK_ROWS):
+            chunk = np.asarray(matrix[start : start + _SEARCH_CHUNK_ROWS], dtype=np.float32)
+            scores[start : start + chunk.shape[0]] = chunk @ query
+
+        k = min(top_k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(ids[i], float(scores[i])) for i in top]
+
+    async def refresh(
+        self,
+        db,
+        encode_batch: EncodeBatchFn,
+        batch_size: int = 256,
+        item_codes: Optional[Iterable[str]] = None,
+    ) -> dict[str, Any]:
+        """
+        Bring the store in line with ``erp_items``.
+
+        With ``item_codes`` only those items are read: changed ones are
+        re-encoded, new ones appended and missing ones dropped. Without it (or
+        while the store is empty) the whole collection is reconciled. Encoding
+        and file writes run off the event loop.
+        """
+        async with self._refresh_lock:
+            await asyncio.to_thread(self._maybe_reload)
+            existing = {
+                code: (row, h) for row, (code, h) in enumerate(zip(self._ids, self._hashes))
+            }
+
+            if item_codes is not None and existing:
+                ids, hashes, pending, removed = await self._scan_items(
+                    db, existing, set(item_codes)
+                )
+            else:
+                ids, hashes, pending, removed = await self._scan_items(db, existing)
+
+            stats = {"items": len(ids), "embedded": len(pending), "removed": removed}
+            if not pending and not removed and ids == self._ids:
+                return stats
+
+            built = await asyncio.to_thread(
+                self._write, ids, hashes, pending, existing, encode_batch, batch_size
+            )
+            if not built:
+                stats["skipped"] = True
+                return stats
+
+            logger.info(
+                f"Item embeddings refreshed: {stats['items']} items, "
+                f"{stats['embedded']} encoded, {stats['removed']} removed"
+            )
+            return stats
+
+    async def _scan_items(
+        self,
+        db,
+        existing: dict[str, tuple[int, str]],
+        item_codes: Optional[set[str]] = None,
+    ) -> tuple[list[str], list[str], list[tuple[int, str]], int]:
+        """
+        Work out the new row order and which rows need encoding.
+
+        Returns ``(ids, hashes, pending, removed)`` where ``pending`` holds
+        ``(row, text)`` pairs to encode.
+        """
+        if item_codes is None:
+            query: dict[str, Any] = {}
+            ids: list[str] = []
+            hashes: list[str] = []
+        else:
+            query = {"item_code": {"$in": sorted(item_codes)}}
+            ids = list(self._ids)
+            hashes = list(self._hashes)
+        rows = {code: row for row, code in enumerate(ids)}
+
+        pending: list[tuple[int, str]] = []
+        seen: set[str] = set()
+        async for item in db.erp_items.find(query, _ITEM_PROJECTION).batch_size(1000):
+            code = item.get("item_code")
+            if not code or code in seen:
+                continue
+            seen.add(code)
+            text = item_embedding_text(item)
+            text_hash = _text_hash(text)
+            row = rows.get(code)
+            if row is None:
+                row = rows[code] = len(ids)
+                ids.append(code)
+                hashes.append(text_hash)
+            else:
+                hashes[row] = text_hash
+            previous = existing.get(code)
+            if previous is None or previous[1] != text_hash:
+                pending.append((row, text))
+
+        if item_codes is None:
+            # ids were rebuilt from the scan, so missing items are already gone
+            gone = set(existing) - seen
+        else:
+            gone = {code for code in item_codes - seen if code in rows}
+            if gone:
+                keep = [row for row, code in enumerate(ids) if code not in gone]
+                renumber = {old: new for new, old in enumerate(keep)}
+                ids = [ids[row] for row in keep]
+                hashes = [hashes[row] for row in keep]
+                pending = [(renumber[row], text) for row, text in pending]
+        return ids, hashes, pending, len(gone)
+
+    def _write(
+        self,
+        ids: list[str],
+        hashes: list[str],
+        pending: list[tuple[int, str]],
+        existing: dict[str, tuple[int, str]],
+        encode_batch: EncodeBatchFn,
+        batch_size: int,
+    ) -> bool:
+        """
+        Write a new matrix generation and publish it with its index.
+
+        Runs in a thread. The matrix goes to a fresh file first; replacing the
+        index (which names that file) then swaps matrix and metadata in one
+        ``os.replace``.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        batches = [pending[i : i + batch_size] for i in range(0, len(pending), batch_size)]
+        first_vectors: Optional[np.ndarray] = None
+        if self._matrix is not None and self._matrix.shape[0] > 0:
+            dim = int(self._matrix.shape[1])
+        elif batches:
+            first_vectors = encode_batch([text for _, text in batches[0]])
+            if first_vectors is None:
+                return False
+            first_vectors = _normalize_rows(first_vectors)
+            dim = int(first_vectors.shape[1])
+        else:
+            dim = 0
+
+        matrix_file = f"{self.MATRIX_PREFIX}.{uuid.uuid4().hex[:12]}.npy"
+        matrix_path = self.directory / matrix_file
+        out = np.lib.format.open_memmap(
+            matrix_path, mode="w+", dtype=self.dtype, shape=(len(ids), dim)
+        )
+
+        # Copy rows whose text is unchanged from the current matrix
+        pending_rows = {row for row, _ in pending}
+        new_rows = []
+        old_rows = []
+        for row, code in enumerate(ids):
+            if row not in pending_rows and code in existing:
+                new_rows.append(row)
+                old_rows.append(existing[code][0])
+        if new_rows and self._matrix is not None:
+            out[np.asarray(new_rows)] = self._matrix[np.asarray(old_rows)]
+
+        for i, batch in enumerate(batches):
+            vectors = first_vectors if i == 0 and first_vectors is not None else None
+            if vectors is None:
+                vectors = encode_batch([text for _, text in batch])
+                if vectors is None:
+                    del out
+                    matrix_path.unlink(missing_ok=True)
+                    return False
+                vectors = _normalize_rows(vectors)
+            out[np.asarray([row for row, _ in batch])] = vectors.astype(self.dtype)
+
+        out.flush()
+        del out
+
+        tmp_index = self.index_path.with_name(self.INDEX_FILE + ".tmp")
+        with open(tmp_index, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "matrix": matrix_file,
+                    "dtype": self.dtype.name,
+                    "dim": dim,
+                    "ids": ids,
+                    "hashes": hashes,
+                },
+                f,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_index, self.index_path)
+
+        previous = self._matrix_file
+        # Release the old mapping before removing its file
+        self._matrix = None
+        self.load()
+        if previous and previous != matrix_file:
+            try:
+                (self.directory / previous).unlink(missing_ok=True)
+            except OSError:
+                # Still mapped by another process on platforms that forbid it
+                logger.debug(f"Could not remove old embedding matrix {previous}")
+        return True
@@ -3,15 +3,23 @@ Data Enrichment Service - Handle item data correction and enrichment
 Manages serial numbers, MRP, HSN codes, and other missing data additions
 """
 
+import asyncio
 import logging
 import re
+import uuid
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import Any, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 logger = logging.getLogger(__name__)
 
+# Rows per prefetch + bulk_write round trip in bulk imports
+BULK_IMPORT_CHUNK_SIZE = 1000
+
 
 # Validation helper functions
 def _validate_serial_number(value: str) -> Optional[str]:
@@ -108,6 +116,26 @@ def _process_enrichment_fields(
     return corrections
 
 
+def _completeness(item: dict[str, Any], required_fields: list[str]) -> dict[str, Any]:
+    """Completeness of ``item`` over ``required_fields`` (0 counts as missing)."""
+    missing = []
+    for field in required_fields:
+        value = item.get(field)
+        if value is None or value == "" or value == 0:
+            missing.append(field)
+
+    filled_count = len(required_fields) - len(missing)
+    percentage = (filled_count / len(required_fields)) * 100
+
+    return {
+        "is_complete": len(missing) == 0,
+        "percentage": round(percentage, 1),
+        "missing_fields": missing,
+        "filled_fields": filled_count,
+        "total_fields": len(required_fields),
+    }
+
+
 class EnrichmentService:
     """
     Service for managing item data enrichment and corrections
@@ -123,6 +151,7 @@ class EnrichmentService:
         """
         self.db = mongo_db
         self.required_fields = ["serial_number", "mrp", "hsn_code", "barcode"]
+        self._import_tasks: set[asyncio.Task] = set()
 
     async def record_enrichment(
         self,
@@ -276,23 +305,7 @@ class EnrichmentService:
         if additional_fields:
             item = {**item, **additional_fields}
 
-        # Check required fields
-        missing = []
-        for field in self.required_fields:
-            value = item.get(field)
-            if value is None or value == "" or value == 0:
-                missing.append(field)
-
-        filled_count = len(self.required_fields) - len(missing)
-        percentage = (filled_count / len(self.required_fields)) * 100
-
-        return {
-            "is_complete": len(missing) == 0,
-            "percentage": round(percentage, 1),
-            "missing_fields": missing,
-            "filled_fields": filled_count,
-            "total_fields": len(self.required_fields),
-        }
+        return _completeness(item, self.required_fields)
 
     async def get_missing_fields(self, item_code: str) -> list[str]:
         """
@@ -422,62 +435,238 @@ class EnrichmentService:
         }
 
     async def bulk_import_enrichments(
-        self, enrichments: list[dict[str, Any]], user_id: str, username: str
+        self,
+        enrichments: list[dict[str, Any]],
+        user_id: str,
+        username: str,
+        progress: Optional[Callable[[dict[str, Any]], Awaitable[None]]] = None,
     ) -> dict[str, Any]:
         """
         Bulk import enrichment data (e.g., from Excel)
 
+        Rows are processed in chunks of ``BULK_IMPORT_CHUNK_SIZE``: target
+        items are fetched with one ``$in`` query, rows are validated and
+        applied in memory (in sheet order, so a later row for the same item
+        sees the earlier one), and each chunk is written with one unordered
+        ``bulk_write`` plus one ``insert_many`` of enrichment records.
+
         Args:
             enrichments: List of enrichment dictionaries
             user_id: User performing import
             username: Username for audit
+            progress: Awaited with the running results after each chunk
 
         Returns:
             Dictionary with import results
         """
-        results = {"success": 0, "failed": 0, "errors": []}
+        results: dict[str, Any] = {"success": 0, "failed": 0, "errors": []}
 
-        for enrichment in enrichments:
+        for start in range(0, len(enrichments), BULK_IMPORT_CHUNK_SIZE):
+            chunk = enrichments[start : start + BULK_IMPORT_CHUNK_SIZE]
             try:
-                item_code = enrichment.get("item_code")
-                if not item_code:
+                await self._import_chunk(chunk, user_id, username, results)
+            except Exception as e:
+                logger.error(f"Bulk enrichment chunk at row {start} failed: {str(e)}")
+                for enrichment in chunk:
                     results["failed"] += 1
                     results["errors"].append(
-                        {"item_code": None, "error": "Missing item_code"}
+                        {"item_code": enrichment.get("item_code"), "error": str(e)}
                     )
-                    continue
-
-                # Record enrichment
-                result = await self.record_enrichment(
-                    item_code=item_code,
-                    enrichment_data=enrichment,
-                    user_id=user_id,
-                    username=username,
-                )
+            if progress:
+                await progress({**results, "processed": start + len(chunk)})
 
-                if result["success"]:
-                    results["success"] += 1
-                else:
-                    results["failed"] += 1
-                    results["errors"].append(
-                        {
-                            "item_code": item_code,
-                            "error": result.get("error", "Unknown error"),
-                        }
-                    )
+        logger.info(
+            f"Bulk enrichment by {username}: "
+            f"{results['success']} succeeded, {results['failed']} failed"
+        )
 
-            except Exception as e:
+        return results
+
+    async def _import_chunk(
+        self,
+        chunk: list[dict[str, Any]],
+        user_id: str,
+        username: str,
+        results: dict[str, Any],
+    ) -> None:
+        """Validate, apply and write one chunk of bulk enrichment rows."""
+        codes = {e.get("item_code") for e in chunk if e.get("item_code")}
+        items: dict[str, dict[str, Any]] = {}
+        if codes:
+            # Only the fields we compare against; skips enrichment_history
+            projection = dict.fromkeys(["item_code", *_ENRICHABLE_FIELDS], 1)
+            cursor = self.db.erp_items.find(
+                {"item_code": {"$in": list(codes)}}, projection
+            )
+            for item in await cursor.to_list(length=None):
+                items.setdefault(item["item_code"], item)
+
+        # Per item: merged $set, history entries, and the rows that touched it
+        pending: dict[str, dict[str, Any]] = {}
+        for enrichment in chunk:
+            item_code = enrichment.get("item_code")
+            if not item_code:
+                results["failed"] += 1
+                results["errors"].append({"item_code": None, "error": "Missing item_code"})
+                continue
+
+            item = items.get(item_code)
+            if item is None:
                 results["failed"] += 1
                 results["errors"].append(
-                    {"item_code": enrichment.get("item_code"), "error": str(e)}
+                    {"item_code": item_code, "error": f"Item {item_code} not found"}
                 )
+                continue
 
-        logger.info(
-            f"Bulk enrichment by {username}: "
-            f"{results['success']} succeeded, {results['failed']} failed"
+            if not self.validate_enrichment_data(enrichment)["is_valid"]:
+                results["failed"] += 1
+                results["errors"].append({"item_code": item_code, "error": "Validation failed"})
+                continue
+
+            now = datetime.utcnow()
+            update_fields: dict[str, Any] = {}
+            corrections = _process_enrichment_fields(enrichment, item, update_fields)
+            update_fields["last_enriched_at"] = now
+            update_fields["enriched_by"] = user_id
+            completeness = _completeness({**item, **update_fields}, self.required_fields)
+            update_fields["data_complete"] = completeness["is_complete"]
+            update_fields["completion_percentage"] = completeness["percentage"]
+            item.update(update_fields)
+
+            entry = pending.setdefault(
+                item_code, {"set": {}, "history": [], "records": []}
+            )
+            entry["set"].update(update_fields)
+            entry["history"].append(
+                {
+                    "updated_at": now,
+                    "updated_by": user_id,
+                    "username": username,
+                    "fields_updated": list(corrections.keys()),
+                    "corrections": corrections,
+                }
+            )
+            entry["records"].append(
+                {
+                    "item_code": item_code,
+                    "corrections": corrections,
+                    "enriched_by": user_id,
+                    "username": username,
+                    "enriched_at": now,
+                    "fields_count": len(corrections),
+                    "data_complete": completeness["is_complete"],
+                }
+            )
+
+        if not pending:
+            return
+
+        item_codes = list(pending)
+        operations = [
+            UpdateOne(
+                {"item_code": code},
+                {
+                    "$set": pending[code]["set"],
+                    "$push": {"enrichment_history": {"$each": pending[code]["history"]}},
+                },
+            )
+            for code in item_codes
+        ]
+        failed_codes: dict[str, str] = {}
+        try:
+            await self.db.erp_items.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed_codes[item_codes[error["index"]]] = error.get("errmsg", "Write failed")
+
+        records = []
+        for code in item_codes:
+            rows = pending[code]["records"]
+            if code in failed_codes:
+                results["failed"] += len(rows)
+                results["errors"].extend(
+                    {"item_code": code, "error": failed_codes[code]} for _ in rows
+                )
+            else:
+                results["success"] += len(rows)
+                records.extend(rows)
+
+        if records:
+            await self.db.enrichments.insert_many(records, ordered=False)
+
+    async def start_bulk_import(
+        self, enrichments: list[dict[str, Any]], user_id: str, username: str
+    ) -> str:
+        """
+        Run ``bulk_import_enrichments`` in the background
+
+        Progress is kept on a job document in ``enrichment_import_jobs``;
+        poll it with ``get_import_job``.
+
+        Returns:
+            Job ID
+        """
+        job_id = uuid.uuid4().hex
+        now = datetime.utcnow()
+        await self.db.enrichment_import_jobs.insert_one(
+            {
+                "job_id": job_id,
+                "status": "running",
+                "total": len(enrichments),
+                "processed": 0,
+                "success": 0,
+                "failed": 0,
+                "errors": [],
+                "created_by": user_id,
+                "username": username,
+                "created_at": now,
+                "updated_at": now,
+            }
         )
 
-        return results
+        async def report(partial: dict[str, Any]) -> None:
+            await self.db.enrichment_import_jobs.update_one(
+                {"job_id": job_id},
+                {
+                    "$set": {
+                        "processed": partial["processed"],
+                        "success": partial["success"],
+                        "failed": partial["failed"],
+                        "updated_at": datetime.utcnow(),
+                    }
+                },
+            )
+
+        async def run() -> None:
+            try:
+                results = await self.bulk_import_enrichments(
+                    enrichments, user_id, username, progress=report
+                )
+                update = {
+                    "status": "completed",
+                    "success": results["success"],
+                    "failed": results["failed"],
+                    "errors": results["errors"],
+                }
+            except Exception as e:
+                logger.error(f"Bulk enrichment job {job_id} failed: {str(e)}")
+                update = {"status": "failed", "error": str(e)}
+            update["updated_at"] = update["finished_at"] = datetime.utcnow()
+            await self.db.enrichment_import_jobs.update_one(
+                {"job_id": job_id}, {"$set": update}
+            )
+
+        task = asyncio.create_task(run())
+        # Keep a reference so the task is not garbage-collected mid-import
+        self._import_tasks.add(task)
+        task.add_done_callback(self._import_tasks.discard)
+        return job_id
+
+    async def get_import_job(self, job_id: str) -> Optional[dict[str, Any]]:
+        """Get a bulk import job (progress while running, results when done)"""
+        return await self.db.enrichment_import_jobs.find_one(
+            {"job_id": job_id}, {"_id": 0}
+        )
 
     async def get_enrichment_leaderboard(
         self,
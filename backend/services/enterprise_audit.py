@@ -2,20 +2,83 @@
 Enterprise Audit Service
 Comprehensive audit logging for compliance (SOC 2, ISO 27001, GDPR)
 Immutable audit trail with tamper detection
+
+Entries are sealed in blocks: every log-sink flush hashes its entries into a
+Merkle root, and the block links to the previous block through a head pointer
+document. Blocks are keyed by sequence number, so only one worker can insert
+each one; the head pointer is advanced after the insert, and several
+processes append to one chain instead of forking it.
 """
 
+import asyncio
 import hashlib
 import json
 import logging
+import uuid
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel, Field
+from pymongo.errors import DuplicateKeyError
+
+from backend.services.log_sink import get_log_sink, write_log
+from backend.services.retention_engine import ArchiveSegmentWriter
 
 logger = logging.getLogger(__name__)
 
+# Head pointer document shared by all workers
+_CHAIN_HEAD_ID = "head"
+# Compare-and-swap attempts before a block append gives up
+_MAX_CLAIM_ATTEMPTS = 50
+
+
+def _merkle_root(leaves: list[str]) -> str:
+    """Root of a binary SHA-256 Merkle tree (an odd node is paired with itself)."""
+    if not leaves:
+        return hashlib.sha256(b"").hexdigest()
+    level = list(leaves)
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [
+            hashlib.sha256((level[i] + level[i + 1]).encode()).hexdigest()
+            for i in range(0, len(level), 2)
+        ]
+    return level[0]
+
+
+def _block_hash(
+    seq: int, previous_block_hash: Optional[str], merkle_root: str, entry_count: int
+) -> str:
+    content = json.dumps(
+        {
+            "seq": seq,
+            "previous_block_hash": previous_block_hash or "",
+            "merkle_root": merkle_root,
+            "entry_count": entry_count,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+async def _next_or_none(iterator):
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+def _invalid_entry(doc: dict[str, Any], reason: str) -> dict[str, Any]:
+    timestamp = doc.get("timestamp")
+    return {
+        "id": str(doc["_id"]),
+        "timestamp": timestamp.isoformat() if isinstance(timestamp, datetime) else None,
+        "reason": reason,
+    }
+
 
 def _build_audit_search_query(
     event_types: Optional[list] = None,
@@ -162,7 +225,7 @@ class EnterpriseAuditService:
     """
     Enterprise-grade audit service with:
     - Immutable audit trail
-    - Hash chain for tamper detection
+    - Merkle-block hash chain for tamper detection
     - Compliance-ready reporting
     - Retention policies
     - Search and filtering
@@ -176,12 +239,13 @@ class EnterpriseAuditService:
     ):
         self.db = mongo_db
         self.collection = mongo_db.enterprise_audit_logs
+        self.blocks = mongo_db.enterprise_audit_blocks
+        self.chain = mongo_db.enterprise_audit_chain
         self.retention_days = retention_days
         self.enable_hash_chain = enable_hash_chain
-        self._last_hash: Optional[str] = None
 
     async def initialize(self):
-        """Initialize indexes and load last hash"""
+        """Initialize indexes, the chain head and the log sink block hook"""
         # Create indexes for efficient querying
         await self.collection.create_index("timestamp")
         await self.collection.create_index("event_type")
@@ -189,17 +253,118 @@ class EnterpriseAuditService:
         await self.collection.create_index("resource_type")
         await self.collection.create_index("correlation_id")
         await self.collection.create_index([("timestamp", -1), ("_id", -1)])
+        await self.collection.create_index([("block_seq", 1), ("block_index", 1)])
+        await self.blocks.create_index("last_timestamp")
 
-        # Load last hash for chain continuity
         if self.enable_hash_chain:
-            last_entry = await self.collection.find_one(
-                sort=[("timestamp", -1), ("_id", -1)]
-            )
-            if last_entry:
-                self._last_hash = last_entry.get("entry_hash")
+            await self._ensure_chain_head()
+            # Seal one block per sink flush instead of hashing entry by entry
+            sink = get_log_sink()
+            if sink is not None:
+                sink.register_collection(self.collection, hook=self._seal_block)
 
         logger.info("Enterprise audit service initialized")
 
+    async def _ensure_chain_head(self) -> None:
+        """Create the head pointer, anchored to the last pre-block entry if any."""
+        if await self.chain.find_one({"_id": _CHAIN_HEAD_ID}) is not None:
+            return
+        anchor = None
+        legacy = (
+            self.collection.find({"block_seq": {"$exists": False}})
+            .sort([("timestamp", -1), ("_id", -1)])
+            .limit(1)
+        )
+        async for doc in legacy:
+            anchor = doc.get("entry_hash")
+        try:
+            await self.chain.update_one(
+                {"_id": _CHAIN_HEAD_ID},
+                {"$setOnInsert": {"seq": 0, "block_hash": anchor}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            pass  # Another worker created it first
+
+    async def _append_block(self, block: dict[str, Any]) -> int:
+        """
+        Insert ``block`` after the chain head, then advance the head pointer.
+
+        The block is inserted first, keyed by its sequence number, so two
+        workers cannot both claim a sequence. A worker that dies between the
+        insert and the head update leaves the head one block behind; the next
+        writer hits the duplicate key, moves the head on and retries.
+        Returns the block's sequence number.
+        """
+        for _ in range(_MAX_CLAIM_ATTEMPTS):
+            head = await self.chain.find_one({"_id": _CHAIN_HEAD_ID})
+            if head is None:
+                await self._ensure_chain_head()
+                continue
+            seq = head["seq"] + 1
+            previous = head.get("block_hash")
+            block_hash = _block_hash(seq, previous, block["merkle_root"], block["entry_count"])
+            try:
+                await self.blocks.insert_one(
+                    {
+                        **block,
+                        "_id": seq,
+                        "previous_block_hash": previous,
+                        "block_hash": block_hash,
+                    }
+                )
+            except DuplicateKeyError:
+                # Another worker appended this sequence first; help move the head on
+                existing = await self.blocks.find_one({"_id": seq})
+                if existing is not None:
+                    await self._advance_head(head["seq"], seq, existing["block_hash"])
+                continue
+            await self._advance_head(head["seq"], seq, block_hash)
+            return seq
+        raise RuntimeError("Could not advance the audit chain head")
+
+    async def _advance_head(self, from_seq: int, seq: int, block_hash: str) -> None:
+        # No match means another worker already moved the head past from_seq
+        await self.chain.update_one(
+            {"_id": _CHAIN_HEAD_ID, "seq": from_seq},
+            {"$set": {"seq": seq, "block_hash": block_hash, "updated_at": datetime.utcnow()}},
+        )
+
+    async def _seal_block(self, collection, documents: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Hash a batch of entries into one Merkle block linked to the chain head.
+
+        Used as the log sink hook for the audit collection. Entries that already
+        carry a ``block_seq`` (e.g. replayed from a spill file) are left as is.
+        """
+        pending = [doc for doc in documents if "block_seq" not in doc]
+        if not pending:
+            return documents
+
+        leaves = []
+        for index, doc in enumerate(pending):
+            doc["block_index"] = index
+            doc["entry_hash"] = self._compute_hash(doc, None)
+            leaves.append(doc["entry_hash"])
+
+        timestamps = [doc["timestamp"] for doc in pending]
+        seq = await self._append_block(
+            {
+                "merkle_root": _merkle_root(leaves),
+                "entry_count": len(pending),
+                "first_timestamp": min(timestamps),
+                "last_timestamp": max(timestamps),
+                "created_at": datetime.utcnow(),
+            }
+        )
+        for doc in pending:
+            doc["block_seq"] = seq
+        return documents
+
+    def _sink_seals_blocks(self) -> bool:
+        sink = get_log_sink()
+        return sink is not None and sink.running and sink.has_hook(self.collection)
+
     def _compute_hash(self, entry: dict[str, Any], previous_hash: Optional[str]) -> str:
         """Compute SHA-256 hash for tamper detection"""
         data = {
@@ -234,10 +399,15 @@ class EnterpriseAuditService:
         correlation_id: Optional[str] = None,
         session_id: Optional[str] = None,
         request_id: Optional[str] = None,
+        durable: bool = False,
     ) -> str:
         """
         Create an immutable audit log entry
 
+        Entries go through the shared log sink; pass ``durable=True`` to
+        write synchronously before returning. ERROR and CRITICAL entries
+        are always written synchronously.
+
         Returns:
             Audit entry ID
         """
@@ -264,13 +434,12 @@ class EnterpriseAuditService:
                 "request_id": request_id,
             }
 
-            # Add hash chain for tamper detection
-            if self.enable_hash_chain:
-                entry["previous_hash"] = self._last_hash
-                entry["entry_hash"] = self._compute_hash(entry, self._last_hash)
-                self._last_hash = str(entry["entry_hash"])
+            # Without a running sink the entry is sealed as a block of one
+            if self.enable_hash_chain and not self._sink_seals_blocks():
+                await self._seal_block(self.collection, [entry])
 
-            result = await self.collection.insert_one(entry)
+            durable = durable or severity in (AuditSeverity.ERROR, AuditSeverity.CRITICAL)
+            entry_id = await write_log(self.collection, entry, durable=durable)
 
             # Log security-critical events
             if severity in [AuditSeverity.ERROR, AuditSeverity.CRITICAL]:
@@ -279,7 +448,7 @@ class EnterpriseAuditService:
                     f"User: {actor_username} - IP: {actor_ip}"
                 )
 
-            return str(result.inserted_id)
+            return entry_id
 
         except Exception as e:
             logger.error(f"Failed to create audit log: {e}")
@@ -331,58 +500,176 @@ class EnterpriseAuditService:
     async def verify_integrity(
         self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
     ) -> dict[str, Any]:
-        """Verify hash chain integrity for tamper detection"""
+        """
+        Verify hash chain integrity for tamper detection
+
+        Streams blocks and their entries in one ordered pass each, holding at
+        most one block of entries in memory. Entries written before block
+        sealing are checked against their per-entry chain.
+        """
         if not self.enable_hash_chain:
             return {"status": "disabled", "message": "Hash chain not enabled"}
 
-        query: dict[str, Any] = {}
-        if start_date or end_date:
-            query["timestamp"] = {}
-            if start_date:
-                query["timestamp"]["$gte"] = start_date
-            if end_date:
-                query["timestamp"]["$lte"] = end_date
+        legacy_valid, invalid_entries = await self._verify_legacy_entries(start_date, end_date)
+        blocks = await self._verify_blocks(start_date, end_date)
+        invalid_entries.extend(blocks["invalid_entries"])
+        valid_count = legacy_valid + blocks["valid_entries"]
+        tampered = invalid_entries or blocks["invalid_blocks"]
+
+        return {
+            "status": "tampered" if tampered else "valid",
+            "total_verified": valid_count + len(invalid_entries),
+            "valid_entries": valid_count,
+            "invalid_entries": invalid_entries,
+            "blocks_verified": blocks["blocks_verified"],
+            "invalid_blocks": blocks["invalid_blocks"],
+            "verified_at": datetime.utcnow().isoformat(),
+        }
 
+    async def _verify_legacy_entries(
+        self, start_date: Optional[datetime], end_date: Optional[datetime]
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """Check entries chained one by one before block sealing was introduced."""
+        query: dict[str, Any] = {"block_seq": {"$exists": False}}
+        _add_date_range_filter(query, "timestamp", start_date, end_date)
         cursor = self.collection.find(query).sort([("timestamp", 1), ("_id", 1)])
 
         previous_hash = None
         valid_count = 0
         invalid_entries = []
-
         async for doc in cursor:
             expected_hash = self._compute_hash(doc, doc.get("previous_hash"))
             stored_hash = doc.get("entry_hash")
 
             if expected_hash != stored_hash:
-                invalid_entries.append(
-                    {
-                        "id": str(doc["_id"]),
-                        "timestamp": doc["timestamp"].isoformat(),
-                        "reason": "hash_mismatch",
-                    }
-                )
+                invalid_entries.append(_invalid_entry(doc, "hash_mismatch"))
             elif (
                 doc.get("previous_hash") != previous_hash and previous_hash is not None
             ):
-                invalid_entries.append(
-                    {
-                        "id": str(doc["_id"]),
-                        "timestamp": doc["timestamp"].isoformat(),
-                        "reason": "chain_broken",
-                    }
-                )
+                invalid_entries.append(_invalid_entry(doc, "chain_broken"))
             else:
                 valid_count += 1
 
             previous_hash = stored_hash
+        return valid_count, invalid_entries
 
-        return {
-            "status": "valid" if not invalid_entries else "tampered",
-            "total_verified": valid_count + len(invalid_entries),
-            "valid_entries": valid_count,
-            "invalid_entries": invalid_entries,
-            "verified_at": datetime.utcnow().isoformat(),
+    async def _block_seq_bounds(
+        self, start_date: Optional[datetime], end_date: Optional[datetime]
+    ) -> Optional[tuple[int, int]]:
+        query: dict[str, Any] = {}
+        if start_date:
+            query["last_timestamp"] = {"$gte": start_date}
+        if end_date:
+            query["first_timestamp"] = {"$lte": end_date}
+        bounds = []
+        for direction in (1, -1):
+            cursor = self.blocks.find(query, {"_id": 1}).sort("_id", direction).limit(1)
+            async for doc in cursor:
+                bounds.append(doc["_id"])
+        return (bounds[0], bounds[1]) if len(bounds) == 2 else None
+
+    @staticmethod
+    async def _iter_block_entries(cursor):
+        """Group an entry cursor sorted by (block_seq, block_index) per block."""
+        seq = None
+        entries: list[dict[str, Any]] = []
+        async for doc in cursor:
+            if doc["block_seq"] != seq and entries:
+                yield seq, entries
+                entries = []
+            seq = doc["block_seq"]
+            entries.append(doc)
+        if entries:
+            yield seq, entries
+
+    async def _verify_blocks(
+        self, start_date: Optional[datetime], end_date: Optional[datetime]
+    ) -> dict[str, Any]:
+        result: dict[str, Any] = {
+            "blocks_verified": 0,
+            "valid_entries": 0,
+            "invalid_entries": [],
+            "invalid_blocks": [],
         }
+        # The head pointer reveals blocks deleted from the end of the chain
+        head_seq = 0
+        if end_date is None:
+            head = await self.chain.find_one({"_id": _CHAIN_HEAD_ID})
+            head_seq = head.get("seq", 0) if head else 0
+        bounds = await self._block_seq_bounds(start_date, end_date)
+        if bounds is None:
+            if head_seq:
+                result["invalid_blocks"].append({"seq": head_seq, "reasons": ["block_missing"]})
+            return result
+        low, high = bounds[0], max(bounds[1], head_seq)
+
+        # Anchor the first block to its predecessor when it still exists
+        expected_previous = None
+        anchored = False
+        if low > 1:
+            predecessor = await self.blocks.find_one({"_id": low - 1})
+            if predecessor is not None:
+                expected_previous, anchored = predecessor["block_hash"], True
+
+        block_cursor = self.blocks.find({"_id": {"$gte": low, "$lte": high}}).sort("_id", 1)
+        entry_cursor = self.collection.find(
+            {"block_seq": {"$gte": low, "$lte": high}}
+        ).sort([("block_seq", 1), ("block_index", 1)])
+        groups = self._iter_block_entries(entry_cursor)
+        group = await _next_or_none(groups)
+        expected_seq = low
+
+        def _orphans(entries: list[dict[str, Any]]) -> None:
+            for doc in entries:
+                result["invalid_entries"].append(_invalid_entry(doc, "block_missing"))
+
+        async for block in block_cursor:
+            seq = block["_id"]
+            while group is not None and group[0] < seq:
+                _orphans(group[1])
+                group = await _next_or_none(groups)
+            entries: list[dict[str, Any]] = []
+            if group is not None and group[0] == seq:
+                entries = group[1]
+                group = await _next_or_none(groups)
+
+            if seq != expected_seq:
+                result["invalid_blocks"].append({"seq": expected_seq, "reasons": ["block_missing"]})
+            problems = []
+            if (anchored or seq > low) and block.get("previous_block_hash") != expected_previous:
+                problems.append("chain_broken")
+
+            leaves = []
+            for doc in entries:
+                leaf = self._compute_hash(doc, None)
+                leaves.append(leaf)
+                if leaf != doc.get("entry_hash"):
+                    result["invalid_entries"].append(_invalid_entry(doc, "hash_mismatch"))
+                else:
+                    result["valid_entries"] += 1
+            if len(entries) != block.get("entry_count"):
+                problems.append("entry_count_mismatch")
+            if _merkle_root(leaves) != block.get("merkle_root"):
+                problems.append("merkle_mismatch")
+            expected_block_hash = _block_hash(
+                seq, block.get("previous_block_hash"), block.get("merkle_root", ""),
+                block.get("entry_count", 0),
+            )
+            if expected_block_hash != block.get("block_hash"):
+                problems.append("block_hash_mismatch")
+
+            if problems:
+                result["invalid_blocks"].append({"seq": seq, "reasons": problems})
+            result["blocks_verified"] += 1
+            expected_previous = block.get("block_hash")
+            expected_seq = seq + 1
+
+        while group is not None:
+            _orphans(group[1])
+            group = await _next_or_none(groups)
+        if expected_seq <= high:
+            result["invalid_blocks"].append({"seq": expected_seq, "reasons": ["block_missing"]})
+        return result
 
     async def generate_compliance_report(
         self, start_date: datetime, end_date: datetime, report_type: str = "summary"
@@ -452,17 +739,76 @@ class EnterpriseAuditService:
             "integrity_status": await self.verify_integrity(start_date, end_date),
         }
 
-    async def apply_retention_policy(self) -> dict[str, int]:
-        """Delete audit logs older than retention period"""
-        cutoff_date = datetime.utcnow() - timedelta(days=self.retention_days)
+    async def apply_retention_policy(
+        self,
+        cutoff: Optional[datetime] = None,
+        archive_writer: Optional[ArchiveSegmentWriter] = None,
+        chunk_size: int = 1000,
+    ) -> dict[str, Any]:
+        """
+        Delete audit logs older than the retention period (or ``cutoff``)
+
+        Sealed entries go a whole block at a time so the remaining blocks still
+        verify. With ``archive_writer`` the expiring entries are written to
+        archive segments, ``chunk_size`` per segment, before anything is deleted.
+        """
+        cutoff_date = cutoff or datetime.utcnow() - timedelta(days=self.retention_days)
+        unsealed = {"block_seq": {"$exists": False}, "timestamp": {"$lt": cutoff_date}}
+
+        # Newest block whose entries are all expired; everything before it goes
+        # too. The head block is kept so verification can still see the chain end.
+        head = await self.chain.find_one({"_id": _CHAIN_HEAD_ID})
+        head_seq = head.get("seq", 0) if head else 0
+        last_block = None
+        expired = (
+            self.blocks.find(
+                {"_id": {"$lt": head_seq}, "last_timestamp": {"$lt": cutoff_date}}, {"_id": 1}
+            )
+            .sort("_id", -1)
+            .limit(1)
+        )
+        async for block in expired:
+            last_block = block["_id"]
+        sealed = {"block_seq": {"$lte": last_block}} if last_block is not None else None
+
+        archived, segments, run_id = 0, 0, None
+        if archive_writer is not None:
+            run_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+            query = {"$or": [unsealed, sealed]} if sealed else unsealed
+            cursor = self.collection.find(query).sort("_id", 1)
+            chunk: list[dict[str, Any]] = []
+            async for doc in cursor:
+                chunk.append(doc)
+                if len(chunk) >= chunk_size:
+                    await asyncio.to_thread(
+                        archive_writer.write_segment, self.collection.name, run_id, segments, chunk
+                    )
+                    archived, segments, chunk = archived + len(chunk), segments + 1, []
+            if chunk:
+                await asyncio.to_thread(
+                    archive_writer.write_segment, self.collection.name, run_id, segments, chunk
+                )
+                archived, segments = archived + len(chunk), segments + 1
 
-        # Archive before deletion (optional)
-        # ... archival logic here ...
+        result = await self.collection.delete_many(unsealed)
+        deleted_count = result.deleted_count
 
-        result = await self.collection.delete_many({"timestamp": {"$lt": cutoff_date}})
+        deleted_blocks = 0
+        if sealed:
+            entries = await self.collection.delete_many(sealed)
+            blocks = await self.blocks.delete_many({"_id": {"$lte": last_block}})
+            deleted_count += entries.deleted_count
+            deleted_blocks = blocks.deleted_count
 
         logger.info(
-            f"Audit retention: deleted {result.deleted_count} entries older than {self.retention_days} days"
+            f"Audit retention: deleted {deleted_count} entries ({deleted_blocks} blocks) "
+            f"older than {cutoff_date.isoformat()}, archived {archived}"
         )
 
-        return {"deleted_count": result.deleted_count}
+        return {
+            "deleted_count": deleted_count,
+            "deleted_blocks": deleted_blocks,
+            "archived": archived,
+            "segments": segments,
+            "run_id": run_id,
+        }
@@ -11,6 +11,13 @@ from typing import Any, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel
 
+from backend.services.log_sink import write_log
+from backend.utils.pagination import (
+    count_total,
+    cursor_paginate_mongo,
+    offset_pagination,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,10 +35,11 @@ def _build_error_filter(
 
     if severity:
         filter_query["severity"] = severity
+    # Free-text fields match case-insensitively, as the error log endpoint does
     if error_type:
-        filter_query["error_type"] = error_type
+        filter_query["error_type"] = {"$regex": error_type, "$options": "i"}
     if endpoint:
-        filter_query["endpoint"] = endpoint
+        filter_query["endpoint"] = {"$regex": endpoint, "$options": "i"}
     if user:
         filter_query["user"] = user
     if resolved is not None:
@@ -168,8 +176,9 @@ class ErrorLogService:
                 "resolved": False,
             }
 
-            result = await self.collection.insert_one(log_entry)
-            log_entry["id"] = str(result.inserted_id)
+            # The sink may hold the dict until it flushes; queue a copy
+            entry_id = await write_log(self.collection, dict(log_entry))
+            log_entry["id"] = entry_id
 
             # Log to application logger based on severity
             log_level = {
@@ -183,13 +192,13 @@ class ErrorLogService:
                 log_level,
                 f"Error logged: {error_type} - {error_message}",
                 extra={
-                    "error_id": str(result.inserted_id),
+                    "error_id": entry_id,
                     "endpoint": endpoint,
                     "user": user,
                 },
             )
 
-            return str(result.inserted_id)
+            return entry_id
         except Exception as e:
             logger.error(f"Failed to log error: {str(e)}", exc_info=True)
             # Don't raise - error logging failures shouldn't break the app
@@ -255,20 +264,24 @@ class ErrorLogService:
         end_date: Optional[datetime] = None,
         page: int = 1,
         page_size: int = 50,
+        cursor: Optional[str] = None,
+        include_total: Optional[bool] = None,
     ) -> dict[str, Any]:
         """
         Retrieve error logs with filtering and pagination
 
         Args:
             severity: Filter by severity
-            error_type: Filter by error type
-            endpoint: Filter by endpoint
+            error_type: Filter by error type (case-insensitive pattern)
+            endpoint: Filter by endpoint (case-insensitive pattern)
             user: Filter by user
             resolved: Filter by resolved status
             start_date: Filter by start date
             end_date: Filter by end date
             page: Page number
             page_size: Items per page
+            cursor: Keyset cursor ("" for the first page); replaces page offsets
+            include_total: Count matching entries (default: offset mode only)
 
         Returns:
             Dictionary with errors and pagination info
@@ -278,30 +291,40 @@ class ErrorLogService:
                 severity, error_type, endpoint, user, resolved, start_date, end_date
             )
 
-            total = await self.collection.count_documents(filter_query)
+            if cursor is not None:
+                result = await cursor_paginate_mongo(
+                    self.collection,
+                    filter_query,
+                    sort_field="timestamp",
+                    direction=-1,
+                    limit=page_size,
+                    cursor=cursor,
+                    include_total=bool(include_total),
+                )
+                errors = result.items
+                for error in errors:
+                    _process_error_for_response(error)
+                return {"errors": errors, "pagination": result.pagination()}
+
+            total = None
+            if include_total is not False:
+                total = await count_total(self.collection, filter_query)
             skip = (page - 1) * page_size
 
-            cursor = (
+            db_cursor = (
                 self.collection.find(filter_query)
                 .sort("timestamp", -1)
                 .skip(skip)
                 .limit(page_size)
             )
-            errors = await cursor.to_list(page_size)
+            errors = await db_cursor.to_list(page_size)
 
             for error in errors:
                 _process_error_for_response(error)
 
             return {
                 "errors": errors,
-                "pagination": {
-                    "page": page,
-                    "page_size": page_size,
-                    "total": total,
-                    "total_pages": (total + page_size - 1) // page_size,
-                    "has_next": skip + page_size < total,
-                    "has_prev": page > 1,
-                },
+                "pagination": offset_pagination(page, page_size, total, len(errors)),
             }
         except Exception as e:
             logger.error(f"Failed to retrieve errors: {str(e)}")
@@ -0,0 +1,237 @@
+"""
+Histogram
+Constant-memory latency histograms with mergeable snapshots.
+
+Each histogram keeps two views of the same observations:
+
+- fixed ``le`` buckets (Prometheus defaults) for ``_bucket``/``_sum``/``_count``
+  exposition, and
+- a log-bucketed sketch (DDSketch-style, 1% relative accuracy) for p50/p95/p99
+  over all traffic, not just a recent window.
+
+Recording is O(1). ``ShardedHistogram`` gives every thread its own shard so
+writers never take a lock; readers merge shard snapshots.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable
+from typing import Any, Optional
+
+# Prometheus client default buckets (seconds)
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# Values at or below this are counted as zero by the sketch
+_MIN_TRACKABLE = 1e-9
+
+
+class Histogram:
+    """Single-writer histogram; use ``ShardedHistogram`` across threads."""
+
+    __slots__ = (
+        "bounds",
+        "relative_accuracy",
+        "_gamma_log",
+        "bucket_counts",
+        "sketch",
+        "zero_count",
+        "count",
+        "sum",
+        "min",
+        "max",
+    )
+
+    def __init__(
+        self,
+        bounds: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+    ):
+        self.bounds = tuple(sorted(bounds))
+        self.relative_accuracy = relative_accuracy
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._gamma_log = math.log(gamma)
+        # One extra slot for +Inf
+        self.bucket_counts = [0] * (len(self.bounds) + 1)
+        self.sketch: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.bucket_counts[bisect_left(self.bounds, value)] += 1
+        if value <= _MIN_TRACKABLE:
+            self.zero_count += 1
+        else:
+            index = math.ceil(math.log(value) / self._gamma_log)
+            self.sketch[index] = self.sketch.get(index, 0) + 1
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """Add ``other``'s observations into this histogram (same layout)."""
+        if other.bounds != self.bounds or other._gamma_log != self._gamma_log:
+            raise ValueError("Cannot merge histograms with different layouts")
+        for i, value in enumerate(other.bucket_counts):
+            self.bucket_counts[i] += value
+        for index, value in list(other.sketch.items()):
+            self.sketch[index] = self.sketch.get(index, 0) + value
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def snapshot(self) -> "Histogram":
+        return Histogram(self.bounds, self.relative_accuracy).merge(self)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile (0..1) within the relative accuracy."""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.sketch):
+            seen += self.sketch[index]
+            if seen > rank:
+                estimate = 2 * math.exp(index * self._gamma_log) / (
+                    1 + math.exp(self._gamma_log)
+                )
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+            "avg": self.mean,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialisable snapshot, e.g. to merge histograms from several workers."""
+        return {
+            "bounds": list(self.bounds),
+            "relative_accuracy": self.relative_accuracy,
+            "bucket_counts": list(self.bucket_counts),
+            "sketch": {str(k): v for k, v in self.sketch.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Histogram":
+        histogram = cls(data["bounds"], data["relative_accuracy"])
+        histogram.bucket_counts = list(data["bucket_counts"])
+        histogram.sketch = {int(k): v for k, v in data["sketch"].items()}
+        histogram.zero_count = data["zero_count"]
+        histogram.count = data["count"]
+        histogram.sum = data["sum"]
+        if data["count"]:
+            histogram.min, histogram.max = data["min"], data["max"]
+        return histogram
+
+    def prometheus_lines(self, name: str, labels: Optional[dict[str, str]] = None) -> list[str]:
+        """``_bucket``/``_sum``/``_count`` samples in Prometheus text format."""
+        base = _format_labels(labels or {})
+        prefix = base[:-1] + "," if base else "{"
+        lines = []
+        cumulative = 0
+        for bound, value in zip(self.bounds, self.bucket_counts):
+            cumulative += value
+            lines.append(f'{name}_bucket{prefix}le="{_format_bound(bound)}"}} {cumulative}')
+        lines.append(f'{name}_bucket{prefix}le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{base} {self.sum:.6f}")
+        lines.append(f"{name}_count{base} {self.count}")
+        return lines
+
+
+class ShardedHistogram:
+    """Histogram with one shard per writer thread; recording never locks."""
+
+    def __init__(
+        self,
+        bounds: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+    ):
+        self.bounds = tuple(sorted(bounds))
+        self.relative_accuracy = relative_accuracy
+        self._local = threading.local()
+        self._shards: list[Histogram] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> Histogram:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = Histogram(self.bounds, self.relative_accuracy)
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def record(self, value: float) -> None:
+        self._shard().record(value)
+
+    def snapshot(self) -> Histogram:
+        merged = Histogram(self.bounds, self.relative_accuracy)
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            merged.merge(shard)
+        return merged
+
+    def reset(self) -> None:
+        with self._shards_lock:
+            self._shards = []
+        self._local = threading.local()
+
+
+def escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{escape_label_value(v)}"' for k, v in labels.items())
+    return f"{{{body}}}"
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
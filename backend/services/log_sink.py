@@ -0,0 +1,448 @@
+"""
+Log Sink
+Buffered, batched writer for activity, audit, error and verification logs.
+
+Log documents are queued in memory and a background flusher writes them with
+``insert_many`` every ``flush_interval_ms`` or once ``batch_size`` entries are
+waiting, so the request path no longer pays a Mongo round trip per log line.
+The ``_id`` is assigned when the entry is queued, so callers still get an ID
+back immediately.
+
+When the queue is full the overflow policy decides what happens:
+
+- ``block``: wait up to ``block_timeout`` for space, then write inline
+- ``drop``: discard the entry (counted in metrics)
+- ``spill``: append the entry to a JSONL file that is replayed on start
+
+Entries that must be durable before the request returns (e.g. security
+audit events) pass ``durable=True`` and are written synchronously.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from bson import ObjectId, json_util
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+
+# Queue sentinel that tells the flusher to exit
+_STOP = object()
+
+_DUPLICATE_KEY = 11000
+
+# Collections written through the sink by default
+LOG_COLLECTIONS = (
+    "activity_logs",
+    "error_logs",
+    "audit_logs",
+    "verification_logs",
+    "enterprise_audit_logs",
+)
+
+
+class OverflowPolicy(str, Enum):
+    BLOCK = "block"
+    DROP = "drop"
+    SPILL = "spill"
+
+
+# Called with (collection, documents) right before a batch is written; may
+# rewrite the batch (e.g. to attach hash-chain fields)
+BatchHook = Callable[[Any, list[dict[str, Any]]], Awaitable[list[dict[str, Any]]]]
+
+
+@dataclass
+class LogSinkMetrics:
+    enqueued: int = 0
+    written: int = 0
+    written_sync: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    replayed: int = 0
+    flushes: int = 0
+    flush_errors: int = 0
+    last_flush_ms: float = 0.0
+    max_flush_ms: float = 0.0
+    total_flush_ms: float = 0.0
+    max_queue_depth: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        avg = self.total_flush_ms / self.flushes if self.flushes else 0.0
+        return {
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "written_sync": self.written_sync,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "avg_flush_ms": round(avg, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+@dataclass
+class _Batch:
+    collection: Any
+    documents: list[dict[str, Any]] = field(default_factory=list)
+
+
+class LogSink:
+    """Bounded in-memory queue of log documents with a background flusher."""
+
+    def __init__(
+        self,
+        *,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval_ms: int = 250,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        block_timeout: float = 1.0,
+        spill_dir: Optional[str] = None,
+    ):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.overflow = OverflowPolicy(overflow)
+        self.block_timeout = block_timeout
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.metrics = LogSinkMetrics()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        # Spilled entries are replayed into these collections on start
+        self._collections: dict[str, Any] = {}
+        self._hooks: dict[str, BatchHook] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def register_collection(self, collection, hook: Optional[BatchHook] = None) -> None:
+        """
+        Make a collection known for spill replay and optionally attach a hook
+        that transforms each batch before it is written.
+        """
+        name = _collection_name(collection)
+        self._collections[name] = collection
+        if hook is not None:
+            self._hooks[name] = hook
+
+    def has_hook(self, collection) -> bool:
+        return _collection_name(collection) in self._hooks
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run(), name="log-sink-flusher")
+        await self.replay_spill()
+        logger.info(
+            f"✓ Log sink started (batch={self.batch_size}, "
+            f"interval={int(self.flush_interval * 1000)}ms, overflow={self.overflow.value})"
+        )
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop the flusher after it has written everything queued so far."""
+        if self._task is None or self._queue is None:
+            return
+        task, self._task = self._task, None
+        try:
+            await asyncio.wait_for(self._queue.put(_STOP), timeout=timeout)
+            await asyncio.wait_for(task, timeout=timeout)
+        except asyncio.TimeoutError:
+            task.cancel()
+            remaining = [item for item in self._drain() if item is not _STOP]
+            logger.warning(f"Log sink stop timed out; spilling {len(remaining)} entries")
+            self._spill(remaining)
+        await self.flush()
+        logger.info(f"✓ Log sink stopped ({self.metrics.written} entries written)")
+
+    async def submit(
+        self, collection, document: dict[str, Any], *, durable: bool = False
+    ) -> str:
+        """
+        Queue ``document`` for ``collection`` and return its ``_id``.
+
+        Writes inline when ``durable`` is set or the sink is not running.
+        """
+        document.setdefault("_id", ObjectId())
+        if durable or not self.running:
+            return await self._write_now(collection, document)
+
+        item = (collection, document)
+        assert self._queue is not None
+        if self._queue.full():
+            if self.overflow == OverflowPolicy.DROP:
+                self.metrics.dropped += 1
+                return str(document["_id"])
+            if self.overflow == OverflowPolicy.SPILL:
+                self._spill([item])
+                return str(document["_id"])
+            try:
+                await asyncio.wait_for(self._queue.put(item), timeout=self.block_timeout)
+            except asyncio.TimeoutError:
+                # Back-pressure did not clear in time; never lose the entry
+                return await self._write_now(collection, document)
+        else:
+            self._queue.put_nowait(item)
+
+        self.metrics.enqueued += 1
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self._queue.qsize())
+        return str(document["_id"])
+
+    async def _write_now(self, collection, document: dict[str, Any]) -> str:
+        hook = self._hooks.get(_collection_name(collection))
+        if hook is not None:
+            documents = await hook(collection, [document])
+            await collection.insert_many(documents, ordered=True)
+        else:
+            await collection.insert_one(document)
+        self.metrics.written_sync += 1
+        return str(document["_id"])
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            items = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(items) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                items.append(item)
+            await self._write_batch(items)
+
+    def _drain(self) -> list[tuple[Any, dict[str, Any]]]:
+        items: list[tuple[Any, dict[str, Any]]] = []
+        if self._queue is None:
+            return items
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return items
+
+    async def flush(self) -> int:
+        """Write everything currently queued. Returns the number of entries."""
+        items = [item for item in self._drain() if item is not _STOP]
+        for start in range(0, len(items), self.batch_size):
+            await self._write_batch(items[start : start + self.batch_size])
+        return len(items)
+
+    async def _write_batch(self, items: list[tuple[Any, dict[str, Any]]]) -> None:
+        batches: dict[int, _Batch] = {}
+        for collection, document in items:
+            batches.setdefault(id(collection), _Batch(collection)).documents.append(document)
+
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            started = time.perf_counter()
+            for batch in batches.values():
+                name = _collection_name(batch.collection)
+                documents = batch.documents
+                try:
+                    hook = self._hooks.get(name)
+                    if hook is not None:
+                        documents = await hook(batch.collection, documents)
+                    # Ordered so hook-produced sequences (hash chains) land in order
+                    await batch.collection.insert_many(documents, ordered=hook is not None)
+                    self.metrics.written += len(documents)
+                except Exception as e:
+                    self.metrics.flush_errors += 1
+                    logger.error(
+                        f"Log sink failed to write {len(documents)} entries to {name}: {e}"
+                    )
+                    self._spill([(batch.collection, doc) for doc in batch.documents])
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.metrics.flushes += 1
+            self.metrics.last_flush_ms = elapsed_ms
+            self.metrics.total_flush_ms += elapsed_ms
+            self.metrics.max_flush_ms = max(self.metrics.max_flush_ms, elapsed_ms)
+
+    # Spill files -------------------------------------------------------
+
+    def _spill_path(self) -> Optional[Path]:
+        if self.spill_dir is None:
+            return None
+        return self.spill_dir / f"log-sink-{os.getpid()}.jsonl"
+
+    def _spill(self, items: list[tuple[Any, dict[str, Any]]]) -> None:
+        path = self._spill_path()
+        if path is None:
+            self.metrics.dropped += len(items)
+            logger.warning(f"Log sink dropped {len(items)} entries (no spill directory)")
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as fh:
+                for collection, document in items:
+                    record = {"collection": _collection_name(collection), "document": document}
+                    fh.write(json_util.dumps(record) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+            self.metrics.spilled += len(items)
+        except OSError as e:
+            self.metrics.dropped += len(items)
+            logger.error(f"Log sink could not spill {len(items)} entries: {e}")
+
+    async def replay_spill(self) -> int:
+        """Re-queue entries spilled by earlier runs (any process)."""
+        if self.spill_dir is None or not self.spill_dir.exists():
+            return 0
+        replayed = 0
+        for path in sorted(self.spill_dir.glob("log-sink-*.jsonl")):
+            # Claim the file so concurrent workers do not replay it twice
+            claimed = path.with_suffix(f".replay-{os.getpid()}")
+            try:
+                path.rename(claimed)
+            except OSError:
+                continue
+            pending: dict[str, list[dict[str, Any]]] = {}
+            with claimed.open(encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        record = json_util.loads(line)
+                        pending.setdefault(record["collection"], []).append(record["document"])
+            for name, documents in pending.items():
+                collection = self._collections.get(name)
+                if collection is None:
+                    logger.warning(
+                        f"Log sink cannot replay {len(documents)} entries for unknown {name}"
+                    )
+                    continue
+                try:
+                    hook = self._hooks.get(name)
+                    if hook is not None:
+                        documents = await hook(collection, documents)
+                    replayed += await _insert_replayed(collection, documents)
+                except Exception as e:
+                    logger.warning(f"Log sink replay into {name} partially failed: {e}")
+            claimed.unlink(missing_ok=True)
+        self.metrics.replayed += replayed
+        if replayed:
+            logger.info(f"✓ Log sink replayed {replayed} spilled entries")
+        return replayed
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "overflow": self.overflow.value,
+            **self.metrics.as_dict(),
+        }
+
+
+async def _insert_replayed(collection, documents: list[dict[str, Any]]) -> int:
+    """
+    Insert spilled documents, skipping those a failed batch already wrote.
+
+    Unordered, so one duplicate ``_id`` does not stop the rest of the batch.
+    Returns the number of documents inserted.
+    """
+    try:
+        await collection.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(error.get("code") != _DUPLICATE_KEY for error in errors):
+            raise
+        return e.details.get("nInserted", len(documents) - len(errors))
+    return len(documents)
+
+
+def _collection_name(collection) -> str:
+    name = getattr(collection, "name", None)
+    return name if isinstance(name, str) else f"collection-{id(collection)}"
+
+
+_log_sink: Optional[LogSink] = None
+
+
+def set_log_sink(sink: Optional[LogSink]) -> None:
+    global _log_sink
+    _log_sink = sink
+
+
+def get_log_sink() -> Optional[LogSink]:
+    return _log_sink
+
+
+def build_log_sink() -> LogSink:
+    """Create a sink from settings."""
+    from backend.config import settings
+
+    return LogSink(
+        max_queue=getattr(settings, "LOG_SINK_MAX_QUEUE", 10000),
+        batch_size=getattr(settings, "LOG_SINK_BATCH_SIZE", 500),
+        flush_interval_ms=getattr(settings, "LOG_SINK_FLUSH_INTERVAL_MS", 250),
+        overflow=getattr(settings, "LOG_SINK_OVERFLOW", OverflowPolicy.BLOCK.value),
+        spill_dir=getattr(settings, "LOG_SINK_SPILL_DIR", None),
+    )
+
+
+async def start_log_sink(db) -> Optional[LogSink]:
+    """Build, register the log collections of ``db`` and start the shared sink."""
+    from backend.config import settings
+
+    if not getattr(settings, "LOG_SINK_ENABLED", True):
+        logger.info("Log sink disabled; log entries are written inline")
+        return None
+    sink = build_log_sink()
+    for name in LOG_COLLECTIONS:
+        sink.register_collection(db[name])
+    await sink.start()
+    set_log_sink(sink)
+    return sink
+
+
+async def stop_log_sink(timeout: float = 10.0) -> None:
+    """Flush and stop the shared sink; later writes go inline."""
+    sink = _log_sink
+    if sink is None:
+        return
+    set_log_sink(None)
+    await sink.stop(timeout=timeout)
+
+
+async def write_log(collection, document: dict[str, Any], *, durable: bool = False) -> str:
+    """
+    Write a log document through the shared sink when one is running,
+    otherwise inline. Returns the document ``_id`` as a string.
+    """
+    sink = _log_sink
+    if sink is not None:
+        return await sink.submit(collection, document, durable=durable)
+    result = await collection.insert_one(document)
+    return str(result.inserted_id)
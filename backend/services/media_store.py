@@ -0,0 +1,309 @@
+"""
+Media Store
+Content-addressed storage for count-line photos and sync evidence.
+
+Uploads (multipart, or base64/data-URI strings still sent inline by older
+clients) are decoded once, checked to be images, and stored under their
+SHA-256, so the same photo sent twice is stored once. Each image also gets a
+small JPEG thumbnail. Documents keep only a reference::
+
+    {"media_id": <sha256>, "url": "/api/media/<sha256>",
+     "thumbnail_url": "/api/media/<sha256>/thumbnail", ...}
+
+Bytes live on local disk (``MEDIA_DIR``) or in GridFS (``MEDIA_STORE=gridfs``);
+metadata lives in the ``media`` collection keyed by the hash.
+"""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import io
+import logging
+import os
+import re
+from collections.abc import AsyncIterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEDIA_DIR = Path(__file__).resolve().parent.parent / "data" / "media"
+MEDIA_URL_PREFIX = "/api/media/"
+THUMBNAIL_SUFFIX = ".thumb"
+STREAM_CHUNK_SIZE = 64 * 1024
+_MEDIA_ID = re.compile(r"^[0-9a-f]{64}$")
+_DATA_URI = re.compile(r"^data:(?P<type>[\w.+-]+/[\w.+-]+)?(?:;[^,]*)?;base64,", re.IGNORECASE)
+# Inline strings shorter than this are URLs or ids, not photos
+_MIN_INLINE_LENGTH = 256
+
+
+class MediaError(ValueError):
+    """Upload is not a usable image"""
+
+
+def is_media_id(value: str) -> bool:
+    return bool(_MEDIA_ID.match(value or ""))
+
+
+def decode_inline(value: str) -> Optional[bytes]:
+    """Bytes of a data URI or bare base64 string, or None if it is neither."""
+    if not isinstance(value, str):
+        return None
+    match = _DATA_URI.match(value)
+    if match:
+        payload = value[match.end() :]
+    elif len(value) >= _MIN_INLINE_LENGTH and "://" not in value[:16] and not value.startswith("/"):
+        payload = value
+    else:
+        return None
+    try:
+        return base64.b64decode("".join(payload.split()), validate=True)
+    except (binascii.Error, ValueError):
+        return None
+
+
+class LocalMediaBackend:
+    """Files under ``root/<aa>/<sha256>``, written atomically."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).exists)
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+
+    async def put(self, key: str, data: bytes) -> None:
+        await asyncio.to_thread(self._write, key, data)
+
+    def _read(self, key: str, start: int, length: int) -> bytes:
+        with open(self._path(key), "rb") as fh:
+            fh.seek(start)
+            return fh.read(length)
+
+    async def iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        position = start
+        while position <= end:
+            chunk = await asyncio.to_thread(
+                self._read, key, position, min(STREAM_CHUNK_SIZE, end - position + 1)
+            )
+            if not chunk:
+                break
+            position += len(chunk)
+            yield chunk
+
+
+class GridFSMediaBackend:
+    """GridFS bucket ``media`` with the hash as the filename."""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+        self.bucket = AsyncIOMotorGridFSBucket(db, bucket_name="media")
+
+    async def exists(self, key: str) -> bool:
+        cursor = self.bucket.find({"filename": key}, limit=1)
+        return bool(await cursor.to_list(1))
+
+    async def put(self, key: str, data: bytes) -> None:
+        await self.bucket.upload_from_stream(key, data)
+
+    async def iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        stream = await self.bucket.open_download_stream_by_name(key)
+        stream.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await stream.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _inspect_image(data: bytes, thumbnail_size: int) -> dict[str, Any]:
+    """Validate an image and render its thumbnail (blocking)."""
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image_format = image.format
+            width, height = image.size
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((thumbnail_size, thumbnail_size))
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            thumb = io.BytesIO()
+            image.save(thumb, format="JPEG", quality=80, optimize=True)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise MediaError(f"Not a readable image: {e}")
+    return {
+        "content_type": Image.MIME.get(image_format, "application/octet-stream"),
+        "width": width,
+        "height": height,
+        "thumbnail": thumb.getvalue(),
+    }
+
+
+class MediaService:
+    """Ingest, dedupe and serve media for one database."""
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        backend=None,
+        max_bytes: int = 10 * 1024 * 1024,
+        thumbnail_size: int = 256,
+    ):
+        self.db = db
+        self.backend = backend or LocalMediaBackend(DEFAULT_MEDIA_DIR)
+        self.max_bytes = max_bytes
+        self.thumbnail_size = thumbnail_size
+
+    @property
+    def collection(self):
+        return self.db["media"]
+
+    @staticmethod
+    def reference(doc: dict[str, Any]) -> dict[str, Any]:
+        media_id = doc["_id"]
+        return {
+            "media_id": media_id,
+            "url": f"{MEDIA_URL_PREFIX}{media_id}",
+            "thumbnail_url": f"{MEDIA_URL_PREFIX}{media_id}/thumbnail",
+            "content_type": doc["content_type"],
+            "size": doc["size"],
+        }
+
+    async def get(self, media_id: str) -> Optional[dict[str, Any]]:
+        if not is_media_id(media_id):
+            return None
+        return await self.collection.find_one({"_id": media_id})
+
+    async def ingest(self, data: bytes, uploaded_by: Optional[str] = None) -> dict[str, Any]:
+        """Store ``data`` (once per distinct content) and return its reference."""
+        if not data:
+            raise MediaError("Empty upload")
+        if len(data) > self.max_bytes:
+            raise MediaError(f"Upload exceeds {self.max_bytes} bytes")
+
+        media_id = hashlib.sha256(data).hexdigest()
+        existing = await self.collection.find_one({"_id": media_id})
+        if existing:
+            return self.reference(existing)
+
+        info = await asyncio.to_thread(_inspect_image, data, self.thumbnail_size)
+        # Bytes may already be stored if an earlier ingest died before its metadata
+        if not await self.backend.exists(media_id):
+            await self.backend.put(media_id, data)
+        await self.backend.put(media_id + THUMBNAIL_SUFFIX, info["thumbnail"])
+        doc = {
+            "_id": media_id,
+            "content_type": info["content_type"],
+            "size": len(data),
+            "width": info["width"],
+            "height": info["height"],
+            "thumbnail_size": len(info["thumbnail"]),
+            "uploaded_by": uploaded_by,
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            await self.collection.insert_one(doc)
+        except DuplicateKeyError:
+            # Same content uploaded concurrently; the bytes are identical
+            pass
+        return self.reference(doc)
+
+    async def ingest_inline(
+        self, value: Any, uploaded_by: Optional[str] = None
+    ) -> Optional[dict[str, Any]]:
+        """Reference for an inline base64/data-URI photo; None if ``value`` is not one."""
+        data = decode_inline(value)
+        if data is None:
+            return None
+        try:
+            return await self.ingest(data, uploaded_by)
+        except MediaError as e:
+            logger.warning(f"Inline photo kept inline: {e}")
+            return None
+
+    async def externalize_count_line(
+        self, line: dict[str, Any], uploaded_by: Optional[str] = None
+    ) -> dict[str, Any]:
+        """Move ``photo_base64`` and data-URI ``photo_proofs`` out of a count line."""
+        if line.get("photo_base64"):
+            ref = await self.ingest_inline(line["photo_base64"], uploaded_by)
+            if ref:
+                line["photo"] = ref
+                line["photo_base64"] = None
+        for proof in line.get("photo_proofs") or []:
+            ref = await self.ingest_inline(proof.get("url"), uploaded_by)
+            if ref:
+                proof.update(
+                    url=ref["url"], media_id=ref["media_id"], thumbnail_url=ref["thumbnail_url"]
+                )
+        return line
+
+    async def externalize_urls(
+        self, values: list[str], uploaded_by: Optional[str] = None
+    ) -> list[str]:
+        """Replace inline photos in a list of photo URLs with media URLs."""
+        result = []
+        for value in values:
+            ref = await self.ingest_inline(value, uploaded_by)
+            result.append(ref["url"] if ref else value)
+        return result
+
+    async def stream(
+        self, media_id: str, start: int, end: int, thumbnail: bool = False
+    ) -> AsyncIterator[bytes]:
+        key = media_id + THUMBNAIL_SUFFIX if thumbnail else media_id
+        async for chunk in self.backend.iter_range(key, start, end):
+            yield chunk
+
+
+_backend = None
+
+
+def _build_backend(db: AsyncIOMotorDatabase):
+    from backend.config import settings
+
+    if getattr(settings, "MEDIA_STORE", "local") == "gridfs":
+        return GridFSMediaBackend(db)
+    return LocalMediaBackend(Path(getattr(settings, "MEDIA_DIR", None) or DEFAULT_MEDIA_DIR))
+
+
+def get_media_service(db: AsyncIOMotorDatabase) -> MediaService:
+    """MediaService for ``db`` using the configured backend."""
+    global _backend
+    from backend.config import settings
+
+    if _backend is None:
+        _backend = _build_backend(db)
+    return MediaService(
+        db,
+        _backend,
+        max_bytes=getattr(settings, "MEDIA_MAX_BYTES", 10 * 1024 * 1024),
+        thumbnail_size=getattr(settings, "MEDIA_THUMBNAIL_SIZE", 256),
+    )
+
+
+def set_media_backend(backend) -> None:
+    """Override the storage backend (tests, alternative stores)."""
+    global _backend
+    _backend = backend
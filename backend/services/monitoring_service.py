@@ -2,6 +2,9 @@
 Monitoring Service - Application metrics and health monitoring
 Tracks performance, errors, and system health
 Provides Prometheus-compatible metrics
+
+Request latency is kept in constant-memory histograms (overall and per
+method + route), so percentiles cover all traffic since start or reset.
 """
 
 import logging
@@ -10,6 +13,8 @@ from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
+from backend.services.histogram import ShardedHistogram, escape_label_value
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,7 +31,8 @@ class MonitoringService:
         self._request_count = 0
         self._error_count = 0
         self._total_response_time = 0.0
-        self._request_times: deque = deque(maxlen=history_size)
+        self._latency = ShardedHistogram()
+        self._route_latency: dict[tuple[str, str], ShardedHistogram] = {}
 
         # Per-endpoint metrics
         self._endpoint_metrics: dict[str, dict[str, Any]] = defaultdict(
@@ -59,18 +65,12 @@ class MonitoringService:
         duration: float = 0.0,
     ):
         """Track API request"""
+        self._latency.record(duration)
+        self._route_histogram(method, endpoint).record(duration)
+
         with self._lock:
             self._request_count += 1
             self._total_response_time += duration
-            self._request_times.append(
-                {
-                    "endpoint": endpoint,
-                    "method": method,
-                    "status_code": status_code,
-                    "duration": duration,
-                    "timestamp": datetime.utcnow().isoformat(),
-                }
-            )
 
             # Update endpoint metrics
             endpoint_key = f"{method} {endpoint}"
@@ -83,6 +83,14 @@ class MonitoringService:
                 metrics["errors"] += 1
                 self._error_count += 1
 
+    def _route_histogram(self, method: str, endpoint: str) -> ShardedHistogram:
+        key = (method, endpoint)
+        histogram = self._route_latency.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._route_latency.setdefault(key, ShardedHistogram())
+        return histogram
+
     def track_error(
         self, endpoint: str, error: Exception, context: dict[str, Optional[Any]] = None
     ):
@@ -123,20 +131,11 @@ class MonitoringService:
                 else 0.0
             )
 
-            # Calculate p50, p95, p99 response times
-            if self._request_times:
-                sorted_times = sorted(
-                    [r["duration"] for r in self._request_times], reverse=True
-                )
-                p50_idx = int(len(sorted_times) * 0.5)
-                p95_idx = int(len(sorted_times) * 0.95)
-                p99_idx = int(len(sorted_times) * 0.99)
-
-                p50 = sorted_times[p50_idx] if p50_idx < len(sorted_times) else 0
-                p95 = sorted_times[p95_idx] if p95_idx < len(sorted_times) else 0
-                p99 = sorted_times[p99_idx] if p99_idx < len(sorted_times) else 0
-            else:
-                p50 = p95 = p99 = 0
+            # p50, p95, p99 response times over all traffic
+            latency = self._latency.snapshot()
+            p50, p95, p99 = (latency.quantile(q) for q in (0.5, 0.95, 0.99))
+            endpoints = {key: dict(value) for key, value in self._endpoint_metrics.items()}
+            route_latency = list(self._route_latency.items())
 
             error_rate = (
                 (self._error_count / self._request_count) * 100
@@ -161,7 +160,11 @@ class MonitoringService:
                     "seconds": uptime,
                     "formatted": str(timedelta(seconds=int(uptime))),
                 },
-                "endpoints": dict(self._endpoint_metrics),
+                "endpoints": endpoints,
+                "latency": {
+                    f"{method} {endpoint}": histogram.snapshot().summary()
+                    for (method, endpoint), histogram in route_latency
+                },
                 "recent_errors": list(self._recent_errors)[-10:],  # Last 10 errors
             }
 
@@ -204,7 +207,8 @@ class MonitoringService:
             self._request_count = 0
             self._error_count = 0
             self._total_response_time = 0.0
-            self._request_times.clear()
+            self._latency.reset()
+            self._route_latency.clear()
             self._endpoint_metrics.clear()
             self._recent_errors.clear()
 
@@ -237,10 +241,24 @@ class MonitoringService:
                 else 0.0
             )
             lines.append(
-                "# HELP http_request_duration_seconds Average HTTP request duration"
+                "# HELP http_request_duration_average_seconds Average HTTP request duration"
             )
-            lines.append("# TYPE http_request_duration_seconds gauge")
-            lines.append(f"http_request_duration_seconds {avg_time:.6f}")
+            lines.append("# TYPE http_request_duration_average_seconds gauge")
+            lines.append(f"http_request_duration_average_seconds {avg_time:.6f}")
+            lines.append("")
+
+            # Latency histogram per method and route
+            lines.append(
+                "# HELP http_request_duration_seconds HTTP request duration by method and route"
+            )
+            lines.append("# TYPE http_request_duration_seconds histogram")
+            for (method, endpoint), histogram in self._route_latency.items():
+                lines.extend(
+                    histogram.snapshot().prometheus_lines(
+                        "http_request_duration_seconds",
+                        {"method": method, "route": endpoint},
+                    )
+                )
             lines.append("")
 
             # Per-endpoint metrics
@@ -248,7 +266,7 @@ class MonitoringService:
             lines.append("# TYPE http_requests_by_endpoint_total counter")
             for endpoint, metrics in self._endpoint_metrics.items():
                 # Escape labels
-                safe_endpoint = endpoint.replace('"', '\\"')
+                safe_endpoint = escape_label_value(endpoint)
                 lines.append(
                     f'http_requests_by_endpoint_total{{endpoint="{safe_endpoint}"}} {metrics["count"]}'
                 )
@@ -259,7 +277,7 @@ class MonitoringService:
             )
             lines.append("# TYPE http_request_duration_by_endpoint_seconds gauge")
             for endpoint, metrics in self._endpoint_metrics.items():
-                safe_endpoint = endpoint.replace('"', '\\"')
+                safe_endpoint = escape_label_value(endpoint)
                 lines.append(
                     f'http_request_duration_by_endpoint_seconds{{endpoint="{safe_endpoint}"}} {metrics["avg_time"]:.6f}'
                 )
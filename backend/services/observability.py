@@ -15,6 +15,8 @@ from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
+from backend.services.histogram import Histogram
+
 # Context variables for request tracing
 request_id_ctx: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 correlation_id_ctx: ContextVar[Optional[str]] = ContextVar(
@@ -295,7 +297,9 @@ class MetricsCollector:
         self.service_name = service_name
         self._counters: dict[str, int] = {}
         self._gauges: dict[str, float] = {}
-        self._histograms: dict[str, list[float]] = {}
+        # Constant-memory histograms plus the (name, labels) they were created with
+        self._histograms: dict[str, Histogram] = {}
+        self._histogram_series: dict[str, tuple[str, dict[str, str]]] = {}
         self._lock = asyncio.Lock()
 
     async def increment(
@@ -319,13 +323,15 @@ class MetricsCollector:
     ):
         """Record a histogram observation"""
         key = self._make_key(name, labels)
-        async with self._lock:
-            if key not in self._histograms:
-                self._histograms[key] = []
-            self._histograms[key].append(value)
-            # Keep last 1000 observations
-            if len(self._histograms[key]) > 1000:
-                self._histograms[key] = self._histograms[key][-1000:]
+        # O(1) and no await, so no lock is needed on the event loop
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram()
+            self._histogram_series[key] = (
+                name,
+                {k: str(v) for k, v in sorted((labels or {}).items())},
+            )
+        histogram.record(value)
 
     def _make_key(self, name: str, labels: Optional[dict[str, Optional[str]]]) -> str:
         """Create metric key from name and labels"""
@@ -340,16 +346,7 @@ class MetricsCollector:
             return {
                 "counters": dict(self._counters),
                 "gauges": dict(self._gauges),
-                "histograms": {
-                    k: {
-                        "count": len(v),
-                        "sum": sum(v),
-                        "min": min(v) if v else 0,
-                        "max": max(v) if v else 0,
-                        "avg": sum(v) / len(v) if v else 0,
-                    }
-                    for k, v in self._histograms.items()
-                },
+                "histograms": {k: v.summary() for k, v in self._histograms.items()},
             }
 
     def to_prometheus(self) -> str:
@@ -362,11 +359,16 @@ class MetricsCollector:
         for gauge_name, gauge_value in self._gauges.items():
             lines.append(f"{self._to_prometheus_name(gauge_name)} {gauge_value}")
 
-        for hist_name, hist_values in self._histograms.items():
-            if hist_values:
-                prom_name = self._to_prometheus_name(hist_name)
-                lines.append(f"{prom_name}_count {len(hist_values)}")
-                lines.append(f"{prom_name}_sum {sum(hist_values)}")
+        typed: set[str] = set()
+        # Group series so each metric family is contiguous
+        series = sorted(self._histograms.items(), key=lambda kv: self._histogram_series[kv[0]][0])
+        for key, histogram in series:
+            name, labels = self._histogram_series[key]
+            prom_name = self._to_prometheus_name(name)
+            if prom_name not in typed:
+                typed.add(prom_name)
+                lines.append(f"# TYPE {prom_name} histogram")
+            lines.extend(histogram.prometheus_lines(prom_name, labels))
 
         return "\n".join(lines)
 
@@ -0,0 +1,424 @@
+"""
+Sampling Profiler
+Opt-in statistical profiler for hot request paths.
+
+A daemon thread samples the event loop thread's Python stack every few
+milliseconds and attributes each sample to the request whose asyncio task is
+running at that moment. Samples are stored as collapsed stacks
+(``frame;frame;frame weight``) that flamegraph.pl or speedscope can render.
+
+Two modes:
+
+- per request: an ``X-Profile: 1`` header (when allowed) or an admin "arm"
+  for the next N requests under a path prefix; samples at the fine interval
+  and keeps the full profile for inspection
+- continuous: every request is sampled at a coarser interval and merged into
+  a per-route profile
+
+Alongside CPU samples each profile records how long the request spent in
+MongoDB commands (from a pymongo ``CommandListener``; Motor runs commands with
+the request's context), so wall time splits into Mongo vs Python CPU vs other
+waiting.
+"""
+
+import asyncio
+import contextvars
+import itertools
+import logging
+import sys
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+_current_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "profiler_request", default=None
+)
+
+# Leading event-loop/server frames that every sample shares
+_LOOP_MODULE_PREFIXES = (
+    "asyncio",
+    "uvloop",
+    "threading",
+    "runpy",
+    "__main__",
+    "uvicorn.main",
+    "uvicorn.server",
+    "click",
+)
+_MAX_STACK_DEPTH = 128
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def collapse_stack(frame) -> str:
+    """Root-first ``;``-joined stack with shared event loop frames trimmed."""
+    labels = []
+    while frame is not None and len(labels) < _MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    start = 0
+    while start < len(labels) - 1 and labels[start].startswith(_LOOP_MODULE_PREFIXES):
+        start += 1
+    return ";".join(labels[start:])
+
+
+class StackProfile:
+    """Collapsed stacks weighted by sampled microseconds."""
+
+    def __init__(self, max_stacks: int = 5000):
+        self.max_stacks = max_stacks
+        self.stacks: dict[str, int] = {}
+        self.total_us = 0
+
+    def add(self, stack: str, weight_us: int) -> None:
+        self.total_us += weight_us
+        self._add_stack(stack, weight_us)
+
+    def _add_stack(self, stack: str, weight_us: int) -> None:
+        if stack not in self.stacks and len(self.stacks) >= self.max_stacks:
+            stack = "(truncated)"
+        self.stacks[stack] = self.stacks.get(stack, 0) + weight_us
+
+    def merge(self, other: "StackProfile") -> None:
+        self.total_us += other.total_us
+        for stack, weight in list(other.stacks.items()):
+            self._add_stack(stack, weight)
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed format, heaviest stacks first."""
+        ordered = sorted(self.stacks.items(), key=lambda kv: kv[1], reverse=True)
+        return "\n".join(f"{stack} {weight}" for stack, weight in ordered)
+
+    def top(self, limit: int = 10) -> list[dict[str, Any]]:
+        ordered = sorted(self.stacks.items(), key=lambda kv: kv[1], reverse=True)
+        return [
+            {"stack": stack, "ms": round(weight / 1000, 2)} for stack, weight in ordered[:limit]
+        ]
+
+
+@dataclass
+class RequestProfile:
+    id: int
+    method: str
+    path: str
+    detailed: bool
+    route: Optional[str] = None
+    started: float = field(default_factory=time.time)
+    wall_ms: float = 0.0
+    mongo_ms: float = 0.0
+    mongo_commands: int = 0
+    status_code: Optional[int] = None
+    samples: StackProfile = field(default_factory=StackProfile)
+    _token: Any = field(default=None, repr=False)
+
+    @property
+    def cpu_ms(self) -> float:
+        return self.samples.total_us / 1000
+
+    def breakdown(self) -> dict[str, float]:
+        other = max(self.wall_ms - self.mongo_ms - self.cpu_ms, 0.0)
+        return {
+            "wall_ms": round(self.wall_ms, 2),
+            "mongo_ms": round(self.mongo_ms, 2),
+            "cpu_ms": round(self.cpu_ms, 2),
+            "other_ms": round(other, 2),
+        }
+
+    def to_dict(self, include_stacks: bool = False) -> dict[str, Any]:
+        data = {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status_code": self.status_code,
+            "started": self.started,
+            "mongo_commands": self.mongo_commands,
+            **self.breakdown(),
+            "top_stacks": self.samples.top(),
+        }
+        if include_stacks:
+            data["collapsed"] = self.samples.collapsed()
+        return data
+
+
+@dataclass
+class RouteProfile:
+    requests: int = 0
+    wall_ms: float = 0.0
+    mongo_ms: float = 0.0
+    mongo_commands: int = 0
+    samples: StackProfile = field(default_factory=StackProfile)
+
+    def add(self, profile: RequestProfile) -> None:
+        self.requests += 1
+        self.wall_ms += profile.wall_ms
+        self.mongo_ms += profile.mongo_ms
+        self.mongo_commands += profile.mongo_commands
+        self.samples.merge(profile.samples)
+
+    def summary(self) -> dict[str, Any]:
+        cpu_ms = self.samples.total_us / 1000
+        return {
+            "requests": self.requests,
+            "wall_ms": round(self.wall_ms, 2),
+            "mongo_ms": round(self.mongo_ms, 2),
+            "cpu_ms": round(cpu_ms, 2),
+            "other_ms": round(max(self.wall_ms - self.mongo_ms - cpu_ms, 0.0), 2),
+            "mongo_commands": self.mongo_commands,
+            "avg_wall_ms": round(self.wall_ms / self.requests, 2) if self.requests else 0.0,
+        }
+
+
+class SamplingProfiler:
+    """Samples the event loop thread and files stacks under the running request."""
+
+    def __init__(
+        self,
+        interval_ms: float = 5.0,
+        continuous_interval_ms: float = 20.0,
+        max_profiles: int = 50,
+        allow_header: bool = False,
+        continuous: bool = False,
+    ):
+        self.interval = interval_ms / 1000
+        self.continuous_interval = continuous_interval_ms / 1000
+        self.allow_header = allow_header
+        self.continuous = continuous
+        self.routes: dict[str, RouteProfile] = {}
+        self.recent: deque[RequestProfile] = deque(maxlen=max_profiles)
+        self.samples_taken = 0
+
+        self._ids = itertools.count(1)
+        self._armed: dict[str, int] = {}
+        self._active: dict[int, RequestProfile] = {}
+        self._task_profiles: "weakref.WeakKeyDictionary[asyncio.Task, RequestProfile]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._previous_factory = None
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stopping = False
+        self._lock = threading.Lock()
+
+    # Activation --------------------------------------------------------
+
+    def arm(self, path_prefix: str, count: int = 1) -> None:
+        """Profile the next ``count`` requests whose path starts with ``path_prefix``."""
+        with self._lock:
+            self._armed[path_prefix] = self._armed.get(path_prefix, 0) + count
+
+    def set_continuous(self, enabled: bool) -> None:
+        self.continuous = enabled
+        self._wake.set()
+
+    def _take_armed(self, path: str) -> bool:
+        with self._lock:
+            for prefix, remaining in self._armed.items():
+                if path.startswith(prefix):
+                    if remaining <= 1:
+                        del self._armed[prefix]
+                    else:
+                        self._armed[prefix] = remaining - 1
+                    return True
+        return False
+
+    def wants(self, path: str, header: Optional[str]) -> Optional[bool]:
+        """None if the request is not profiled, else whether it gets a detailed profile."""
+        detailed = bool(header and self.allow_header and header.lower() in ("1", "true"))
+        if not detailed and self._armed:
+            detailed = self._take_armed(path)
+        if detailed:
+            return True
+        return False if self.continuous else None
+
+    # Request lifecycle (event loop thread) ------------------------------
+
+    def begin(self, method: str, path: str, detailed: bool) -> RequestProfile:
+        self._ensure_attached()
+        profile = RequestProfile(next(self._ids), method, path, detailed)
+        profile._token = _current_profile.set(profile)
+        task = asyncio.current_task()
+        if task is not None:
+            self._task_profiles[task] = profile
+        self._active[profile.id] = profile
+        self._wake.set()
+        return profile
+
+    def end(self, profile: RequestProfile, route: Optional[str], status_code: Optional[int]) -> None:
+        profile.wall_ms = (time.time() - profile.started) * 1000
+        profile.route = route or profile.path
+        profile.status_code = status_code
+        self._active.pop(profile.id, None)
+        task = asyncio.current_task()
+        if task is not None:
+            self._task_profiles.pop(task, None)
+        _current_profile.reset(profile._token)
+
+        key = f"{profile.method} {profile.route}"
+        with self._lock:
+            self.routes.setdefault(key, RouteProfile()).add(profile)
+            if profile.detailed:
+                self.recent.append(profile)
+
+    def _ensure_attached(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._thread is not None:
+            return
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        # Tasks spawned while a request is profiled (e.g. by BaseHTTPMiddleware)
+        # inherit its profile
+        self._previous_factory = loop.get_task_factory()
+        loop.set_task_factory(self._task_factory)
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._sample_loop, name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+
+    def _task_factory(self, loop, coro, **kwargs):
+        if self._previous_factory is not None:
+            task = self._previous_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        profile = _current_profile.get()
+        if profile is not None:
+            self._task_profiles[task] = profile
+        return task
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._wake.set()
+        if self._loop is not None and self._loop.get_task_factory() == self._task_factory:
+            self._loop.set_task_factory(self._previous_factory)
+        self._thread = None
+
+    # Sampler thread -------------------------------------------------------
+
+    def _sample_loop(self) -> None:
+        last = time.perf_counter()
+        # A restarted profiler replaces this thread; the old one exits
+        while not self._stopping and self._thread is threading.current_thread():
+            if not self._active:
+                self._wake.clear()
+                self._wake.wait()
+                last = time.perf_counter()
+                continue
+            detailed = any(p.detailed for p in list(self._active.values()))
+            time.sleep(self.interval if detailed else self.continuous_interval)
+            now = time.perf_counter()
+            self._sample(int((now - last) * 1_000_000))
+            last = now
+
+    def _sample(self, weight_us: int) -> None:
+        loop, thread_id = self._loop, self._loop_thread_id
+        if loop is None or thread_id is None:
+            return
+        current_tasks = getattr(asyncio.tasks, "_current_tasks", None)
+        task = current_tasks.get(loop) if current_tasks is not None else None
+        if task is None:
+            return  # Loop is idle or running plain callbacks
+        profile = self._task_profiles.get(task)
+        if profile is None:
+            return
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            return
+        profile.samples.add(collapse_stack(frame), weight_us)
+        self.samples_taken += 1
+
+    # Mongo attribution ----------------------------------------------------
+
+    @staticmethod
+    def record_mongo(duration_micros: int) -> None:
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.mongo_ms += duration_micros / 1000
+            profile.mongo_commands += 1
+
+    # Reporting ------------------------------------------------------------
+
+    def get_summary(self) -> dict[str, Any]:
+        with self._lock:
+            routes = {key: value.summary() for key, value in self.routes.items()}
+            recent = [p.to_dict() for p in self.recent]
+            armed = dict(self._armed)
+        ordered = dict(sorted(routes.items(), key=lambda kv: kv[1]["wall_ms"], reverse=True))
+        return {
+            "continuous": self.continuous,
+            "header_enabled": self.allow_header,
+            "interval_ms": self.interval * 1000,
+            "continuous_interval_ms": self.continuous_interval * 1000,
+            "armed": armed,
+            "active_requests": len(self._active),
+            "samples_taken": self.samples_taken,
+            "routes": ordered,
+            "recent_profiles": recent,
+        }
+
+    def get_profile(self, profile_id: int) -> Optional[RequestProfile]:
+        with self._lock:
+            return next((p for p in self.recent if p.id == profile_id), None)
+
+    def route_collapsed(self, route: str) -> Optional[str]:
+        with self._lock:
+            profile = self.routes.get(route)
+            return profile.samples.collapsed() if profile else None
+
+    def reset(self) -> None:
+        with self._lock:
+            self.routes.clear()
+            self.recent.clear()
+            self._armed.clear()
+            self.samples_taken = 0
+
+
+class ProfilerCommandListener(monitoring.CommandListener):
+    """Adds MongoDB command time to the profile of the request that issued it."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        SamplingProfiler.record_mongo(event.duration_micros)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        SamplingProfiler.record_mongo(event.duration_micros)
+
+
+def _build_profiler() -> SamplingProfiler:
+    try:
+        from backend.config import settings
+
+        return SamplingProfiler(
+            interval_ms=getattr(settings, "PROFILER_SAMPLE_INTERVAL_MS", 5.0),
+            continuous_interval_ms=getattr(settings, "PROFILER_CONTINUOUS_INTERVAL_MS", 20.0),
+            max_profiles=getattr(settings, "PROFILER_MAX_PROFILES", 50),
+            allow_header=getattr(settings, "PROFILER_ALLOW_HEADER", False),
+            continuous=getattr(settings, "PROFILER_CONTINUOUS", False),
+        )
+    except Exception:
+        return SamplingProfiler()
+
+
+profiler = _build_profiler()
+
+
+def profiler_command_listener() -> ProfilerCommandListener:
+    """Listener for ``AsyncIOMotorClient(event_listeners=[...])``."""
+    return ProfilerCommandListener()
@@ -0,0 +1,459 @@
+"""
+Query Monitor
+Per-query-shape MongoDB latency from driver command monitoring.
+
+A pymongo ``CommandListener`` sees every command this process sends, so no
+call site needs decorating. Commands are grouped by (database, collection,
+command, shape), where the shape is the filter/pipeline with every value
+replaced by ``"?"``. Each group keeps a latency histogram, docs returned or
+affected, and a few slow samples. ``getMore`` batches are credited to the
+shape that opened the cursor.
+
+For the groups with the most total time, ``explain`` (queryPlanner only, the
+query is not executed) is sampled on demand to flag shapes that scan the
+whole collection.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from pymongo import monitoring
+
+from backend.services.histogram import Histogram, escape_label_value
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER = "?"
+
+# Handshake, auth and session housekeeping are not queries
+_IGNORED_COMMANDS = frozenset(
+    {
+        "hello",
+        "ismaster",
+        "isMaster",
+        "ping",
+        "buildInfo",
+        "saslStart",
+        "saslContinue",
+        "endSessions",
+        "killCursors",
+        "explain",
+        "getLastError",
+        "listIndexes",
+        "createIndexes",
+    }
+)
+_EXPLAINABLE = frozenset({"find", "aggregate", "count", "distinct", "update", "delete"})
+_ARRAY_OPERATORS = frozenset({"$in", "$nin", "$all"})
+_LOGICAL_OPERATORS = frozenset({"$and", "$or", "$nor"})
+# Operators whose literal argument changes the plan, not just the bounds
+_LITERAL_OPERATORS = frozenset({"$exists", "$type"})
+_OTHER_SHAPE = "(other)"
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def normalize_shape(value: Any) -> Any:
+    """Replace every literal in a filter with ``"?"``, keeping fields and operators."""
+    if isinstance(value, Mapping):
+        return {key: _normalize_field(key, value[key]) for key in sorted(value)}
+    if isinstance(value, (list, tuple)):
+        return [PLACEHOLDER]
+    return PLACEHOLDER
+
+
+def _normalize_field(key: str, value: Any) -> Any:
+    if key in _LOGICAL_OPERATORS and isinstance(value, (list, tuple)):
+        shapes = {_dumps(normalize_shape(v)): normalize_shape(v) for v in value}
+        return [shapes[k] for k in sorted(shapes)]
+    if key in _ARRAY_OPERATORS:
+        return [PLACEHOLDER]
+    if key in _LITERAL_OPERATORS:
+        return value
+    return normalize_shape(value)
+
+
+def _sort_shape(sort: Any) -> Any:
+    return dict(sort) if isinstance(sort, Mapping) else None
+
+
+def _stage_shape(stage: Mapping) -> dict[str, Any]:
+    name = next(iter(stage), "?")
+    body = stage[name] if name in stage else None
+    if name == "$match":
+        return {name: normalize_shape(body)}
+    if name == "$sort":
+        return {name: _sort_shape(body)}
+    if name == "$lookup" and isinstance(body, Mapping):
+        return {name: {"from": body.get("from")}}
+    return {name: PLACEHOLDER}
+
+
+def command_shape(command_name: str, command: Mapping) -> Optional[tuple[str, dict[str, Any]]]:
+    """(collection, shape) for a command, or None for commands we do not group."""
+    collection = command.get(command_name)
+    if not isinstance(collection, str):
+        return None
+    if command_name == "find":
+        shape = {"filter": normalize_shape(command.get("filter") or {})}
+        if command.get("sort"):
+            shape["sort"] = _sort_shape(command["sort"])
+    elif command_name == "aggregate":
+        shape = {"pipeline": [_stage_shape(s) for s in command.get("pipeline", []) if s]}
+    elif command_name == "count":
+        shape = {"query": normalize_shape(command.get("query") or {})}
+    elif command_name == "distinct":
+        shape = {"key": command.get("key"), "query": normalize_shape(command.get("query") or {})}
+    elif command_name == "update":
+        updates = command.get("updates") or [{}]
+        shape = {
+            "q": normalize_shape(updates[0].get("q") or {}),
+            "multi": bool(updates[0].get("multi")),
+        }
+    elif command_name == "delete":
+        deletes = command.get("deletes") or [{}]
+        shape = {"q": normalize_shape(deletes[0].get("q") or {})}
+    elif command_name == "findAndModify":
+        shape = {"query": normalize_shape(command.get("query") or {})}
+        if command.get("sort"):
+            shape["sort"] = _sort_shape(command["sort"])
+    else:
+        shape = {}
+    return collection, shape
+
+
+def _explain_target(command_name: str, command: Mapping) -> Optional[dict[str, Any]]:
+    """The parts of a command ``explain`` needs (no session/cluster fields)."""
+    if command_name not in _EXPLAINABLE:
+        return None
+    keys = {
+        "find": ("find", "filter", "sort", "projection", "hint"),
+        "aggregate": ("aggregate", "pipeline", "hint"),
+        "count": ("count", "query", "hint"),
+        "distinct": ("distinct", "key", "query"),
+        "update": ("update", "updates"),
+        "delete": ("delete", "deletes"),
+    }[command_name]
+    target = {k: command[k] for k in keys if k in command}
+    # Bulk writes can carry thousands of statements; the first shares the shape
+    for statements in ("updates", "deletes"):
+        if target.get(statements):
+            target[statements] = list(target[statements][:1])
+    if command_name == "aggregate":
+        target["cursor"] = {}
+    return target
+
+
+def _plan_stages(plan: Any) -> list[str]:
+    stages: list[str] = []
+    if isinstance(plan, Mapping):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for key in ("inputStage", "queryPlan"):
+            stages.extend(_plan_stages(plan.get(key)))
+        for child in plan.get("inputStages", []) or []:
+            stages.extend(_plan_stages(child))
+    return stages
+
+
+def summarize_explain(result: Mapping) -> dict[str, Any]:
+    """Winning plan stages and whether the shape scans the collection."""
+    planner = result.get("queryPlanner")
+    if planner is None:
+        # aggregate explain nests the planner under the first $cursor stage
+        for stage in result.get("stages", []) or []:
+            cursor = stage.get("$cursor") if isinstance(stage, Mapping) else None
+            if cursor:
+                planner = cursor.get("queryPlanner")
+                break
+    winning = (planner or {}).get("winningPlan", {})
+    stages = _plan_stages(winning)
+    return {"stages": stages, "unindexed": "COLLSCAN" in stages}
+
+
+@dataclass
+class ShapeStats:
+    database: str
+    collection: str
+    command: str
+    shape: str
+    count: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    docs_returned: int = 0
+    docs_affected: int = 0
+    latency: Histogram = field(default_factory=Histogram)
+    slow_samples: deque = field(default_factory=lambda: deque(maxlen=5))
+    last_seen: float = 0.0
+    # Last real command, used only for explain; never returned by the API
+    explain_target: Optional[dict[str, Any]] = field(default=None, repr=False)
+    explain: Optional[dict[str, Any]] = None
+    explained_at: float = 0.0
+
+    @property
+    def shape_id(self) -> str:
+        key = f"{self.database}.{self.collection}.{self.command}.{self.shape}"
+        return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.shape_id,
+            "database": self.database,
+            "collection": self.collection,
+            "command": self.command,
+            "shape": json.loads(self.shape),
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p95_ms": round(self.latency.quantile(0.95) * 1000, 3),
+            "docs_returned": self.docs_returned,
+            "docs_affected": self.docs_affected,
+            "slow_samples": list(self.slow_samples),
+            "explain": self.explain,
+        }
+
+
+@dataclass
+class _Pending:
+    key: tuple[str, str, str, str]
+    explain_target: Optional[dict[str, Any]]
+    cursor_id: Optional[int] = None
+
+
+class QueryMonitor(monitoring.CommandListener):
+    """Aggregates command latency per query shape (thread-safe; called by the driver)."""
+
+    def __init__(
+        self, slow_ms: float = 100.0, max_shapes: int = 1000, explain_ttl_seconds: float = 300.0
+    ):
+        self.slow_ms = slow_ms
+        self.max_shapes = max_shapes
+        self.explain_ttl_seconds = explain_ttl_seconds
+        self._shapes: dict[tuple[str, str, str, str], ShapeStats] = {}
+        self._pending: dict[tuple[Any, int], _Pending] = {}
+        # Open cursors -> shape that created them, so getMore time is attributed
+        self._cursors: dict[int, tuple[str, str, str, str]] = {}
+        self._lock = threading.Lock()
+
+    # CommandListener ----------------------------------------------------
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        name = event.command_name
+        if name in _IGNORED_COMMANDS:
+            return
+        try:
+            if name == "getMore":
+                cursor_id = event.command.get("getMore")
+                with self._lock:
+                    key = self._cursors.get(cursor_id)
+                if key is None:
+                    return
+                pending = _Pending(key, None, cursor_id)
+            else:
+                parsed = command_shape(name, event.command)
+                if parsed is None:
+                    return
+                collection, shape = parsed
+                key = (event.database_name, collection, name, _dumps(shape))
+                pending = _Pending(key, _explain_target(name, event.command))
+        except Exception:
+            logger.debug("Query monitor could not shape command", exc_info=True)
+            return
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = pending
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, event.reply, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, None, failed=True)
+
+    def _finish(self, event, reply: Optional[Mapping], failed: bool) -> None:
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+            if pending is None:
+                return
+            stats = self._stats_for(pending.key)
+            duration_ms = event.duration_micros / 1000
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.last_seen = time.time()
+            stats.latency.record(duration_ms / 1000)
+            if pending.explain_target is not None:
+                stats.explain_target = pending.explain_target
+            if failed:
+                stats.errors += 1
+            elif reply is not None:
+                returned, affected = self._reply_docs(reply, pending.key, pending.cursor_id)
+                stats.docs_returned += returned
+                stats.docs_affected += affected
+            if duration_ms >= self.slow_ms:
+                stats.slow_samples.append(
+                    {"ms": round(duration_ms, 3), "at": stats.last_seen, "failed": failed}
+                )
+
+    def _reply_docs(
+        self, reply: Mapping, key: tuple[str, str, str, str], pending_cursor: Optional[int]
+    ) -> tuple[int, int]:
+        cursor = reply.get("cursor")
+        if isinstance(cursor, Mapping):
+            batch = cursor.get("firstBatch", cursor.get("nextBatch")) or []
+            cursor_id = cursor.get("id")
+            if cursor_id:
+                self._cursors[cursor_id] = key
+                # Bound the map if cursors are abandoned without exhaustion
+                while len(self._cursors) > self.max_shapes * 4:
+                    self._cursors.pop(next(iter(self._cursors)))
+            elif cursor_id is not None and pending_cursor:
+                self._cursors.pop(pending_cursor, None)
+            return len(batch), 0
+        if key[2] in ("update", "delete", "findAndModify", "insert"):
+            return 0, int(reply.get("n", 0) or 0)
+        if key[2] == "count":
+            return int(reply.get("n", 0) or 0), 0
+        if key[2] == "distinct":
+            return len(reply.get("values", []) or []), 0
+        return 0, 0
+
+    def _stats_for(self, key: tuple[str, str, str, str]) -> ShapeStats:
+        stats = self._shapes.get(key)
+        if stats is None:
+            if len(self._shapes) >= self.max_shapes:
+                key = (key[0], key[1], key[2], _dumps(_OTHER_SHAPE))
+                stats = self._shapes.get(key)
+            if stats is None:
+                stats = ShapeStats(key[0], key[1], key[2], key[3])
+                self._shapes[key] = stats
+        return stats
+
+    # Reporting ----------------------------------------------------------
+
+    def top(self, limit: int = 20, sort: str = "total_ms") -> list[ShapeStats]:
+        with self._lock:
+            shapes = list(self._shapes.values())
+        return sorted(shapes, key=lambda s: getattr(s, sort, 0), reverse=True)[:limit]
+
+    def get_stats(self, limit: int = 20, sort: str = "total_ms") -> dict[str, Any]:
+        shapes = self.top(limit, sort)
+        with self._lock:
+            return {
+                "slow_ms": self.slow_ms,
+                "shapes_tracked": len(self._shapes),
+                "shapes": [s.to_dict() for s in shapes],
+            }
+
+    async def explain_top(self, db, limit: int = 5) -> list[dict[str, Any]]:
+        """Run queryPlanner ``explain`` for the most expensive shapes (cached for a TTL)."""
+        results = []
+        now = time.time()
+        for stats in self.top(limit):
+            target = stats.explain_target
+            if target is None or stats.database != db.name:
+                continue
+            if stats.explain is None or now - stats.explained_at > self.explain_ttl_seconds:
+                try:
+                    reply = await db.command({"explain": target, "verbosity": "queryPlanner"})
+                    stats.explain = summarize_explain(reply)
+                except Exception as e:
+                    stats.explain = {"error": str(e)}
+                stats.explained_at = now
+                if stats.explain.get("unindexed"):
+                    logger.warning(
+                        f"Unindexed query shape on {stats.collection}.{stats.command}: "
+                        f"{stats.shape} ({stats.count} calls, {stats.total_ms:.0f}ms total)"
+                    )
+            results.append({"id": stats.shape_id, **stats.explain})
+        return results
+
+    def prometheus_lines(self, limit: int = 50) -> list[str]:
+        """Per (collection, command) histograms plus per-shape totals for the top shapes."""
+        with self._lock:
+            shapes = list(self._shapes.values())
+        families: dict[tuple[str, str], Histogram] = {}
+        for stats in shapes:
+            families.setdefault((stats.collection, stats.command), Histogram()).merge(stats.latency)
+
+        lines = [
+            "# HELP mongodb_command_duration_seconds "
+            "MongoDB command duration by collection and command",
+            "# TYPE mongodb_command_duration_seconds histogram",
+        ]
+        for (collection, command), histogram in sorted(families.items()):
+            lines.extend(
+                histogram.prometheus_lines(
+                    "mongodb_command_duration_seconds",
+                    {"collection": collection, "command": command},
+                )
+            )
+
+        top = sorted(shapes, key=lambda s: s.total_ms, reverse=True)[:limit]
+        lines.append("# HELP mongodb_query_shape_seconds_total Time spent per query shape")
+        lines.append("# TYPE mongodb_query_shape_seconds_total counter")
+        for stats in top:
+            lines.append(
+                f"mongodb_query_shape_seconds_total{{{self._shape_labels(stats)}}} "
+                f"{stats.total_ms / 1000:.6f}"
+            )
+        lines.append(
+            "# HELP mongodb_query_shape_unindexed Shape's sampled plan scans the collection"
+        )
+        lines.append("# TYPE mongodb_query_shape_unindexed gauge")
+        for stats in top:
+            if stats.explain and "unindexed" in stats.explain:
+                lines.append(
+                    f"mongodb_query_shape_unindexed{{{self._shape_labels(stats)}}} "
+                    f'{int(stats.explain["unindexed"])}'
+                )
+        return lines
+
+    @staticmethod
+    def _shape_labels(stats: ShapeStats) -> str:
+        return (
+            f'collection="{escape_label_value(stats.collection)}",'
+            f'command="{stats.command}",shape="{stats.shape_id}"'
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+            self._cursors.clear()
+
+
+def _build_query_monitor() -> QueryMonitor:
+    try:
+        from backend.config import settings
+
+        return QueryMonitor(
+            slow_ms=getattr(settings, "QUERY_MONITOR_SLOW_MS", 100.0),
+            max_shapes=getattr(settings, "QUERY_MONITOR_MAX_SHAPES", 1000),
+        )
+    except Exception:
+        return QueryMonitor()
+
+
+query_monitor = _build_query_monitor()
+
+
+def query_monitor_listener() -> Optional[QueryMonitor]:
+    """The shared monitor, or None when QUERY_MONITOR_ENABLED is off."""
+    try:
+        from backend.config import settings
+
+        if not getattr(settings, "QUERY_MONITOR_ENABLED", True):
+            return None
+    except Exception:
+        pass
+    return query_monitor
@@ -1,22 +1,272 @@
 """
 Compare Engine - Compare two snapshots
 Identifies differences, trends, and changes
+
+Rows are keyed by the snapshot's group_by fields and hash-partitioned (on
+disk once a snapshot is larger than ``COMPARE_PARTITION_ROWS``). Each
+partition is sorted by key and merge-joined, so memory is bounded by one
+partition rather than both snapshots. The job keeps counts plus the first
+added/removed rows and the largest changes; every diff is written in
+compressed pages to ``report_compare_diffs`` and read back with
+``get_comparison_diffs``.
 """
 
+import asyncio
+import heapq
 import logging
+import math
+import struct
+import tempfile
 import time
+import uuid
+import zlib
+from collections.abc import AsyncIterable, Iterable, Iterator
+from operator import itemgetter
+from pathlib import Path
 from typing import Any, Optional
 
+import bson
+
+from backend.config import settings
+from backend.services.reporting.snapshot_engine import SnapshotEngine
+from backend.services.reporting.snapshot_storage import decode_chunk, encode_chunk
+
 logger = logging.getLogger(__name__)
 
+DIFFS_COLLECTION = "report_compare_diffs"
+CHANGE_TYPES = ("added", "removed", "changed")
+SAMPLE_SIZE = 100
+DIFF_PAGE_ROWS = 500
+SPILL_CHUNK_ROWS = 500
+_LENGTH = struct.Struct("<I")
+
+KeyedRow = tuple[str, dict[str, Any]]
+
+
+def row_key(row: dict[str, Any], group_by: list[str]) -> str:
+    """Join key of a snapshot row"""
+    if not group_by:
+        # No grouping, use entire row as key
+        return str(row)
+    # Grouped data keeps the group fields under _id
+    source = row.get("_id")
+    if not isinstance(source, dict):
+        source = row
+    return "|".join([str(source.get(field, "")) for field in group_by])
+
+
+def sorted_unique(entries: list[KeyedRow]) -> list[KeyedRow]:
+    """Sort by key; when a key repeats the last row wins"""
+    entries.sort(key=itemgetter(0))
+    result: list[KeyedRow] = []
+    for entry in entries:
+        if result and result[-1][0] == entry[0]:
+            result[-1] = entry
+        else:
+            result.append(entry)
+    return result
+
+
+def merge_join(
+    side_a: Iterable[KeyedRow], side_b: Iterable[KeyedRow]
+) -> Iterator[tuple[str, str, Optional[dict], Optional[dict]]]:
+    """
+    Merge two key-sorted, key-unique streams
+
+    Yields ``(change_type, key, row_a, row_b)`` with change_type one of
+    added, removed, changed or unchanged.
+    """
+    iter_a, iter_b = iter(side_a), iter(side_b)
+    a, b = next(iter_a, None), next(iter_b, None)
+    while a is not None and b is not None:
+        if a[0] < b[0]:
+            yield "removed", a[0], a[1], None
+            a = next(iter_a, None)
+        elif a[0] > b[0]:
+            yield "added", b[0], None, b[1]
+            b = next(iter_b, None)
+        else:
+            yield ("unchanged" if a[1] == b[1] else "changed"), a[0], a[1], b[1]
+            a, b = next(iter_a, None), next(iter_b, None)
+    while a is not None:
+        yield "removed", a[0], a[1], None
+        a = next(iter_a, None)
+    while b is not None:
+        yield "added", b[0], None, b[1]
+        b = next(iter_b, None)
+
+
+class _KeyPartitioner:
+    """
+    Hash-partitions one snapshot's keyed rows
+
+    With one partition rows stay in memory; otherwise each partition is a
+    file of length-prefixed ``encode_chunk`` blocks.
+    """
+
+    def __init__(self, partitions: int, directory: Optional[Path] = None, label: str = "a"):
+        self.partitions = max(1, partitions)
+        self.directory = directory
+        self.label = label
+        self._buffers: list[list[dict[str, Any]]] = [[] for _ in range(self.partitions)]
+
+    def _path(self, partition: int) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{self.label}{partition:04d}.bin"
+
+    def _append(self, partition: int, block: bytes) -> None:
+        with open(self._path(partition), "ab") as fh:
+            fh.write(_LENGTH.pack(len(block)))
+            fh.write(block)
+
+    async def _spill(self, partition: int) -> None:
+        block = encode_chunk(self._buffers[partition])
+        self._buffers[partition] = []
+        await asyncio.to_thread(self._append, partition, block)
+
+    async def add_all(self, rows: AsyncIterable[dict[str, Any]], group_by: list[str]) -> int:
+        count = 0
+        async for row in rows:
+            key = row_key(row, group_by)
+            partition = zlib.crc32(key.encode("utf-8")) % self.partitions
+            self._buffers[partition].append({"k": key, "r": row})
+            count += 1
+            if self.partitions > 1 and len(self._buffers[partition]) >= SPILL_CHUNK_ROWS:
+                await self._spill(partition)
+        if self.partitions > 1:
+            for partition in range(self.partitions):
+                if self._buffers[partition]:
+                    await self._spill(partition)
+        return count
+
+    def _read(self, partition: int) -> list[KeyedRow]:
+        if self.partitions == 1:
+            return [(entry["k"], entry["r"]) for entry in self._buffers[0]]
+        entries: list[KeyedRow] = []
+        path = self._path(partition)
+        if not path.exists():
+            return entries
+        with open(path, "rb") as fh:
+            while header := fh.read(_LENGTH.size):
+                (length,) = _LENGTH.unpack(header)
+                entries.extend((e["k"], e["r"]) for e in decode_chunk(fh.read(length)))
+        return entries
+
+    async def load(self, partition: int) -> list[KeyedRow]:
+        """Partition entries, sorted and de-duplicated by key"""
+        entries = await asyncio.to_thread(self._read, partition)
+        return sorted_unique(entries)
+
+
+class _RowDiffSummary:
+    """Diff counts plus bounded samples, fed one merge-join result at a time"""
+
+    def __init__(self, sample_size: int = SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.counts = dict.fromkeys((*CHANGE_TYPES, "unchanged"), 0)
+        # (key, row) candidates; partitions arrive out of key order, so these
+        # are trimmed to the smallest keys rather than truncated on arrival
+        self._added: list[KeyedRow] = []
+        self._removed: list[KeyedRow] = []
+        # Min-heap of (magnitude, seq, entry): keeps the largest changes
+        self._changed: list[tuple[float, int, dict[str, Any]]] = []
+
+    def _sample(self, samples: list[KeyedRow], entry: dict[str, Any]) -> None:
+        samples.append((entry["key"], entry["row"]))
+        if len(samples) >= 2 * self.sample_size:
+            self._trim(samples)
+
+    def _trim(self, samples: list[KeyedRow]) -> list[KeyedRow]:
+        samples.sort(key=lambda item: item[0])
+        del samples[self.sample_size :]
+        return samples
+
+    def add(self, change_type: str, entry: Optional[dict[str, Any]]) -> None:
+        seq = self.counts[change_type]
+        self.counts[change_type] += 1
+        if not self.sample_size:
+            return
+        if change_type == "added":
+            self._sample(self._added, entry)
+        elif change_type == "removed":
+            self._sample(self._removed, entry)
+        elif change_type == "changed":
+            magnitude = sum(abs(d["change"]) for d in entry["diff"].values() if "change" in d)
+            item = (magnitude, seq, entry)
+            if len(self._changed) < self.sample_size:
+                heapq.heappush(self._changed, item)
+            elif item > self._changed[0]:
+                heapq.heapreplace(self._changed, item)
+
+    def result(self) -> dict[str, Any]:
+        changed = sorted(self._changed, key=lambda item: (-item[0], item[1]))
+        return {
+            "added_count": self.counts["added"],
+            "removed_count": self.counts["removed"],
+            "changed_count": self.counts["changed"],
+            "unchanged_count": self.counts["unchanged"],
+            # First SAMPLE_SIZE in key order
+            "added": [row for _, row in self._trim(self._added)],
+            "removed": [row for _, row in self._trim(self._removed)],
+            "changed": [entry for _, _, entry in changed],  # Largest changes
+        }
+
+
+class _DiffPageWriter:
+    """Buffers diff entries per change type into compressed pages"""
+
+    def __init__(self, db, job_id: str, page_rows: int = DIFF_PAGE_ROWS):
+        self.db = db
+        self.job_id = job_id
+        self.page_rows = page_rows
+        self._buffers: dict[str, list[dict[str, Any]]] = {t: [] for t in CHANGE_TYPES}
+        self._written = dict.fromkeys(CHANGE_TYPES, 0)
+        self._pages = dict.fromkeys(CHANGE_TYPES, 0)
+
+    async def add(self, change_type: str, entry: dict[str, Any]) -> None:
+        buffer = self._buffers[change_type]
+        buffer.append(entry)
+        if len(buffer) >= self.page_rows:
+            await self._flush(change_type)
+
+    async def _flush(self, change_type: str) -> None:
+        buffer = self._buffers[change_type]
+        if not buffer:
+            return
+        await self.db[DIFFS_COLLECTION].insert_one(
+            {
+                "job_id": self.job_id,
+                "change_type": change_type,
+                "seq": self._pages[change_type],
+                "start": self._written[change_type],
+                "count": len(buffer),
+                "data": bson.Binary(encode_chunk(buffer)),
+            }
+        )
+        self._written[change_type] += len(buffer)
+        self._pages[change_type] += 1
+        self._buffers[change_type] = []
+
+    async def close(self) -> dict[str, Any]:
+        for change_type in CHANGE_TYPES:
+            await self._flush(change_type)
+        return {
+            "backend": DIFFS_COLLECTION,
+            "page_rows": self.page_rows,
+            "pages": dict(self._pages),
+        }
+
 
 class CompareEngine:
     """
     Compare two snapshots and generate diff report
     """
 
-    def __init__(self, db):
+    def __init__(self, db, partition_rows: Optional[int] = None):
         self.db = db
+        if partition_rows is None:
+            partition_rows = getattr(settings, "COMPARE_PARTITION_ROWS", 100_000)
+        self.partition_rows = max(1, partition_rows)
 
     async def compare_snapshots(
         self,
@@ -37,13 +287,10 @@ class CompareEngine:
         Returns:
             Comparison report
         """
-        # Get snapshots
-        snapshot_a = await self.db.report_snapshots.find_one(
-            {"snapshot_id": snapshot_a_id}
-        )
-        snapshot_b = await self.db.report_snapshots.find_one(
-            {"snapshot_id": snapshot_b_id}
-        )
+        # Get snapshots (metadata only; rows are loaded from chunk storage)
+        snapshot_engine = SnapshotEngine(self.db)
+        snapshot_a = await snapshot_engine.get_snapshot(snapshot_a_id)
+        snapshot_b = await snapshot_engine.get_snapshot(snapshot_b_id)
 
         if not snapshot_a:
             raise ValueError(f"Snapshot {snapshot_a_id} not found")
@@ -56,16 +303,25 @@ class CompareEngine:
 
         # Perform comparison
         start_time = time.time()
+        job_id = f"compare_{int(start_time)}_{created_by}_{uuid.uuid4().hex[:8]}"
+
+        try:
+            row_diff, diff_storage = await self._stream_row_diff(
+                snapshot_engine,
+                snapshot_a,
+                snapshot_b,
+                snapshot_a.get("query_spec", {}).get("group_by", []) or [],
+                job_id,
+            )
+        except Exception:
+            await self.db[DIFFS_COLLECTION].delete_many({"job_id": job_id})
+            raise
 
         comparison = {
             "summary_diff": self._compare_summaries(
                 snapshot_a["summary"], snapshot_b["summary"]
             ),
-            "row_diff": self._compare_rows(
-                snapshot_a.get("row_data", []),
-                snapshot_b.get("row_data", []),
-                snapshot_a.get("query_spec", {}).get("group_by", []),
-            ),
+            "row_diff": row_diff,
             "metadata": {
                 "snapshot_a": {
                     "id": snapshot_a_id,
@@ -83,14 +339,13 @@ class CompareEngine:
         execution_time = (time.time() - start_time) * 1000
 
         # Create comparison job document
-        job_id = f"compare_{int(time.time())}_{created_by}"
-
         comparison_job = {
             "job_id": job_id,
             "name": comparison_name or f"Compare {snapshot_a_id} vs {snapshot_b_id}",
             "snapshot_a_id": snapshot_a_id,
             "snapshot_b_id": snapshot_b_id,
             "comparison_result": comparison,
+            "diff_storage": diff_storage,
             "execution_time_ms": execution_time,
             "created_by": created_by,
             "created_at": time.time(),
@@ -104,6 +359,54 @@ class CompareEngine:
 
         return comparison_job
 
+    async def _stream_row_diff(
+        self,
+        snapshot_engine: SnapshotEngine,
+        snapshot_a: dict[str, Any],
+        snapshot_b: dict[str, Any],
+        group_by: list[str],
+        job_id: str,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Partition both snapshots, merge-join each partition and page out the diffs"""
+        largest = max(snapshot_a.get("row_count", 0), snapshot_b.get("row_count", 0))
+        partitions = max(1, math.ceil(largest / self.partition_rows))
+        summary = _RowDiffSummary(SAMPLE_SIZE)
+        pages = _DiffPageWriter(self.db, job_id, DIFF_PAGE_ROWS)
+
+        with tempfile.TemporaryDirectory(prefix="compare_") as tmp:
+            directory = Path(tmp)
+            side_a = _KeyPartitioner(partitions, directory, "a")
+            side_b = _KeyPartitioner(partitions, directory, "b")
+            await side_a.add_all(snapshot_engine.iter_rows(snapshot_a), group_by)
+            await side_b.add_all(snapshot_engine.iter_rows(snapshot_b), group_by)
+
+            for partition in range(partitions):
+                rows_a = await side_a.load(partition)
+                rows_b = await side_b.load(partition)
+                for change_type, key, row_a, row_b in merge_join(rows_a, rows_b):
+                    entry = self._diff_entry(change_type, key, row_a, row_b)
+                    summary.add(change_type, entry)
+                    if entry is not None:
+                        await pages.add(change_type, entry)
+
+        return summary.result(), await pages.close()
+
+    def _diff_entry(
+        self, change_type: str, key: str, row_a: Optional[dict], row_b: Optional[dict]
+    ) -> Optional[dict[str, Any]]:
+        if change_type == "added":
+            return {"key": key, "row": row_b}
+        if change_type == "removed":
+            return {"key": key, "row": row_a}
+        if change_type == "changed":
+            return {
+                "key": key,
+                "baseline": row_a,
+                "comparison": row_b,
+                "diff": self._calculate_row_diff(row_a, row_b),
+            }
+        return None
+
     def _compare_summaries(
         self, summary_a: dict[str, Any], summary_b: dict[str, Any]
     ) -> dict[str, Any]:
@@ -154,74 +457,15 @@ class CompareEngine:
         self, rows_a: list[dict], rows_b: list[dict], group_by: list[str]
     ) -> dict[str, Any]:
         """
-        Compare row-level data
-        """
-        # Create lookup dictionaries
-        lookup_a = self._create_row_lookup(rows_a, group_by)
-        lookup_b = self._create_row_lookup(rows_b, group_by)
-
-        # Find differences
-        added = []
-        removed = []
-        changed = []
-
-        # Check for added and changed
-        for key, row_b in lookup_b.items():
-            if key not in lookup_a:
-                added.append(row_b)
-            else:
-                row_a = lookup_a[key]
-                if row_a != row_b:
-                    changed.append(
-                        {
-                            "key": key,
-                            "baseline": row_a,
-                            "comparison": row_b,
-                            "diff": self._calculate_row_diff(row_a, row_b),
-                        }
-                    )
-
-        # Check for removed
-        for key, row_a in lookup_a.items():
-            if key not in lookup_b:
-                removed.append(row_a)
-
-        return {
-            "added_count": len(added),
-            "removed_count": len(removed),
-            "changed_count": len(changed),
-            "unchanged_count": len(lookup_a) - len(removed) - len(changed),
-            "added": added[:100],  # Limit to first 100
-            "removed": removed[:100],
-            "changed": changed[:100],
-        }
-
-    def _create_row_lookup(
-        self, rows: list[dict], group_by: list[str]
-    ) -> dict[str, dict]:
-        """
-        Create lookup dictionary keyed by group_by fields
+        Compare row-level data held in memory (no diff pages are written)
         """
-        lookup = {}
-
-        for row in rows:
-            # Create key from group_by fields
-            if group_by:
-                if "_id" in row and isinstance(row["_id"], dict):
-                    # Grouped data
-                    key_parts = [str(row["_id"].get(field, "")) for field in group_by]
-                else:
-                    # Ungrouped data
-                    key_parts = [str(row.get(field, "")) for field in group_by]
+        side_a = sorted_unique([(row_key(row, group_by), row) for row in rows_a])
+        side_b = sorted_unique([(row_key(row, group_by), row) for row in rows_b])
 
-                key = "|".join(key_parts)
-            else:
-                # No grouping, use entire row as key
-                key = str(row)
-
-            lookup[key] = row
-
-        return lookup
+        summary = _RowDiffSummary(SAMPLE_SIZE)
+        for change_type, key, row_a, row_b in merge_join(side_a, side_b):
+            summary.add(change_type, self._diff_entry(change_type, key, row_a, row_b))
+        return summary.result()
 
     def _calculate_row_diff(self, row_a: dict, row_b: dict) -> dict[str, Any]:
         """
@@ -249,6 +493,50 @@ class CompareEngine:
 
         return diff
 
+    async def get_comparison_diffs(
+        self, job_id: str, change_type: str, skip: int = 0, limit: int = 100
+    ) -> Optional[list[dict[str, Any]]]:
+        """
+        Page through the full diff of a comparison
+
+        Args:
+            job_id: Comparison job ID
+            change_type: added, removed or changed
+            skip: Entries to skip
+            limit: Max entries to return
+
+        Returns:
+            Diff entries, or None if the comparison does not exist
+        """
+        if change_type not in CHANGE_TYPES:
+            raise ValueError(f"change_type must be one of: {', '.join(CHANGE_TYPES)}")
+
+        job = await self.db.report_compare_jobs.find_one(
+            {"job_id": job_id}, {"diff_storage": 1}
+        )
+        if not job:
+            return None
+        storage = job.get("diff_storage")
+        if not storage:
+            # Comparisons made before diffs were paged only kept samples
+            return []
+
+        # Every page but the last holds page_rows entries
+        first_seq, offset = divmod(skip, storage["page_rows"])
+        cursor = self.db[DIFFS_COLLECTION].find(
+            {"job_id": job_id, "change_type": change_type, "seq": {"$gte": first_seq}},
+            {"_id": 0, "data": 1, "seq": 1},
+        ).sort("seq", 1)
+
+        entries: list[dict[str, Any]] = []
+        async for page in cursor:
+            page_entries = decode_chunk(page["data"])[offset:]
+            offset = 0
+            entries.extend(page_entries[: limit - len(entries)])
+            if len(entries) >= limit:
+                break
+        return entries
+
     async def get_comparison(self, job_id: str) -> dict[str, Optional[Any]]:
         """Get comparison job by ID"""
         job = await self.db.report_compare_jobs.find_one({"job_id": job_id})
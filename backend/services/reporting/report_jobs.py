@@ -0,0 +1,442 @@
+"""
+Report Jobs - Background report generation
+Report endpoints submit a job and return at once instead of building the
+report inside the HTTP request. An in-process pool of asyncio workers runs
+the jobs; CPU-heavy steps (openpyxl/pandas) can go through
+``ReportJobContext.run_blocking``, which uses a process pool when
+``REPORT_JOB_PROCESS_WORKERS`` is set and a thread otherwise.
+
+Job records live in ``report_jobs`` with status, progress percentage and a
+small result document; result rows are stored as compressed chunks in
+``report_job_rows``. Each job carries a ``cache_key`` from
+``QueryBuilder.generate_query_hash`` over its kind and parameters, so an
+identical request reuses a job that is still running or finished within
+``REPORT_JOB_CACHE_TTL_SECONDS``.
+
+Workers stamp ``heartbeat_at`` on their active jobs every
+``REPORT_JOB_HEARTBEAT_SECONDS``. An active job whose heartbeat is older
+than three intervals belongs to a process that died without ``stop()``:
+it is never reused from the cache and is marked failed when seen. Finished
+jobs and their rows are purged after ``REPORT_JOB_RETENTION_SECONDS``.
+
+Handlers are registered per kind with ``@report_job("<kind>")``:
+
+    @report_job("stock_summary")
+    async def run(db, params, job):
+        await job.progress(50, "Aggregating")
+        return {"summary": {...}, "rows": rows}
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional, Union
+
+from pymongo import ReturnDocument
+
+from backend.services.reporting.query_builder import QueryBuilder
+from backend.services.reporting.snapshot_storage import SnapshotRowStore
+
+logger = logging.getLogger(__name__)
+
+JOBS_COLLECTION = "report_jobs"
+JOB_ROWS_COLLECTION = "report_job_rows"
+ACTIVE_STATUSES = ("queued", "running")
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+# Heartbeats a job may miss before it counts as orphaned
+STALE_HEARTBEATS = 3
+PURGE_INTERVAL_SECONDS = 3600
+
+ReportJobHandler = Callable[[Any, dict[str, Any], "ReportJobContext"], Awaitable[dict[str, Any]]]
+
+# kind -> handler, filled in by the API modules that own each report
+REPORT_JOB_HANDLERS: dict[str, ReportJobHandler] = {}
+
+
+def report_job(kind: str) -> Callable[[ReportJobHandler], ReportJobHandler]:
+    """Register the handler for a job kind"""
+
+    def decorator(handler: ReportJobHandler) -> ReportJobHandler:
+        REPORT_JOB_HANDLERS[kind] = handler
+        return handler
+
+    return decorator
+
+
+class ReportJobCancelled(Exception):
+    """The job was cancelled while it was running"""
+
+
+async def _aiter(rows: Union[Iterable[dict], AsyncIterable[dict]]) -> AsyncIterator[dict]:
+    if isinstance(rows, AsyncIterable):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
+
+
+class ReportJobContext:
+    """Handed to a running handler: progress reporting and blocking work"""
+
+    def __init__(self, queue: "ReportJobQueue", job_id: str):
+        self.queue = queue
+        self.job_id = job_id
+        self._last_percent = -1.0
+
+    async def progress(self, percent: float, message: Optional[str] = None) -> None:
+        """
+        Record progress (0-100)
+
+        Raises ReportJobCancelled once the job has been cancelled, including
+        from another process, so long loops stop at their next update.
+        """
+        percent = round(max(0.0, min(100.0, percent)), 1)
+        if percent - self._last_percent < 1 and message is None:
+            return
+        self._last_percent = percent
+        update: dict[str, Any] = {"progress": percent, "updated_at": datetime.utcnow()}
+        if message is not None:
+            update["message"] = message
+        result = await self.queue.jobs.update_one(
+            {"job_id": self.job_id, "cancel_requested": {"$ne": True}}, {"$set": update}
+        )
+        if result.matched_count == 0:
+            raise ReportJobCancelled(self.job_id)
+
+    async def run_blocking(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` off the event loop (process pool if configured)"""
+        return await self.queue.run_blocking(fn, *args)
+
+
+class ReportJobQueue:
+    """
+    Job records plus the in-process worker pool that runs them
+    """
+
+    def __init__(
+        self,
+        db,
+        workers: int = 2,
+        process_workers: int = 0,
+        cache_ttl_seconds: int = 900,
+        handlers: Optional[dict[str, ReportJobHandler]] = None,
+        heartbeat_seconds: float = 15,
+        retention_seconds: int = 86400,
+    ):
+        self.db = db
+        self.workers = max(1, workers)
+        self.process_workers = process_workers
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        # Cached results must outlive the cache window
+        self.retention_seconds = max(retention_seconds, cache_ttl_seconds)
+        self.handlers = REPORT_JOB_HANDLERS if handlers is None else handlers
+        self.row_store = SnapshotRowStore(db, collection=JOB_ROWS_COLLECTION)
+        self.query_builder = QueryBuilder()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._maintenance: Optional[asyncio.Task] = None
+        self._running: dict[str, asyncio.Task] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._stopping = False
+
+    @property
+    def jobs(self):
+        return self.db[JOBS_COLLECTION]
+
+    def cache_key(self, kind: str, params: dict[str, Any]) -> str:
+        return self.query_builder.generate_query_hash({"kind": kind, "params": params})
+
+    def _stale_cutoff(self) -> datetime:
+        return datetime.utcnow() - timedelta(seconds=self.heartbeat_seconds * STALE_HEARTBEATS)
+
+    async def submit(
+        self,
+        kind: str,
+        params: dict[str, Any],
+        created_by: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> dict[str, Any]:
+        """
+        Queue a job, or return an identical one that is running or recent
+
+        ``params`` must be JSON-serialisable; the returned job has
+        ``cached: True`` when an existing job was reused.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown report job kind: {kind}")
+
+        cache_key = self.cache_key(kind, params)
+        if use_cache:
+            cutoff = datetime.utcnow() - timedelta(seconds=self.cache_ttl_seconds)
+            existing = await self.jobs.find_one(
+                {
+                    "cache_key": cache_key,
+                    "$or": [
+                        {
+                            "status": {"$in": list(ACTIVE_STATUSES)},
+                            "heartbeat_at": {"$gte": self._stale_cutoff()},
+                        },
+                        {"status": "completed", "finished_at": {"$gte": cutoff}},
+                    ],
+                },
+                {"_id": 0},
+            )
+            if existing:
+                logger.info(f"Report job cache hit: {kind} -> {existing['job_id']}")
+                return {**existing, "cached": True}
+
+        now = datetime.utcnow()
+        job = {
+            "job_id": f"rjob_{uuid.uuid4().hex}",
+            "kind": kind,
+            "params": params,
+            "cache_key": cache_key,
+            "status": "queued",
+            "progress": 0.0,
+            "message": None,
+            "result": None,
+            "row_count": 0,
+            "error": None,
+            "cancel_requested": False,
+            "worker_id": self.worker_id,
+            "created_by": created_by,
+            "created_at": now,
+            "heartbeat_at": now,
+            "started_at": None,
+            "finished_at": None,
+        }
+        await self.jobs.insert_one(job)
+        job.pop("_id", None)
+
+        self._ensure_workers()
+        assert self._queue is not None
+        await self._queue.put(job["job_id"])
+        return {**job, "cached": False}
+
+    async def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        job = await self.jobs.find_one({"job_id": job_id}, {"_id": 0})
+        if job and job["status"] in ACTIVE_STATUSES and job["job_id"] not in self._running:
+            heartbeat = job.get("heartbeat_at") or job.get("created_at")
+            if heartbeat is not None and heartbeat < self._stale_cutoff():
+                await self._fail_orphans({"job_id": job_id})
+                job = await self.jobs.find_one({"job_id": job_id}, {"_id": 0})
+        return job
+
+    async def cancel(self, job_id: str) -> Optional[dict[str, Any]]:
+        """Cancel a queued or running job; finished jobs are returned unchanged"""
+        job = await self.get(job_id)
+        if not job or job["status"] in TERMINAL_STATUSES:
+            return job
+
+        await self.jobs.update_one({"job_id": job_id}, {"$set": {"cancel_requested": True}})
+        # Still queued: the worker skips it when it comes up
+        await self.jobs.update_one(
+            {"job_id": job_id, "status": "queued"},
+            {"$set": {"status": "cancelled", "finished_at": datetime.utcnow()}},
+        )
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+            await asyncio.wait({task})
+        return await self.get(job_id)
+
+    async def iter_rows(
+        self, job: dict[str, Any], skip: int = 0, limit: Optional[int] = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream a completed job's result rows"""
+        storage = job.get("row_storage")
+        if not storage:
+            return
+        async for row in self.row_store.iter_rows(job["job_id"], storage, skip=skip, limit=limit):
+            yield row
+
+    async def run_blocking(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.process_workers > 0:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.process_workers)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, functools.partial(fn, *args))
+        return await asyncio.to_thread(fn, *args)
+
+    async def recover_orphans(self) -> int:
+        """Fail active jobs whose worker stopped heartbeating; returns how many"""
+        return await self._fail_orphans({})
+
+    async def _fail_orphans(self, query: dict[str, Any]) -> int:
+        result = await self.jobs.update_many(
+            {
+                **query,
+                "status": {"$in": list(ACTIVE_STATUSES)},
+                "heartbeat_at": {"$lt": self._stale_cutoff()},
+            },
+            {
+                "$set": {
+                    "status": "failed",
+                    "error": "Worker stopped before the job finished",
+                    "finished_at": datetime.utcnow(),
+                }
+            },
+        )
+        if result.modified_count:
+            logger.warning(f"Marked {result.modified_count} orphaned report job(s) failed")
+        return result.modified_count
+
+    async def purge_expired(self) -> int:
+        """Delete finished jobs older than the retention window, rows included"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        query = {"status": {"$in": list(TERMINAL_STATUSES)}, "finished_at": {"$lt": cutoff}}
+        job_ids = [job["job_id"] async for job in self.jobs.find(query, {"job_id": 1})]
+        if not job_ids:
+            return 0
+        await self.row_store.collection.delete_many({"snapshot_id": {"$in": job_ids}})
+        await self.jobs.delete_many({"job_id": {"$in": job_ids}})
+        logger.info(f"Purged {len(job_ids)} expired report job(s)")
+        return len(job_ids)
+
+    def _ensure_workers(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < self.workers:
+            self._workers.append(asyncio.create_task(self._worker()))
+        if self._maintenance is None or self._maintenance.done():
+            self._maintenance = asyncio.create_task(self._maintain())
+
+    async def _maintain(self) -> None:
+        """Heartbeat this process's active jobs; recover orphans and purge old jobs"""
+        last_purge: Optional[float] = None
+        while True:
+            try:
+                await self.jobs.update_many(
+                    {"worker_id": self.worker_id, "status": {"$in": list(ACTIVE_STATUSES)}},
+                    {"$set": {"heartbeat_at": datetime.utcnow()}},
+                )
+                if last_purge is None or time.monotonic() - last_purge >= PURGE_INTERVAL_SECONDS:
+                    await self.recover_orphans()
+                    await self.purge_expired()
+                    last_purge = time.monotonic()
+            except Exception as e:
+                logger.error(f"Report job maintenance error: {str(e)}")
+            await asyncio.sleep(self.heartbeat_seconds)
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job_id = await self._queue.get()
+            try:
+                # Separate task so cancelling the job leaves the worker running
+                task = asyncio.create_task(self._run(job_id))
+                self._running[job_id] = task
+                await asyncio.wait({task})
+            except Exception as e:
+                logger.error(f"Report job worker error for {job_id}: {str(e)}")
+            finally:
+                self._running.pop(job_id, None)
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        now = datetime.utcnow()
+        job = await self.jobs.find_one_and_update(
+            {"job_id": job_id, "status": "queued", "cancel_requested": {"$ne": True}},
+            {"$set": {"status": "running", "started_at": now, "heartbeat_at": now}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+        if not job:
+            return
+
+        start_time = time.time()
+        context = ReportJobContext(self, job_id)
+        try:
+            output = dict(await self.handlers[job["kind"]](self.db, job["params"], context))
+            rows = output.pop("rows", None)
+            update: dict[str, Any] = {"result": output}
+            if rows is not None:
+                storage = await self.row_store.write_rows(job_id, _aiter(rows))
+                update.update(row_storage=storage, row_count=storage["row_count"])
+            await self._finish(job_id, "completed", progress=100.0, **update)
+            logger.info(
+                f"✓ Report job {job['kind']} {job_id} completed "
+                f"({(time.time() - start_time) * 1000:.0f}ms)"
+            )
+        except (asyncio.CancelledError, ReportJobCancelled):
+            await self.row_store.delete_rows(job_id)
+            if self._stopping:
+                await self._finish(job_id, "failed", error="Interrupted by shutdown")
+            else:
+                await self._finish(job_id, "cancelled")
+            logger.info(f"Report job {job_id} cancelled")
+        except Exception as e:
+            logger.error(f"Report job {job['kind']} {job_id} failed: {str(e)}")
+            await self.row_store.delete_rows(job_id)
+            await self._finish(job_id, "failed", error=str(e))
+
+    async def _finish(self, job_id: str, status: str, **fields: Any) -> None:
+        await self.jobs.update_one(
+            {"job_id": job_id},
+            {"$set": {"status": status, "finished_at": datetime.utcnow(), **fields}},
+        )
+
+    async def stop(self) -> None:
+        """Stop workers; running and queued jobs of this process are marked failed"""
+        self._stopping = True
+        tasks = [*self._running.values(), *self._workers]
+        if self._maintenance is not None:
+            tasks.append(self._maintenance)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._maintenance = None
+        await self.jobs.update_many(
+            {"worker_id": self.worker_id, "status": "queued"},
+            {
+                "$set": {
+                    "status": "failed",
+                    "error": "Interrupted by shutdown",
+                    "finished_at": datetime.utcnow(),
+                }
+            },
+        )
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._queue = None
+        self._stopping = False
+
+
+_queue: Optional[ReportJobQueue] = None
+
+
+def get_report_job_queue(db) -> ReportJobQueue:
+    """Process-wide ReportJobQueue using the configured pool sizes."""
+    global _queue
+    from backend.config import settings
+
+    if _queue is None:
+        _queue = ReportJobQueue(
+            db,
+            workers=getattr(settings, "REPORT_JOB_WORKERS", 2),
+            process_workers=getattr(settings, "REPORT_JOB_PROCESS_WORKERS", 0),
+            cache_ttl_seconds=getattr(settings, "REPORT_JOB_CACHE_TTL_SECONDS", 900),
+            heartbeat_seconds=getattr(settings, "REPORT_JOB_HEARTBEAT_SECONDS", 15),
+            retention_seconds=getattr(settings, "REPORT_JOB_RETENTION_SECONDS", 86400),
+        )
+    return _queue
+
+
+async def shutdown_report_job_queue() -> None:
+    global _queue
+    if _queue is not None:
+        await _queue.stop()
+        _queue = None
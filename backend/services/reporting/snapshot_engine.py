@@ -5,9 +5,16 @@ Enables point-in-time reporting and comparisons
 
 import logging
 import time
+import uuid
+from collections.abc import AsyncIterator
 from typing import Any, Optional, cast
 
+from backend.config import settings
 from backend.services.reporting.query_builder import QueryBuilder
+from backend.services.reporting.snapshot_storage import SnapshotRowStore
+
+# Metadata reads never load row data (legacy snapshots kept it inline)
+_METADATA_PROJECTION = {"row_data": 0}
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +24,12 @@ class SnapshotEngine:
     Create and manage report snapshots
     """
 
-    def __init__(self, db):
+    def __init__(self, db, chunk_rows: Optional[int] = None):
         self.db = db
         self.query_builder = QueryBuilder()
+        if chunk_rows is None:
+            chunk_rows = getattr(settings, "SNAPSHOT_ROWS_PER_CHUNK", 1000)
+        self.row_store = SnapshotRowStore(db, chunk_rows=chunk_rows)
 
     async def create_snapshot(
         self,
@@ -61,20 +71,21 @@ class SnapshotEngine:
             limit=limit,
         )
 
-        # Execute query
-        start_time = time.time()
-        cursor = self.db[collection].aggregate(pipeline)
-        results = await cursor.to_list(length=10000)
-        execution_time = (time.time() - start_time) * 1000
-
-        # Calculate summary statistics
-        summary = self._calculate_summary(results, aggregations)
-
         # Generate snapshot ID and hash
-        snapshot_id = f"snapshot_{int(time.time())}_{created_by}"
+        snapshot_id = f"snapshot_{uuid.uuid4().hex}"
         query_hash = self.query_builder.generate_query_hash(query_spec)
 
-        # Create snapshot document
+        # Execute query, streaming rows into chunked storage
+        start_time = time.time()
+        summary_builder = _SummaryBuilder(aggregations)
+        cursor = self.db[collection].aggregate(pipeline, allowDiskUse=True)
+        row_storage = await self.row_store.write_rows(
+            snapshot_id, cursor, on_row=summary_builder.add
+        )
+        execution_time = (time.time() - start_time) * 1000
+        row_count = row_storage["row_count"]
+
+        # Create snapshot document (metadata only)
         snapshot = {
             "snapshot_id": snapshot_id,
             "name": name,
@@ -83,33 +94,69 @@ class SnapshotEngine:
             "query_spec": query_spec,
             "query_hash": query_hash,
             "collection": collection,
-            "summary": summary,
-            "row_count": len(results),
-            "row_data": results,
+            "summary": summary_builder.result(),
+            "row_count": row_count,
+            "row_storage": row_storage,
             "execution_time_ms": execution_time,
             "created_by": created_by,
             "created_at": time.time(),
             "tags": tags or [],
         }
 
-        # Save to database
-        await self.db.report_snapshots.insert_one(snapshot)
+        # Save to database; the id is unique to this call, so cleanup only
+        # ever removes the chunks written above
+        try:
+            await self.db.report_snapshots.insert_one(snapshot)
+        except Exception:
+            await self.row_store.delete_rows(snapshot_id)
+            raise
 
         logger.info(
-            f"✓ Snapshot created: {snapshot_id} ({len(results)} rows, {execution_time:.2f}ms)"
+            f"✓ Snapshot created: {snapshot_id} ({row_count} rows, "
+            f"{row_storage['chunk_count']} chunks, {execution_time:.2f}ms)"
         )
 
-        # Return without row_data for response (too large)
+        # Return without row data for response (too large)
         snapshot_response = {**snapshot}
-        snapshot_response["row_data"] = f"[{len(results)} rows]"
+        snapshot_response["row_data"] = f"[{row_count} rows]"
 
         return snapshot_response
 
     async def get_snapshot(self, snapshot_id: str) -> dict[str, Optional[Any]]:
-        """Get snapshot by ID"""
-        snapshot = await self.db.report_snapshots.find_one({"snapshot_id": snapshot_id})
+        """Get snapshot metadata by ID (row data is never loaded)"""
+        snapshot = await self.db.report_snapshots.find_one(
+            {"snapshot_id": snapshot_id}, _METADATA_PROJECTION
+        )
         return snapshot
 
+    async def iter_rows(
+        self, snapshot: dict[str, Any], skip: int = 0, limit: Optional[int] = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream a snapshot's rows in order
+
+        Args:
+            snapshot: Snapshot metadata document (from get_snapshot)
+            skip: Rows to skip
+            limit: Max rows to yield (None for all)
+        """
+        storage = snapshot.get("row_storage")
+        if storage:
+            async for row in self.row_store.iter_rows(
+                snapshot["snapshot_id"], storage, skip=skip, limit=limit
+            ):
+                yield row
+            return
+
+        # Legacy snapshot with inline row_data: slice server-side
+        slice_spec: Any = [skip, limit] if limit is not None else [skip, 2**31 - 1]
+        legacy = await self.db.report_snapshots.find_one(
+            {"snapshot_id": snapshot["snapshot_id"]},
+            {"row_data": {"$slice": slice_spec}},
+        )
+        for row in (legacy or {}).get("row_data", []) or []:
+            yield row
+
     async def list_snapshots(
         self,
         created_by: Optional[str] = None,
@@ -164,6 +211,7 @@ class SnapshotEngine:
             raise PermissionError("Only snapshot creator can delete")
 
         result = await self.db.report_snapshots.delete_one({"snapshot_id": snapshot_id})
+        await self.row_store.delete_rows(snapshot_id)
 
         if result.deleted_count > 0:
             logger.info(f"✓ Snapshot deleted: {snapshot_id}")
@@ -177,26 +225,25 @@ class SnapshotEngine:
         """
         Get snapshot data with pagination
         """
-        snapshot = await self.db.report_snapshots.find_one({"snapshot_id": snapshot_id})
+        snapshot = await self.get_snapshot(snapshot_id)
 
         if not snapshot:
             return None
 
-        # Paginate row_data
-        row_data = snapshot.get("row_data", [])
-        paginated_data = row_data[skip : skip + limit]
+        rows = [row async for row in self.iter_rows(snapshot, skip=skip, limit=limit)]
+        total = snapshot.get("row_count", 0)
 
         return {
             "snapshot_id": snapshot_id,
             "name": snapshot["name"],
             "summary": snapshot["summary"],
-            "row_count": len(row_data),
-            "rows": paginated_data,
+            "row_count": total,
+            "rows": rows,
             "pagination": {
                 "skip": skip,
                 "limit": limit,
-                "total": len(row_data),
-                "has_more": (skip + limit) < len(row_data),
+                "total": total,
+                "has_more": (skip + limit) < total,
             },
         }
 
@@ -206,27 +253,10 @@ class SnapshotEngine:
         """
         Calculate summary statistics from results
         """
-        if not results:
-            return {"total_rows": 0}
-
-        summary = {"total_rows": len(results)}
-
-        # If aggregations were used, extract totals
-        if aggregations:
-            for field, func in aggregations.items():
-                agg_field = f"{field}_{func}"
-
-                if func == "sum":
-                    total = sum(r.get(agg_field, 0) for r in results)
-                    summary[f"total_{field}"] = total
-                elif func == "avg":
-                    values = [r.get(agg_field, 0) for r in results if agg_field in r]
-                    summary[f"avg_{field}"] = sum(values) / len(values) if values else 0
-                elif func == "count":
-                    total = sum(r.get(agg_field, 0) for r in results)
-                    summary[f"total_{field}"] = total
-
-        return summary
+        builder = _SummaryBuilder(aggregations)
+        for row in results:
+            builder.add(row)
+        return builder.result()
 
     async def refresh_snapshot(self, snapshot_id: str) -> dict[str, Any]:
         """
@@ -251,3 +281,37 @@ class SnapshotEngine:
         )
 
         return new_snapshot
+
+
+class _SummaryBuilder:
+    """Incremental summary statistics, fed one row at a time"""
+
+    def __init__(self, aggregations: Optional[dict] = None):
+        self.aggregations = aggregations or {}
+        self.total_rows = 0
+        self._sums: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+
+    def add(self, row: dict[str, Any]) -> None:
+        self.total_rows += 1
+        for field, func in self.aggregations.items():
+            agg_field = f"{field}_{func}"
+            if func in ("sum", "count"):
+                self._sums[field] = self._sums.get(field, 0) + row.get(agg_field, 0)
+            elif func == "avg" and agg_field in row:
+                self._sums[field] = self._sums.get(field, 0) + row[agg_field]
+                self._counts[field] = self._counts.get(field, 0) + 1
+
+    def result(self) -> dict[str, Any]:
+        summary: dict[str, Any] = {"total_rows": self.total_rows}
+        if not self.total_rows:
+            return summary
+
+        for field, func in self.aggregations.items():
+            if func in ("sum", "count"):
+                summary[f"total_{field}"] = self._sums.get(field, 0)
+            elif func == "avg":
+                count = self._counts.get(field, 0)
+                summary[f"avg_{field}"] = self._sums.get(field, 0) / count if count else 0
+
+        return summary
@@ -0,0 +1,181 @@
+"""
+Snapshot Row Storage - Chunked, compressed row data for report snapshots
+Rows live in ``report_snapshot_rows`` as fixed-size chunks; each chunk is a
+zlib-compressed BSON document in columnar layout ({column: [values...]}).
+The ``report_snapshots`` document only carries metadata.
+"""
+
+import logging
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any, Optional
+
+import bson
+
+logger = logging.getLogger(__name__)
+
+ROWS_COLLECTION = "report_snapshot_rows"
+CODEC = "zlib-columnar-bson"
+DEFAULT_CHUNK_ROWS = 1000
+
+
+def encode_chunk(rows: list[dict[str, Any]], level: int = 6) -> bytes:
+    """
+    Encode rows column-wise and compress.
+
+    Column order follows first appearance; rows missing a column are
+    recorded in ``missing`` so that absent keys round-trip exactly.
+    """
+    columns: dict[str, list[Any]] = {}
+    missing: dict[str, list[int]] = {}
+    for idx, row in enumerate(rows):
+        for key in row:
+            if key not in columns:
+                columns[key] = [None] * idx
+                if idx:
+                    missing[key] = list(range(idx))
+        for key, values in columns.items():
+            if key in row:
+                values.append(row[key])
+            else:
+                values.append(None)
+                missing.setdefault(key, []).append(idx)
+
+    payload = {
+        "n": len(rows),
+        "keys": list(columns),
+        "values": list(columns.values()),
+        "missing": missing,
+    }
+    return zlib.compress(bson.encode(payload), level)
+
+
+def decode_chunk(data: bytes) -> list[dict[str, Any]]:
+    """Inverse of :func:`encode_chunk`."""
+    payload = bson.decode(zlib.decompress(data))
+    keys: list[str] = payload["keys"]
+    values: list[list[Any]] = payload["values"]
+    missing = {key: set(idx) for key, idx in payload.get("missing", {}).items()}
+
+    rows = []
+    for i in range(payload["n"]):
+        row = {}
+        for key, column in zip(keys, values):
+            if key in missing and i in missing[key]:
+                continue
+            row[key] = column[i]
+        rows.append(row)
+    return rows
+
+
+class SnapshotRowStore:
+    """
+    Write, page through and delete snapshot rows stored out of line.
+
+    Chunks are keyed by ``snapshot_id``; other row owners (report jobs) use
+    their own ``collection`` with their id in that field.
+    """
+
+    def __init__(
+        self, db, chunk_rows: int = DEFAULT_CHUNK_ROWS, collection: str = ROWS_COLLECTION
+    ):
+        self.db = db
+        self.chunk_rows = max(1, chunk_rows)
+        self.collection_name = collection
+
+    @property
+    def collection(self):
+        return self.db[self.collection_name]
+
+    async def write_rows(
+        self,
+        snapshot_id: str,
+        rows: AsyncIterable[dict[str, Any]],
+        on_row=None,
+    ) -> dict[str, Any]:
+        """
+        Persist rows as compressed chunks.
+
+        ``on_row`` (optional) is called with every row, e.g. to accumulate a
+        summary while the rows stream through. Returns the storage descriptor
+        stored on the snapshot document under ``row_storage``.
+        """
+        seq = 0
+        row_count = 0
+        stored_bytes = 0
+        batch: list[dict[str, Any]] = []
+
+        async def _flush() -> None:
+            nonlocal seq, stored_bytes
+            data = encode_chunk(batch)
+            await self.collection.insert_one(
+                {
+                    "snapshot_id": snapshot_id,
+                    "seq": seq,
+                    "start": row_count - len(batch),
+                    "count": len(batch),
+                    "data": bson.Binary(data),
+                }
+            )
+            stored_bytes += len(data)
+            seq += 1
+            batch.clear()
+
+        try:
+            async for row in rows:
+                if on_row is not None:
+                    on_row(row)
+                batch.append(row)
+                row_count += 1
+                if len(batch) >= self.chunk_rows:
+                    await _flush()
+            if batch:
+                await _flush()
+        except Exception:
+            await self.delete_rows(snapshot_id)
+            raise
+
+        return {
+            "backend": self.collection_name,
+            "codec": CODEC,
+            "chunk_rows": self.chunk_rows,
+            "chunk_count": seq,
+            "stored_bytes": stored_bytes,
+            "row_count": row_count,
+        }
+
+    async def iter_rows(
+        self,
+        snapshot_id: str,
+        storage: dict[str, Any],
+        skip: int = 0,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield rows in order, decoding only the chunks that overlap the page."""
+        chunk_rows = storage.get("chunk_rows") or self.chunk_rows
+        first_seq = skip // chunk_rows
+        offset = skip - first_seq * chunk_rows
+        remaining = limit
+
+        cursor = self.collection.find(
+            {"snapshot_id": snapshot_id, "seq": {"$gte": first_seq}},
+            {"_id": 0, "data": 1, "seq": 1},
+        ).sort("seq", 1)
+
+        async for chunk in cursor:
+            rows = decode_chunk(chunk["data"])
+            if offset:
+                rows = rows[offset:]
+                offset = 0
+            for row in rows:
+                if remaining is not None:
+                    if remaining <= 0:
+                        return
+                    remaining -= 1
+                yield row
+            if remaining is not None and remaining <= 0:
+                return
+
+    async def delete_rows(self, snapshot_id: str) -> int:
+        result = await self.collection.delete_many({"snapshot_id": snapshot_id})
+        return result.deleted_count
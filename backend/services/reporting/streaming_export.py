@@ -0,0 +1,357 @@
+"""
+Streaming Export - Constant-memory CSV/XLSX/JSON writers
+Rows are pulled from an async source (usually a Mongo cursor) in batches;
+CSV and JSON are yielded as byte chunks and XLSX is written with openpyxl write-only
+mode into a temporary file.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from bson import ObjectId
+
+logger = logging.getLogger(__name__)
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# (field, label) pairs; None means "infer from the first row"
+ColumnSpec = Optional[list[tuple[str, str]]]
+
+
+@dataclass
+class ExportProgress:
+    """Progress of a running export, passed to ``on_progress`` callbacks."""
+
+    rows_written: int = 0
+    total_rows: Optional[int] = None
+    started_at: float = field(default_factory=time.monotonic)
+    finished: bool = False
+
+    @property
+    def percent(self) -> Optional[float]:
+        if not self.total_rows:
+            return None
+        return round(min(100.0, self.rows_written * 100.0 / self.total_rows), 1)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rows_written": self.rows_written,
+            "total_rows": self.total_rows,
+            "percent": self.percent,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "finished": self.finished,
+        }
+
+
+ProgressCallback = Callable[[ExportProgress], None]
+
+
+def cell_value(value: Any) -> Any:
+    """Convert a Mongo value into something CSV/XLSX writers accept."""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+
+async def aiter_rows(rows: Iterable[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
+    """Adapt an in-memory iterable to the async row source the writers expect."""
+    for row in rows:
+        yield row
+
+
+async def _batched(
+    rows: AsyncIterable[dict[str, Any]], batch_size: int
+) -> AsyncIterator[list[dict[str, Any]]]:
+    batch: list[dict[str, Any]] = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _report(progress: ExportProgress, on_progress: Optional[ProgressCallback]) -> None:
+    if on_progress is not None:
+        try:
+            on_progress(progress)
+        except Exception as e:
+            logger.debug(f"Export progress callback failed: {e}")
+
+
+class CsvChunkWriter:
+    """Incremental CSV writer that hands back encoded chunks."""
+
+    def __init__(self, columns: ColumnSpec = None):
+        self.columns = columns
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._header_written = False
+
+    def write_raw(self, values: list[Any]) -> None:
+        self._writer.writerow(values)
+
+    def write_rows(self, rows: list[dict[str, Any]]) -> None:
+        if self.columns is None and rows:
+            self.columns = [(key, key) for key in rows[0].keys()]
+        if not self._header_written and self.columns:
+            self._writer.writerow([label for _, label in self.columns])
+            self._header_written = True
+        fields = [f for f, _ in self.columns or []]
+        for row in rows:
+            self._writer.writerow([cell_value(row.get(f, "")) for f in fields])
+
+    def drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate(0)
+        return data
+
+
+class XlsxStreamWriter:
+    """
+    openpyxl write-only workbook appended to row by row.
+
+    Write-only sheets ignore column widths set after the first ``append``,
+    so preamble rows are held back until the header (and the widths sized
+    from the first batch) has been decided.
+    """
+
+    def __init__(
+        self,
+        columns: ColumnSpec = None,
+        sheet_title: str = "Report",
+        header_bold: bool = True,
+        header_fill: Optional[str] = "CCCCCC",
+    ):
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise ImportError("openpyxl is required for XLSX export")
+
+        self.columns = columns
+        self.header_bold = header_bold
+        self.header_fill = header_fill
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet(title=sheet_title)
+        self._preamble: list[list[Any]] = []
+        self._header_written = False
+
+    def write_raw(self, values: list[Any]) -> None:
+        row = [cell_value(v) for v in values]
+        if self._header_written:
+            self._ws.append(row)
+        else:
+            self._preamble.append(row)
+
+    def _write_header(self, sample: list[dict[str, Any]]) -> None:
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill
+        from openpyxl.utils import get_column_letter
+
+        # Column widths must be set before the first row in write-only mode
+        for idx, (name, label) in enumerate(self.columns or [], 1):
+            width = max([len(str(label))] + [len(str(cell_value(r.get(name)))) for r in sample])
+            self._ws.column_dimensions[get_column_letter(idx)].width = min(width + 2, 50)
+
+        for row in self._preamble:
+            self._ws.append(row)
+        self._preamble = []
+
+        if self.columns:
+            header = []
+            for _, label in self.columns:
+                cell = WriteOnlyCell(self._ws, value=label)
+                if self.header_bold:
+                    cell.font = Font(bold=True)
+                if self.header_fill:
+                    cell.fill = PatternFill(
+                        start_color=self.header_fill,
+                        end_color=self.header_fill,
+                        fill_type="solid",
+                    )
+                header.append(cell)
+            self._ws.append(header)
+        self._header_written = True
+
+    def write_rows(self, rows: list[dict[str, Any]]) -> None:
+        if self.columns is None and rows:
+            self.columns = [(key, key) for key in rows[0].keys()]
+        if not self._header_written and (self.columns or rows):
+            self._write_header(rows[:100])
+        fields = [f for f, _ in self.columns or []]
+        for row in rows:
+            self._ws.append([cell_value(row.get(f, "")) for f in fields])
+
+    def save(self, target: Any) -> None:
+        """Save to a path or binary file object."""
+        if not self._header_written:
+            self._write_header([])
+        self._wb.save(str(target) if isinstance(target, Path) else target)
+
+
+def _new_temp_path(suffix: str) -> Path:
+    fd, name = tempfile.mkstemp(prefix="export_", suffix=suffix)
+    os.close(fd)
+    return Path(name)
+
+
+async def stream_csv(
+    rows: AsyncIterable[dict[str, Any]],
+    columns: ColumnSpec = None,
+    *,
+    preamble: Optional[list[list[Any]]] = None,
+    batch_size: int = 1000,
+    total_rows: Optional[int] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yield CSV bytes chunk by chunk (one chunk per ``batch_size`` rows).
+
+    Suitable as the body of a ``StreamingResponse``.
+    """
+    writer = CsvChunkWriter(columns)
+    progress = ExportProgress(total_rows=total_rows)
+
+    for values in preamble or []:
+        writer.write_raw(values)
+
+    async for batch in _batched(rows, batch_size):
+        writer.write_rows(batch)
+        progress.rows_written += len(batch)
+        _report(progress, on_progress)
+        yield writer.drain()
+
+    writer.write_rows([])
+    progress.finished = True
+    _report(progress, on_progress)
+    tail = writer.drain()
+    if tail:
+        yield tail
+    logger.info(f"✓ CSV export streamed: {progress.rows_written} rows")
+
+
+async def stream_json(
+    rows: AsyncIterable[dict[str, Any]],
+    *,
+    envelope: Optional[dict[str, Any]] = None,
+    rows_key: str = "rows",
+    batch_size: int = 1000,
+    total_rows: Optional[int] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yield a JSON object chunk by chunk: ``envelope`` keys first, then the rows
+    as an array under ``rows_key`` (one chunk per ``batch_size`` rows).
+    """
+    progress = ExportProgress(total_rows=total_rows)
+    head = json.dumps({**(envelope or {}), rows_key: []}, default=str)
+    # Reopen the empty array ("...[]}") so rows can be appended to it
+    yield head[:-2].encode("utf-8")
+
+    separator = ""
+    async for batch in _batched(rows, batch_size):
+        chunk = ",".join(json.dumps(row, default=str) for row in batch)
+        yield (separator + chunk).encode("utf-8")
+        separator = ","
+        progress.rows_written += len(batch)
+        _report(progress, on_progress)
+
+    yield b"]}"
+    progress.finished = True
+    _report(progress, on_progress)
+    logger.info(f"✓ JSON export streamed: {progress.rows_written} rows")
+
+
+async def write_xlsx_file(
+    rows: AsyncIterable[dict[str, Any]],
+    columns: ColumnSpec = None,
+    *,
+    preamble: Optional[list[list[Any]]] = None,
+    sheet_title: str = "Report",
+    batch_size: int = 1000,
+    total_rows: Optional[int] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    path: Optional[Path] = None,
+) -> Path:
+    """
+    Write rows to an XLSX file using openpyxl write-only mode.
+
+    Returns the file path; the caller owns (and should delete) the file.
+    """
+    writer = XlsxStreamWriter(columns, sheet_title=sheet_title)
+    progress = ExportProgress(total_rows=total_rows)
+
+    for values in preamble or []:
+        writer.write_raw(values)
+
+    async for batch in _batched(rows, batch_size):
+        writer.write_rows(batch)
+        progress.rows_written += len(batch)
+        _report(progress, on_progress)
+
+    target = path or _new_temp_path(".xlsx")
+    try:
+        await asyncio.to_thread(writer.save, target)
+    except Exception:
+        if path is None:
+            target.unlink(missing_ok=True)
+        raise
+
+    progress.finished = True
+    _report(progress, on_progress)
+    logger.info(f"✓ XLSX export written: {progress.rows_written} rows")
+    return target
+
+
+def write_csv_bytes(rows: Iterable[dict[str, Any]], columns: ColumnSpec = None) -> bytes:
+    """Synchronous helper for small in-memory datasets."""
+    writer = CsvChunkWriter(columns)
+    writer.write_rows(list(rows))
+    return writer.drain()
+
+
+def write_xlsx_bytes(
+    rows: Iterable[dict[str, Any]], columns: ColumnSpec = None, sheet_title: str = "Report"
+) -> bytes:
+    """Synchronous helper for small in-memory datasets (write-only mode)."""
+    writer = XlsxStreamWriter(columns, sheet_title=sheet_title)
+    writer.write_rows(list(rows))
+    output = io.BytesIO()
+    writer.save(output)
+    return output.getvalue()
+
+
+def log_progress(label: str, every_rows: int = 50000) -> ProgressCallback:
+    """Progress callback that logs every ``every_rows`` rows."""
+    state = {"next": every_rows}
+
+    def _callback(progress: ExportProgress) -> None:
+        if progress.finished or progress.rows_written >= state["next"]:
+            state["next"] = progress.rows_written + every_rows
+            pct = f" ({progress.percent}%)" if progress.percent is not None else ""
+            logger.info(f"{label}: {progress.rows_written} rows{pct}")
+
+    return _callback
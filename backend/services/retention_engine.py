@@ -0,0 +1,385 @@
+"""
+Retention Engine
+Chunked, throttled retention with compressed on-disk archive segments.
+
+Expired documents are walked in ``_id`` order, ``chunk_size`` at a time. When
+a policy archives, each chunk is written as one segment file (gzip JSONL, or
+Parquet when pyarrow is installed), fsynced, and recorded in the collection's
+``manifest.jsonl`` before the chunk is deleted by ``_id``. Deletes never span
+more than one chunk, and a documents-per-second limit spaces the chunks out
+so retention does not hold locks or flood the oplog.
+
+Progress is checkpointed per collection in ``retention_checkpoints``. A run
+that dies mid-way resumes from its last chunk with the same cutoff; a chunk
+whose segment was written but not yet deleted is deleted on resume without
+being archived twice. The checkpoint also carries a lease (``lease_owner`` /
+``lease_until``, renewed on every checkpoint write) so only one worker runs
+or resumes a collection at a time.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from bson import json_util
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_DIR = Path(__file__).resolve().parent.parent / "data" / "retention_archive"
+MANIFEST_NAME = "manifest.jsonl"
+ARCHIVE_FORMATS = ("jsonl", "parquet")
+_EXTENSIONS = {"jsonl": "jsonl.gz", "parquet": "parquet"}
+
+
+class RetentionLeaseHeld(RuntimeError):
+    """Another worker holds the retention lease for the collection"""
+
+
+class RetentionLeaseLost(RuntimeError):
+    """The lease expired and another worker took over the run"""
+
+
+def _fsync_directory(directory: Path) -> None:
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_durable(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` atomically and fsync file and directory."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+    _fsync_directory(path.parent)
+
+
+class ArchiveSegmentWriter:
+    """Writes archive segments and their manifest under ``root/<collection>/``."""
+
+    def __init__(self, root: Path, fmt: str = "jsonl", time_field: str = "timestamp"):
+        if fmt not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format: {fmt}")
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError("pyarrow is required for Parquet retention archives")
+        self.root = Path(root)
+        self.format = fmt
+        self.time_field = time_field
+
+    def _encode_jsonl(self, docs: list[dict[str, Any]]) -> bytes:
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as gz:
+            for doc in docs:
+                line = json_util.dumps(doc, json_options=json_util.RELAXED_JSON_OPTIONS)
+                gz.write(line.encode("utf-8") + b"\n")
+        return buffer.getvalue()
+
+    def _encode_parquet(self, docs: list[dict[str, Any]]) -> bytes:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Documents are schemaless, so keep each one whole as Extended JSON and
+        # lift only the columns used to find segments back out.
+        table = pa.table(
+            {
+                "_id": [str(doc.get("_id")) for doc in docs],
+                self.time_field: [doc.get(self.time_field) for doc in docs],
+                "document": [
+                    json_util.dumps(doc, json_options=json_util.RELAXED_JSON_OPTIONS)
+                    for doc in docs
+                ],
+            }
+        )
+        sink = pa.BufferOutputStream()
+        pq.write_table(table, sink, compression="zstd")
+        return sink.getvalue().to_pybytes()
+
+    def write_segment(
+        self, collection: str, run_id: str, seq: int, docs: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Durably write one segment and append it to the manifest (blocking)."""
+        directory = self.root / collection / run_id
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{seq:06d}.{_EXTENSIONS[self.format]}"
+        data = self._encode_parquet(docs) if self.format == "parquet" else self._encode_jsonl(docs)
+        _write_durable(path, data)
+
+        timestamps = [
+            d[self.time_field] for d in docs if isinstance(d.get(self.time_field), datetime)
+        ]
+        entry = {
+            "run_id": run_id,
+            "seq": seq,
+            "file": str(path.relative_to(self.root / collection)),
+            "format": self.format,
+            "count": len(docs),
+            "bytes": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "first_id": str(docs[0]["_id"]),
+            "last_id": str(docs[-1]["_id"]),
+            "min_timestamp": min(timestamps).isoformat() if timestamps else None,
+            "max_timestamp": max(timestamps).isoformat() if timestamps else None,
+            "written_at": datetime.utcnow().isoformat(),
+        }
+        manifest = self.root / collection / MANIFEST_NAME
+        with open(manifest, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        return entry
+
+    def read_manifest(self, collection: str) -> list[dict[str, Any]]:
+        """Manifest entries, last write winning when a segment was rewritten."""
+        manifest = self.root / collection / MANIFEST_NAME
+        if not manifest.exists():
+            return []
+        entries: dict[tuple[str, int], dict[str, Any]] = {}
+        with open(manifest, encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries[(entry["run_id"], entry["seq"])] = entry
+        return [entries[k] for k in sorted(entries)]
+
+    def iter_segment(self, collection: str, entry: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        """Yield the archived documents of one manifest entry."""
+        path = self.root / collection / entry["file"]
+        if entry["format"] == "parquet":
+            import pyarrow.parquet as pq
+
+            for value in pq.read_table(path, columns=["document"]).column("document").to_pylist():
+                yield json_util.loads(value)
+            return
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield json_util.loads(line)
+
+
+class RetentionEngine:
+    """Applies one retention policy at a time in throttled, checkpointed chunks."""
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        writer: ArchiveSegmentWriter,
+        chunk_size: int = 1000,
+        max_docs_per_second: float = 0,
+        time_field: str = "timestamp",
+        lease_seconds: float = 300,
+    ):
+        self.db = db
+        self.writer = writer
+        self.chunk_size = chunk_size
+        self.max_docs_per_second = max_docs_per_second
+        self.time_field = time_field
+        self.lease_seconds = lease_seconds
+        self.checkpoints = db["retention_checkpoints"]
+
+    async def _acquire_lease(self, collection_name: str, owner: str) -> dict[str, Any]:
+        """Lease the collection's checkpoint; returns it (raises if held elsewhere)."""
+        await self.checkpoints.update_one(
+            {"_id": collection_name}, {"$setOnInsert": {"status": "idle"}}, upsert=True
+        )
+        now = datetime.utcnow()
+        checkpoint = await self.checkpoints.find_one_and_update(
+            {
+                "_id": collection_name,
+                "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}],
+            },
+            {
+                "$set": {
+                    "lease_owner": owner,
+                    "lease_until": now + timedelta(seconds=self.lease_seconds),
+                }
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+        if checkpoint is None:
+            raise RetentionLeaseHeld(f"Retention for {collection_name} is running elsewhere")
+        return checkpoint
+
+    async def _release_lease(self, collection_name: str, owner: str) -> None:
+        try:
+            await self.checkpoints.update_one(
+                {"_id": collection_name, "lease_owner": owner},
+                {"$set": {"lease_owner": None, "lease_until": None}},
+            )
+        except Exception as e:
+            # The lease expires on its own
+            logger.warning(f"Could not release retention lease for {collection_name}: {e}")
+
+    async def _save(self, collection_name: str, owner: str, fields: dict[str, Any]) -> None:
+        """Write checkpoint fields and renew the lease; raises if it was lost."""
+        now = datetime.utcnow()
+        fields["updated_at"] = now
+        fields["lease_until"] = now + timedelta(seconds=self.lease_seconds)
+        result = await self.checkpoints.update_one(
+            {"_id": collection_name, "lease_owner": owner}, {"$set": fields}
+        )
+        if result.matched_count == 0:
+            raise RetentionLeaseLost(f"Retention lease for {collection_name} was lost")
+
+    async def _throttle(self, docs: int, started: float) -> None:
+        if self.max_docs_per_second <= 0:
+            return
+        wait = docs / self.max_docs_per_second - (time.monotonic() - started)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def run(self, collection_name: str, cutoff: datetime, archive: bool) -> dict[str, Any]:
+        """Archive (optionally) and delete documents older than ``cutoff``.
+
+        If an unfinished run exists for the collection it is resumed, keeping
+        its original cutoff so the two halves cover the same range. Raises
+        RetentionLeaseHeld when another worker is running the collection.
+        """
+        owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        checkpoint = await self._acquire_lease(collection_name, owner)
+        try:
+            return await self._run_leased(collection_name, owner, checkpoint, cutoff, archive)
+        finally:
+            await self._release_lease(collection_name, owner)
+
+    async def _run_leased(
+        self,
+        collection_name: str,
+        owner: str,
+        checkpoint: dict[str, Any],
+        cutoff: datetime,
+        archive: bool,
+    ) -> dict[str, Any]:
+        collection = self.db[collection_name]
+        if checkpoint.get("status") == "running":
+            logger.info(f"Resuming retention for {collection_name} (run {checkpoint['run_id']})")
+            state = checkpoint
+        else:
+            # Unique per run: a second run in the same second must not
+            # overwrite the first run's segment files
+            run_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+            state = {
+                "run_id": run_id,
+                "cutoff": cutoff,
+                "archive": archive,
+                "last_id": None,
+                "next_seq": 0,
+                "pending": None,
+                "deleted": 0,
+                "archived": 0,
+                "chunks": 0,
+                "status": "running",
+                "started_at": datetime.utcnow(),
+            }
+            await self._save(collection_name, owner, dict(state))
+
+        run_id, cutoff, archive = state["run_id"], state["cutoff"], state["archive"]
+        last_id, seq = state["last_id"], state["next_seq"]
+        deleted, archived, chunks = state["deleted"], state["archived"], state["chunks"]
+
+        pending = state.get("pending")
+        if pending:
+            # Segment is already on disk; only the delete may be missing
+            result = await collection.delete_many({"_id": {"$in": pending["ids"]}})
+            deleted += result.deleted_count
+            last_id, seq = pending["ids"][-1], pending["seq"] + 1
+            chunks += 1
+            await self._save(
+                collection_name,
+                owner,
+                {
+                    "last_id": last_id,
+                    "next_seq": seq,
+                    "pending": None,
+                    "deleted": deleted,
+                    "chunks": chunks,
+                },
+            )
+
+        while True:
+            started = time.monotonic()
+            query: dict[str, Any] = {self.time_field: {"$lt": cutoff}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            cursor = collection.find(query).sort("_id", 1).limit(self.chunk_size)
+            docs = await cursor.to_list(self.chunk_size)
+            if not docs:
+                break
+
+            ids = [doc["_id"] for doc in docs]
+            if archive:
+                await asyncio.to_thread(
+                    self.writer.write_segment, collection_name, run_id, seq, docs
+                )
+                archived += len(docs)
+                await self._save(
+                    collection_name,
+                    owner,
+                    {"pending": {"seq": seq, "ids": ids}, "archived": archived},
+                )
+
+            result = await collection.delete_many({"_id": {"$in": ids}})
+            deleted += result.deleted_count
+            last_id, seq = ids[-1], seq + 1
+            chunks += 1
+            await self._save(
+                collection_name,
+                owner,
+                {
+                    "last_id": last_id,
+                    "next_seq": seq,
+                    "pending": None,
+                    "deleted": deleted,
+                    "chunks": chunks,
+                },
+            )
+            await self._throttle(len(docs), started)
+
+        await self._save(
+            collection_name, owner, {"status": "completed", "finished_at": datetime.utcnow()}
+        )
+        return {
+            "deleted": deleted,
+            "archived": archived,
+            "chunks": chunks,
+            "run_id": run_id,
+            "archive_dir": str(self.writer.root / collection_name) if archive else None,
+        }
+
+
+def build_retention_engine(db: AsyncIOMotorDatabase) -> RetentionEngine:
+    """Engine configured from RETENTION_* settings."""
+    from backend.config import settings
+
+    writer = ArchiveSegmentWriter(
+        Path(getattr(settings, "RETENTION_ARCHIVE_DIR", None) or DEFAULT_ARCHIVE_DIR),
+        fmt=getattr(settings, "RETENTION_ARCHIVE_FORMAT", "jsonl"),
+    )
+    return RetentionEngine(
+        db,
+        writer,
+        chunk_size=getattr(settings, "RETENTION_CHUNK_SIZE", 1000),
+        max_docs_per_second=getattr(settings, "RETENTION_MAX_DOCS_PER_SECOND", 2000.0),
+        lease_seconds=getattr(settings, "RETENTION_LEASE_SECONDS", 300),
+    )
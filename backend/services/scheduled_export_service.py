@@ -1,23 +1,47 @@
 """
 Scheduled Export Service
-Automated periodic exports of data to CSV/Excel
+Automated periodic exports of data to CSV/JSON
+
+Due schedules are claimed atomically with a lease (``lease_owner`` /
+``lease_until`` on the schedule), so several workers can poll the same
+collection without running a schedule twice. Each worker runs up to
+``max_concurrency`` exports at once. Rows are streamed from a cursor, gzip
+compressed and written to local disk (``EXPORT_DIR``) or GridFS
+(``EXPORT_STORE=gridfs``); ``export_results`` keeps only metadata.
+
+A worker renews its lease while an export runs. If it dies, the lease
+expires, the schedule is claimed again and the run restarts under the same
+``export_results`` document, replacing the partial file.
 """
 
 import asyncio
-import csv
-import io
+import json
 import logging
+import os
+import socket
+import time
+import uuid
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator
 from datetime import datetime, timedelta, timezone
 from enum import Enum
+from pathlib import Path
 from typing import Any, Optional
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+from backend.services.reporting.streaming_export import stream_csv
 
 UTC = timezone.utc
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_EXPORT_DIR = Path(__file__).resolve().parent.parent / "data" / "exports"
+EXPORT_BATCH_SIZE = 1000
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class ExportFrequency(str, Enum):
     DAILY = "daily"
@@ -30,13 +54,154 @@ class ExportFormat(str, Enum):
     JSON = "json"
 
 
+class ExportLeaseLost(RuntimeError):
+    """Another worker took over the schedule while this export was running"""
+
+
+class ExportAlreadyRunning(RuntimeError):
+    """A manual run was requested while a worker holds the schedule's lease"""
+
+
+class _LocalExportWriter:
+    """Appends to ``<path>.tmp`` and renames it into place on close."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(self.tmp, "wb")
+
+    async def write(self, data: bytes) -> None:
+        await asyncio.to_thread(self._fh.write, data)
+
+    def _finish(self) -> None:
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
+        os.replace(self.tmp, self.path)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._finish)
+
+    async def abort(self) -> None:
+        self._fh.close()
+        self.tmp.unlink(missing_ok=True)
+
+
+class LocalExportStore:
+    """Export files under ``root/<schedule_id>/<result_id>.<ext>.gz``."""
+
+    name = "local"
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    async def open_writer(self, key: str) -> _LocalExportWriter:
+        return await asyncio.to_thread(_LocalExportWriter, self.root / key)
+
+    async def iter_bytes(self, key: str) -> AsyncIterator[bytes]:
+        fh = await asyncio.to_thread(open, self.root / key, "rb")
+        try:
+            while chunk := await asyncio.to_thread(fh.read, STREAM_CHUNK_SIZE):
+                yield chunk
+        finally:
+            fh.close()
+
+    def _delete(self, key: str) -> None:
+        path = self.root / key
+        # Including partial files left by a worker that died mid-write
+        for stale in path.parent.glob(f"{path.name}.*.tmp"):
+            stale.unlink(missing_ok=True)
+        path.unlink(missing_ok=True)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+
+class GridFSExportStore:
+    """GridFS bucket ``exports`` with the key as the filename."""
+
+    name = "gridfs"
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+        self.bucket = AsyncIOMotorGridFSBucket(db, bucket_name="exports")
+
+    async def open_writer(self, key: str):
+        # AsyncIOMotorGridIn already has write/close/abort
+        return self.bucket.open_upload_stream(key)
+
+    async def iter_bytes(self, key: str) -> AsyncIterator[bytes]:
+        stream = await self.bucket.open_download_stream_by_name(key)
+        while chunk := await stream.read(STREAM_CHUNK_SIZE):
+            yield chunk
+
+    async def delete(self, key: str) -> None:
+        async for grid_file in self.bucket.find({"filename": key}):
+            await self.bucket.delete(grid_file._id)
+
+
+def build_export_store(db: AsyncIOMotorDatabase):
+    """Export file store configured by ``EXPORT_STORE`` / ``EXPORT_DIR``."""
+    from backend.config import settings
+
+    if getattr(settings, "EXPORT_STORE", "local") == "gridfs":
+        return GridFSExportStore(db)
+    return LocalExportStore(
+        Path(getattr(settings, "EXPORT_DIR", None) or DEFAULT_EXPORT_DIR)
+    )
+
+
+async def iter_decompressed(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Gunzip a stored export chunk by chunk."""
+    decompressor = zlib.decompressobj(wbits=31)
+    async for chunk in chunks:
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+async def _json_array(rows: AsyncIterable[dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode rows as a JSON array, one chunk per ``EXPORT_BATCH_SIZE`` rows."""
+    parts = ["["]
+    first = True
+    async for row in rows:
+        parts.append(
+            ("\n" if first else ",\n") + json.dumps(row, indent=2, default=str)
+        )
+        first = False
+        if len(parts) >= EXPORT_BATCH_SIZE:
+            yield "".join(parts).encode("utf-8")
+            parts = []
+    parts.append("]" if first else "\n]")
+    yield "".join(parts).encode("utf-8")
+
+
 class ScheduledExportService:
     """Service for scheduling and executing automated exports"""
 
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        store=None,
+        max_concurrency: int = 2,
+        lease_seconds: int = 600,
+        poll_interval: float = 60,
+    ):
         self.db = db
+        self.store = store or LocalExportStore(DEFAULT_EXPORT_DIR)
+        self.max_concurrency = max_concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
         self._running = False
         self._task: asyncio.Task = None
+        self._slots = asyncio.BoundedSemaphore(max_concurrency)
+        self._active: set[asyncio.Task] = set()
 
     async def create_export_schedule(
         self,
@@ -111,54 +276,58 @@ class ScheduledExportService:
 
         return schedules
 
-    async def execute_export(self, schedule: dict[str, Any]) -> dict[str, Any]:
-        """Execute a single export based on schedule"""
+    async def execute_export(
+        self, schedule: dict[str, Any], lease_owner: Optional[str] = None
+    ) -> dict[str, Any]:
+        """
+        Execute a single export based on schedule
+
+        With ``lease_owner`` the schedule was claimed by ``_claim_due_schedule``:
+        the lease is renewed while rows stream and released when the run ends.
+        A manual run (no ``lease_owner``) claims the lease first and raises
+        ``ExportAlreadyRunning`` if a worker holds it.
+        """
+        schedule_id = schedule.get("_id") or ObjectId(schedule.get("id"))
+        if lease_owner is None:
+            claimed = await self._claim_schedule({"_id": schedule_id})
+            if claimed is None:
+                raise ExportAlreadyRunning(
+                    f"Export {schedule['name']} is already running"
+                )
+            schedule, lease_owner = claimed, self.worker_id
+
+        result_id = None
         try:
             export_type = schedule["export_type"]
-            filters = schedule.get("filters", {})
             format_type = ExportFormat(schedule["format"])
+            rows = self._iter_rows(export_type, schedule.get("filters", {}))
 
-            # Generate export data based on type
-            if export_type == "sessions":
-                data = await self._export_sessions(filters)
-            elif export_type == "count_lines":
-                data = await self._export_count_lines(filters)
-            elif export_type == "variance_report":
-                data = await self._export_variance_report(filters)
-            elif export_type == "activity_logs":
-                data = await self._export_activity_logs(filters)
-            else:
-                raise ValueError(f"Unknown export type: {export_type}")
-
-            # Format data
-            if format_type == ExportFormat.CSV:
-                file_content = self._format_as_csv(data)
-                file_extension = "csv"
-            else:
-                import json
-
-                file_content = json.dumps(data, indent=2, default=str)
-                file_extension = "json"
-
-            # Store export result
-            export_doc = {
-                "schedule_id": schedule.get("_id") or schedule.get("id"),
-                "schedule_name": schedule["name"],
-                "export_type": export_type,
-                "format": format_type.value,
-                "file_content": file_content,
-                "file_extension": file_extension,
-                "row_count": len(data),
-                "created_at": datetime.now(UTC),
-                "size_bytes": len(file_content.encode("utf-8")),
-            }
+            result_id = await self._start_result(
+                schedule, schedule_id, format_type, lease_owner
+            )
+            storage_key = f"{schedule_id}/{result_id}.{format_type.value}.gz"
+            stats = await self._write_export(
+                rows, format_type, storage_key, schedule_id, lease_owner
+            )
 
-            result = await self.db.export_results.insert_one(export_doc)
-            export_id = str(result.inserted_id)
+            await self.db.export_results.update_one(
+                {"_id": result_id, "worker_id": lease_owner},
+                {
+                    "$set": {
+                        "status": "completed",
+                        "storage": self.store.name,
+                        "storage_key": storage_key,
+                        "row_count": stats["row_count"],
+                        "size_bytes": stats["size_bytes"],
+                        "stored_bytes": stats["stored_bytes"],
+                        "completed_at": datetime.now(UTC),
+                    }
+                },
+            )
 
             # Update schedule last_run and next_run
             await self.db.export_schedules.update_one(
-                {"_id": schedule.get("_id") or ObjectId(schedule.get("id"))},
+                {"_id": schedule_id, "lease_owner": lease_owner},
                 {
                     "$set": {
                         "last_run": datetime.now(UTC),
@@ -166,32 +335,186 @@ class ScheduledExportService:
                             ExportFrequency(schedule["frequency"])
                         ),
                         "updated_at": datetime.now(UTC),
+                        "lease_owner": None,
+                        "lease_until": None,
                     },
                     "$inc": {"run_count": 1},
                 },
             )
 
-            logger.info(f"Export completed: {schedule['name']} - {len(data)} rows")
+            logger.info(
+                f"Export completed: {schedule['name']} - {stats['row_count']} rows"
+            )
 
             return {
                 "success": True,
-                "export_id": export_id,
-                "row_count": len(data),
-                "size_bytes": export_doc["size_bytes"],
+                "export_id": str(result_id),
+                "row_count": stats["row_count"],
+                "size_bytes": stats["size_bytes"],
             }
 
         except Exception as e:
             logger.error(f"Export failed for {schedule['name']}: {str(e)}")
 
-            # Update error count
+            if result_id is not None:
+                await self.db.export_results.update_one(
+                    {"_id": result_id, "worker_id": lease_owner},
+                    {"$set": {"status": "failed", "error": str(e)}},
+                )
+
+            # Update error count; the schedule stays due and is retried next poll
             await self.db.export_schedules.update_one(
-                {"_id": schedule.get("_id") or ObjectId(schedule.get("id"))},
-                {"$inc": {"error_count": 1}},
+                {"_id": schedule_id, "lease_owner": lease_owner},
+                {
+                    "$set": {"lease_owner": None, "lease_until": None},
+                    "$inc": {"error_count": 1},
+                },
             )
 
             return {"success": False, "error": str(e)}
 
-    async def _export_sessions(self, filters: dict[str, Any]) -> list[dict]:
+    async def _start_result(
+        self,
+        schedule: dict[str, Any],
+        schedule_id: Any,
+        format_type: ExportFormat,
+        lease_owner: str,
+    ) -> Any:
+        """Create the ``export_results`` record, or take over an interrupted one."""
+        scheduled_for = schedule.get("next_run")
+        if scheduled_for is not None:
+            stale = await self.db.export_results.find_one_and_update(
+                {
+                    "schedule_id": schedule_id,
+                    "scheduled_for": scheduled_for,
+                    "status": "running",
+                },
+                {
+                    "$set": {"worker_id": lease_owner, "started_at": datetime.now(UTC)},
+                    "$inc": {"attempts": 1},
+                },
+            )
+            if stale:
+                logger.info(f"Resuming interrupted export: {schedule['name']}")
+                await self.store.delete(
+                    f"{schedule_id}/{stale['_id']}.{format_type.value}.gz"
+                )
+                return stale["_id"]
+
+        export_doc = {
+            "schedule_id": schedule_id,
+            "schedule_name": schedule["name"],
+            "export_type": schedule["export_type"],
+            "format": format_type.value,
+            "file_extension": format_type.value,
+            "status": "running",
+            "scheduled_for": scheduled_for,
+            "worker_id": lease_owner,
+            "attempts": 1,
+            "created_at": datetime.now(UTC),
+            "started_at": datetime.now(UTC),
+        }
+        result = await self.db.export_results.insert_one(export_doc)
+        return result.inserted_id
+
+    async def _write_export(
+        self,
+        rows: AsyncIterable[dict[str, Any]],
+        format_type: ExportFormat,
+        storage_key: str,
+        schedule_id: Any,
+        lease_owner: str,
+    ) -> dict[str, int]:
+        """Stream encoded, gzip-compressed rows into the store."""
+        stats = {"row_count": 0, "size_bytes": 0, "stored_bytes": 0}
+
+        async def counted() -> AsyncIterator[dict[str, Any]]:
+            async for row in rows:
+                stats["row_count"] += 1
+                yield row
+
+        if format_type == ExportFormat.CSV:
+            chunks = stream_csv(counted(), batch_size=EXPORT_BATCH_SIZE)
+        else:
+            chunks = _json_array(counted())
+
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        renewed_at = time.monotonic()
+        writer = await self.store.open_writer(storage_key)
+        try:
+            async for chunk in chunks:
+                stats["size_bytes"] += len(chunk)
+                data = compressor.compress(chunk)
+                if data:
+                    await writer.write(data)
+                    stats["stored_bytes"] += len(data)
+                if time.monotonic() - renewed_at > self.lease_seconds / 3:
+                    await self._renew_lease(schedule_id, lease_owner)
+                    renewed_at = time.monotonic()
+            data = compressor.flush()
+            await writer.write(data)
+            stats["stored_bytes"] += len(data)
+            await writer.close()
+        except BaseException:
+            await writer.abort()
+            raise
+        return stats
+
+    async def _claim_due_schedule(self) -> Optional[dict[str, Any]]:
+        """Lease the most overdue schedule that no live worker holds."""
+        return await self._claim_schedule(
+            {"enabled": True, "next_run": {"$lte": datetime.now(UTC)}},
+            sort=[("next_run", 1)],
+        )
+
+    async def _claim_schedule(
+        self, query: dict[str, Any], sort: Optional[list] = None
+    ) -> Optional[dict[str, Any]]:
+        """Lease a schedule matching ``query`` unless a live worker holds it."""
+        now = datetime.now(UTC)
+        return await self.db.export_schedules.find_one_and_update(
+            {
+                **query,
+                "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}],
+            },
+            {
+                "$set": {
+                    "lease_owner": self.worker_id,
+                    "lease_until": now + timedelta(seconds=self.lease_seconds),
+                }
+            },
+            sort=sort,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _renew_lease(self, schedule_id: Any, lease_owner: str) -> None:
+        result = await self.db.export_schedules.update_one(
+            {"_id": schedule_id, "lease_owner": lease_owner},
+            {
+                "$set": {
+                    "lease_until": datetime.now(UTC)
+                    + timedelta(seconds=self.lease_seconds)
+                }
+            },
+        )
+        if result.matched_count == 0:
+            raise ExportLeaseLost(f"Lease on schedule {schedule_id} was lost")
+
+    def _iter_rows(
+        self, export_type: str, filters: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Row source for an export type"""
+        sources = {
+            "sessions": self._export_sessions,
+            "count_lines": self._export_count_lines,
+            "variance_report": self._export_variance_report,
+            "activity_logs": self._export_activity_logs,
+        }
+        if export_type not in sources:
+            raise ValueError(f"Unknown export type: {export_type}")
+        return sources[export_type](filters)
+
+    async def _export_sessions(self, filters: dict[str, Any]) -> AsyncIterator[dict]:
         """Export sessions data"""
         query = {}
 
@@ -207,29 +530,25 @@ class ScheduledExportService:
                 filters["end_date"]
             )
 
-        cursor = self.db.sessions.find(query).sort("start_time", -1)
-        sessions = await cursor.to_list(length=10000)
-
-        # Format for export
-        export_data = []
-        for session in sessions:
-            export_data.append(
-                {
-                    "session_id": str(session["_id"]),
-                    "warehouse": session.get("warehouse"),
-                    "staff_user": session.get("staff_user"),
-                    "staff_name": session.get("staff_name"),
-                    "status": session.get("status"),
-                    "start_time": session.get("start_time"),
-                    "end_time": session.get("end_time"),
-                    "items_counted": session.get("items_counted", 0),
-                    "total_variance": session.get("total_variance", 0.0),
-                }
-            )
-
-        return export_data
+        cursor = (
+            self.db.sessions.find(query)
+            .sort("start_time", -1)
+            .batch_size(EXPORT_BATCH_SIZE)
+        )
+        async for session in cursor:
+            yield {
+                "session_id": str(session["_id"]),
+                "warehouse": session.get("warehouse"),
+                "staff_user": session.get("staff_user"),
+                "staff_name": session.get("staff_name"),
+                "status": session.get("status"),
+                "start_time": session.get("start_time"),
+                "end_time": session.get("end_time"),
+                "items_counted": session.get("items_counted", 0),
+                "total_variance": session.get("total_variance", 0.0),
+            }
 
-    async def _export_count_lines(self, filters: dict[str, Any]) -> list[dict]:
+    async def _export_count_lines(self, filters: dict[str, Any]) -> AsyncIterator[dict]:
         """Export count lines data"""
         query = {}
 
@@ -238,30 +557,29 @@ class ScheduledExportService:
         if "has_variance" in filters and filters["has_variance"]:
             query["variance"] = {"$ne": 0}
 
-        cursor = self.db.count_lines.find(query).sort("created_at", -1)
-        lines = await cursor.to_list(length=10000)
-
-        export_data = []
-        for line in lines:
-            export_data.append(
-                {
-                    "line_id": str(line["_id"]),
-                    "session_id": line.get("session_id"),
-                    "item_code": line.get("item_code"),
-                    "item_name": line.get("item_name"),
-                    "barcode": line.get("barcode"),
-                    "system_stock": line.get("system_stock", 0),
-                    "counted_qty": line.get("counted_qty", 0),
-                    "variance": line.get("variance", 0),
-                    "variance_reason": line.get("variance_reason"),
-                    "counted_by": line.get("counted_by"),
-                    "counted_at": line.get("counted_at"),
-                }
-            )
-
-        return export_data
+        cursor = (
+            self.db.count_lines.find(query)
+            .sort("created_at", -1)
+            .batch_size(EXPORT_BATCH_SIZE)
+        )
+        async for line in cursor:
+            yield {
+                "line_id": str(line["_id"]),
+                "session_id": line.get("session_id"),
+                "item_code": line.get("item_code"),
+                "item_name": line.get("item_name"),
+                "barcode": line.get("barcode"),
+                "system_stock": line.get("system_stock", 0),
+                "counted_qty": line.get("counted_qty", 0),
+                "variance": line.get("variance", 0),
+                "variance_reason": line.get("variance_reason"),
+                "counted_by": line.get("counted_by"),
+                "counted_at": line.get("counted_at"),
+            }
 
-    async def _export_variance_report(self, filters: dict[str, Any]) -> list[dict]:
+    async def _export_variance_report(
+        self, filters: dict[str, Any]
+    ) -> AsyncIterator[dict]:
         """Export variance summary report"""
         # Aggregate variance data
         pipeline = [
@@ -278,23 +596,21 @@ class ScheduledExportService:
             {"$sort": {"total_variance": -1}},
         ]
 
-        results = await self.db.count_lines.aggregate(pipeline).to_list(length=10000)
-
-        export_data = []
-        for result in results:
-            export_data.append(
-                {
-                    "item_code": result["_id"],
-                    "item_name": result.get("item_name"),
-                    "total_variance": result.get("total_variance", 0),
-                    "occurrences": result.get("occurrences", 0),
-                    "last_counted": result.get("last_counted"),
-                }
-            )
-
-        return export_data
+        cursor = self.db.count_lines.aggregate(
+            pipeline, allowDiskUse=True, batchSize=EXPORT_BATCH_SIZE
+        )
+        async for result in cursor:
+            yield {
+                "item_code": result["_id"],
+                "item_name": result.get("item_name"),
+                "total_variance": result.get("total_variance", 0),
+                "occurrences": result.get("occurrences", 0),
+                "last_counted": result.get("last_counted"),
+            }
 
-    async def _export_activity_logs(self, filters: dict[str, Any]) -> list[dict]:
+    async def _export_activity_logs(
+        self, filters: dict[str, Any]
+    ) -> AsyncIterator[dict]:
         """Export activity logs"""
         query = {}
 
@@ -305,41 +621,29 @@ class ScheduledExportService:
         if "start_date" in filters:
             query["timestamp"] = {"$gte": datetime.fromisoformat(filters["start_date"])}
 
-        cursor = self.db.activity_logs.find(query).sort("timestamp", -1)
-        logs = await cursor.to_list(length=10000)
-
-        export_data = []
-        for log in logs:
-            export_data.append(
-                {
-                    "timestamp": log.get("timestamp"),
-                    "user": log.get("user"),
-                    "role": log.get("role"),
-                    "action": log.get("action"),
-                    "entity_type": log.get("entity_type"),
-                    "entity_id": log.get("entity_id"),
-                    "details": str(log.get("details", {})),
-                    "ip_address": log.get("ip_address"),
-                }
-            )
-
-        return export_data
-
-    def _format_as_csv(self, data: list[dict]) -> str:
-        """Convert data to CSV format"""
-        if not data:
-            return ""
-
-        output = io.StringIO()
-
-        # Get headers from first row
-        headers = list(data[0].keys())
-        writer = csv.DictWriter(output, fieldnames=headers)
-
-        writer.writeheader()
-        writer.writerows(data)
+        cursor = (
+            self.db.activity_logs.find(query)
+            .sort("timestamp", -1)
+            .batch_size(EXPORT_BATCH_SIZE)
+        )
+        async for log in cursor:
+            yield {
+                "timestamp": log.get("timestamp"),
+                "user": log.get("user"),
+                "role": log.get("role"),
+                "action": log.get("action"),
+                "entity_type": log.get("entity_type"),
+                "entity_id": log.get("entity_id"),
+                "details": str(log.get("details", {})),
+                "ip_address": log.get("ip_address"),
+            }
 
-        return output.getvalue()
+    async def open_result(self, result: dict[str, Any]) -> AsyncIterator[bytes]:
+        """Uncompressed bytes of a completed export result"""
+        async for chunk in iter_decompressed(
+            self.store.iter_bytes(result["storage_key"])
+        ):
+            yield chunk
 
     def _calculate_next_run(self, frequency: ExportFrequency) -> datetime:
         """Calculate next run time based on frequency"""
@@ -384,28 +688,40 @@ class ScheduledExportService:
 
         return next_run
 
+    async def _dispatch_due(self) -> None:
+        """Claim due schedules while run slots are free and start them."""
+        while self._running and not self._slots.locked():
+            await self._slots.acquire()
+            try:
+                schedule = await self._claim_due_schedule()
+            except Exception:
+                self._slots.release()
+                raise
+            if schedule is None:
+                self._slots.release()
+                return
+            task = asyncio.create_task(self._run_claimed(schedule))
+            self._active.add(task)
+            task.add_done_callback(self._active.discard)
+
+    async def _run_claimed(self, schedule: dict[str, Any]) -> None:
+        try:
+            await self.execute_export(schedule, lease_owner=self.worker_id)
+        finally:
+            self._slots.release()
+
     async def _run_scheduler(self):
         """Background task to run scheduled exports"""
         logger.info("Scheduled export service started")
 
         while self._running:
             try:
-                # Find schedules due for execution
-                now = datetime.now(UTC)
-                due_schedules = await self.db.export_schedules.find(
-                    {"enabled": True, "next_run": {"$lte": now}}
-                ).to_list(length=100)
-
-                # Execute each due schedule
-                for schedule in due_schedules:
-                    await self.execute_export(schedule)
-
-                # Sleep for 1 minute before checking again
-                await asyncio.sleep(60)
-
+                await self._dispatch_due()
             except Exception as e:
                 logger.error(f"Error in export scheduler: {str(e)}")
-                await asyncio.sleep(60)
+
+            # Sleep before checking again
+            await asyncio.sleep(self.poll_interval)
 
     def start(self):
         """Start the scheduled export service"""
@@ -423,10 +739,14 @@ class ScheduledExportService:
             return
 
         self._running = False
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
+        tasks = [t for t in (self._task, *self._active) if t]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Hand unfinished schedules straight back instead of waiting out the lease
+        await self.db.export_schedules.update_many(
+            {"lease_owner": self.worker_id},
+            {"$set": {"lease_owner": None, "lease_until": None}},
+        )
         logger.info("Scheduled export service stopped")
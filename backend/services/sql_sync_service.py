@@ -110,6 +110,10 @@ _NEW_ITEM_FIELDS: list[tuple[str, str, str]] = [
     ("expiry_date", "expiry_date", "date"),
 ]
 
+# Fields the semantic search embeddings are built from
+# (mirrors ITEM_TEXT_FIELDS in services/embedding_store.py, which pulls in numpy)
+_EMBEDDED_FIELDS = ("item_name", "category", "subcategory")
+
 
 def _apply_field_conversion(value: Any, converter: str) -> Any:
     """Apply the appropriate converter to a value."""
@@ -238,6 +242,8 @@ class SQLSyncService:
             "items_synced": 0,
             "qty_changes_detected": 0,
         }
+        # Items created or renamed during the current sync (for re-embedding)
+        self._embedding_changes: set[str] = set()
 
     async def sync_quantities_only(self) -> dict[str, Any]:
         """
@@ -265,6 +271,7 @@ class SQLSyncService:
         try:
             # Fetch all items from SQL Server
             logger.info("Starting SQL Server quantity sync...")
+            self._embedding_changes = set()
             sql_items = self.sql_connector.get_all_items()
 
             # Batch process items
@@ -292,6 +299,7 @@ class SQLSyncService:
             )
 
             await self._update_sync_metadata(stats)
+            await self._refresh_item_embeddings()
             return stats
 
         except Exception as e:
@@ -315,6 +323,7 @@ class SQLSyncService:
             # New item - create with basic data
             new_item = _build_new_item_dict(sql_item, sql_qty, now)
             await self.mongo_db.erp_items.insert_one(new_item)
+            self._embedding_changes.add(item_code)
             stats["items_created"] += 1
             logger.debug(f"Created new item: {item_code}")
         else:
@@ -366,6 +375,8 @@ class SQLSyncService:
 
         if metadata_updates:
             update_fields.update(metadata_updates)
+            if any(f in metadata_updates for f in _EMBEDDED_FIELDS):
+                self._embedding_changes.add(item_code)
 
         await self.mongo_db.erp_items.update_one(
             {"item_code": item_code},
@@ -418,6 +429,21 @@ class SQLSyncService:
                 "skipping metadata update",
             )
 
+    async def _refresh_item_embeddings(self) -> None:
+        """Re-embed new/changed items for semantic search (best-effort)."""
+        from backend.config import settings
+
+        if not getattr(settings, "EMBEDDINGS_REFRESH_ON_SYNC", True):
+            return
+        try:
+            from backend.services.ai_search import ai_search_service
+
+            await ai_search_service.refresh_item_embeddings(
+                self.mongo_db, item_codes=self._embedding_changes
+            )
+        except Exception:
+            logger.warning("Failed to refresh item embeddings after sync", exc_info=True)
+
     async def check_item_qty_realtime(self, item_code: str) -> dict[str, Any]:
         """
         Real-time quantity check for a specific item
@@ -2,7 +2,10 @@ import io
 import logging
 from datetime import datetime, timedelta
 
-import pandas as pd
+from backend.utils.lazy_import import lazy_module
+
+# pandas is only needed when a report is actually generated
+pd = lazy_module("pandas")
 
 logger = logging.getLogger(__name__)
 
@@ -0,0 +1,284 @@
+"""
+Validation Engine
+Streaming, resumable full-collection validation for DataValidationService.
+
+The rules from ``DataValidationService._define_validation_rules`` are compiled
+into a Mongo filter that matches every document that *could* break a rule
+(missing required fields, values of the wrong BSON type, out-of-range numbers,
+string lengths via ``$expr``, patterns, allowed values). Only those candidates
+and only the rule fields are sent back; each candidate is then checked with
+the same Python rules as ``validate_data``, so the filter may over-select but
+the reported violations are exact.
+
+Collections are walked in ``_id`` order in batches and progress is
+checkpointed in ``validation_checkpoints`` after every batch, so an audit
+that is interrupted picks up where it stopped. ``start_validation_worker``
+runs the whole audit in a separate process with its own Mongo client, keeping
+the work off the API's event loop.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import re
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Collection -> rule set, as audited by validate_and_clean_database
+DEFAULT_JOBS: list[tuple[str, str]] = [
+    ("erp_items", "erp_item"),
+    ("sessions", "session"),
+    ("count_lines", "count_line"),
+]
+
+# Types validate_data accepts without conversion errors. Decimal128 is left
+# out on purpose: float() rejects it, so it must reach the Python check.
+_BSON_TYPES = {str: ["string"], float: ["double", "int", "long"], int: ["int", "long"]}
+
+
+def _present(field: str) -> dict[str, Any]:
+    return {field: {"$exists": True, "$ne": None}}
+
+
+def compile_violation_filter(rules: dict[str, Any]) -> dict[str, Any]:
+    """Mongo filter matching a superset of the documents that violate ``rules``."""
+    clauses: list[dict[str, Any]] = []
+
+    for field in rules.get("required_fields", []):
+        # null also matches a missing field
+        clauses.append({field: {"$in": [None, ""]}})
+
+    for field, expected in rules.get("field_types", {}).items():
+        # Values of another type are converted before constraints run, so the
+        # Python pass decides whether they fail. $type also matches array
+        # elements, so arrays are always candidates.
+        mismatched = [
+            {field: {"$not": {"$type": _BSON_TYPES[expected]}}},
+            {field: {"$type": "array"}},
+        ]
+        clauses.append({"$and": [_present(field), {"$or": mismatched}]})
+
+    for field, constraints in rules.get("field_constraints", {}).items():
+        if "min" in constraints:
+            clauses.append({field: {"$type": "number", "$lt": constraints["min"]}})
+        if "max" in constraints:
+            clauses.append({field: {"$type": "number", "$gt": constraints["max"]}})
+        if "min_length" in constraints or "max_length" in constraints:
+            length = {"$strLenCP": f"${field}"}
+            bounds = []
+            if "min_length" in constraints:
+                bounds.append({"$lt": [length, constraints["min_length"]]})
+            if "max_length" in constraints:
+                bounds.append({"$gt": [length, constraints["max_length"]]})
+            clauses.append(
+                {
+                    "$expr": {
+                        "$cond": [
+                            {"$eq": [{"$type": f"${field}"}, "string"]},
+                            {"$or": bounds},
+                            False,
+                        ]
+                    }
+                }
+            )
+        if "pattern" in constraints:
+            # re.match only anchors at the start; mirror that for the server
+            pattern = re.compile(f"^(?:{constraints['pattern']})")
+            clauses.append({field: {"$type": "string", "$not": pattern}})
+        if "allowed_values" in constraints:
+            clauses.append(
+                {"$and": [_present(field), {field: {"$nin": constraints["allowed_values"]}}]}
+            )
+
+    return {"$or": clauses} if clauses else {}
+
+
+def rule_fields(rules: dict[str, Any]) -> list[str]:
+    fields = set(rules.get("required_fields", []))
+    fields.update(rules.get("field_types", {}))
+    fields.update(rules.get("field_constraints", {}))
+    return sorted(fields)
+
+
+class StreamingValidator:
+    """Validates whole collections batch by batch with per-collection checkpoints."""
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        service,
+        batch_size: int = 5000,
+        sample_limit: int = 100,
+        pushdown: bool = True,
+    ):
+        self.db = db
+        self.service = service
+        self.batch_size = batch_size
+        self.sample_limit = sample_limit
+        self.pushdown = pushdown
+        self.checkpoints = db["validation_checkpoints"]
+        self.violations = db["validation_violations"]
+
+    async def _save(self, collection_name: str, fields: dict[str, Any]) -> None:
+        fields["updated_at"] = datetime.utcnow()
+        await self.checkpoints.update_one({"_id": collection_name}, {"$set": fields}, upsert=True)
+
+    async def _fetch(self, collection, query: dict[str, Any], projection: dict[str, int]) -> list:
+        return await (
+            collection.find(query, projection)
+            .sort("_id", 1)
+            .limit(self.batch_size)
+            .to_list(self.batch_size)
+        )
+
+    async def run(
+        self, collection_name: str, data_type: str, resume: bool = True
+    ) -> dict[str, Any]:
+        """Validate every document of ``collection_name`` against ``data_type`` rules."""
+        rules = self.service.validation_rules[data_type]
+        collection = self.db[collection_name]
+        projection = {"_id": 1, **{field: 1 for field in rule_fields(rules)}}
+
+        checkpoint = await self.checkpoints.find_one({"_id": collection_name}) if resume else None
+        if (
+            checkpoint
+            and checkpoint.get("status") == "running"
+            and checkpoint.get("data_type") == data_type
+        ):
+            logger.info(f"Resuming validation of {collection_name} (run {checkpoint['run_id']})")
+            state = checkpoint
+        else:
+            state = {
+                "run_id": f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}",
+                "data_type": data_type,
+                "last_id": None,
+                "documents_total": await collection.estimated_document_count(),
+                "candidates": 0,
+                "invalid": 0,
+                "pushdown": self.pushdown,
+                "status": "running",
+                "started_at": datetime.utcnow(),
+            }
+            await self._save(collection_name, dict(state))
+
+        run_id, last_id = state["run_id"], state["last_id"]
+        candidates, invalid = state["candidates"], state["invalid"]
+        if last_id is not None:
+            # Violations written after the last checkpoint are found again
+            await self.violations.delete_many(
+                {"run_id": run_id, "collection": collection_name, "document_key": {"$gt": last_id}}
+            )
+        base_filter = compile_violation_filter(rules) if state["pushdown"] else {}
+
+        while True:
+            query = base_filter
+            if last_id is not None:
+                after = {"_id": {"$gt": last_id}}
+                query = {"$and": [base_filter, after]} if base_filter else after
+            try:
+                batch = await self._fetch(collection, query, projection)
+            except OperationFailure as e:
+                if not base_filter:
+                    raise
+                # Server could not run the pushdown; check every document instead
+                logger.warning(f"Validation pushdown rejected for {collection_name}, scanning: {e}")
+                base_filter = {}
+                await self._save(collection_name, {"pushdown": False})
+                continue
+            if not batch:
+                break
+
+            failures = []
+            for document in batch:
+                clean_doc = {k: v for k, v in document.items() if not k.startswith("_")}
+                errors = self.service.validate_document(clean_doc, data_type)
+                if errors:
+                    failures.append(
+                        {
+                            "run_id": run_id,
+                            "collection": collection_name,
+                            "document_key": document["_id"],
+                            "document_id": str(document["_id"]),
+                            "errors": errors,
+                        }
+                    )
+            if failures:
+                await self.violations.insert_many(failures)
+
+            candidates += len(batch)
+            invalid += len(failures)
+            last_id = batch[-1]["_id"]
+            await self._save(
+                collection_name, {"last_id": last_id, "candidates": candidates, "invalid": invalid}
+            )
+            # Let other tasks run between batches when sharing a loop
+            await asyncio.sleep(0)
+
+        await self._save(collection_name, {"status": "completed", "finished_at": datetime.utcnow()})
+        samples = await (
+            self.violations.find({"run_id": run_id, "collection": collection_name})
+            .limit(self.sample_limit)
+            .to_list(self.sample_limit)
+        )
+        return {
+            "collection": collection_name,
+            "run_id": run_id,
+            "documents_checked": state["documents_total"],
+            "candidates": candidates,
+            "invalid_count": invalid,
+            "invalid_documents": [
+                {"_id": s["document_id"], "errors": s["errors"]} for s in samples
+            ],
+        }
+
+
+async def _run_worker_jobs(
+    mongo_url: str, db_name: str, jobs: list[tuple[str, str]], batch_size: int
+) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    from backend.services.data_validation_service import DataValidationService
+
+    client = AsyncIOMotorClient(mongo_url)
+    try:
+        db = client[db_name]
+        validator = StreamingValidator(db, DataValidationService(db), batch_size=batch_size)
+        for collection_name, data_type in jobs:
+            report = await validator.run(collection_name, data_type)
+            logger.info(
+                f"✓ Validated {collection_name}: {report['invalid_count']} invalid of "
+                f"{report['documents_checked']} ({report['candidates']} candidates)"
+            )
+    finally:
+        client.close()
+
+
+def _worker_main(
+    mongo_url: str, db_name: str, jobs: list[tuple[str, str]], batch_size: int
+) -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run_worker_jobs(mongo_url, db_name, jobs, batch_size))
+
+
+def start_validation_worker(
+    jobs: Optional[list[tuple[str, str]]] = None, batch_size: int = 5000
+) -> multiprocessing.Process:
+    """Run a full audit in a child process; progress is in ``validation_checkpoints``."""
+    from backend.config import settings
+
+    context = multiprocessing.get_context("spawn")
+    process = context.Process(
+        target=_worker_main,
+        args=(settings.MONGO_URL, settings.DB_NAME, jobs or DEFAULT_JOBS, batch_size),
+        name="data-validation",
+        daemon=True,
+    )
+    process.start()
+    logger.info(f"Data validation worker started (pid {process.pid})")
+    return process
@@ -0,0 +1,39 @@
+"""
+Stock Verify Benchmarks
+=======================
+
+In-process end-to-end benchmarks for the counting workflow. The app runs over
+an ASGI transport on the in-memory database, fake Redis and mocked SQL Server
+connector, so no live services are needed.
+
+Scenarios: login storm, barcode scans, count-line posts, batch offline sync,
+dashboard polling and report export.
+
+Micro-benchmarks (``micro.py``) time pure hot-path functions at 1k/10k/100k
+and compare them against the stored baseline in ``baselines/micro.json``.
+
+Usage:
+    python -m backend.tests.benchmarks.run_e2e --concurrency 20 --requests 500
+    python -m backend.tests.benchmarks.run_micro compare --tolerance 0.2
+    pytest backend/tests/benchmarks/ -v
+"""
+
+from .harness import (
+    BenchmarkContext,
+    Scenario,
+    ScenarioResult,
+    run_benchmarks,
+    run_scenario,
+    write_report,
+)
+from .scenarios import SCENARIOS
+
+__all__ = [
+    "BenchmarkContext",
+    "Scenario",
+    "ScenarioResult",
+    "SCENARIOS",
+    "run_benchmarks",
+    "run_scenario",
+    "write_report",
+]
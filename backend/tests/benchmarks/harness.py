@@ -0,0 +1,324 @@
+"""
+Benchmark Harness
+=================
+
+Drives the FastAPI app in-process over ``httpx.ASGITransport``, backed by the
+in-memory database, the fake Redis service and the mocked SQL Server
+connector from ``tests/utils/in_memory_db.py``. No live server or database is
+needed, so runs are repeatable in CI.
+
+Each scenario is replayed ``requests`` times by ``concurrency`` workers that
+share one client. Per scenario the harness records:
+
+- throughput (requests per second of wall-clock time)
+- latency p50/p95/p99 (seconds, via ``services.histogram.Histogram``)
+- status-code counts and error count
+- allocations: peak traced memory and the net number of allocated blocks
+"""
+
+import asyncio
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from backend.services.histogram import Histogram
+
+DEFAULT_REPORTS_DIR = Path(__file__).resolve().parent / "reports"
+
+BENCHMARK_ENV = {
+    "TESTING": "true",
+    "MONGO_URL": "mongodb://localhost:27017/stock_count_test",
+    "DB_NAME": "stock_count_test",
+    "JWT_SECRET": "test-jwt-secret-key-for-testing-only",
+    "JWT_REFRESH_SECRET": "test-jwt-refresh-secret-key-for-testing-only",
+    "JWT_ALGORITHM": "HS256",
+    "RATE_LIMIT_ENABLED": "false",
+    "LOG_LEVEL": "WARNING",
+}
+
+# Seeded users from setup_server_with_in_memory_db
+USERS = {
+    "staff": ("staff1", "staff123"),
+    "supervisor": ("supervisor", "super123"),
+    "admin": ("admin", "admin123"),
+}
+
+
+@dataclass
+class BenchmarkContext:
+    """State shared by every request of a run."""
+
+    client: Any
+    db: Any
+    rng: random.Random
+    tokens: dict[str, str] = field(default_factory=dict)
+    items: list[dict[str, Any]] = field(default_factory=list)
+    session_id: Optional[str] = None
+
+    def headers(self, role: str = "staff") -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.tokens[role]}"}
+
+
+# A scenario step issues one request and returns its HTTP status code
+Step = Callable[[BenchmarkContext, int], Awaitable[int]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    step: Step
+    # Statuses that count as success for this scenario
+    expected_status: tuple[int, ...] = (200,)
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    concurrency: int
+    duration_seconds: float
+    latency: Histogram
+    status_codes: Counter
+    errors: int
+    peak_memory_bytes: int
+    allocated_blocks: int
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration_seconds if self.duration_seconds else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        summary = self.latency.summary()
+        return {
+            "name": self.name,
+            "requests": self.requests,
+            "concurrency": self.concurrency,
+            "duration_seconds": round(self.duration_seconds, 4),
+            "throughput_rps": round(self.throughput, 2),
+            "latency_seconds": {
+                key: round(summary[key], 6)
+                for key in ("min", "avg", "p50", "p95", "p99", "max")
+            },
+            "status_codes": dict(sorted(self.status_codes.items())),
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+            "allocations": {
+                "peak_bytes": self.peak_memory_bytes,
+                "net_blocks": self.allocated_blocks,
+            },
+        }
+
+
+async def run_scenario(
+    ctx: BenchmarkContext, scenario: Scenario, requests: int, concurrency: int
+) -> ScenarioResult:
+    """Replay ``scenario.step`` ``requests`` times across ``concurrency`` workers."""
+    latency = Histogram()
+    statuses: Counter = Counter()
+    errors = 0
+    next_index = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in next_index:
+            started = time.perf_counter()
+            try:
+                status_code = await scenario.step(ctx, index)
+            except Exception as e:
+                status_code = type(e).__name__
+            latency.record(time.perf_counter() - started)
+            statuses[str(status_code)] += 1
+            if status_code not in scenario.expected_status:
+                errors += 1
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    blocks_before = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    baseline, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        duration = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        blocks_after = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    return ScenarioResult(
+        name=scenario.name,
+        requests=requests,
+        concurrency=concurrency,
+        duration_seconds=duration,
+        latency=latency,
+        status_codes=statuses,
+        errors=errors,
+        peak_memory_bytes=max(peak - baseline, 0),
+        allocated_blocks=blocks_after - blocks_before,
+    )
+
+
+def seed_erp_items(db, count: int, rng: random.Random) -> list[dict[str, Any]]:
+    """Insert ``count`` ERP items with valid 6-digit barcodes (51xxxx-53xxxx)."""
+    items = []
+    for i in range(count):
+        prefix = ("51", "52", "53")[i % 3]
+        stock_qty = float(rng.randint(0, 500))
+        items.append(
+            {
+                "item_code": f"ITEM{i:05d}",
+                "item_name": f"Benchmark Item {i}",
+                "barcode": f"{prefix}{(i // 3) % 10000:04d}",
+                "category": rng.choice(["Grocery", "Hardware", "Apparel", "Pharmacy"]),
+                "subcategory": "General",
+                "warehouse": "Main",
+                "uom_code": "NOS",
+                "uom_name": "Numbers",
+                "stock_qty": stock_qty,
+                "mrp": round(rng.uniform(10, 5000), 2),
+                "sales_price": round(rng.uniform(10, 5000), 2),
+                "is_active": True,
+                "synced_at": datetime.utcnow(),
+            }
+        )
+    db.erp_items._documents.extend(items)
+    return items
+
+
+def seed_report_history(db, items: list[dict[str, Any]], rng: random.Random) -> None:
+    """Insert counted variances and audit actions so every report has rows."""
+    now = datetime.utcnow()
+    user_ids = [user["_id"] for user in db.users._documents]
+    records = []
+    for item in rng.sample(items, max(1, len(items) // 10)):
+        counted = item["stock_qty"] + rng.choice([-3, -1, 1, 2, 5])
+        records.append(
+            {
+                "item_code": item["item_code"],
+                "expected_qty": item["stock_qty"],
+                "counted_qty": counted,
+                "variance": counted - item["stock_qty"],
+                "status": rng.choice(["pending", "approved"]),
+                "scanned_by": rng.choice(user_ids),
+                "warehouse": item["warehouse"],
+                "created_at": now,
+            }
+        )
+    db.verification_records._documents.extend(records)
+    db.audit_logs._documents.extend(
+        {
+            "user_id": rng.choice(user_ids),
+            "action": rng.choice(["scan", "verify", "approve"]),
+            "timestamp": now,
+        }
+        for _ in range(len(records) * 3)
+    )
+
+
+@asynccontextmanager
+async def benchmark_app(items: int = 1000, seed: int = 42):
+    """
+    Boot the app on the in-memory stack and yield a ready ``BenchmarkContext``.
+
+    Authentication is real: the test-only ``get_current_user`` overrides are
+    removed and every role logs in once, so requests carry genuine JWTs.
+    """
+    os.environ.update(BENCHMARK_ENV)
+
+    import pytest
+    from httpx import ASGITransport, AsyncClient
+
+    import backend.server as server_module
+    from backend.api import sync_batch_api
+    from backend.auth import dependencies as auth_deps_module
+    from backend.tests.utils.in_memory_db import setup_server_with_in_memory_db
+
+    monkeypatch = pytest.MonkeyPatch()
+    try:
+        db = setup_server_with_in_memory_db(monkeypatch)
+        app = server_module.app
+        for dependency in (server_module.get_current_user, auth_deps_module.get_current_user):
+            app.dependency_overrides.pop(dependency, None)
+        # The per-user batch limit (10/min) would turn the sync scenario into a 429 benchmark
+        monkeypatch.setattr(
+            sync_batch_api.batch_rate_limiter, "is_allowed", lambda _user: (True, {})
+        )
+
+        rng = random.Random(seed)
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            ctx = BenchmarkContext(client=client, db=db, rng=rng)
+            ctx.items = seed_erp_items(db, items, rng)
+            seed_report_history(db, ctx.items, rng)
+            for role, (username, password) in USERS.items():
+                response = await client.post(
+                    "/api/auth/login", json={"username": username, "password": password}
+                )
+                response.raise_for_status()
+                ctx.tokens[role] = response.json()["data"]["access_token"]
+
+            response = await client.post(
+                "/api/sessions",
+                json={"warehouse": "Main", "type": "STANDARD"},
+                headers=ctx.headers("staff"),
+            )
+            response.raise_for_status()
+            ctx.session_id = response.json()["id"]
+            yield ctx
+    finally:
+        monkeypatch.undo()
+
+
+async def run_benchmarks(
+    scenarios: list[Scenario],
+    requests: int = 200,
+    concurrency: int = 10,
+    items: int = 1000,
+    seed: int = 42,
+) -> dict[str, Any]:
+    """Run ``scenarios`` in order against one booted app and return the report."""
+    results = []
+    async with benchmark_app(items=items, seed=seed) as ctx:
+        for scenario in scenarios:
+            result = await run_scenario(ctx, scenario, requests, concurrency)
+            results.append(result.to_dict())
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "config": {
+            "requests": requests,
+            "concurrency": concurrency,
+            "items": items,
+            "seed": seed,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "scenarios": results,
+    }
+
+
+def write_report(report: dict[str, Any], output_dir: Optional[Path] = None) -> Path:
+    """Write ``report`` to ``<output_dir>/e2e_benchmark_<timestamp>.json``."""
+    output_dir = Path(output_dir or DEFAULT_REPORTS_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    path = output_dir / f"e2e_benchmark_{stamp}.json"
+    with open(path, "w") as fh:
+        json.dump(report, fh, indent=2, default=str)
+    return path
@@ -0,0 +1,403 @@
+"""
+Micro-benchmarks
+================
+
+Timings for pure, CPU-bound hot paths on seeded synthetic data at 1k/10k/100k
+scale, with stored baselines and a regression check.
+
+Each benchmark's ``setup(size, seed)`` builds its inputs outside the timed
+region and returns a zero-argument callable; only that call is timed. Targets
+are imported inside ``setup`` so a missing driver (e.g. pyodbc for the SQL
+sync helpers) skips one benchmark instead of the whole suite.
+
+Results are keyed ``<name>[<size>]``. ``compare`` flags an entry when its
+median exceeds the baseline median by more than ``tolerance`` (a fraction).
+Baselines are only meaningful on the machine that recorded them, so CI should
+record its own with ``run_micro --save-baseline``.
+"""
+
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import string
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+from .harness import BENCHMARK_ENV
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "micro.json"
+DEFAULT_TOLERANCE = 0.25
+
+CATEGORIES = ("Grocery", "Hardware", "Apparel", "Pharmacy", "Electronics", "Stationery")
+WORDS = (
+    "rice", "basmati", "sugar", "steel", "bolt", "shirt", "cotton", "paracetamol",
+    "charger", "usb", "notebook", "pen", "oil", "soap", "tea", "coffee", "cable",
+)
+
+
+# ---------------------------------------------------------------------------
+# Seeded data generators
+# ---------------------------------------------------------------------------
+
+
+def generate_items(n: int, seed: int = 0) -> list[dict[str, Any]]:
+    """ERP item documents with realistic names, barcodes and prices."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 4))).title()
+        items.append(
+            {
+                "_id": f"{i:024x}",
+                "item_code": f"ITEM{i:06d}",
+                "item_name": f"{name} {rng.randint(1, 999)}g",
+                "barcode": f"{rng.choice(('51', '52', '53'))}{rng.randint(0, 9999):04d}",
+                "stock_qty": float(rng.randint(0, 500)),
+                "mrp": round(rng.uniform(5, 20000), 2),
+                "sale_price": round(rng.uniform(5, 20000), 2),
+                "category": rng.choice(CATEGORIES),
+                "subcategory": "General",
+                "warehouse": rng.choice(("Main", "Annex")),
+                "uom_name": "Numbers",
+            }
+        )
+    return items
+
+
+def generate_sql_items(n: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Rows as returned by the SQL Server item query, with sparse metadata."""
+    rng = random.Random(seed)
+    rows = []
+    for item in generate_items(n, seed):
+        row = dict(item)
+        row.pop("_id")
+        row.update(
+            hsn_code=rng.choice((None, "", f"{rng.randint(1000, 9999)}")),
+            gst_percent=rng.choice((None, 5, 12, 18, "28")),
+            location=rng.choice((None, f"F{rng.randint(0, 3)}-R{rng.randint(1, 40)}")),
+            uom_code="NOS",
+            manufacturing_date=rng.choice(
+                (None, datetime(2024, 1, 1) + timedelta(days=rng.randint(0, 600)))
+            ),
+        )
+        rows.append(row)
+    return rows
+
+
+def generate_payloads(n: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Nested JSON request bodies; about 1% carry an injection attempt."""
+    rng = random.Random(seed)
+    attacks = ("<script>alert(1)</script>", "1; DROP TABLE users", "{'$where': 'sleep(1)'}")
+    payloads = []
+    for i in range(n):
+        text = "".join(rng.choice(string.ascii_letters + " ") for _ in range(40))
+        payload = {
+            "session_id": f"S{i % 50}",
+            "item_code": f"ITEM{i:06d}",
+            "remark": text,
+            "counted_qty": rng.randint(0, 100),
+            "serial_numbers": [f"SN{rng.randint(0, 10**8)}" for _ in range(rng.randint(0, 3))],
+            "correction_metadata": {"note": text[:20], "tags": ["recount", "floor"]},
+        }
+        if rng.random() < 0.01:
+            payload["remark"] = rng.choice(attacks)
+        payloads.append(payload)
+    return payloads
+
+
+def generate_report_rows(n: int, seed: int = 0) -> tuple[list[dict], list[dict]]:
+    """Two snapshots of grouped report rows: ~5% added, removed and changed."""
+    rng = random.Random(seed)
+    rows_a = [
+        {
+            "_id": {"warehouse": rng.choice(("Main", "Annex")), "item_code": f"ITEM{i:06d}"},
+            "total_qty": rng.randint(0, 500),
+            "total_value": round(rng.uniform(0, 1e5), 2),
+        }
+        for i in range(n)
+    ]
+    rows_b = []
+    for row in rows_a:
+        roll = rng.random()
+        if roll < 0.05:
+            continue
+        if roll < 0.10:
+            row = {**row, "total_qty": row["total_qty"] + rng.randint(1, 10)}
+        rows_b.append(row)
+    for i in range(n, n + n // 20):
+        rows_b.append(
+            {"_id": {"warehouse": "Main", "item_code": f"ITEM{i:06d}"}, "total_qty": 1, "total_value": 1.0}
+        )
+    return rows_a, rows_b
+
+
+def generate_count_lines(n: int, seed: int = 0) -> list[tuple[dict, Any, float]]:
+    """(erp_item, CountLineCreate, variance) triples spanning every risk rule."""
+    from backend.api.schemas import CountLineCreate
+
+    rng = random.Random(seed)
+    lines = []
+    for item in generate_items(n, seed):
+        counted = max(item["stock_qty"] + rng.choice((0, 0, 0, 1, -3, 150)), 0)
+        line = CountLineCreate(
+            session_id="S1",
+            item_code=item["item_code"],
+            counted_qty=counted,
+            mrp_counted=rng.choice((None, item["mrp"], round(item["mrp"] * 0.7, 2))),
+            variance_reason=rng.choice((None, "damaged")),
+            serial_numbers=rng.choice((None, ["SN1"])),
+        )
+        lines.append((item, line, counted - item["stock_qty"]))
+    return lines
+
+
+def generate_barcodes(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [f"{rng.choice(('51', '52', '53'))}{rng.randint(0, 9999):04d}" for _ in range(n)]
+
+
+def generate_audit_entries(n: int, seed: int = 0) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "timestamp": start + timedelta(seconds=i),
+            "event_type": rng.choice(("auth.login", "count.create", "session.close")),
+            "actor_id": f"user{rng.randint(1, 50)}",
+            "action": rng.choice(("create", "update", "delete")),
+            "resource_id": f"ITEM{rng.randint(0, n):06d}",
+            "details": {"qty": rng.randint(0, 100), "ip": f"10.0.{rng.randint(0, 255)}.{rng.randint(0, 255)}"},
+        }
+        for i in range(n)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class MicroBenchmark:
+    name: str
+    target: str
+    setup: Callable[[int, int], Callable[[], Any]]
+
+
+def _search_score(size: int, seed: int):
+    from backend.services.search_service import SearchService
+
+    service = SearchService(db=None)
+    candidates = generate_items(size, seed)
+    return lambda: service._score_candidates(candidates, "basmati rice", False)
+
+
+def _sql_build_items(size: int, seed: int):
+    from backend.services.sql_sync_service import _build_new_item_dict
+
+    rows = generate_sql_items(size, seed)
+    now = datetime(2025, 1, 1)
+    return lambda: [_build_new_item_dict(row, row["stock_qty"], now) for row in rows]
+
+
+def _sql_metadata_updates(size: int, seed: int):
+    from backend.services.sql_sync_service import (
+        _build_metadata_candidates,
+        _compute_metadata_updates,
+    )
+
+    rows = generate_sql_items(size, seed)
+    existing = generate_items(size, seed + 1)
+    pairs = [(_build_metadata_candidates(row), item) for row, item in zip(rows, existing)]
+    return lambda: [_compute_metadata_updates(candidates, item) for candidates, item in pairs]
+
+
+def _sanitization(size: int, seed: int):
+    from backend.middleware.input_sanitization import InputSanitizationMiddleware
+
+    middleware = InputSanitizationMiddleware(app=None, log_violations=False)
+    payloads = generate_payloads(size, seed)
+    return lambda: [middleware._contains_dangerous_input(payload) for payload in payloads]
+
+
+def _compare_rows(size: int, seed: int):
+    from backend.services.reporting.compare_engine import CompareEngine
+
+    engine = CompareEngine(db=None)
+    rows_a, rows_b = generate_report_rows(size, seed)
+    return lambda: engine._compare_rows(rows_a, rows_b, ["warehouse", "item_code"])
+
+
+def _risk_flags(size: int, seed: int):
+    from backend.api.count_lines_api import calculate_financial_impact, detect_risk_flags
+
+    lines = generate_count_lines(size, seed)
+
+    def run():
+        for item, line, variance in lines:
+            detect_risk_flags(item, line, variance)
+            calculate_financial_impact(item["mrp"], line.mrp_counted or item["mrp"], line.counted_qty)
+
+    return run
+
+
+def _barcode_batch(size: int, seed: int):
+    from backend.scripts.barcode_analyzer import BarcodeAnalyzer
+
+    barcodes = generate_barcodes(size, seed)
+    return lambda: BarcodeAnalyzer.batch_analyze(barcodes)
+
+
+def _audit_hash(size: int, seed: int):
+    from backend.services.enterprise_audit import EnterpriseAuditService
+
+    compute_hash = EnterpriseAuditService._compute_hash
+    entries = generate_audit_entries(size, seed)
+
+    def run():
+        previous = None
+        for entry in entries:
+            previous = compute_hash(None, entry, previous)
+
+    return run
+
+
+BENCHMARKS: dict[str, MicroBenchmark] = {
+    benchmark.name: benchmark
+    for benchmark in (
+        MicroBenchmark("search_score_candidates", "SearchService._score_candidates", _search_score),
+        MicroBenchmark("sql_build_new_item_dict", "sql_sync_service._build_new_item_dict", _sql_build_items),
+        MicroBenchmark(
+            "sql_compute_metadata_updates", "sql_sync_service._compute_metadata_updates", _sql_metadata_updates
+        ),
+        MicroBenchmark(
+            "sanitization_dangerous_input",
+            "InputSanitizationMiddleware._contains_dangerous_input",
+            _sanitization,
+        ),
+        MicroBenchmark("compare_rows", "CompareEngine._compare_rows", _compare_rows),
+        MicroBenchmark(
+            "count_line_risk_flags",
+            "count_lines_api.detect_risk_flags/calculate_financial_impact",
+            _risk_flags,
+        ),
+        MicroBenchmark("barcode_batch_analyze", "BarcodeAnalyzer.batch_analyze", _barcode_batch),
+        MicroBenchmark("audit_compute_hash", "EnterpriseAuditService._compute_hash", _audit_hash),
+    )
+}
+
+
+# ---------------------------------------------------------------------------
+# Running and comparing
+# ---------------------------------------------------------------------------
+
+
+def time_callable(fn: Callable[[], Any], rounds: int = 5, warmup: int = 1) -> dict[str, float]:
+    """Per-round wall times of ``fn`` (seconds), with GC paused while timing."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        "rounds": rounds,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stddev": statistics.stdev(timings) if rounds > 1 else 0.0,
+    }
+
+
+def run_micro_benchmarks(
+    names: Optional[list[str]] = None,
+    sizes: Optional[list[str]] = None,
+    rounds: int = 5,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Run the selected benchmarks; unavailable targets are listed under ``skipped``."""
+    for key, value in BENCHMARK_ENV.items():
+        os.environ.setdefault(key, value)
+
+    results: dict[str, Any] = {}
+    skipped: dict[str, str] = {}
+    for name in names or list(BENCHMARKS):
+        benchmark = BENCHMARKS[name]
+        for label in sizes or list(SIZES):
+            try:
+                fn = benchmark.setup(SIZES[label], seed)
+            except ImportError as e:
+                skipped[name] = f"{type(e).__name__}: {e}"
+                break
+            results[f"{name}[{label}]"] = {
+                "target": benchmark.target,
+                "size": SIZES[label],
+                **time_callable(fn, rounds=rounds),
+            }
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "config": {"rounds": rounds, "seed": seed},
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare_results(
+    current: dict[str, Any], baseline: dict[str, Any], tolerance: float = DEFAULT_TOLERANCE
+) -> dict[str, Any]:
+    """Median-vs-median comparison; ``regressions`` lists keys slower than tolerance allows."""
+    rows = []
+    regressions = []
+    for key, result in sorted(current["results"].items()):
+        base = baseline.get("results", {}).get(key)
+        if base is None:
+            rows.append({"key": key, "median": result["median"], "baseline": None, "ratio": None, "status": "new"})
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else float("inf")
+        if ratio > 1 + tolerance:
+            status = "regressed"
+            regressions.append(key)
+        elif ratio < 1 - tolerance:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append(
+            {"key": key, "median": result["median"], "baseline": base["median"], "ratio": ratio, "status": status}
+        )
+    return {"tolerance": tolerance, "rows": rows, "regressions": regressions}
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def save_results(results: dict[str, Any], path: Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as fh:
+        json.dump(results, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+    return path
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+End-to-End Benchmark Runner
+===========================
+
+Replays counting-workflow scenarios against the in-process app and writes a
+JSON report.
+
+Usage:
+    python -m backend.tests.benchmarks.run_e2e
+    python -m backend.tests.benchmarks.run_e2e --concurrency 50 --requests 1000
+    python -m backend.tests.benchmarks.run_e2e --scenario barcode_scans --scenario count_line_posts
+    python -m backend.tests.benchmarks.run_e2e --output-dir /tmp/bench --seed 7
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from .harness import DEFAULT_REPORTS_DIR, run_benchmarks, write_report
+from .scenarios import SCENARIOS
+
+
+def _print_summary(report: dict) -> None:
+    print(
+        f"\n{'Scenario':<22}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        f"{'errors':>8}{'peak KiB':>10}"
+    )
+    print("-" * 80)
+    for result in report["scenarios"]:
+        latency = result["latency_seconds"]
+        print(
+            f"{result['name']:<22}{result['throughput_rps']:>10.1f}"
+            f"{latency['p50'] * 1000:>10.2f}{latency['p95'] * 1000:>10.2f}"
+            f"{latency['p99'] * 1000:>10.2f}{result['errors']:>8}"
+            f"{result['allocations']['peak_bytes'] / 1024:>10.0f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stock Verify in-process E2E benchmarks")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run (repeatable; default: all)",
+    )
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent clients")
+    parser.add_argument("--items", type=int, default=1000, help="ERP items to seed")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed for traffic")
+    parser.add_argument(
+        "--output-dir", type=Path, default=DEFAULT_REPORTS_DIR, help="Report directory"
+    )
+    args = parser.parse_args()
+
+    names = args.scenario or list(SCENARIOS)
+    report = asyncio.run(
+        run_benchmarks(
+            [SCENARIOS[name] for name in names],
+            requests=args.requests,
+            concurrency=args.concurrency,
+            items=args.items,
+            seed=args.seed,
+        )
+    )
+    path = write_report(report, args.output_dir)
+    _print_summary(report)
+    print(f"\n📊 Report saved: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
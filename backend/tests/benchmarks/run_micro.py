@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark Runner
+======================
+
+Usage:
+    python -m backend.tests.benchmarks.run_micro run --size 1k --size 10k
+    python -m backend.tests.benchmarks.run_micro run --save-baseline
+    python -m backend.tests.benchmarks.run_micro run --output current.json
+    python -m backend.tests.benchmarks.run_micro compare --tolerance 0.2
+    python -m backend.tests.benchmarks.run_micro compare --current current.json
+
+``compare`` exits with status 1 when any benchmark's median is slower than
+the baseline by more than the tolerance.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from .micro import (
+    BENCHMARKS,
+    DEFAULT_BASELINE,
+    DEFAULT_TOLERANCE,
+    SIZES,
+    compare_results,
+    load_results,
+    run_micro_benchmarks,
+    save_results,
+)
+
+
+def _add_selection(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--benchmark", action="append", choices=sorted(BENCHMARKS), help="Benchmark to run (repeatable)"
+    )
+    parser.add_argument("--size", action="append", choices=list(SIZES), help="Input size (repeatable)")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Data generator seed")
+
+
+def _run(args) -> dict:
+    results = run_micro_benchmarks(args.benchmark, args.size, rounds=args.rounds, seed=args.seed)
+    for name, reason in results["skipped"].items():
+        print(f"⚠️  {name} skipped ({reason})")
+    return results
+
+
+def _print_results(results: dict) -> None:
+    print(f"\n{'Benchmark':<42}{'median ms':>12}{'min ms':>12}{'stddev ms':>12}")
+    print("-" * 78)
+    for key, result in results["results"].items():
+        print(
+            f"{key:<42}{result['median'] * 1000:>12.3f}{result['min'] * 1000:>12.3f}"
+            f"{result['stddev'] * 1000:>12.3f}"
+        )
+
+
+def _print_comparison(comparison: dict) -> None:
+    print(f"\n{'Benchmark':<42}{'median ms':>12}{'base ms':>12}{'ratio':>8}  status")
+    print("-" * 86)
+    for row in comparison["rows"]:
+        base = f"{row['baseline'] * 1000:>12.3f}" if row["baseline"] is not None else f"{'-':>12}"
+        ratio = f"{row['ratio']:>8.2f}" if row["ratio"] is not None else f"{'-':>8}"
+        print(f"{row['key']:<42}{row['median'] * 1000:>12.3f}{base}{ratio}  {row['status']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stock Verify hot-path micro-benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks")
+    _add_selection(run_parser)
+    run_parser.add_argument("--output", type=Path, help="Write results to this JSON file")
+    run_parser.add_argument(
+        "--save-baseline", action="store_true", help=f"Store results as the baseline ({DEFAULT_BASELINE.name})"
+    )
+
+    compare_parser = commands.add_parser("compare", help="Compare against the stored baseline")
+    _add_selection(compare_parser)
+    compare_parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    compare_parser.add_argument(
+        "--current", type=Path, help="Results file to compare instead of running the benchmarks"
+    )
+    compare_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown as a fraction of the baseline median (default: %(default)s)",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = _run(args)
+        _print_results(results)
+        if args.output:
+            print(f"\n📊 Results saved: {save_results(results, args.output)}")
+        if args.save_baseline:
+            print(f"\n📌 Baseline saved: {save_results(results, DEFAULT_BASELINE)}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"❌ No baseline at {args.baseline}; record one with 'run --save-baseline'")
+        return 2
+    current = load_results(args.current) if args.current else _run(args)
+    comparison = compare_results(current, load_results(args.baseline), args.tolerance)
+    _print_comparison(comparison)
+    if comparison["regressions"]:
+        print(f"\n❌ {len(comparison['regressions'])} regression(s) beyond {args.tolerance:.0%}:")
+        for key in comparison["regressions"]:
+            print(f"   - {key}")
+        return 1
+    print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
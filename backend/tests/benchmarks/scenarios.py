@@ -0,0 +1,128 @@
+"""
+Benchmark Scenarios
+===================
+
+Realistic slices of the counting workflow. Each step issues one request with
+inputs derived from the run's seeded RNG, so two runs with the same seed
+replay the same traffic.
+"""
+
+import uuid
+from datetime import datetime
+
+from .harness import BenchmarkContext, Scenario
+
+# Records per offline-sync batch, roughly what a device uploads after a shift
+SYNC_BATCH_SIZE = 25
+DASHBOARD_ENDPOINTS = (
+    "/api/admin/dashboard/kpis",
+    "/api/admin/dashboard/system-status",
+    "/api/admin/dashboard/summary",
+)
+REPORT_TYPES = ("stock_summary", "variance_report", "user_activity")
+
+
+async def login_storm(ctx: BenchmarkContext, index: int) -> int:
+    """Many users signing in at shift start (password hashing dominates)."""
+    username, password = (
+        ("staff1", "staff123"),
+        ("supervisor", "super123"),
+        ("admin", "admin123"),
+    )[index % 3]
+    response = await ctx.client.post(
+        "/api/auth/login", json={"username": username, "password": password}
+    )
+    return response.status_code
+
+
+async def barcode_scans(ctx: BenchmarkContext, index: int) -> int:
+    """Scanner lookups; a small share are misses for unknown barcodes."""
+    if ctx.rng.random() < 0.05:
+        barcode = f"53{9000 + index % 1000:04d}"
+    else:
+        barcode = ctx.rng.choice(ctx.items)["barcode"]
+    response = await ctx.client.get(
+        f"/api/erp/items/barcode/{barcode}", headers=ctx.headers("staff")
+    )
+    return response.status_code
+
+
+async def count_line_posts(ctx: BenchmarkContext, index: int) -> int:
+    """Counted quantities posted one at a time, a fifth of them with variance."""
+    item = ctx.rng.choice(ctx.items)
+    payload = {
+        "session_id": ctx.session_id,
+        "item_code": item["item_code"],
+        "counted_qty": item["stock_qty"],
+        "floor_no": "G",
+        "rack_no": f"R{index % 40:02d}",
+    }
+    if ctx.rng.random() < 0.2:
+        payload["counted_qty"] = item["stock_qty"] + ctx.rng.randint(1, 5)
+        payload["variance_reason"] = "count_mismatch"
+    response = await ctx.client.post(
+        "/api/count-lines", json=payload, headers=ctx.headers("staff")
+    )
+    return response.status_code
+
+
+async def batch_offline_sync(ctx: BenchmarkContext, index: int) -> int:
+    """A device flushing its offline queue."""
+    now = datetime.utcnow().isoformat()
+    records = []
+    for _ in range(SYNC_BATCH_SIZE):
+        item = ctx.rng.choice(ctx.items)
+        records.append(
+            {
+                "client_record_id": uuid.UUID(int=ctx.rng.getrandbits(128)).hex,
+                "session_id": ctx.session_id,
+                "rack_id": f"R{index % 40:02d}",
+                "floor": "G",
+                "item_code": item["item_code"],
+                "verified_qty": item["stock_qty"],
+                "status": "finalized",
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+    response = await ctx.client.post(
+        "/api/sync/batch",
+        json={"records": records, "batch_id": f"bench-{index}"},
+        headers=ctx.headers("staff"),
+    )
+    return response.status_code
+
+
+async def dashboard_polling(ctx: BenchmarkContext, index: int) -> int:
+    """Supervisors' dashboards refreshing their panels."""
+    path = DASHBOARD_ENDPOINTS[index % len(DASHBOARD_ENDPOINTS)]
+    response = await ctx.client.get(path, headers=ctx.headers("admin"))
+    return response.status_code
+
+
+async def report_export(ctx: BenchmarkContext, index: int) -> int:
+    """CSV report downloads."""
+    report_type = REPORT_TYPES[index % len(REPORT_TYPES)]
+    response = await ctx.client.post(
+        "/api/reports/export/csv",
+        json={"report_type": report_type, "format": "csv"},
+        headers=ctx.headers("supervisor"),
+    )
+    return response.status_code
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("login_storm", "Concurrent logins", login_storm),
+        Scenario("barcode_scans", "ERP barcode lookups", barcode_scans, (200, 404)),
+        Scenario("count_line_posts", "Single count-line posts", count_line_posts),
+        Scenario(
+            "batch_offline_sync",
+            f"Offline sync batches of {SYNC_BATCH_SIZE} records",
+            batch_offline_sync,
+        ),
+        Scenario("dashboard_polling", "Admin dashboard refreshes", dashboard_polling),
+        Scenario("report_export", "CSV report exports", report_export),
+    )
+}
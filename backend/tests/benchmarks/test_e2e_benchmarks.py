@@ -0,0 +1,51 @@
+"""
+Tests for the in-process E2E benchmark harness
+"""
+
+import asyncio
+import json
+import random
+
+from .harness import BenchmarkContext, Scenario, run_benchmarks, run_scenario, write_report
+from .scenarios import SCENARIOS
+
+
+async def test_run_scenario_measures_latency_statuses_and_allocations():
+    in_flight = {"now": 0, "max": 0}
+
+    async def step(ctx, index):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        ctx.items.append(bytearray(1024))
+        await asyncio.sleep(0.001)
+        in_flight["now"] -= 1
+        if index % 10 == 0:
+            raise ConnectionError("dropped")
+        return 500 if index % 10 == 1 else 200
+
+    ctx = BenchmarkContext(client=None, db=None, rng=random.Random(1))
+    result = await run_scenario(ctx, Scenario("fake", "fake", step), requests=50, concurrency=5)
+    report = result.to_dict()
+
+    assert in_flight["max"] == 5
+    assert report["requests"] == 50
+    assert report["status_codes"] == {"200": 40, "500": 5, "ConnectionError": 5}
+    assert report["errors"] == 10
+    assert 0.001 <= report["latency_seconds"]["p50"] <= report["latency_seconds"]["p99"]
+    assert report["throughput_rps"] > 0
+    assert report["allocations"]["peak_bytes"] >= 50 * 1024
+
+
+def test_report_is_written_as_json(tmp_path):
+    path = write_report({"scenarios": []}, tmp_path)
+
+    assert path.parent == tmp_path
+    assert json.loads(path.read_text()) == {"scenarios": []}
+
+
+async def test_all_scenarios_run_against_the_in_process_app():
+    report = await run_benchmarks(list(SCENARIOS.values()), requests=6, concurrency=3, items=50)
+
+    assert [r["name"] for r in report["scenarios"]] == list(SCENARIOS)
+    for result in report["scenarios"]:
+        assert result["errors"] == 0, result
@@ -0,0 +1,48 @@
+"""
+Tests for the hot-path micro-benchmark suite
+"""
+
+import pytest
+
+from .micro import (
+    BENCHMARKS,
+    compare_results,
+    generate_items,
+    generate_report_rows,
+    time_callable,
+)
+
+
+def test_generators_are_seeded():
+    assert generate_items(50, seed=3) == generate_items(50, seed=3)
+    assert generate_items(50, seed=3) != generate_items(50, seed=4)
+
+    rows_a, rows_b = generate_report_rows(1000, seed=1)
+    assert len(rows_a) == 1000
+    assert 0.9 * len(rows_a) < len(rows_b) < 1.1 * len(rows_a)
+
+
+@pytest.mark.parametrize("name", sorted(BENCHMARKS))
+def test_benchmark_runs_on_small_input(name):
+    try:
+        fn = BENCHMARKS[name].setup(100, 0)
+    except ImportError as e:
+        pytest.skip(f"{name} target unavailable: {e}")
+
+    timing = time_callable(fn, rounds=2, warmup=0)
+
+    assert 0 < timing["min"] <= timing["median"]
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    def results(**medians):
+        return {"results": {key: {"median": value} for key, value in medians.items()}}
+
+    baseline = results(a=1.0, b=1.0, c=1.0)
+    current = results(a=1.2, b=1.5, c=0.5, d=0.1)
+
+    comparison = compare_results(current, baseline, tolerance=0.25)
+
+    statuses = {row["key"]: row["status"] for row in comparison["rows"]}
+    assert statuses == {"a": "ok", "b": "regressed", "c": "improved", "d": "new"}
+    assert comparison["regressions"] == ["b"]
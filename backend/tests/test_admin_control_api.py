@@ -158,3 +158,30 @@ def test_test_sql_server_connection(mock_sql_connector):
     response = client.post("/api/admin/control/sql-server/test", json=config)
     assert response.status_code == 200
     assert mock_sql_connector.connect.called
+
+
+def test_data_validation_start_and_progress():
+    service = MagicMock()
+    service.start_full_validation.side_effect = [
+        {"pid": 4242, "collections": ["erp_items"]},
+        RuntimeError("Data validation is already running"),
+    ]
+    service.is_full_validation_running.return_value = True
+
+    async def progress():
+        return [{"collection": "erp_items", "status": "running"}]
+
+    service.get_validation_progress = progress
+    with patch("backend.api.admin_control_api._data_validation_service", service):
+        response = client.post("/api/admin/control/data-validation/start?batch_size=1000")
+        assert response.status_code == 200
+        assert response.json()["data"]["pid"] == 4242
+        service.start_full_validation.assert_called_with(batch_size=1000)
+
+        assert client.post("/api/admin/control/data-validation/start").status_code == 409
+
+        response = client.get("/api/admin/control/data-validation/progress")
+        assert response.json()["data"] == {
+            "running": True,
+            "collections": [{"collection": "erp_items", "status": "running"}],
+        }
@@ -0,0 +1,74 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from backend.services.ai_search import (
+    AISearchService,
+    InferenceQueueFullError,
+)
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(texts)
+        if isinstance(texts, str):
+            return np.array([float(len(texts)), 1.0])
+        return np.array([[float(len(t)), 1.0] for t in texts])
+
+
+@pytest.fixture
+def service(monkeypatch):
+    svc = AISearchService()
+    model = FakeModel()
+    monkeypatch.setattr(AISearchService, "_model", model)
+    monkeypatch.setattr(svc, "batch_window", 0.02)
+    yield svc, model
+    svc.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_encode_async_micro_batches_concurrent_queries(service):
+    svc, model = service
+
+    results = await asyncio.gather(*(svc.encode_async("q" * n) for n in range(1, 6)))
+
+    assert [r[0] for r in results] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert len(model.calls) == 1
+    stats = svc.get_stats()
+    assert stats["inference_items"] >= 5
+    assert stats["latency_ms"]["p50"] is not None
+
+
+@pytest.mark.asyncio
+async def test_encode_async_rejects_when_queue_full(service, monkeypatch):
+    svc, _ = service
+    monkeypatch.setattr(svc, "max_queue_size", 1)
+    svc.shutdown()
+
+    filler = asyncio.get_running_loop().create_future()
+    svc._ensure_batcher().put_nowait((["filler"], filler))
+
+    with pytest.raises(InferenceQueueFullError):
+        await svc.encode_async("b")
+    assert svc.get_stats()["rejected"] >= 1
+    await filler
+
+
+@pytest.mark.asyncio
+async def test_search_rerank_async_goes_through_the_batcher(service):
+    svc, model = service
+    candidates = [{"item_name": "a"}, {"item_name": "abc"}, {"item_name": "ab"}]
+
+    reranked, query_vector = await asyncio.gather(
+        svc.search_rerank_async("abc", candidates, top_k=2),
+        svc.encode_async("xyz"),
+    )
+
+    assert [c["item_name"] for c in reranked] == ["abc", "ab"]
+    assert query_vector[0] == 3.0
+    # The rerank texts and the concurrent query shared one model call
+    assert len(model.calls) == 1 and len(model.calls[0]) == 5
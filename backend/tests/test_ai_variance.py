@@ -1,8 +1,10 @@
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from backend.services.ai_variance import AIVarianceService
+from backend.services.ai_variance import INVALIDATIONS_COLLECTION, AIVarianceService
+from backend.tests.utils.in_memory_db import InMemoryDatabase
 
 
 @pytest.mark.asyncio
@@ -59,3 +61,117 @@ async def test_predict_session_risks():
     assert len(risks) > 0
     assert risks[0]["item_name"] == "iPhone"
     assert risks[0]["risk_score"] > 0.4
+
+
+@pytest.mark.asyncio
+async def test_predict_session_risks_cached_until_invalidated():
+    service = AIVarianceService()
+    service.clear_cache()
+    db = MagicMock()
+
+    db.count_lines.find.return_value.to_list = AsyncMock(
+        return_value=[
+            {"item_code": "ITEM1", "item_name": "iPhone", "category": "Electronics"},
+        ]
+    )
+    db.variances.aggregate.return_value.to_list = AsyncMock(return_value=[])
+
+    first = await service.predict_session_risks(db, "sess-cache")
+    second = await service.predict_session_risks(db, "sess-cache")
+
+    assert first == second
+    assert db.count_lines.find.call_count == 1
+
+    service.invalidate_session("sess-cache")
+    await service.predict_session_risks(db, "sess-cache")
+    assert db.count_lines.find.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_session_cache_sees_writes_from_other_processes():
+    service = AIVarianceService()
+    service.clear_cache()
+    db = InMemoryDatabase()
+    db.count_lines._documents = [
+        {"id": "l1", "session_id": "s1", "item_code": "A", "category": "Laptop"},
+    ]
+
+    first = await service.predict_session_risks(db, "s1")
+    db.count_lines._documents.append(
+        {"id": "l2", "session_id": "s1", "item_code": "B", "category": "Mobile"}
+    )
+    # Still served from this process's cache
+    assert await service.predict_session_risks(db, "s1") == first
+
+    # Another process wrote a count line and stamped the session
+    await db[INVALIDATIONS_COLLECTION].update_one(
+        {"_id": "s1"}, {"$set": {"changed_at": datetime.utcnow()}}, upsert=True
+    )
+    refreshed = await service.predict_session_risks(db, "s1")
+    assert {r["item_code"] for r in refreshed} == {"A", "B"}
+
+    # Approving a line resolves its session and invalidates it everywhere
+    db.count_lines._documents[0]["variance_reason"] = "damaged"
+    await service.invalidate_count_line(db, {"id": "l1"})
+    assert {r["item_code"] for r in await service.predict_session_risks(db, "s1")} == {"B"}
+
+
+def test_process_items_for_risks_vectorised():
+    service = AIVarianceService()
+    items = [
+        {"item_code": "A", "item_name": "Phone", "category": "Smartphone"},
+        {"item_code": "B", "item_name": "Cable", "category": "Peripherals"},
+        {"item_code": "C", "item_name": "Laptop", "category": "Laptop"},
+        {"item_code": "D", "item_name": "Tab", "category": "Tablet", "variance_reason": "x"},
+        {"item_code": None, "item_name": "Ghost"},
+    ]
+
+    risks = service._process_items_for_risks(
+        items, item_risk_map={"B": 1.0}, cat_risk_map={"Laptop": 0.3}
+    )
+
+    by_code = {r["item_code"]: r for r in risks}
+    assert set(by_code) == {"A", "B"}
+    assert by_code["A"]["risk_score"] == 0.85
+    assert by_code["A"]["reason"] == "High-risk category: Smartphone"
+    # 1.0 * 0.7 + 0.3 * 0.3
+    assert by_code["B"]["risk_score"] == 0.79
+    assert by_code["B"]["reason"] == "Historical variance pattern"
+
+
+class _AsyncCursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def batch_size(self, _size):
+        return self
+
+    def __aiter__(self):
+        self._iter = iter(self._docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+@pytest.mark.asyncio
+async def test_predict_warehouse_risks_batches_and_ranks():
+    service = AIVarianceService()
+    service.clear_cache()
+    db = MagicMock()
+
+    docs = [
+        {"item_code": f"I{i}", "item_name": f"Item {i}", "category": cat}
+        for i, cat in enumerate(["Storage", "High-Value", "Mobile", "Accessories"] * 5)
+    ]
+    db.erp_items.find.return_value = _AsyncCursor(docs)
+    db.variances.aggregate.return_value.to_list = AsyncMock(return_value=[])
+
+    risks = await service.predict_warehouse_risks(db, "Main", limit=3, batch_size=7)
+
+    assert len(risks) == 3
+    assert all(r["category"] == "High-Value" for r in risks)
+    assert [r["risk_score"] for r in risks] == [0.9, 0.9, 0.9]
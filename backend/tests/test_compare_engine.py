@@ -0,0 +1,79 @@
+"""
+Tests for the partitioned, merge-join snapshot comparison
+"""
+
+import pytest
+
+from backend.services.reporting import compare_engine
+from backend.services.reporting.compare_engine import CompareEngine
+from backend.services.reporting.snapshot_engine import SnapshotEngine
+from backend.tests.utils.in_memory_db import InMemoryCursor, InMemoryDatabase
+
+BASELINE = [{"_id": {"item_code": f"I{i:03d}"}, "qty_sum": i} for i in range(40)]
+# I000-I004 removed, I035-I039 changed, I040-I046 added, I010 duplicated (last wins)
+COMPARISON = (
+    [{"_id": {"item_code": f"I{i:03d}"}, "qty_sum": i} for i in range(5, 35)]
+    + [{"_id": {"item_code": f"I{i:03d}"}, "qty_sum": i + (i - 30) * 10} for i in range(35, 40)]
+    + [{"_id": {"item_code": f"I{i:03d}"}, "qty_sum": i} for i in range(40, 47)]
+    + [{"_id": {"item_code": "I010"}, "qty_sum": 10}]
+)
+
+
+async def _snapshot(db, rows, created_by):
+    db.count_lines.aggregate = lambda pipeline, **kwargs: InMemoryCursor(rows)
+    snapshot = await SnapshotEngine(db, chunk_rows=8).create_snapshot(
+        name=created_by,
+        description="",
+        query_spec={"collection": "count_lines", "group_by": ["item_code"]},
+        created_by=created_by,
+    )
+    return snapshot["snapshot_id"]
+
+
+@pytest.fixture
+def small_pages(monkeypatch):
+    monkeypatch.setattr(compare_engine, "DIFF_PAGE_ROWS", 3)
+    monkeypatch.setattr(compare_engine, "SAMPLE_SIZE", 2)
+
+
+@pytest.mark.parametrize("partition_rows", [10, 1000])
+async def test_compare_counts_samples_and_pages(small_pages, partition_rows):
+    db = InMemoryDatabase()
+    db["report_compare_jobs"]
+    a = await _snapshot(db, BASELINE, "week1")
+    b = await _snapshot(db, COMPARISON, "week2")
+    engine = CompareEngine(db, partition_rows=partition_rows)
+
+    job = await engine.compare_snapshots(a, b, "admin")
+
+    row_diff = job["comparison_result"]["row_diff"]
+    assert {k: v for k, v in row_diff.items() if k.endswith("_count")} == {
+        "added_count": 7,
+        "removed_count": 5,
+        "changed_count": 5,
+        "unchanged_count": 30,
+    }
+    # Smallest keys across all partitions
+    assert [r["_id"]["item_code"] for r in row_diff["added"]] == ["I040", "I041"]
+    assert [r["_id"]["item_code"] for r in row_diff["removed"]] == ["I000", "I001"]
+    # Largest changes first
+    assert [c["key"] for c in row_diff["changed"]] == ["I039", "I038"]
+    assert row_diff["changed"][0]["diff"] == {"qty_sum": {"from": 39, "to": 129, "change": 90}}
+    assert job["diff_storage"]["pages"] == {"added": 3, "removed": 2, "changed": 2}
+
+    added = await engine.get_comparison_diffs(job["job_id"], "added", skip=2, limit=4)
+    every_added = await engine.get_comparison_diffs(job["job_id"], "added", limit=100)
+    assert sorted(e["key"] for e in every_added) == [f"I{i:03d}" for i in range(40, 47)]
+    assert added == every_added[2:6]
+    assert await engine.get_comparison_diffs("missing", "added") is None
+
+
+def test_in_memory_compare_without_group_by_keys_on_whole_row():
+    engine = CompareEngine(db=None)
+    rows_a = [{"x": 1}, {"x": 2}, {"x": 2}]
+    rows_b = [{"x": 2}, {"x": 3}]
+
+    result = engine._compare_rows(rows_a, rows_b, [])
+
+    assert (result["added_count"], result["removed_count"], result["unchanged_count"]) == (1, 1, 1)
+    assert result["added"] == [{"x": 3}] and result["removed"] == [{"x": 1}]
@@ -0,0 +1,100 @@
+"""
+Tests for the memoised count service
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from backend.services.count_service import (
+    CountInvalidationListener,
+    CountService,
+    normalize_filter,
+)
+
+
+def _collection(name="count_lines", count=5, estimate=100):
+    return SimpleNamespace(
+        name=name,
+        database=SimpleNamespace(name="stock_verification"),
+        count_documents=AsyncMock(return_value=count),
+        estimated_document_count=AsyncMock(return_value=estimate),
+    )
+
+
+def test_normalize_filter_ignores_key_order():
+    assert normalize_filter({"a": 1, "b": {"$gt": 2}}) == normalize_filter(
+        {"b": {"$gt": 2}, "a": 1}
+    )
+    assert normalize_filter({"a": 1}) != normalize_filter({"a": 2})
+    assert normalize_filter(None) == normalize_filter({})
+
+
+@pytest.mark.asyncio
+async def test_filtered_counts_are_memoised_and_unfiltered_estimated():
+    service = CountService(ttl_seconds=60)
+    collection = _collection()
+
+    first = await service.count(collection, {"session_id": "s1"})
+    second = await service.count(collection, {"session_id": "s1"})
+    assert (first.value, first.accuracy) == (5, "exact")
+    assert (second.value, second.accuracy) == (5, "cached")
+    collection.count_documents.assert_awaited_once()
+
+    total = await service.count(collection)
+    assert total.value == 100 and total.is_estimate
+    collection.estimated_document_count.assert_awaited_once()
+
+    exact_total = await service.count(collection, exact=True)
+    assert exact_total.accuracy == "exact"
+    collection.count_documents.assert_awaited_with({})
+
+
+@pytest.mark.asyncio
+async def test_write_listener_invalidates_only_the_written_collection():
+    service = CountService(ttl_seconds=60)
+    listener = CountInvalidationListener(service)
+    lines, sessions = _collection("count_lines"), _collection("sessions")
+
+    await service.count(lines, {"verified": True})
+    await service.count(sessions, {"status": "OPEN"})
+
+    event = SimpleNamespace(
+        command_name="insert",
+        command={"insert": "count_lines", "documents": []},
+        database_name="stock_verification",
+        connection_id=("localhost", 27017),
+        request_id=1,
+    )
+    listener.started(event)
+    listener.succeeded(event)
+
+    assert (await service.count(lines, {"verified": True})).accuracy == "exact"
+    assert (await service.count(sessions, {"status": "OPEN"})).accuracy == "cached"
+    assert lines.count_documents.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_counts_coalesce_and_racing_writes_are_not_cached():
+    service = CountService(ttl_seconds=60)
+    release = asyncio.Event()
+    collection = _collection()
+
+    async def _slow_count(_query):
+        await release.wait()
+        return 7
+
+    collection.count_documents = AsyncMock(side_effect=_slow_count)
+
+    tasks = [asyncio.create_task(service.count(collection, {"x": 1})) for _ in range(3)]
+    await asyncio.sleep(0)
+    service.invalidate("count_lines")  # a write lands while the count runs
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert [r.value for r in results] == [7, 7, 7]
+    assert collection.count_documents.await_count == 1
+    # The in-flight result predates the write, so it was not memoised
+    assert service.get_stats()["entries"] == 0
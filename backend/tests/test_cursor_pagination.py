@@ -0,0 +1,199 @@
+"""
+Tests for signed keyset (cursor) pagination
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from backend.api.count_lines_api import paginate_count_lines
+from backend.services.activity_log import ActivityLogService
+from backend.tests.utils.in_memory_db import InMemoryDatabase
+from backend.utils.pagination import (
+    InvalidCursorError,
+    cursor_paginate_mongo,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def test_cursor_round_trip_preserves_bson_types():
+    ts = datetime(2024, 5, 1, 12, 30, 15, 123000)
+    oid = ObjectId()
+    cursor = encode_cursor("counted_at", -1, ts, oid, {"session_id": "s1"})
+
+    assert decode_cursor(cursor, "counted_at", -1, {"session_id": "s1"}) == (ts, oid)
+
+
+def test_cursor_rejects_tampering_and_reuse():
+    cursor = encode_cursor("counted_at", -1, "2024-01-01", "abc", {"session_id": "s1"})
+    body, signature = cursor.split(".")
+
+    with pytest.raises(InvalidCursorError, match="signature"):
+        decode_cursor(f"{body[:-2]}AA.{signature}", "counted_at", -1, {"session_id": "s1"})
+    with pytest.raises(InvalidCursorError, match="Malformed"):
+        decode_cursor("not-a-cursor", "counted_at", -1, {"session_id": "s1"})
+    with pytest.raises(InvalidCursorError, match="sort"):
+        decode_cursor(cursor, "counted_at", 1, {"session_id": "s1"})
+    with pytest.raises(InvalidCursorError, match="filter"):
+        decode_cursor(cursor, "counted_at", -1, {"session_id": "s2"})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("direction", [1, -1])
+async def test_keyset_pages_include_rows_without_a_sort_value(direction):
+    db = InMemoryDatabase()
+    for i in range(7):
+        doc = {"_id": f"{i:04d}", "session_id": "s1"}
+        if i % 3:
+            doc["counted_at"] = datetime(2024, 1, 1) + timedelta(minutes=i)
+        elif i:
+            doc["counted_at"] = None
+        await db.count_lines.insert_one(doc)
+
+    seen = []
+    cursor = ""
+    while True:
+        page = await cursor_paginate_mongo(
+            db.count_lines,
+            {"session_id": "s1"},
+            sort_field="counted_at",
+            direction=direction,
+            limit=2,
+            cursor=cursor,
+        )
+        seen.extend(item["_id"] for item in page.items)
+        if not page.has_more:
+            break
+        cursor = page.next_cursor
+
+    assert sorted(seen) == [f"{i:04d}" for i in range(7)]
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_every_row_once_with_ties():
+    db = InMemoryDatabase()
+    base = datetime(2024, 1, 1)
+    # Several rows share a timestamp so the _id tie-break matters
+    for i in range(23):
+        await db.count_lines.insert_one(
+            {
+                "_id": f"{i:04d}",
+                "session_id": "s1",
+                "counted_at": base + timedelta(minutes=i // 3),
+            }
+        )
+    await db.count_lines.insert_one({"_id": "other", "session_id": "s2", "counted_at": base})
+
+    seen = []
+    cursor = ""
+    while True:
+        page = await cursor_paginate_mongo(
+            db.count_lines,
+            {"session_id": "s1"},
+            sort_field="counted_at",
+            limit=5,
+            cursor=cursor,
+            projection={"_id": 0},
+        )
+        assert all("_id" not in item for item in page.items)
+        seen.extend(item["counted_at"] for item in page.items)
+        if not page.has_more:
+            assert page.next_cursor is None
+            break
+        cursor = page.next_cursor
+
+    assert len(seen) == 23
+    assert seen == sorted(seen, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_count_lines_cursor_mode_and_offset_compatibility():
+    db = InMemoryDatabase()
+    for i in range(7):
+        await db.count_lines.insert_one(
+            {"id": str(i), "session_id": "s1", "counted_at": datetime(2024, 1, 1, 0, i)}
+        )
+
+    first = await paginate_count_lines(db, {"session_id": "s1"}, page_size=4, cursor="")
+    assert [line["id"] for line in first["items"]] == ["6", "5", "4", "3"]
+    assert first["pagination"]["has_more"] is True
+    assert first["pagination"]["total"] is None
+
+    second = await paginate_count_lines(
+        db,
+        {"session_id": "s1"},
+        page_size=4,
+        cursor=first["pagination"]["next_cursor"],
+        include_total=True,
+    )
+    assert [line["id"] for line in second["items"]] == ["2", "1", "0"]
+    assert second["pagination"]["total"] == 7
+    assert second["pagination"]["total_is_estimate"] is False
+
+    offset = await paginate_count_lines(db, {"session_id": "s1"}, page=2, page_size=4)
+    assert [line["id"] for line in offset["items"]] == ["2", "1", "0"]
+    assert offset["pagination"]["total"] == 7
+    assert offset["pagination"]["has_prev"] is True
+
+    from fastapi import HTTPException
+
+    with pytest.raises(HTTPException) as exc:
+        await paginate_count_lines(
+            db, {"session_id": "s2"}, cursor=first["pagination"]["next_cursor"]
+        )
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_activity_log_cursor_uses_estimated_total_when_unfiltered():
+    db = InMemoryDatabase()
+    service = ActivityLogService(db)
+    for i in range(3):
+        await db.activity_logs.insert_one(
+            {"user": "u", "action": "a", "status": "success", "timestamp": datetime(2024, 1, i + 1)}
+        )
+
+    result = await service.get_activities(page_size=2, cursor="", include_total=True)
+    assert len(result["activities"]) == 2
+    assert all("id" in activity for activity in result["activities"])
+    assert result["pagination"]["total"] == 3
+    assert result["pagination"]["total_is_estimate"] is True
+
+
+@pytest.mark.asyncio
+async def test_activity_log_endpoint_pages_with_cursor(monkeypatch):
+    from fastapi import HTTPException
+
+    from backend.api import logs_api
+
+    db = InMemoryDatabase()
+    monkeypatch.setattr(logs_api.auth_deps, "_db", db)
+    monkeypatch.setattr(logs_api.auth_deps, "_initialized", True)
+    for i in range(3):
+        await db.activity_logs.insert_one(
+            {"user": "u", "action": "a", "status": "success", "timestamp": datetime(2024, 1, i + 1)}
+        )
+    filters = dict(user=None, action=None, status_filter=None, start_date=None, end_date=None)
+
+    first = await logs_api.get_activity_logs(
+        page=1, page_size=2, cursor="", include_total=False, current_user={}, **filters
+    )
+    assert [a.timestamp.day for a in first["activities"]] == [3, 2]
+    assert first["pagination"]["total"] is None
+    second = await logs_api.get_activity_logs(
+        page=1,
+        page_size=2,
+        cursor=first["pagination"]["next_cursor"],
+        include_total=False,
+        current_user={},
+        **filters,
+    )
+    assert [a.timestamp.day for a in second["activities"]] == [1]
+
+    with pytest.raises(HTTPException) as exc:
+        await logs_api.get_activity_logs(
+            page=1, page_size=2, cursor="bogus", include_total=None, current_user={}, **filters
+        )
+    assert exc.value.status_code == 400
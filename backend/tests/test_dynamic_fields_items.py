@@ -0,0 +1,112 @@
+"""
+Tests for join-free dynamic field reads on erp_items
+"""
+
+import pytest
+from bson import ObjectId
+
+from backend.services.dynamic_fields_service import DynamicFieldsService
+from backend.tests.utils.in_memory_db import InMemoryDatabase
+
+
+@pytest.fixture
+def service():
+    db = InMemoryDatabase()
+    db["dynamic_field_definitions"]
+    db["dynamic_field_values"]
+    db.erp_items._documents = [
+        {"item_code": code, "item_name": f"Item {code}"} for code in ("A1", "B2", "C3", "D4")
+    ]
+    return DynamicFieldsService(db)
+
+
+def _item(service, code):
+    return next(doc for doc in service.db.erp_items._documents if doc["item_code"] == code)
+
+
+def _definition_id(service, name):
+    """Give a stored definition a Mongo-style ObjectId, as the API passes one in"""
+    field = next(doc for doc in service.field_definitions._documents if doc["field_name"] == name)
+    field["_id"] = ObjectId()
+    return str(field["_id"])
+
+
+async def _define_fields(service):
+    await service.create_field_definition("warranty", "text", "Warranty")
+    await service.create_field_definition("shelf", "text", "Shelf")
+
+
+async def test_set_field_value_mirrors_onto_item(service):
+    await _define_fields(service)
+
+    await service.set_field_value("A1", "warranty", "1 year", "u1")
+    await service.set_field_value("A1", "shelf", "S-2", "u1")
+    await service.set_field_value("A1", "warranty", "2 years", "u1")
+
+    assert _item(service, "A1")["dynamic_fields"] == {"warranty": "2 years", "shelf": "S-2"}
+    assert "dynamic_fields" not in _item(service, "B2")
+
+
+async def test_get_items_filters_and_pages_by_item_code(service):
+    await _define_fields(service)
+    for code, warranty in (("D4", "1 year"), ("B2", "1 year"), ("A1", "2 years")):
+        await service.set_field_value(code, "warranty", warranty, "u1")
+    await service.set_field_value("C3", "shelf", "S-1", "u1")
+
+    everything = await service.get_items_with_fields()
+    assert [i["item_code"] for i in everything] == ["A1", "B2", "C3", "D4"]
+
+    matched = await service.get_items_with_fields({"warranty": "1 year", "shelf": "S-1"})
+    assert [i["item_code"] for i in matched] == ["B2", "C3", "D4"]
+    assert matched[0]["dynamic_fields"] == {"warranty": "1 year"}
+
+    first = await service.get_items_with_fields(limit=2)
+    second = await service.get_items_with_fields(limit=2, after=first[-1]["item_code"])
+    assert [i["item_code"] for i in first + second] == ["A1", "B2", "C3", "D4"]
+
+
+async def test_create_field_definition_rejects_path_names(service):
+    with pytest.raises(ValueError):
+        await service.create_field_definition("a.b", "text", "Dotted")
+    with pytest.raises(ValueError):
+        await service.create_field_definition("$where", "text", "Operator")
+
+
+async def test_backfill_rebuilds_item_fields(service):
+    await _define_fields(service)
+    await service.create_field_definition("retired", "text", "Retired")
+    await service.delete_field_definition(_definition_id(service, "retired"))
+    service.field_values._documents = [
+        {"item_code": "C3", "field_name": "shelf", "value": "S-9"},
+        {"item_code": "A1", "field_name": "warranty", "value": "1 year"},
+        {"item_code": "A1", "field_name": "shelf", "value": "S-1"},
+        {"item_code": "A1", "field_name": "retired", "value": "old"},
+    ]
+
+    assert await service.backfill_item_fields() == 2
+
+    assert _item(service, "A1")["dynamic_fields"] == {"warranty": "1 year", "shelf": "S-1"}
+    assert _item(service, "C3")["dynamic_fields"] == {"shelf": "S-9"}
+    assert "dynamic_fields" not in _item(service, "B2")
+
+
+async def test_delete_field_definition_removes_item_values(service):
+    await _define_fields(service)
+    await service.set_field_value("A1", "warranty", "1 year", "u1")
+    await service.set_field_value("A1", "shelf", "S-2", "u1")
+    await service.set_field_value("B2", "warranty", "2 years", "u1")
+    warranty = _definition_id(service, "warranty")
+
+    assert await service.delete_field_definition(warranty) is True
+    assert await service.delete_field_definition(warranty) is False
+
+    assert _item(service, "A1")["dynamic_fields"] == {"shelf": "S-2"}
+    assert _item(service, "B2")["dynamic_fields"] == {}
+    items = await service.get_items_with_fields({"warranty": "1 year"})
+    assert items == []
+
+
+async def test_db_mapping_updates_erp_items(service):
+    await service._update_db_mapping("A1", "warranty_text", "1 year")
+
+    assert _item(service, "A1")["warranty_text"] == "1 year"
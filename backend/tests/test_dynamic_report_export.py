@@ -0,0 +1,60 @@
+"""
+Tests for streamed dynamic report files
+"""
+
+import io
+
+from openpyxl import load_workbook
+
+from backend.services.dynamic_report_service import DynamicReportService
+from backend.tests.utils.in_memory_db import InMemoryDatabase
+
+
+def _db():
+    db = InMemoryDatabase()
+    for name in ("items", "report_templates", "generated_reports", "report_files"):
+        db[name]
+    db["items"]._documents = [
+        {"item_code": f"I{i}", "item_name": f"Item {i}", "stock_qty": i} for i in range(5)
+    ]
+    return db
+
+
+def _template(fmt):
+    return {
+        "name": "stock",
+        "report_type": "items",
+        "format": fmt,
+        "fields": [
+            {"name": "item_code", "label": "Code"},
+            {"name": "stock_qty", "label": "Qty"},
+        ],
+        "sorting": [{"field": "stock_qty", "order": "desc"}],
+    }
+
+
+async def test_excel_report_is_written_from_the_cursor():
+    db = _db()
+    service = DynamicReportService(db)
+
+    async def no_full_fetch(*args, **kwargs):
+        raise AssertionError("streamed formats must not load the whole report")
+
+    service._fetch_report_data = no_full_fetch
+
+    report = await service.generate_report(template_data=_template("excel"), generated_by="u")
+
+    assert report["record_count"] == 5
+    stored = db["report_files"]._documents[0]["file_data"]
+    rows = list(load_workbook(io.BytesIO(stored)).active.iter_rows(values_only=True))
+    assert rows[0] == ("Code", "Qty")
+    assert rows[1] == ("I4", 4)
+
+
+async def test_csv_report_streams_rows():
+    db = _db()
+    report = await DynamicReportService(db).generate_report(template_data=_template("csv"))
+
+    stored = db["report_files"]._documents[0]["file_data"].decode()
+    assert report["record_count"] == 5
+    assert stored.splitlines()[:2] == ["Code,Qty", "I4,4"]
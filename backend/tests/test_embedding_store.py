@@ -0,0 +1,122 @@
+import json
+
+import numpy as np
+import pytest
+
+from backend.services.embedding_store import ItemEmbeddingStore, item_embedding_text
+from backend.tests.utils.in_memory_db import InMemoryDatabase
+
+VOCAB = ["cola", "chips", "biscuit", "phone", "cable"]
+
+
+def fake_encode(texts):
+    """Bag-of-words embedding over a tiny vocabulary."""
+    fake_encode.calls.append(list(texts))
+    return np.array(
+        [[float(word in text.lower()) + 0.01 for word in VOCAB] for text in texts],
+        dtype=np.float32,
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    fake_encode.calls = []
+
+
+async def _seed(db, items):
+    for code, name, category in items:
+        await db.erp_items.insert_one(
+            {"item_code": code, "item_name": name, "category": category}
+        )
+
+
+def test_item_embedding_text_skips_missing_fields():
+    assert item_embedding_text({"item_name": "Cola", "category": None}) == "Cola"
+
+
+@pytest.mark.asyncio
+async def test_refresh_and_search(temp_dir):
+    db = InMemoryDatabase()
+    await _seed(
+        db,
+        [("A", "Cola 500ml", "Drinks"), ("B", "Potato Chips", "Snacks"), ("C", "USB Cable", "")],
+    )
+    store = ItemEmbeddingStore(temp_dir, dtype="float32")
+
+    stats = await store.refresh(db, fake_encode, batch_size=2)
+
+    assert stats == {"items": 3, "embedded": 3, "removed": 0}
+    assert len(fake_encode.calls) == 2
+    hits = store.search(fake_encode(["chips"])[0], top_k=2)
+    assert hits[0][0] == "B"
+    assert len(hits) == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_only_reencodes_changed_items(temp_dir):
+    db = InMemoryDatabase()
+    await _seed(db, [("A", "Cola", "Drinks"), ("B", "Chips", "Snacks")])
+    store = ItemEmbeddingStore(temp_dir)
+    await store.refresh(db, fake_encode)
+    fake_encode.calls = []
+
+    unchanged = await store.refresh(db, fake_encode)
+    assert unchanged["embedded"] == 0
+    assert fake_encode.calls == []
+
+    await db.erp_items.update_one({"item_code": "B"}, {"$set": {"item_name": "Phone"}})
+    await db.erp_items.delete_many({"item_code": "A"})
+    stats = await store.refresh(db, fake_encode)
+
+    assert stats == {"items": 1, "embedded": 1, "removed": 1}
+    assert fake_encode.calls == [["Phone Snacks"]]
+
+    # A fresh store (e.g. another worker) sees the same data from disk
+    reopened = ItemEmbeddingStore(temp_dir)
+    assert reopened.is_available()
+    assert reopened.search(fake_encode(["phone"])[0], top_k=5)[0][0] == "B"
+
+
+@pytest.mark.asyncio
+async def test_refresh_with_item_codes_reads_only_those_items(temp_dir):
+    db = InMemoryDatabase()
+    await _seed(
+        db, [("A", "Cola", "Drinks"), ("B", "Chips", "Snacks"), ("C", "Cable", "")]
+    )
+    store = ItemEmbeddingStore(temp_dir)
+    await store.refresh(db, fake_encode)
+    fake_encode.calls = []
+
+    await db.erp_items.update_one({"item_code": "B"}, {"$set": {"item_name": "Phone"}})
+    # A's text changed too, but it was not part of this sync
+    await db.erp_items.update_one(
+        {"item_code": "A"}, {"$set": {"item_name": "Biscuit"}}
+    )
+    await db.erp_items.delete_many({"item_code": "C"})
+    await _seed(db, [("D", "Chips", "Snacks")])
+
+    stats = await store.refresh(db, fake_encode, item_codes=["B", "C", "D"])
+
+    assert stats == {"items": 3, "embedded": 2, "removed": 1}
+    assert sorted(fake_encode.calls[0]) == ["Chips Snacks", "Phone Snacks"]
+    assert store.search(fake_encode(["phone"])[0], top_k=1)[0][0] == "B"
+    assert store.search(fake_encode(["cola"])[0], top_k=1)[0][0] == "A"
+
+
+@pytest.mark.asyncio
+async def test_refresh_publishes_matrix_and_index_together(temp_dir):
+    db = InMemoryDatabase()
+    await _seed(db, [("A", "Cola", "Drinks")])
+    store = ItemEmbeddingStore(temp_dir)
+    await store.refresh(db, fake_encode)
+    first = json.loads(store.index_path.read_text())["matrix"]
+
+    await _seed(db, [("B", "Chips", "Snacks")])
+    await store.refresh(db, fake_encode, item_codes=["B"])
+    second = json.loads(store.index_path.read_text())["matrix"]
+
+    assert second != first
+    assert sorted(p.name for p in temp_dir.glob("item_embeddings*")) == sorted(
+        [second, ItemEmbeddingStore.INDEX_FILE]
+    )
+    assert len(ItemEmbeddingStore(temp_dir).search(fake_encode(["chips"])[0])) == 2
@@ -0,0 +1,113 @@
+"""
+Tests for the batched enrichment import pipeline
+"""
+
+import asyncio
+
+import pytest
+
+from backend.services import enrichment_service
+from backend.services.enrichment_service import EnrichmentService
+from backend.tests.utils.in_memory_db import InMemoryDatabase
+
+ROWS = [
+    {"item_code": "A1", "serial_number": "SN-1", "mrp": 120.0},
+    {"item_code": None, "mrp": 10.0},
+    {"item_code": "MISSING", "mrp": 10.0},
+    {"item_code": "B2", "hsn_code": "12ab"},
+    {"item_code": "B2", "hsn_code": "1234", "barcode": "12345678"},
+    {"item_code": "A1", "hsn_code": "5678", "barcode": "87654321"},
+]
+
+
+def _db_with_items():
+    db = InMemoryDatabase()
+    db["enrichments"]
+    db["enrichment_import_jobs"]
+    db.erp_items._documents = [
+        {"item_code": "A1", "item_name": "Rice", "mrp": 100.0},
+        {"item_code": "B2", "item_name": "Bolt", "serial_number": "X-1", "mrp": 5.0},
+    ]
+    return db
+
+
+def _item(db, code):
+    return next(doc for doc in db.erp_items._documents if doc["item_code"] == code)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(enrichment_service, "BULK_IMPORT_CHUNK_SIZE", 3)
+
+
+async def test_bulk_import_batches_writes_and_keeps_per_row_errors(small_chunks):
+    db = _db_with_items()
+    calls = {"find": 0, "bulk_write": 0}
+    for name in calls:
+        original = getattr(db.erp_items, name)
+
+        def counted(*args, _name=name, _original=original, **kwargs):
+            calls[_name] += 1
+            return _original(*args, **kwargs)
+
+        setattr(db.erp_items, name, counted)
+
+    results = await EnrichmentService(db).bulk_import_enrichments(ROWS, "u1", "admin")
+
+    assert results["success"] == 3
+    assert results["failed"] == 3
+    assert results["errors"] == [
+        {"item_code": None, "error": "Missing item_code"},
+        {"item_code": "MISSING", "error": "Item MISSING not found"},
+        {"item_code": "B2", "error": "Validation failed"},
+    ]
+    # One prefetch and one bulk_write per chunk of three rows
+    assert calls == {"find": 2, "bulk_write": 2}
+
+    a1 = _item(db, "A1")
+    assert (a1["serial_number"], a1["mrp"], a1["hsn_code"]) == ("SN-1", 120.0, "5678")
+    assert a1["data_complete"] is True and a1["completion_percentage"] == 100.0
+    assert [h["fields_updated"] for h in a1["enrichment_history"]] == [
+        ["serial_number", "mrp"],
+        ["hsn_code", "barcode"],
+    ]
+    assert a1["enrichment_history"][0]["corrections"]["mrp"]["action"] == "corrected"
+    assert _item(db, "B2")["data_complete"] is True
+    assert len(db["enrichments"]._documents) == 3
+
+
+async def test_rows_for_the_same_item_apply_in_sheet_order():
+    db = _db_with_items()
+    rows = [
+        {"item_code": "A1", "mrp": 150.0},
+        {"item_code": "A1", "mrp": 175.0},
+    ]
+
+    await EnrichmentService(db).bulk_import_enrichments(rows, "u1", "admin")
+
+    history = _item(db, "A1")["enrichment_history"]
+    assert _item(db, "A1")["mrp"] == 175.0
+    assert [h["corrections"]["mrp"]["old_value"] for h in history] == [100.0, 150.0]
+
+
+async def test_background_job_reports_progress_and_results(small_chunks):
+    db = _db_with_items()
+    service = EnrichmentService(db)
+    snapshots = []
+    real_update = db["enrichment_import_jobs"].update_one
+
+    async def record_progress(query, update, **kwargs):
+        snapshots.append(dict(update["$set"]))
+        return await real_update(query, update, **kwargs)
+
+    db["enrichment_import_jobs"].update_one = record_progress
+
+    job_id = await service.start_bulk_import(ROWS, "u1", "admin")
+    await asyncio.gather(*service._import_tasks)
+
+    assert [s.get("processed") for s in snapshots[:-1]] == [3, 6]
+    job = await service.get_import_job(job_id)
+    assert job["status"] == "completed"
+    assert (job["total"], job["success"], job["failed"]) == (6, 3, 3)
+    assert job["errors"][1] == {"item_code": "MISSING", "error": "Item MISSING not found"}
+    assert await service.get_import_job("nope") is None
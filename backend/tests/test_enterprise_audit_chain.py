@@ -0,0 +1,152 @@
+"""
+Tests for the block-sealed enterprise audit hash chain
+"""
+
+import pytest
+
+from backend.services import data_governance
+from backend.services import log_sink as log_sink_module
+from backend.services.data_governance import DataCategory, DataGovernanceService, RetentionPolicy
+from backend.services.enterprise_audit import AuditEventType, EnterpriseAuditService
+from backend.services.log_sink import LogSink
+from backend.services.retention_engine import ArchiveSegmentWriter, RetentionEngine
+from backend.tests.utils.in_memory_db import InMemoryDatabase
+
+
+def _db():
+    db = InMemoryDatabase()
+    for name in (
+        "enterprise_audit_logs",
+        "enterprise_audit_blocks",
+        "enterprise_audit_chain",
+        "data_retention_policies",
+        "data_subject_requests",
+        "data_archive",
+    ):
+        db[name]
+    return db
+
+
+@pytest.fixture(autouse=True)
+def _no_sink(monkeypatch):
+    monkeypatch.setattr(log_sink_module, "_log_sink", None)
+
+
+@pytest.mark.asyncio
+async def test_workers_share_one_linear_chain():
+    db = _db()
+    worker_a, worker_b = EnterpriseAuditService(db), EnterpriseAuditService(db)
+    await worker_a.initialize()
+    await worker_b.initialize()
+
+    for i in range(3):
+        await worker_a.log(AuditEventType.DATA_CREATE, f"create {i}", actor_id="a")
+        await worker_b.log(AuditEventType.DATA_UPDATE, f"update {i}", actor_id="b")
+
+    blocks = await db.enterprise_audit_blocks.find({}).sort("_id", 1).to_list(10)
+    assert [b["_id"] for b in blocks] == [1, 2, 3, 4, 5, 6]
+    for previous, block in zip(blocks, blocks[1:]):
+        assert block["previous_block_hash"] == previous["block_hash"]
+
+    report = await worker_a.verify_integrity()
+    assert report["status"] == "valid"
+    assert report["blocks_verified"] == 6
+    assert report["valid_entries"] == 6
+
+
+@pytest.mark.asyncio
+async def test_sink_flush_seals_one_block():
+    db = _db()
+    sink = LogSink(flush_interval_ms=10_000)
+    log_sink_module.set_log_sink(sink)
+    service = EnterpriseAuditService(db)
+    await service.initialize()
+    await sink.start()
+
+    for i in range(5):
+        await service.log(AuditEventType.AUTH_LOGIN, f"login {i}", actor_id=str(i))
+    await sink.stop()
+
+    assert await db.enterprise_audit_blocks.count_documents({}) == 1
+    block = await db.enterprise_audit_blocks.find_one({"_id": 1})
+    assert block["entry_count"] == 5
+    assert (await service.verify_integrity())["status"] == "valid"
+
+
+@pytest.mark.asyncio
+async def test_tampering_is_reported_per_block():
+    db = _db()
+    service = EnterpriseAuditService(db)
+    await service.initialize()
+    for i in range(3):
+        await service.log(AuditEventType.DATA_DELETE, f"delete {i}")
+
+    await db.enterprise_audit_logs.update_one(
+        {"block_seq": 2}, {"$set": {"action": "nothing to see"}}
+    )
+    await db.enterprise_audit_blocks.delete_one({"_id": 3})
+
+    report = await service.verify_integrity()
+    assert report["status"] == "tampered"
+    assert [e["reason"] for e in report["invalid_entries"]] == ["hash_mismatch", "block_missing"]
+    assert report["invalid_blocks"] == [
+        {"seq": 2, "reasons": ["merkle_mismatch"]},
+        {"seq": 3, "reasons": ["block_missing"]},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_block_inserted_before_a_crashed_head_update_is_not_lost():
+    db = _db()
+    crashed, survivor = EnterpriseAuditService(db), EnterpriseAuditService(db)
+    await crashed.initialize()
+    await crashed.log(AuditEventType.DATA_CREATE, "create 0", actor_id="a")
+
+    async def die(*_args):
+        raise ConnectionError("worker died")
+
+    # The block lands but the worker dies before moving the head pointer
+    crashed._advance_head = die
+    with pytest.raises(ConnectionError):
+        await crashed._seal_block(db.enterprise_audit_logs, [{"timestamp": "t1", "action": "x"}])
+    head = await db.enterprise_audit_chain.find_one({})
+    assert head["seq"] == 1
+
+    await survivor.log(AuditEventType.DATA_UPDATE, "update 1", actor_id="b")
+
+    blocks = await db.enterprise_audit_blocks.find({}).sort("_id", 1).to_list(10)
+    assert [b["_id"] for b in blocks] == [1, 2, 3]
+    for previous, block in zip(blocks, blocks[1:]):
+        assert block["previous_block_hash"] == previous["block_hash"]
+    head = await db.enterprise_audit_chain.find_one({})
+    assert (head["seq"], head["block_hash"]) == (3, blocks[-1]["block_hash"])
+
+
+@pytest.mark.asyncio
+async def test_governance_retention_keeps_the_chain_verifiable(tmp_path, monkeypatch):
+    db = _db()
+    service = EnterpriseAuditService(db)
+    await service.initialize()
+    for i in range(4):
+        await service.log(AuditEventType.DATA_CREATE, f"create {i}")
+    engine = RetentionEngine(db, ArchiveSegmentWriter(tmp_path), chunk_size=2)
+    monkeypatch.setattr(data_governance, "build_retention_engine", lambda _db: engine)
+    governance = DataGovernanceService(db)
+    await governance.policies_collection.insert_one(
+        RetentionPolicy(
+            category=DataCategory.AUDIT,
+            collection_name="enterprise_audit_logs",
+            retention_days=0,
+            archive_before_delete=True,
+        ).model_dump()
+    )
+
+    results = await governance.apply_retention_policies()
+
+    result = results["enterprise_audit_logs"]
+    assert (result["deleted"], result["archived"], result["deleted_blocks"]) == (3, 3, 3)
+    # The head block stays so the end of the chain is still accounted for
+    assert [b["_id"] for b in await db.enterprise_audit_blocks.find({}).to_list(10)] == [4]
+    report = await service.verify_integrity()
+    assert report["status"] == "valid"
+    assert report["valid_entries"] == 1
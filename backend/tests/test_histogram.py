@@ -0,0 +1,95 @@
+"""
+Tests for constant-memory latency histograms
+"""
+
+import random
+import threading
+
+import pytest
+
+from backend.services.histogram import Histogram, ShardedHistogram
+from backend.services.monitoring_service import MonitoringService
+from backend.services.observability import MetricsCollector
+
+
+def test_quantiles_are_within_relative_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-3, 1) for _ in range(20_000)]
+    histogram = Histogram()
+    for value in values:
+        histogram.record(value)
+
+    ordered = sorted(values)
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert histogram.quantile(q) == pytest.approx(exact, rel=0.03)
+    assert histogram.count == len(values)
+
+
+def test_snapshots_merge_across_threads_and_workers():
+    sharded = ShardedHistogram()
+
+    def _work():
+        for _ in range(1000):
+            sharded.record(0.02)
+
+    threads = [threading.Thread(target=_work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = sharded.snapshot()
+    assert snapshot.count == 4000
+
+    other_worker = Histogram.from_dict(snapshot.to_dict())
+    assert snapshot.merge(other_worker).count == 8000
+
+
+def test_prometheus_exposition_has_cumulative_buckets():
+    histogram = Histogram(bounds=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.record(value)
+
+    lines = histogram.prometheus_lines("latency_seconds", {"route": "/items"})
+
+    assert lines == [
+        'latency_seconds_bucket{route="/items",le="0.1"} 2',
+        'latency_seconds_bucket{route="/items",le="1.0"} 3',
+        'latency_seconds_bucket{route="/items",le="+Inf"} 4',
+        'latency_seconds_sum{route="/items"} 3.650000',
+        'latency_seconds_count{route="/items"} 4',
+    ]
+
+
+def test_monitoring_service_percentiles_cover_all_requests():
+    service = MonitoringService(history_size=10)
+    for i in range(100):
+        service.track_request("/api/items/{id}", "GET", 200, duration=(i + 1) / 1000)
+
+    metrics = service.get_metrics()
+    assert metrics["performance"]["p50"] == pytest.approx(0.05, rel=0.03)
+    assert metrics["performance"]["p99"] == pytest.approx(0.099, rel=0.03)
+    assert metrics["latency"]["GET /api/items/{id}"]["count"] == 100
+
+    text = service.get_prometheus_metrics()
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert (
+        'http_request_duration_seconds_bucket{method="GET",route="/api/items/{id}",le="+Inf"} 100'
+        in text
+    )
+
+
+@pytest.mark.asyncio
+async def test_metrics_collector_exports_histograms():
+    collector = MetricsCollector()
+    await collector.observe("db.query-seconds", 0.2, {"op": "find"})
+    await collector.observe("db.query-seconds", 0.4, {"op": "find"})
+
+    summary = (await collector.get_metrics())["histograms"]['db.query-seconds{op="find"}']
+    assert summary["count"] == 2 and summary["max"] == 0.4
+
+    text = collector.to_prometheus()
+    assert "# TYPE db_query_seconds histogram" in text
+    assert 'db_query_seconds_bucket{op="find",le="0.25"} 1' in text
+    assert 'db_query_seconds_count{op="find"} 2' in text
@@ -0,0 +1,114 @@
+"""
+Tests for lazy imports, lazy router registration and the import-time budget
+"""
+
+import os
+import sys
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from backend.core.lazy_routers import LazyRouterRegistry
+from backend.scripts.check_import_time import (
+    DEFAULT_FORBIDDEN,
+    measure_import_time,
+    parse_importtime,
+)
+from backend.utils.lazy_import import LazyModule, lazy_module
+
+_lazy_router = APIRouter(prefix="/api/lazy")
+
+
+@_lazy_router.get("/ping")
+async def _ping():
+    return {"pong": True}
+
+
+def test_lazy_module_imports_on_first_attribute_access():
+    sys.modules.pop("colorsys", None)
+    module = lazy_module("colorsys")
+
+    assert isinstance(module, LazyModule)
+    assert not module.is_loaded
+    assert "colorsys" not in sys.modules
+
+    assert module.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1)
+    assert module.is_loaded
+
+
+def test_lazy_module_returns_already_imported_module():
+    assert lazy_module("os") is os
+
+
+def test_lazy_router_loads_on_first_request_and_keeps_position():
+    app = FastAPI()
+    registry = LazyRouterRegistry(app)
+    registry.include("/api/lazy", "backend.tests.test_import_time:_lazy_router")
+
+    @app.get("/api/other")
+    async def _other():
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert client.get("/api/other").status_code == 200
+    assert registry.status() == {"/api/lazy": False}
+
+    response = client.get("/api/lazy/ping")
+    assert response.status_code == 200
+    assert response.json() == {"pong": True}
+    assert registry.status() == {"/api/lazy": True}
+
+    paths = [getattr(route, "path", None) for route in app.router.routes]
+    assert paths.index("/api/lazy/ping") < paths.index("/api/other")
+    assert client.get("/api/lazy/missing").status_code == 404
+
+
+def test_openapi_includes_lazy_routes():
+    app = FastAPI()
+    registry = LazyRouterRegistry(app)
+    registry.include("/api/lazy", "backend.tests.test_import_time:_lazy_router")
+
+    assert "/api/lazy/ping" in app.openapi()["paths"]
+
+
+def test_lazy_router_passes_include_prefix_through():
+    app = FastAPI()
+    registry = LazyRouterRegistry(app)
+    registry.include("/v9", "backend.tests.test_import_time:_lazy_router", prefix="/v9")
+
+    response = TestClient(app).get("/v9/api/lazy/ping")
+    assert response.status_code == 200
+    assert registry.status() == {"/v9": True}
+
+
+def test_parse_importtime_reads_cumulative_times():
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   encodings.utf_8",
+            "import time:      2000 |       5000 | backend.server",
+        ]
+    )
+    assert parse_importtime(output) == {"encodings.utf_8": 0.12, "backend.server": 5.0}
+
+
+@pytest.mark.slow
+def test_server_cold_import_within_budget():
+    from backend.config import settings
+
+    budget_ms = float(
+        os.getenv("IMPORT_TIME_BUDGET_MS", getattr(settings, "IMPORT_TIME_BUDGET_MS", 4000))
+    )
+    result = measure_import_time("backend.server")
+    assert (
+        result.returncode == 0 and result.total_ms is not None
+    ), f"backend.server failed to import:\n{result.stderr_tail}"
+
+    assert "numpy" in DEFAULT_FORBIDDEN
+    for name in DEFAULT_FORBIDDEN:
+        assert name not in result.packages, f"{name} is imported eagerly by backend.server"
+    assert result.total_ms <= budget_ms, (
+        f"backend.server import took {result.total_ms:.0f}ms (budget {budget_ms:.0f}ms); "
+        f"slowest: {result.slowest(10)}"
+    )
@@ -0,0 +1,144 @@
+"""
+Tests for the buffered log sink
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from backend.services import log_sink as log_sink_module
+from backend.services.log_sink import LogSink, write_log
+
+
+def _collection(name="activity_logs"):
+    return SimpleNamespace(
+        name=name,
+        insert_one=AsyncMock(),
+        insert_many=AsyncMock(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_queued_entries_are_batched_and_flushed_on_stop():
+    sink = LogSink(batch_size=100, flush_interval_ms=10_000)
+    activity, errors = _collection("activity_logs"), _collection("error_logs")
+    await sink.start()
+
+    ids = [await sink.submit(activity, {"n": i}) for i in range(3)]
+    await sink.submit(errors, {"error": "boom"})
+    await sink.stop()
+
+    assert len(set(ids)) == 3
+    activity.insert_one.assert_not_awaited()
+    activity.insert_many.assert_awaited_once()
+    written = activity.insert_many.await_args.args[0]
+    assert [doc["n"] for doc in written] == [0, 1, 2]
+    assert str(written[0]["_id"]) == ids[0]
+    errors.insert_many.assert_awaited_once()
+    assert sink.get_metrics()["written"] == 4
+
+
+@pytest.mark.asyncio
+async def test_durable_entries_are_written_synchronously():
+    sink = LogSink(flush_interval_ms=10_000)
+    audit = _collection("audit_logs")
+    await sink.start()
+
+    entry_id = await sink.submit(audit, {"action": "LOGIN"}, durable=True)
+
+    audit.insert_one.assert_awaited_once()
+    assert str(audit.insert_one.await_args.args[0]["_id"]) == entry_id
+    assert sink.queue_depth == 0
+    await sink.stop()
+    audit.insert_many.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_discards_when_full():
+    sink = LogSink(max_queue=1, overflow="drop", flush_interval_ms=10_000)
+    logs = _collection()
+    await sink.start()
+
+    await sink.submit(logs, {"n": 1})
+    await sink.submit(logs, {"n": 2})
+
+    assert sink.get_metrics()["dropped"] == 1
+    await sink.stop()
+    assert [doc["n"] for doc in logs.insert_many.await_args.args[0]] == [1]
+
+
+@pytest.mark.asyncio
+async def test_spilled_entries_are_replayed_on_start(tmp_path):
+    logs = _collection()
+    first = LogSink(max_queue=1, overflow="spill", flush_interval_ms=10_000, spill_dir=str(tmp_path))
+    await first.start()
+    await first.submit(logs, {"n": 1})
+    spilled_id = await first.submit(logs, {"n": 2})
+    assert first.get_metrics()["spilled"] == 1
+    await first.stop()
+
+    second = LogSink(spill_dir=str(tmp_path))
+    second.register_collection(logs)
+    await second.start()
+    await second.stop()
+
+    replayed = logs.insert_many.await_args_list[-1].args[0]
+    assert [str(doc["_id"]) for doc in replayed] == [spilled_id]
+    assert second.get_metrics()["replayed"] == 1
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_replay_skips_entries_a_failed_batch_already_wrote(tmp_path):
+    audit = _collection("enterprise_audit_logs")
+    first = LogSink(flush_interval_ms=10_000, spill_dir=str(tmp_path))
+    first.register_collection(audit)
+    audit.insert_many.side_effect = ConnectionError("primary stepped down")
+    await first.start()
+    ids = [await first.submit(audit, {"n": i}) for i in range(3)]
+    await first.stop()
+    assert first.get_metrics()["spilled"] == 3
+
+    # The first entry reached Mongo before the batch failed
+    duplicate = BulkWriteError(
+        {"writeErrors": [{"index": 0, "code": 11000, "errmsg": "dup"}], "nInserted": 2}
+    )
+    audit.insert_many.side_effect = duplicate
+    second = LogSink(spill_dir=str(tmp_path))
+    second.register_collection(audit, hook=AsyncMock(side_effect=lambda _c, docs: docs))
+
+    assert await second.replay_spill() == 2
+    replayed = audit.insert_many.await_args
+    assert [str(doc["_id"]) for doc in replayed.args[0]] == ids
+    assert replayed.kwargs == {"ordered": False}
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_write_log_falls_back_to_insert_one_without_sink(monkeypatch):
+    monkeypatch.setattr(log_sink_module, "_log_sink", None)
+    logs = _collection()
+    logs.insert_one.return_value = SimpleNamespace(inserted_id="abc")
+
+    assert await write_log(logs, {"action": "x"}) == "abc"
+
+
+@pytest.mark.asyncio
+async def test_activity_log_queues_a_copy_of_its_entry(monkeypatch):
+    from backend.services.activity_log import ActivityLogService
+
+    sink = LogSink(flush_interval_ms=10_000)
+    activity = _collection("activity_logs")
+    monkeypatch.setattr(log_sink_module, "_log_sink", sink)
+    await sink.start()
+
+    entry_id = await ActivityLogService(SimpleNamespace(activity_logs=activity)).log_activity(
+        user="staff1", role="staff", action="scan_item"
+    )
+    await sink.stop()
+
+    [written] = activity.insert_many.await_args.args[0]
+    assert str(written["_id"]) == entry_id
+    assert "id" not in written
@@ -0,0 +1,86 @@
+"""
+Tests for the reverse block log tail reader
+"""
+
+import os
+import time
+
+from backend.api.service_logs_api import _parse_log_file
+from backend.utils.log_tail import read_since, tail_lines
+
+
+def _write(path, lines, partial=""):
+    path.write_text("".join(f"{line}\n" for line in lines) + partial, encoding="utf-8")
+
+
+def test_tail_reads_last_lines_across_small_blocks(tmp_path):
+    log = tmp_path / "app.log"
+    _write(log, [f"line {i} " + "x" * 20 for i in range(200)], partial="half writ")
+
+    result = tail_lines(log, 5, block_size=16)
+
+    assert [line.split()[1] for line in result.lines] == ["195", "196", "197", "198", "199"]
+    # The partially written line is not returned and not skipped over
+    assert result.offset == log.stat().st_size - len("half writ")
+
+
+def test_final_line_without_newline_is_returned_once_settled(tmp_path):
+    log = tmp_path / "app.log"
+    _write(log, ["INFO one", "INFO two"], partial="INFO last")
+    assert tail_lines(log, 2).lines == ["INFO one", "INFO two"]
+
+    past = time.time() - 60
+    os.utime(log, (past, past))
+    result = tail_lines(log, 2, block_size=4)
+
+    assert result.lines == ["INFO two", "INFO last"]
+    assert result.offset == log.stat().st_size
+
+
+def test_level_filter_is_applied_while_streaming(tmp_path):
+    log = tmp_path / "backend.log"
+    _write(log, ["INFO started", "ERROR boom", "INFO ok", "ERROR again", "INFO done"])
+
+    logs, tail = _parse_log_file(log, 10, "ERROR")
+
+    assert [entry["message"] for entry in logs] == ["ERROR boom", "ERROR again"]
+    assert tail.offset == log.stat().st_size
+
+
+def test_since_returns_only_appended_lines(tmp_path):
+    log = tmp_path / "backend.log"
+    _write(log, ["INFO one", "INFO two"])
+    first = tail_lines(log, 100)
+
+    with open(log, "a", encoding="utf-8") as fh:
+        fh.write("INFO three\nINFO fo")
+    second = read_since(log, first.offset, 100)
+    assert second.lines == ["INFO three"]
+
+    with open(log, "a", encoding="utf-8") as fh:
+        fh.write("ur\n")
+    third = read_since(log, second.offset, 100)
+    assert third.lines == ["INFO four"]
+    assert read_since(log, third.offset, 100).lines == []
+
+
+def test_since_beyond_end_resets_after_rotation(tmp_path):
+    log = tmp_path / "backend.log"
+    _write(log, ["INFO a"] * 50)
+    offset = tail_lines(log, 10).offset
+
+    _write(log, ["INFO rotated"])
+    result = read_since(log, offset, 10)
+
+    assert result.reset is True
+    assert result.lines == ["INFO rotated"]
+
+
+def test_since_keeps_newest_lines_when_over_limit(tmp_path):
+    log = tmp_path / "backend.log"
+    _write(log, [f"INFO {i}" for i in range(10)])
+
+    result = read_since(log, 0, 3)
+
+    assert result.lines == ["INFO 7", "INFO 8", "INFO 9"]
+    assert result.truncated is True
@@ -0,0 +1,123 @@
+"""
+Tests for the content-addressed media store and streaming endpoint
+"""
+
+import base64
+import io
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from PIL import Image
+
+from backend.api import media_api
+from backend.auth.dependencies import get_current_user
+from backend.services import media_store
+from backend.services.media_store import LocalMediaBackend, MediaService
+from backend.tests.utils.in_memory_db import InMemoryDatabase
+
+
+def _png(width=800, height=600, color=(200, 30, 30)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def media(tmp_path):
+    db = InMemoryDatabase()
+    return MediaService(db, LocalMediaBackend(tmp_path))
+
+
+async def test_ingest_dedupes_by_content_and_makes_thumbnail(media, tmp_path):
+    data = _png()
+
+    first = await media.ingest(data, uploaded_by="staff1")
+    second = await media.ingest(data, uploaded_by="staff2")
+
+    assert first["media_id"] == second["media_id"]
+    assert first["url"] == f"/api/media/{first['media_id']}"
+    assert len(media.collection._documents) == 1
+    assert first["content_type"] == "image/png"
+    thumb = tmp_path / first["media_id"][:2] / (first["media_id"] + ".thumb")
+    with Image.open(thumb) as image:
+        assert max(image.size) <= 256
+
+    with pytest.raises(media_store.MediaError):
+        await media.ingest(b"not an image at all" * 10)
+
+
+async def test_count_line_keeps_only_references(media):
+    inline = "data:image/png;base64," + base64.b64encode(_png()).decode()
+    line = {
+        "photo_base64": inline,
+        "photo_proofs": [
+            {"id": "p1", "url": inline, "timestamp": "t"},
+            {"id": "p2", "url": "https://x/y.jpg"},
+        ],
+    }
+
+    await media.externalize_count_line(line)
+
+    assert line["photo_base64"] is None
+    assert line["photo"]["media_id"] == line["photo_proofs"][0]["media_id"]
+    assert line["photo_proofs"][0]["url"].startswith("/api/media/")
+    assert line["photo_proofs"][1]["url"] == "https://x/y.jpg"
+    assert await media.externalize_urls(["https://cdn/a.jpg", inline]) == [
+        "https://cdn/a.jpg",
+        line["photo"]["url"],
+    ]
+
+
+async def test_streaming_endpoint_supports_etag_and_ranges(tmp_path, monkeypatch):
+    db = InMemoryDatabase()
+    monkeypatch.setattr(media_api, "get_db", lambda: db)
+    monkeypatch.setattr(media_store, "_backend", LocalMediaBackend(tmp_path))
+    app = FastAPI()
+    app.include_router(media_api.media_router)
+    app.dependency_overrides[get_current_user] = lambda: {"username": "staff1"}
+    data = _png(1200, 900)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        upload = await client.post("/api/media", files={"file": ("p.png", data, "image/png")})
+        url = upload.json()["data"]["url"]
+
+        full = await client.get(url)
+        assert full.status_code == 200
+        assert full.content == data
+        assert full.headers["accept-ranges"] == "bytes"
+
+        cached = await client.get(url, headers={"If-None-Match": full.headers["etag"]})
+        assert cached.status_code == 304
+
+        part = await client.get(url, headers={"Range": "bytes=10-19"})
+        assert part.status_code == 206
+        assert part.content == data[10:20]
+        assert part.headers["content-range"] == f"bytes 10-19/{len(data)}"
+
+        tail = await client.get(url, headers={"Range": "bytes=-5"})
+        assert tail.content == data[-5:]
+
+        beyond = await client.get(url, headers={"Range": f"bytes={len(data)}-"})
+        assert beyond.status_code == 416
+
+        thumb = await client.get(url + "/thumbnail")
+        assert thumb.headers["content-type"] == "image/jpeg"
+        assert len(thumb.content) < len(data)
+
+
+async def test_offline_synced_count_line_is_externalized(tmp_path, monkeypatch):
+    from backend.api import sync_batch_api
+
+    db = InMemoryDatabase()
+    monkeypatch.setattr(media_store, "_backend", LocalMediaBackend(tmp_path))
+    inline = "data:image/png;base64," + base64.b64encode(_png()).decode()
+    line = {"session_id": "tmp-1", "item_code": "I1", "photo_base64": inline}
+
+    await sync_batch_api._process_count_line_op(line, {"username": "staff1"}, {"tmp-1": "s1"}, db)
+
+    stored = db.count_lines._documents[0]
+    assert stored["session_id"] == "s1"
+    assert stored["photo_base64"] is None
+    assert stored["photo"]["url"].startswith("/api/media/")
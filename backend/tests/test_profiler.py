@@ -0,0 +1,89 @@
+"""
+Tests for the sampling profiler
+"""
+
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from backend.middleware.profiling_middleware import ProfilingMiddleware
+from backend.services.profiler import ProfilerCommandListener, SamplingProfiler
+
+
+def _busy_work(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def _app(profiler: SamplingProfiler) -> FastAPI:
+    app = FastAPI()
+    listener = ProfilerCommandListener()
+
+    @app.get("/api/count-lines/{session_id}")
+    async def count_lines(session_id: str):
+        # Stand-in for a Mongo round trip reported by the command listener
+        listener.succeeded(SimpleNamespace(duration_micros=12_000))
+        return {"total": _busy_work(0.08)}
+
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    return app
+
+
+async def _get(app: FastAPI, path: str, headers=None) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_armed_request_gets_detailed_profile():
+    profiler = SamplingProfiler(interval_ms=2)
+    app = _app(profiler)
+    try:
+        profiler.arm("/api/count-lines", count=1)
+        response = await _get(app, "/api/count-lines/s1")
+        assert response.status_code == 200
+        profile = profiler.get_profile(int(response.headers["X-Profile-ID"]))
+
+        assert profile.route == "/api/count-lines/{session_id}"
+        assert profile.mongo_commands == 1 and profile.mongo_ms == pytest.approx(12.0)
+        assert profile.cpu_ms > 0
+        assert "test_profiler:_busy_work" in profile.samples.collapsed()
+
+        # The arm was used up
+        assert "X-Profile-ID" not in (await _get(app, "/api/count-lines/s2")).headers
+    finally:
+        profiler.stop()
+
+
+@pytest.mark.asyncio
+async def test_header_is_ignored_unless_allowed():
+    profiler = SamplingProfiler(allow_header=False)
+    response = await _get(_app(profiler), "/api/count-lines/s1", {"X-Profile": "1"})
+    assert "X-Profile-ID" not in response.headers
+    assert profiler.routes == {}
+
+
+@pytest.mark.asyncio
+async def test_continuous_mode_aggregates_by_route_template():
+    profiler = SamplingProfiler(continuous_interval_ms=2, continuous=True)
+    app = _app(profiler)
+    try:
+        for session_id in ("a", "b"):
+            await _get(app, f"/api/count-lines/{session_id}")
+
+        summary = profiler.get_summary()
+        route = summary["routes"]["GET /api/count-lines/{session_id}"]
+        assert route["requests"] == 2
+        assert route["mongo_commands"] == 2
+        assert route["cpu_ms"] > 0
+        assert summary["recent_profiles"] == []
+        assert profiler.route_collapsed("GET /api/count-lines/{session_id}")
+    finally:
+        profiler.stop()
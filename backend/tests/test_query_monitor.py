@@ -0,0 +1,111 @@
+"""
+Tests for per-query-shape MongoDB command monitoring
+"""
+
+from types import SimpleNamespace
+
+from backend.services.query_monitor import (
+    QueryMonitor,
+    _explain_target,
+    normalize_shape,
+    summarize_explain,
+)
+
+
+def _started(name, command, request_id, db="stock"):
+    return SimpleNamespace(
+        command_name=name,
+        command=command,
+        database_name=db,
+        connection_id=("localhost", 27017),
+        request_id=request_id,
+    )
+
+
+def _done(request_id, micros, reply):
+    return SimpleNamespace(
+        connection_id=("localhost", 27017),
+        request_id=request_id,
+        duration_micros=micros,
+        reply=reply,
+    )
+
+
+def test_shape_strips_values_but_keeps_fields_and_operators():
+    a = normalize_shape({"barcode": "123", "qty": {"$gt": 5}, "tags": {"$in": [1, 2, 3]}})
+    b = normalize_shape({"tags": {"$in": [9]}, "qty": {"$gt": 0}, "barcode": "999"})
+
+    assert a == b == {"barcode": "?", "qty": {"$gt": "?"}, "tags": {"$in": ["?"]}}
+    assert normalize_shape({"x": {"$exists": True}}) != normalize_shape({"x": {"$exists": False}})
+    assert normalize_shape({"$or": [{"a": 1}, {"b": 2}]}) == normalize_shape(
+        {"$or": [{"b": 3}, {"a": 4}]}
+    )
+
+
+def test_commands_grouped_by_shape_with_getmore_and_slow_samples():
+    monitor = QueryMonitor(slow_ms=50)
+
+    monitor.started(_started("find", {"find": "erp_items", "filter": {"barcode": "1"}}, 1))
+    monitor.succeeded(_done(1, 10_000, {"cursor": {"id": 77, "firstBatch": [{}] * 101}}))
+    monitor.started(_started("getMore", {"getMore": 77, "collection": "erp_items"}, 2))
+    monitor.succeeded(_done(2, 80_000, {"cursor": {"id": 0, "nextBatch": [{}] * 20}}))
+    monitor.started(_started("find", {"find": "erp_items", "filter": {"barcode": "2"}}, 3))
+    monitor.succeeded(_done(3, 5_000, {"cursor": {"id": 0, "firstBatch": []}}))
+    monitor.started(_started("hello", {"hello": 1}, 4))
+    monitor.succeeded(_done(4, 1_000, {}))
+
+    stats = monitor.get_stats()
+    assert stats["shapes_tracked"] == 1
+    shape = stats["shapes"][0]
+    assert shape["collection"] == "erp_items"
+    assert shape["shape"] == {"filter": {"barcode": "?"}}
+    assert shape["count"] == 3
+    assert shape["docs_returned"] == 121
+    assert shape["max_ms"] == 80.0
+    assert [s["ms"] for s in shape["slow_samples"]] == [80.0]
+    # Exhausted cursor is forgotten
+    assert monitor._cursors == {}
+
+    text = "\n".join(monitor.prometheus_lines())
+    assert 'mongodb_command_duration_seconds_count{collection="erp_items",command="find"} 3' in text
+
+
+async def test_explain_flags_collection_scans():
+    monitor = QueryMonitor()
+    monitor.started(_started("find", {"find": "sessions", "filter": {"status": "OPEN"}}, 1))
+    monitor.succeeded(_done(1, 2_000, {"cursor": {"id": 0, "firstBatch": []}}))
+
+    class FakeDb:
+        name = "stock"
+
+        def __init__(self):
+            self.commands = []
+
+        async def command(self, cmd):
+            self.commands.append(cmd)
+            return {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}
+
+    db = FakeDb()
+    results = await monitor.explain_top(db)
+
+    assert results[0]["unindexed"] is True
+    assert db.commands[0]["explain"] == {"find": "sessions", "filter": {"status": "OPEN"}}
+    assert "mongodb_query_shape_unindexed" in "\n".join(monitor.prometheus_lines())
+    # Cached until the TTL expires
+    await monitor.explain_top(db)
+    assert len(db.commands) == 1
+    assert summarize_explain(
+        {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}}
+    ) == {"stages": ["FETCH", "IXSCAN"], "unindexed": False}
+
+
+def test_explain_target_keeps_only_the_first_bulk_statement():
+    updates = [{"q": {"item_code": f"I{i}"}, "u": {"$set": {"qty": i}}} for i in range(1000)]
+
+    target = _explain_target("update", {"update": "erp_items", "updates": updates, "lsid": {}})
+
+    assert target == {"update": "erp_items", "updates": [updates[0]]}
+    deletes = [{"q": {"_id": i}, "limit": 1} for i in range(3)]
+    assert _explain_target("delete", {"delete": "logs", "deletes": deletes})["deletes"] == [
+        deletes[0]
+    ]
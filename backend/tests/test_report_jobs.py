@@ -0,0 +1,137 @@
+"""
+Tests for the background report job queue
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from backend.services.reporting.report_jobs import ReportJobQueue
+from backend.tests.utils.in_memory_db import InMemoryDatabase
+
+
+def _db():
+    db = InMemoryDatabase()
+    db["report_jobs"]
+    db["report_job_rows"]
+    return db
+
+
+async def _wait_for(queue, job_id, statuses=("completed", "failed", "cancelled")):
+    for _ in range(200):
+        job = await queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} stuck in {job['status']}")
+
+
+async def test_job_completes_with_progress_and_rows():
+    calls = []
+
+    async def build(db, params, job):
+        calls.append(params)
+        await job.progress(50, "Half way")
+        total = await job.run_blocking(sum, range(params["n"]))
+        return {"total": total, "rows": [{"i": i} for i in range(params["n"])]}
+
+    queue = ReportJobQueue(_db(), handlers={"sum": build})
+    try:
+        submitted = await queue.submit("sum", {"n": 5}, created_by="u1")
+        assert submitted["status"] == "queued" and submitted["cached"] is False
+
+        job = await _wait_for(queue, submitted["job_id"])
+        assert job["status"] == "completed"
+        assert (job["progress"], job["message"]) == (100.0, "Half way")
+        assert job["result"] == {"total": 10}
+        assert job["row_count"] == 5
+        rows = [row async for row in queue.iter_rows(job, skip=1, limit=2)]
+        assert rows == [{"i": 1}, {"i": 2}]
+
+        again = await queue.submit("sum", {"n": 5})
+        assert again["cached"] is True and again["job_id"] == job["job_id"]
+        other = await queue.submit("sum", {"n": 6})
+        assert other["cached"] is False
+        await _wait_for(queue, other["job_id"])
+        assert len(calls) == 2
+    finally:
+        await queue.stop()
+
+
+async def test_cancel_running_job_and_failed_handler():
+    started = asyncio.Event()
+
+    async def slow(db, params, job):
+        started.set()
+        await asyncio.sleep(10)
+        return {}
+
+    async def broken(db, params, job):
+        raise RuntimeError("boom")
+
+    queue = ReportJobQueue(_db(), handlers={"slow": slow, "broken": broken})
+    try:
+        running = await queue.submit("slow", {})
+        await asyncio.wait_for(started.wait(), 1)
+        job = await queue.cancel(running["job_id"])
+        assert job["status"] == "cancelled"
+        # A cancelled job is not reused from the cache
+        assert (await queue.submit("slow", {}))["cached"] is False
+
+        failed = await queue.submit("broken", {})
+        job = await _wait_for(queue, failed["job_id"])
+        assert (job["status"], job["error"]) == ("failed", "boom")
+    finally:
+        await queue.stop()
+
+
+async def _noop(db, params, job):
+    return {"rows": [{"x": 1}]}
+
+
+async def test_orphaned_active_job_is_not_reused_and_fails():
+    db = _db()
+    queue = ReportJobQueue(db, handlers={"noop": _noop}, heartbeat_seconds=5)
+    stale = datetime.utcnow() - timedelta(minutes=5)
+    key = queue.cache_key("noop", {})
+    db["report_jobs"]._documents.append(
+        {
+            "job_id": "rjob_dead",
+            "kind": "noop",
+            "params": {},
+            "cache_key": key,
+            "status": "running",
+            "worker_id": "crashed-host:1",
+            "created_at": stale,
+            "heartbeat_at": stale,
+        }
+    )
+    try:
+        submitted = await queue.submit("noop", {})
+        assert submitted["cached"] is False and submitted["job_id"] != "rjob_dead"
+
+        dead = await queue.get("rjob_dead")
+        assert dead["status"] == "failed"
+        assert await queue.recover_orphans() == 0
+    finally:
+        await queue.stop()
+
+
+async def test_purge_removes_expired_jobs_and_rows():
+    db = _db()
+    queue = ReportJobQueue(db, handlers={"noop": _noop}, cache_ttl_seconds=60)
+    try:
+        old = await queue.submit("noop", {"n": 1})
+        fresh = await queue.submit("noop", {"n": 2})
+        await _wait_for(queue, old["job_id"])
+        await _wait_for(queue, fresh["job_id"])
+        await db["report_jobs"].update_one(
+            {"job_id": old["job_id"]},
+            {"$set": {"finished_at": datetime.utcnow() - timedelta(days=2)}},
+        )
+
+        assert await queue.purge_expired() == 1
+        assert await queue.get(old["job_id"]) is None
+        remaining = {doc["snapshot_id"] for doc in db["report_job_rows"]._documents}
+        assert remaining == {fresh["job_id"]}
+    finally:
+        await queue.stop()
@@ -0,0 +1,132 @@
+"""
+Tests for the chunked retention engine and its archive segments
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from backend.services.retention_engine import (
+    ArchiveSegmentWriter,
+    RetentionEngine,
+    RetentionLeaseHeld,
+)
+from backend.tests.utils.in_memory_db import InMemoryDatabase
+
+
+def _seed(db, expired, fresh):
+    old = datetime.utcnow() - timedelta(days=400)
+    now = datetime.utcnow()
+    collection = db["enterprise_audit_logs"]
+    collection._documents = [
+        {"_id": ObjectId(), "timestamp": old + timedelta(minutes=i), "n": i} for i in range(expired)
+    ] + [{"_id": ObjectId(), "timestamp": now, "n": -1} for _ in range(fresh)]
+    return collection
+
+
+async def test_archives_in_chunks_then_deletes(tmp_path):
+    db = InMemoryDatabase()
+    collection = _seed(db, expired=25, fresh=3)
+    writer = ArchiveSegmentWriter(tmp_path)
+    engine = RetentionEngine(db, writer, chunk_size=10)
+
+    result = await engine.run("enterprise_audit_logs", datetime.utcnow() - timedelta(days=365), True)
+
+    assert result["deleted"] == result["archived"] == 25
+    assert result["chunks"] == 3
+    assert len(collection._documents) == 3
+
+    manifest = writer.read_manifest("enterprise_audit_logs")
+    assert [entry["count"] for entry in manifest] == [10, 10, 5]
+    restored = [doc for entry in manifest for doc in writer.iter_segment("enterprise_audit_logs", entry)]
+    assert [doc["n"] for doc in restored] == list(range(25))
+    assert isinstance(restored[0]["timestamp"], datetime)
+    assert isinstance(restored[0]["_id"], ObjectId)
+
+    checkpoint = await db["retention_checkpoints"].find_one({"_id": "enterprise_audit_logs"})
+    assert checkpoint["status"] == "completed"
+
+
+async def test_resumes_after_crash_without_rearchiving(tmp_path):
+    db = InMemoryDatabase()
+    collection = _seed(db, expired=25, fresh=0)
+    writer = ArchiveSegmentWriter(tmp_path)
+    real_delete = collection.delete_many
+    calls = {"n": 0}
+
+    async def crash_on_second_delete(query):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise ConnectionError("primary stepped down")
+        return await real_delete(query)
+
+    collection.delete_many = crash_on_second_delete
+    engine = RetentionEngine(db, writer, chunk_size=10)
+    cutoff = datetime.utcnow() - timedelta(days=365)
+    with pytest.raises(ConnectionError):
+        await engine.run("enterprise_audit_logs", cutoff, True)
+    assert len(collection._documents) == 15
+
+    collection.delete_many = real_delete
+    result = await engine.run("enterprise_audit_logs", datetime.utcnow(), True)
+
+    assert collection._documents == []
+    assert result["deleted"] == result["archived"] == 25
+    # Segment 1 was written before the crash and is not written again
+    seqs = [entry["seq"] for entry in writer.read_manifest("enterprise_audit_logs")]
+    assert seqs == [0, 1, 2]
+    lines = (tmp_path / "enterprise_audit_logs" / "manifest.jsonl").read_text().splitlines()
+    assert len(lines) == 3
+
+
+async def test_without_archive_only_deletes(tmp_path):
+    db = InMemoryDatabase()
+    collection = _seed(db, expired=5, fresh=2)
+    engine = RetentionEngine(db, ArchiveSegmentWriter(tmp_path), chunk_size=2)
+
+    result = await engine.run("enterprise_audit_logs", datetime.utcnow() - timedelta(days=365), False)
+
+    assert result == {"deleted": 5, "archived": 0, "chunks": 3, "run_id": result["run_id"], "archive_dir": None}
+    assert len(collection._documents) == 2
+    assert not (tmp_path / "enterprise_audit_logs").exists()
+
+
+async def test_runs_in_the_same_second_keep_separate_archives(tmp_path):
+    db = InMemoryDatabase()
+    collection = _seed(db, expired=3, fresh=0)
+    writer = ArchiveSegmentWriter(tmp_path)
+    engine = RetentionEngine(db, writer, chunk_size=10)
+    cutoff = datetime.utcnow()
+
+    first = await engine.run("enterprise_audit_logs", cutoff, True)
+    collection._documents = [{"_id": ObjectId(), "timestamp": cutoff - timedelta(days=1), "n": 9}]
+    second = await engine.run("enterprise_audit_logs", cutoff, True)
+
+    assert first["run_id"] != second["run_id"]
+    manifest = writer.read_manifest("enterprise_audit_logs")
+    restored = [doc["n"] for e in manifest for doc in writer.iter_segment("enterprise_audit_logs", e)]
+    assert sorted(restored) == [0, 1, 2, 9]
+
+
+async def test_second_worker_cannot_run_a_leased_collection(tmp_path):
+    db = InMemoryDatabase()
+    _seed(db, expired=3, fresh=0)
+    engine = RetentionEngine(db, ArchiveSegmentWriter(tmp_path), chunk_size=10)
+    await db["retention_checkpoints"].update_one(
+        {"_id": "enterprise_audit_logs"},
+        {
+            "$set": {
+                "status": "running",
+                "lease_owner": "other-host:1",
+                "lease_until": datetime.utcnow() + timedelta(minutes=5),
+            }
+        },
+        upsert=True,
+    )
+
+    with pytest.raises(RetentionLeaseHeld):
+        await engine.run("enterprise_audit_logs", datetime.utcnow(), True)
+
+    checkpoint = await db["retention_checkpoints"].find_one({"_id": "enterprise_audit_logs"})
+    assert checkpoint["lease_owner"] == "other-host:1"
@@ -0,0 +1,174 @@
+"""
+Tests for the leased, concurrent scheduled export runner
+"""
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.services.scheduled_export_service import (
+    ExportAlreadyRunning,
+    ExportFormat,
+    ExportFrequency,
+    LocalExportStore,
+    ScheduledExportService,
+)
+from backend.tests.utils.in_memory_db import InMemoryDatabase
+
+UTC = timezone.utc
+
+
+@pytest.fixture
+def db():
+    db = InMemoryDatabase()
+    db["export_schedules"]
+    db["export_results"]
+    db.sessions._documents = [
+        {
+            "_id": f"S{i}",
+            "warehouse": "WH1",
+            "staff_user": "staff1",
+            "status": "CLOSED",
+            "start_time": datetime(2024, 1, 1) + timedelta(hours=i),
+            "items_counted": i,
+        }
+        for i in range(2500)
+    ]
+    return db
+
+
+def _service(db, tmp_path, **kwargs):
+    return ScheduledExportService(db, store=LocalExportStore(tmp_path), **kwargs)
+
+
+async def _due_schedule(service, name="nightly", fmt=ExportFormat.CSV):
+    schedule_id = await service.create_export_schedule(
+        name, "sessions", ExportFrequency.DAILY, fmt
+    )
+    doc = next(d for d in service.db["export_schedules"]._documents if str(d["_id"]) == schedule_id)
+    doc["next_run"] = datetime.now(UTC) - timedelta(minutes=5)
+    return doc
+
+
+async def _read(service, result):
+    return b"".join([chunk async for chunk in service.open_result(result)])
+
+
+@pytest.mark.parametrize("fmt", [ExportFormat.CSV, ExportFormat.JSON])
+async def test_export_streams_compressed_file_and_stores_metadata(db, tmp_path, fmt):
+    service = _service(db, tmp_path)
+    schedule = await _due_schedule(service, fmt=fmt)
+
+    outcome = await service.execute_export(schedule)
+
+    assert outcome["success"] and outcome["row_count"] == 2500
+    [result] = db["export_results"]._documents
+    assert "file_content" not in result
+    assert result["status"] == "completed"
+    assert result["stored_bytes"] < result["size_bytes"] == outcome["size_bytes"]
+    stored = (tmp_path / result["storage_key"]).read_bytes()
+    assert len(stored) == result["stored_bytes"]
+
+    content = await _read(service, result)
+    assert content == gzip.decompress(stored)
+    if fmt == ExportFormat.CSV:
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+    else:
+        rows = json.loads(content)
+    assert len(rows) == 2500
+    assert rows[0]["session_id"] == "S2499"
+    stored_schedule = db["export_schedules"]._documents[0]
+    assert stored_schedule["run_count"] == 1
+    assert stored_schedule["next_run"] > datetime.now(UTC)
+
+
+async def test_due_schedule_is_claimed_by_one_worker_until_lease_expires(db, tmp_path):
+    first = _service(db, tmp_path)
+    second = _service(db, tmp_path)
+    await _due_schedule(first)
+
+    claimed = await first._claim_due_schedule()
+    assert claimed["lease_owner"] == first.worker_id
+    assert await second._claim_due_schedule() is None
+
+    db["export_schedules"]._documents[0]["lease_until"] = datetime.now(UTC) - timedelta(seconds=1)
+    assert (await second._claim_due_schedule())["lease_owner"] == second.worker_id
+
+
+async def test_dispatch_runs_at_most_max_concurrency_exports(db, tmp_path, monkeypatch):
+    service = _service(db, tmp_path, max_concurrency=2)
+    for i in range(4):
+        await _due_schedule(service, name=f"s{i}")
+    running, release = [], asyncio.Event()
+
+    async def slow_export(schedule, lease_owner=None):
+        running.append(schedule["name"])
+        await release.wait()
+        await db["export_schedules"].update_one(
+            {"_id": schedule["_id"]},
+            {"$set": {"next_run": datetime.now(UTC) + timedelta(days=1), "lease_owner": None}},
+        )
+
+    monkeypatch.setattr(service, "execute_export", slow_export)
+    service._running = True
+
+    await service._dispatch_due()
+    await asyncio.sleep(0)
+    assert len(running) == 2
+    leased = [d for d in db["export_schedules"]._documents if d.get("lease_owner")]
+    assert len(leased) == 2
+
+    release.set()
+    await asyncio.gather(*service._active)
+    await service._dispatch_due()
+    await asyncio.gather(*service._active)
+    assert sorted(running) == ["s0", "s1", "s2", "s3"]
+
+
+async def test_interrupted_run_restarts_under_the_same_result(db, tmp_path):
+    crashed = _service(db, tmp_path)
+    await _due_schedule(crashed)
+    schedule = await crashed._claim_due_schedule()
+    result_id = await crashed._start_result(
+        schedule, schedule["_id"], ExportFormat.CSV, crashed.worker_id
+    )
+    partial = tmp_path / f"{schedule['_id']}/{result_id}.csv.gz.dead.tmp"
+    partial.parent.mkdir(parents=True)
+    partial.write_bytes(b"partial")
+    db["export_schedules"]._documents[0]["lease_until"] = datetime.now(UTC) - timedelta(seconds=1)
+
+    survivor = _service(db, tmp_path)
+    reclaimed = await survivor._claim_due_schedule()
+    outcome = await survivor.execute_export(reclaimed, lease_owner=survivor.worker_id)
+
+    assert outcome["success"] and outcome["export_id"] == str(result_id)
+    [result] = db["export_results"]._documents
+    assert (result["status"], result["attempts"], result["worker_id"]) == (
+        "completed",
+        2,
+        survivor.worker_id,
+    )
+    assert not partial.exists()
+    assert db["export_schedules"]._documents[0]["lease_owner"] is None
+
+
+async def test_manual_run_claims_the_lease_and_refuses_a_leased_schedule(db, tmp_path):
+    worker = _service(db, tmp_path)
+    manual = _service(db, tmp_path)
+    schedule = await _due_schedule(worker)
+    claimed = await worker._claim_due_schedule()
+
+    with pytest.raises(ExportAlreadyRunning):
+        await manual.execute_export(schedule)
+    stored = db["export_schedules"]._documents[0]
+    assert stored["lease_owner"] == worker.worker_id
+    assert db["export_results"]._documents == []
+
+    outcome = await worker.execute_export(claimed, lease_owner=worker.worker_id)
+    assert outcome["success"]
+    assert stored["run_count"] == 1
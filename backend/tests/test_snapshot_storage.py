@@ -0,0 +1,87 @@
+"""
+Tests for chunked report snapshot row storage
+"""
+
+import pytest
+
+from backend.services.reporting.snapshot_engine import SnapshotEngine
+from backend.services.reporting.snapshot_storage import decode_chunk, encode_chunk
+from backend.tests.utils.in_memory_db import InMemoryCursor, InMemoryDatabase
+
+
+def test_chunk_codec_round_trips_sparse_rows():
+    rows = [
+        {"_id": {"warehouse": "A"}, "qty_sum": 10},
+        {"_id": {"warehouse": "B"}, "qty_sum": None, "note": "x"},
+        {"_id": {"warehouse": "C"}},
+    ]
+
+    assert decode_chunk(encode_chunk(rows)) == rows
+
+
+def _engine_with_rows(rows, chunk_rows=4):
+    db = InMemoryDatabase()
+    db.count_lines.aggregate = lambda pipeline, **kwargs: InMemoryCursor(rows)
+    return db, SnapshotEngine(db, chunk_rows=chunk_rows)
+
+
+@pytest.mark.asyncio
+async def test_create_snapshot_stores_rows_out_of_line():
+    rows = [{"item_code": f"I{i}", "qty_sum": i} for i in range(10)]
+    db, engine = _engine_with_rows(rows)
+
+    created = await engine.create_snapshot(
+        name="Stock",
+        description="",
+        query_spec={"collection": "count_lines", "aggregations": {"qty": "sum"}},
+        created_by="admin",
+    )
+
+    stored = await db.report_snapshots.find_one({"snapshot_id": created["snapshot_id"]})
+    assert "row_data" not in stored
+    assert stored["row_count"] == 10
+    assert stored["row_storage"]["chunk_count"] == 3
+    assert stored["summary"] == {"total_rows": 10, "total_qty": 45}
+    assert await db.report_snapshot_rows.count_documents({}) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_snapshot_data_pages_across_chunks():
+    rows = [{"item_code": f"I{i}", "qty_sum": i} for i in range(10)]
+    db, engine = _engine_with_rows(rows)
+    created = await engine.create_snapshot(
+        name="Stock", description="", query_spec={"collection": "count_lines"}, created_by="u"
+    )
+
+    page = await engine.get_snapshot_data(created["snapshot_id"], skip=3, limit=5)
+
+    assert [r["item_code"] for r in page["rows"]] == ["I3", "I4", "I5", "I6", "I7"]
+    assert page["pagination"] == {"skip": 3, "limit": 5, "total": 10, "has_more": True}
+
+
+@pytest.mark.asyncio
+async def test_delete_snapshot_removes_row_chunks():
+    db, engine = _engine_with_rows([{"item_code": "I1"}])
+    created = await engine.create_snapshot(
+        name="Stock", description="", query_spec={"collection": "count_lines"}, created_by="u"
+    )
+
+    assert await engine.delete_snapshot(created["snapshot_id"], "u") is True
+    assert await db.report_snapshot_rows.count_documents({}) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_snapshot_keeps_earlier_snapshot_rows():
+    db, engine = _engine_with_rows([{"item_code": "I1"}])
+    spec = {"collection": "count_lines"}
+    first = await engine.create_snapshot(name="A", description="", query_spec=spec, created_by="u")
+
+    async def fail_insert(document):
+        raise RuntimeError("insert failed")
+
+    db.report_snapshots.insert_one = fail_insert
+    with pytest.raises(RuntimeError):
+        await engine.create_snapshot(name="B", description="", query_spec=spec, created_by="u")
+
+    chunks = db.report_snapshot_rows._documents
+    assert [chunk["snapshot_id"] for chunk in chunks] == [first["snapshot_id"]]
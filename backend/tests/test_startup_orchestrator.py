@@ -0,0 +1,159 @@
+"""
+Tests for the dependency-graph startup orchestrator
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from backend.core.startup import APP_STARTUP_PHASES, StartupOrchestrator, build_app_startup
+
+
+@pytest.mark.asyncio
+async def test_independent_phases_run_concurrently_and_respect_dependencies():
+    order = []
+
+    def _phase(name, delay=0.05):
+        async def _run():
+            order.append(f"{name}:start")
+            await asyncio.sleep(delay)
+            order.append(f"{name}:end")
+
+        return _run
+
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("a", _phase("a"))
+    orchestrator.add("b", _phase("b"))
+    orchestrator.add("c", _phase("c", 0), depends_on=("a", "b"))
+
+    started = time.perf_counter()
+    report = await orchestrator.run()
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.09  # a and b overlapped
+    assert order.index("c:start") > order.index("a:end")
+    assert order.index("c:start") > order.index("b:end")
+    assert report["serving"] is True
+    assert all(p["status"] == "ok" for p in report["phases"].values())
+    assert report["phases"]["a"]["duration_ms"] >= 40
+
+
+@pytest.mark.asyncio
+async def test_background_phases_do_not_block_serving():
+    release = asyncio.Event()
+
+    async def _slow_sql():
+        await release.wait()
+
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("mongodb", lambda: asyncio.sleep(0))
+    orchestrator.add("sql_server", _slow_sql, background=True)
+    orchestrator.add(
+        "auto_sync", lambda: asyncio.sleep(0), depends_on=("sql_server",), background=True
+    )
+
+    report = await orchestrator.run()
+    assert report["serving"] is True
+    assert report["warmed"] is False
+    assert report["phases"]["auto_sync"]["status"] == "pending"
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert orchestrator.is_warmed
+    assert orchestrator.phase_status("auto_sync") == "ok"
+
+
+@pytest.mark.asyncio
+async def test_non_critical_failure_is_recorded_and_critical_failure_aborts():
+    async def _boom():
+        raise RuntimeError("redis down")
+
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("redis", _boom)
+    orchestrator.add("cache", lambda: asyncio.sleep(0), after=("redis",))
+    orchestrator.add("locks", lambda: asyncio.sleep(0), depends_on=("redis",))
+    report = await orchestrator.run()
+    assert report["phases"]["redis"]["status"] == "failed"
+    assert "redis down" in report["phases"]["redis"]["error"]
+    # after= only orders phases; depends_on= skips them when the dependency failed
+    assert report["phases"]["cache"]["status"] == "ok"
+    assert report["phases"]["locks"]["status"] == "skipped"
+    assert report["phases"]["locks"]["error"] == "dependency failed: redis"
+
+    critical = StartupOrchestrator()
+    critical.add("mongodb", _boom, critical=True)
+    critical.add("indexes", lambda: asyncio.sleep(0), depends_on=("mongodb",))
+    with pytest.raises(RuntimeError):
+        await critical.run()
+
+
+def test_validation_rejects_cycles_and_foreground_on_background():
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("a", lambda: asyncio.sleep(0), depends_on=("b",))
+    orchestrator.add("b", lambda: asyncio.sleep(0), depends_on=("a",))
+    with pytest.raises(ValueError, match="cycle"):
+        orchestrator._validate()
+
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("sql", lambda: asyncio.sleep(0), background=True)
+    orchestrator.add("api", lambda: asyncio.sleep(0), depends_on=("sql",))
+    with pytest.raises(ValueError, match="background"):
+        orchestrator._validate()
+
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("a", lambda: asyncio.sleep(0), after=("b",))
+    orchestrator.add("b", lambda: asyncio.sleep(0), depends_on=("a",))
+    with pytest.raises(ValueError, match="cycle"):
+        orchestrator._validate()
+
+
+@pytest.mark.asyncio
+async def test_after_waits_for_a_failed_background_phase():
+    order = []
+
+    async def _sql_down():
+        await asyncio.sleep(0.02)
+        order.append("sql_server")
+        raise ConnectionError("login timeout")
+
+    async def _auto_sync():
+        order.append("auto_sync")
+
+    orchestrator = StartupOrchestrator()
+    orchestrator.add("sql_server", _sql_down, background=True)
+    orchestrator.add("auto_sync", _auto_sync, after=("sql_server",), background=True)
+    await orchestrator.run()
+    await asyncio.sleep(0.05)
+
+    assert order == ["sql_server", "auto_sync"]
+    assert orchestrator.phase_status("sql_server") == "failed"
+    assert orchestrator.phase_status("auto_sync") == "ok"
+
+
+@pytest.mark.asyncio
+async def test_app_startup_graph_requires_every_phase_and_skips_mongo_dependents():
+    async def _ok():
+        pass
+
+    async def _mongo_down():
+        raise ConnectionError("no primary")
+
+    phases = {spec.name: _ok for spec in APP_STARTUP_PHASES}
+    with pytest.raises(ValueError, match="missing: \\['search_service'\\]"):
+        build_app_startup({k: v for k, v in phases.items() if k != "search_service"})
+    with pytest.raises(ValueError, match="unknown: \\['feature_services'\\]"):
+        build_app_startup({**phases, "feature_services": _ok})
+
+    orchestrator = build_app_startup({**phases, "mongodb": _mongo_down}, mongodb_critical=False)
+    await orchestrator.run()
+    await asyncio.sleep(0.01)
+
+    assert orchestrator.phases["mongodb"].critical is False
+    assert orchestrator.phase_status("scheduled_export") == "skipped"
+    assert orchestrator.phase_status("auto_sync") == "skipped"
+    assert orchestrator.phase_status("cache") == "ok"
+    assert orchestrator.phases["sql_server"].background is True
+
+    with pytest.raises(ConnectionError):
+        await build_app_startup({**phases, "mongodb": _mongo_down}).run()
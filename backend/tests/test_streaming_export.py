@@ -0,0 +1,142 @@
+"""
+Tests for the streaming CSV/XLSX export engine
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+from openpyxl import load_workbook
+
+from backend.services.reporting.export_engine import ExportEngine
+from backend.services.reporting.streaming_export import (
+    aiter_rows,
+    stream_csv,
+    stream_json,
+    write_csv_bytes,
+    write_xlsx_file,
+)
+
+
+def _rows(n):
+    return [
+        {"item_code": f"I{i:05d}", "qty": i, "counted_at": datetime(2024, 1, 1), "tags": ["a"]}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_yields_one_chunk_per_batch():
+    columns = [("item_code", "Item Code"), ("qty", "Quantity")]
+    progress = []
+
+    chunks = [
+        chunk
+        async for chunk in stream_csv(
+            aiter_rows(_rows(25)),
+            columns,
+            batch_size=10,
+            total_rows=25,
+            on_progress=lambda p: progress.append(p.as_dict()),
+        )
+    ]
+
+    assert len(chunks) == 3
+    parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert parsed[0] == ["Item Code", "Quantity"]
+    assert parsed[1] == ["I00000", "0"]
+    assert len(parsed) == 26
+    assert progress[-1]["finished"] is True
+    assert progress[-1]["percent"] == 100.0
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_infers_columns_and_serialises_values():
+    chunks = [chunk async for chunk in stream_csv(aiter_rows(_rows(1)))]
+    parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+
+    assert parsed[0] == ["item_code", "qty", "counted_at", "tags"]
+    assert parsed[1] == ["I00000", "0", "2024-01-01T00:00:00", '["a"]']
+
+
+@pytest.mark.asyncio
+async def test_write_xlsx_file_uses_write_only_workbook(tmp_path):
+    path = await write_xlsx_file(
+        aiter_rows(_rows(50)),
+        [("item_code", "Item Code"), ("qty", "Quantity")],
+        preamble=[["Report"], []],
+        batch_size=7,
+        path=tmp_path / "out.xlsx",
+    )
+
+    ws = load_workbook(path, read_only=True).active
+    values = [row for row in ws.iter_rows(values_only=True)]
+    assert values[0][0] == "Report"
+    assert values[2] == ("Item Code", "Quantity")
+    assert values[3] == ("I00000", 0)
+    assert len(values) == 53
+
+    # Widths and header style survive the preamble rows
+    ws = load_workbook(path).active
+    assert ws.column_dimensions["A"].width == len("Item Code") + 2
+    assert ws["A3"].font.bold is True
+    assert ws["A3"].fill.fgColor.rgb.endswith("CCCCCC")
+
+
+def test_write_csv_bytes_empty_rows_with_columns_writes_header():
+    data = write_csv_bytes([], [("a", "A")])
+    assert data.decode("utf-8").strip() == "A"
+
+
+@pytest.mark.asyncio
+async def test_export_engine_streams_snapshot_with_preamble():
+    snapshot = {
+        "snapshot_id": "s1",
+        "name": "Daily",
+        "created_at": 0,
+        "created_by": "admin",
+        "summary": {"total_rows": 2},
+        "row_count": 2,
+    }
+    engine = ExportEngine()
+
+    chunks = [chunk async for chunk in engine.stream_csv(snapshot, aiter_rows(_rows(2)))]
+    text = b"".join(chunks).decode("utf-8")
+
+    assert text.startswith("Snapshot Report")
+    assert "total_rows,2" in text
+    assert "I00001" in text
+
+
+@pytest.mark.asyncio
+async def test_stream_json_writes_rows_array_in_batches():
+    chunks = [
+        chunk
+        async for chunk in stream_json(
+            aiter_rows(_rows(5)), envelope={"name": "Daily"}, rows_key="row_data", batch_size=2
+        )
+    ]
+
+    # Envelope, three row batches, closing brackets
+    assert len(chunks) == 5
+    document = json.loads(b"".join(chunks))
+    assert document["name"] == "Daily"
+    assert [row["item_code"] for row in document["row_data"]] == [f"I{i:05d}" for i in range(5)]
+    assert document["row_data"][0]["counted_at"] == "2024-01-01 00:00:00"
+
+    empty = [chunk async for chunk in stream_json(aiter_rows([]))]
+    assert json.loads(b"".join(empty)) == {"rows": []}
+
+
+@pytest.mark.asyncio
+async def test_export_engine_streams_snapshot_json():
+    snapshot = {"_id": object(), "snapshot_id": "s1", "row_count": 3, "row_data": ["stale"]}
+
+    chunks = [chunk async for chunk in ExportEngine().stream_json(snapshot, aiter_rows(_rows(3)))]
+    document = json.loads(b"".join(chunks))
+
+    assert document["snapshot_id"] == "s1"
+    assert isinstance(document["_id"], str)
+    assert [row["qty"] for row in document["row_data"]] == [0, 1, 2]
@@ -0,0 +1,132 @@
+"""
+Tests for the streaming full-collection validator
+"""
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+
+from backend.services.data_validation_service import DataValidationService
+from backend.services.validation_engine import StreamingValidator, compile_violation_filter
+from backend.tests.utils.in_memory_db import InMemoryDatabase
+
+
+def _seed_count_lines(db, total, bad_every):
+    lines = []
+    for i in range(total):
+        line = {"_id": ObjectId(), "session_id": "S1", "item_code": f"I{i}", "counted_qty": 5.0}
+        if i % bad_every == 0:
+            line["counted_qty"] = -1.0
+        lines.append(line)
+    db["count_lines"]._documents = lines
+    return lines
+
+
+def test_rules_compile_to_a_pushdown_filter():
+    service = DataValidationService(InMemoryDatabase())
+    query = compile_violation_filter(service.validation_rules["session"])
+    clauses = query["$or"]
+
+    assert {"warehouse": {"$in": [None, ""]}} in clauses
+    assert {
+        "$and": [
+            {"status": {"$exists": True, "$ne": None}},
+            {"status": {"$nin": ["active", "completed", "cancelled"]}},
+        ]
+    } in clauses
+    assert any("$expr" in clause for clause in clauses)
+
+    barcode = compile_violation_filter(service.validation_rules["erp_item"])["$or"]
+    pattern = next(c["barcode"]["$not"] for c in barcode if "$not" in c.get("barcode", {}))
+    assert pattern.match("12345") and not pattern.match("12a45")
+
+
+async def test_whole_collection_is_validated_in_batches():
+    db = InMemoryDatabase()
+    _seed_count_lines(db, total=2500, bad_every=10)
+    service = DataValidationService(db)
+
+    report = await StreamingValidator(db, service, batch_size=400, pushdown=False).run(
+        "count_lines", "count_line"
+    )
+
+    assert report["documents_checked"] == 2500
+    assert report["invalid_count"] == 250
+    assert len(report["invalid_documents"]) == 100
+    assert report["invalid_documents"][0]["errors"] == ["counted_qty below minimum (0)"]
+    assert len(db["validation_violations"]._documents) == 250
+    checkpoint = await db["validation_checkpoints"].find_one({"_id": "count_lines"})
+    assert checkpoint["status"] == "completed"
+
+
+async def test_back_to_back_runs_keep_their_violations_apart():
+    db = InMemoryDatabase()
+    _seed_count_lines(db, total=20, bad_every=10)
+    validator = StreamingValidator(db, DataValidationService(db), pushdown=False)
+
+    first = await validator.run("count_lines", "count_line")
+    second = await validator.run("count_lines", "count_line")
+
+    # Both runs start within the same second
+    assert first["run_id"] != second["run_id"]
+    assert second["invalid_count"] == 2
+    assert len(second["invalid_documents"]) == 2
+
+
+async def test_resumes_from_checkpoint_and_falls_back_without_pushdown():
+    db = InMemoryDatabase()
+    _seed_count_lines(db, total=50, bad_every=5)
+    service = DataValidationService(db)
+    validator = StreamingValidator(db, service, batch_size=10)
+    real_fetch = validator._fetch
+    calls = {"n": 0}
+
+    async def flaky_fetch(collection, query, projection):
+        calls["n"] += 1
+        if "$or" in str(query):
+            raise OperationFailure("unknown operator: $strLenCP")
+        if calls["n"] == 4:
+            raise ConnectionError("network blip")
+        return await real_fetch(collection, query, projection)
+
+    validator._fetch = flaky_fetch
+    with pytest.raises(ConnectionError):
+        await validator.run("count_lines", "count_line")
+
+    validator._fetch = real_fetch
+    report = await validator.run("count_lines", "count_line")
+
+    assert report["invalid_count"] == 10
+    assert len(db["validation_violations"]._documents) == 10
+    checkpoint = await db["validation_checkpoints"].find_one({"_id": "count_lines"})
+    assert checkpoint["pushdown"] is False
+
+
+async def test_full_validation_runs_once_and_reports_checkpoint_progress(monkeypatch):
+    db = InMemoryDatabase()
+    _seed_count_lines(db, total=20, bad_every=4)
+    service = DataValidationService(db)
+    await StreamingValidator(db, service, pushdown=False).run("count_lines", "count_line")
+
+    class _Worker:
+        pid = 4242
+
+        def is_alive(self):
+            return True
+
+    monkeypatch.setattr(
+        "backend.services.data_validation_service.start_validation_worker",
+        lambda batch_size: _Worker(),
+    )
+    started = service.start_full_validation(batch_size=1000)
+    assert started["pid"] == 4242 and "count_lines" in started["collections"]
+    assert service.is_full_validation_running()
+    with pytest.raises(RuntimeError, match="already running"):
+        service.start_full_validation()
+
+    [progress] = await service.get_validation_progress()
+    assert (progress["collection"], progress["status"], progress["invalid"]) == (
+        "count_lines",
+        "completed",
+        5,
+    )
@@ -13,6 +13,9 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Optional
 
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
 from backend.auth.dependencies import init_auth_dependencies
 from backend.services.activity_log import ActivityLogService
 from backend.services.error_log import ErrorLogService
@@ -22,6 +25,9 @@ from backend.services.refresh_token import RefreshTokenService
 def _match_condition(value: Any, condition: dict[str, Any]) -> bool:
     """Evaluate comparison operators."""
     for op, expected in condition.items():
+        if op in {"$lt", "$lte", "$gt", "$gte"} and (value is None) != (expected is None):
+            # Range operators never match across null and other types
+            return False
         if op == "$lt" and not (value < expected):
             return False
         if op == "$lte" and not (value <= expected):
@@ -43,12 +49,37 @@ def _match_condition(value: Any, condition: dict[str, Any]) -> bool:
     return True
 
 
+_MISSING = object()
+
+
+def _get_path(document: dict[str, Any], key: str) -> Any:
+    """Value at a dotted path, or ``_MISSING``."""
+    value: Any = document
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set_path(document: dict[str, Any], key: str, value: Any) -> bool:
+    """Set a dotted path, creating sub-documents; returns whether it changed."""
+    *parents, leaf = key.split(".")
+    target = document
+    for part in parents:
+        target = target.setdefault(part, {})
+    if leaf in target and target[leaf] == value:
+        return False
+    target[leaf] = value
+    return True
+
+
 def _matches_exists_logic(
     document: dict[str, Any], key: str, value: dict[str, Any]
 ) -> bool:
     """Helper to handle $exists operator logic."""
     should_exist = value["$exists"]
-    does_exist = key in document
+    does_exist = _get_path(document, key) is not _MISSING
 
     if does_exist != should_exist:
         return False
@@ -63,7 +94,7 @@ def _matches_exists_logic(
     if not does_exist:
         return True
 
-    doc_value = document.get(key)
+    doc_value = _get_path(document, key)
     return _match_condition(doc_value, condition_without_exists)
 
 
@@ -79,6 +110,10 @@ def _match_filter(
             if not any(_match_filter(document, clause) for clause in value):
                 return False
             continue
+        if key == "$and":
+            if not all(_match_filter(document, clause) for clause in value):
+                return False
+            continue
 
         # Handle $exists specifically
         if isinstance(value, dict) and "$exists" in value:
@@ -86,7 +121,8 @@ def _match_filter(
                 return False
             continue
 
-        doc_value = document.get(key)
+        doc_value = _get_path(document, key)
+        doc_value = None if doc_value is _MISSING else doc_value
         if isinstance(value, dict):
             if not _match_condition(doc_value, value):
                 return False
@@ -97,17 +133,179 @@ def _match_filter(
 
 
 def _apply_update(document: dict[str, Any], update: dict[str, Any]) -> bool:
-    """Apply $set updates to the document."""
+    """Apply $set and $push (including $each) updates to the document."""
     modified = False
     set_values = update.get("$set", {})
     for key, value in set_values.items():
-        if document.get(key) != value:
-            document[key] = value
+        if _set_path(document, key, value):
             modified = True
 
+    for key, amount in update.get("$inc", {}).items():
+        current = _get_path(document, key)
+        _set_path(document, key, (0 if current is _MISSING else current) + amount)
+        modified = modified or amount != 0
+
+    for key in update.get("$unset", {}):
+        *parents, leaf = key.split(".")
+        target = _get_path(document, ".".join(parents)) if parents else document
+        if isinstance(target, dict) and leaf in target:
+            del target[leaf]
+            modified = True
+
+    for key, value in update.get("$push", {}).items():
+        values = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+        document.setdefault(key, []).extend(copy.deepcopy(values))
+        modified = modified or bool(values)
+
     return modified
 
 
+def _resolve(document: Any, path: str) -> Any:
+    """Value at a dotted path, mapping over arrays like ``$items.qty`` does."""
+    value = document
+    for part in path.split("."):
+        if isinstance(value, list):
+            value = [_resolve(item, part) for item in value]
+            value = [item for item in value if item is not None]
+        elif isinstance(value, dict):
+            value = value.get(part)
+        else:
+            return None
+    return value
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    if op == "$eq":
+        return left == right
+    if op == "$ne":
+        return left != right
+    if left is None or right is None:
+        return False
+    return {
+        "$gt": left > right,
+        "$gte": left >= right,
+        "$lt": left < right,
+        "$lte": left <= right,
+    }[op]
+
+
+def _eval_expr(document: dict[str, Any], expr: Any) -> Any:  # noqa: C901
+    """Evaluate the aggregation expressions used by the app's pipelines."""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return _resolve(document, expr[1:])
+    if isinstance(expr, list):
+        return [_eval_expr(document, item) for item in expr]
+    if not isinstance(expr, dict):
+        return expr
+    if len(expr) != 1 or not next(iter(expr)).startswith("$"):
+        return {key: _eval_expr(document, value) for key, value in expr.items()}
+
+    op, raw = next(iter(expr.items()))
+    if op == "$literal":
+        return raw
+    if op == "$cond":
+        if isinstance(raw, dict):
+            raw = [raw["if"], raw["then"], raw["else"]]
+        condition, then, otherwise = raw
+        return _eval_expr(document, then if _eval_expr(document, condition) else otherwise)
+
+    args = _eval_expr(document, raw)
+    if op == "$ifNull":
+        return next((arg for arg in args if arg is not None), None)
+    if op in ("$eq", "$ne", "$gt", "$gte", "$lt", "$lte"):
+        return _compare(op, args[0], args[1])
+    if op in ("$sum", "$max", "$min", "$avg"):
+        values = args if isinstance(args, list) else [args]
+        values = [v for v in values if v is not None]
+        if op == "$sum":
+            return sum(v for v in values if isinstance(v, (int, float)))
+        if not values:
+            return None
+        if op == "$avg":
+            return sum(values) / len(values)
+        return max(values) if op == "$max" else min(values)
+    if op == "$size":
+        return len(args or [])
+    if op == "$abs":
+        return None if args is None else abs(args)
+    if op in ("$multiply", "$divide", "$add", "$subtract"):
+        if any(arg is None for arg in args):
+            return None
+        if op == "$multiply":
+            result = 1
+            for arg in args:
+                result *= arg
+            return result
+        if op == "$add":
+            return sum(args)
+        return args[0] / args[1] if op == "$divide" else args[0] - args[1]
+    raise NotImplementedError(f"Unsupported aggregation operator: {op}")
+
+
+def _project(document: dict[str, Any], spec: dict[str, Any]) -> dict[str, Any]:
+    fields = {key: value for key, value in spec.items() if key != "_id"}
+    if fields and all(value in (0, False) for value in fields.values()):
+        projected = {key: value for key, value in document.items() if key not in fields}
+    else:
+        projected = {"_id": document["_id"]} if "_id" in document else {}
+        for key, value in fields.items():
+            if value not in (1, True):
+                projected[key] = _eval_expr(document, value)
+            elif key in document:
+                projected[key] = document[key]
+    id_spec = spec.get("_id", 1)
+    if id_spec in (0, False):
+        projected.pop("_id", None)
+    elif id_spec not in (1, True):
+        projected["_id"] = _eval_expr(document, id_spec)
+    return projected
+
+
+def _group(documents: list[dict[str, Any]], spec: dict[str, Any]) -> list[dict[str, Any]]:
+    groups: dict[Any, list[dict[str, Any]]] = {}
+    keys: dict[Any, Any] = {}
+    for document in documents:
+        key = _eval_expr(document, spec["_id"])
+        marker = repr(key)
+        groups.setdefault(marker, []).append(document)
+        keys[marker] = key
+
+    results = []
+    for marker, members in groups.items():
+        row: dict[str, Any] = {"_id": keys[marker]}
+        for field, accumulator in spec.items():
+            if field == "_id":
+                continue
+            op, arg = next(iter(accumulator.items()))
+            values = [_eval_expr(member, arg) for member in members]
+            if op in ("$sum", "$max", "$min", "$avg"):
+                row[field] = _eval_expr({}, {op: {"$literal": values}})
+            elif op == "$first":
+                row[field] = values[0]
+            elif op == "$last":
+                row[field] = values[-1]
+            elif op == "$push":
+                row[field] = values
+            elif op == "$addToSet":
+                row[field] = [v for i, v in enumerate(values) if v not in values[:i]]
+            else:
+                raise NotImplementedError(f"Unsupported accumulator: {op}")
+        results.append(row)
+    return results
+
+
+def _sort_documents(documents: list[dict[str, Any]], spec: dict[str, int]) -> list[dict[str, Any]]:
+    for field, direction in reversed(list(spec.items())):
+        documents.sort(
+            key=lambda doc, f=field: (
+                (_get_path(doc, f) not in (None, _MISSING)),
+                _get_path(doc, f) if _get_path(doc, f) not in (None, _MISSING) else 0,
+            ),
+            reverse=direction < 0,
+        )
+    return documents
+
+
 @dataclass
 class InsertOneResult:
     inserted_id: str
@@ -125,15 +323,22 @@ class DeleteResult:
     deleted_count: int
 
 
+@dataclass
+class BulkWriteResult:
+    inserted_count: int = 0
+    matched_count: int = 0
+    modified_count: int = 0
+
+
 class InMemoryCursor:
     def __init__(self, documents: Iterable[dict[str, Any]]):
         self._documents = list(documents)
 
-    def sort(self, key: str, direction: int) -> InMemoryCursor:
-        reverse = direction < 0
-        self._documents.sort(
-            key=lambda doc: doc.get(key, datetime.min), reverse=reverse
-        )
+    def sort(self, key: Any, direction: int = 1) -> InMemoryCursor:
+        # Accept both sort("field", -1) and sort([("field", -1), ("_id", -1)])
+        specs = key if isinstance(key, list) else [(key, direction)]
+        # Missing and null values sort first, as in MongoDB
+        self._documents = _sort_documents(self._documents, dict(specs))
         return self
 
     def skip(self, count: int) -> InMemoryCursor:
@@ -151,10 +356,23 @@ class InMemoryCursor:
     async def to_list(self, length: int) -> list[dict[str, Any]]:
         return [copy.deepcopy(doc) for doc in self._documents[:length]]
 
+    def __aiter__(self) -> InMemoryCursor:
+        self._iter = iter(self._documents)
+        return self
+
+    async def __anext__(self) -> dict[str, Any]:
+        try:
+            return copy.deepcopy(next(self._iter))
+        except StopIteration:
+            raise StopAsyncIteration
+
 
 class InMemoryCollection:
     def __init__(self):
         self._documents: list[dict[str, Any]] = []
+        # Set by InMemoryDatabase so $lookup can reach sibling collections
+        self.database: Optional[InMemoryDatabase] = None
+        self.name: Optional[str] = None
 
     def _ensure_id(self, document: dict[str, Any]) -> None:
         document.setdefault("_id", uuid.uuid4().hex)
@@ -176,10 +394,37 @@ class InMemoryCollection:
         print("DEBUG: insert_one called")
         doc_copy = copy.deepcopy(document)
         self._ensure_id(doc_copy)
+        if any(doc.get("_id") == doc_copy["_id"] for doc in self._documents):
+            raise DuplicateKeyError(f"E11000 duplicate key error: _id {doc_copy['_id']!r}")
         self._documents.append(doc_copy)
         print("DEBUG: insert_one done")
         return InsertOneResult(inserted_id=doc_copy["_id"])
 
+    async def insert_many(self, documents: list[dict[str, Any]], *args, **kwargs) -> None:
+        for document in documents:
+            await self.insert_one(document)
+
+    async def find_one_and_update(
+        self, filter_query: dict[str, Any], update: dict[str, Any], *args, **kwargs
+    ) -> Optional[dict[str, Any]]:
+        """Atomically update the first match (in ``sort`` order) and return it.
+
+        Returns the document as it was before the update unless
+        ``return_document`` is truthy (``ReturnDocument.AFTER``).
+        """
+        candidates = [doc for doc in self._documents if _match_filter(doc, filter_query)]
+        if kwargs.get("sort"):
+            candidates = InMemoryCursor(candidates).sort(kwargs["sort"])._documents
+        if not candidates:
+            return None
+        doc = candidates[0]
+        before = copy.deepcopy(doc)
+        _apply_update(doc, update)
+        return copy.deepcopy(doc) if kwargs.get("return_document") else before
+
+    async def create_index(self, *args, **kwargs) -> str:
+        return "index"
+
     async def update_one(
         self,
         filter_query: dict[str, Optional[Any]],
@@ -211,6 +456,38 @@ class InMemoryCollection:
 
         return UpdateResult(matched_count=0, modified_count=0)
 
+    async def update_many(
+        self, filter_query: dict[str, Optional[Any]], update: dict[str, Any]
+    ) -> UpdateResult:
+        matched = modified = 0
+        for doc in self._documents:
+            if _match_filter(doc, filter_query):
+                matched += 1
+                modified += 1 if _apply_update(doc, update) else 0
+        return UpdateResult(matched_count=matched, modified_count=modified)
+
+    async def bulk_write(self, requests: list[Any], ordered: bool = True) -> BulkWriteResult:
+        """Apply pymongo InsertOne/UpdateOne requests in order."""
+        result = BulkWriteResult()
+        for request in requests:
+            if isinstance(request, InsertOne):
+                await self.insert_one(request._doc)
+                result.inserted_count += 1
+            elif isinstance(request, UpdateOne):
+                outcome = await self.update_one(request._filter, request._doc, upsert=bool(request._upsert))
+                result.matched_count += outcome.matched_count
+                result.modified_count += outcome.modified_count
+            else:
+                raise NotImplementedError(f"Unsupported bulk request: {type(request).__name__}")
+        return result
+
+    async def delete_one(self, filter_query: dict[str, Optional[Any]]) -> DeleteResult:
+        for idx, doc in enumerate(self._documents):
+            if _match_filter(doc, filter_query):
+                del self._documents[idx]
+                return DeleteResult(deleted_count=1)
+        return DeleteResult(deleted_count=0)
+
     async def delete_many(self, filter_query: dict[str, Optional[Any]]) -> DeleteResult:
         to_keep = []
         deleted = 0
@@ -227,6 +504,9 @@ class InMemoryCollection:
     ) -> int:
         return sum(1 for doc in self._documents if _match_filter(doc, filter_query))
 
+    async def estimated_document_count(self) -> int:
+        return len(self._documents)
+
     def find(
         self,
         filter_query: dict[str, Optional[Any]] = None,
@@ -247,10 +527,65 @@ class InMemoryCollection:
                 results.append(doc)
         return InMemoryCursor(results)
 
-    def aggregate(self, pipeline: list[dict[str, Any]]) -> InMemoryCursor:
-        # For now, return empty cursor or basic aggregation if needed
-        # This is a mock, so we can just return empty list or implement basic logic
-        return InMemoryCursor([])
+    def aggregate(self, pipeline: list[dict[str, Any]], **_kwargs) -> InMemoryCursor:
+        """Run the common pipeline stages; unsupported pipelines yield no rows."""
+        try:
+            return InMemoryCursor(self._run_pipeline(pipeline))
+        except NotImplementedError:
+            return InMemoryCursor([])
+
+    def _run_pipeline(self, pipeline: list[dict[str, Any]]) -> list[dict[str, Any]]:  # noqa: C901
+        documents = [copy.deepcopy(doc) for doc in self._documents]
+        for stage in pipeline:
+            name, spec = next(iter(stage.items()))
+            if name == "$match":
+                documents = [doc for doc in documents if _match_filter(doc, spec)]
+            elif name == "$project":
+                documents = [_project(doc, spec) for doc in documents]
+            elif name in ("$addFields", "$set"):
+                for doc in documents:
+                    doc.update({key: _eval_expr(doc, value) for key, value in spec.items()})
+            elif name == "$group":
+                documents = _group(documents, spec)
+            elif name == "$sort":
+                documents = _sort_documents(documents, spec)
+            elif name == "$skip":
+                documents = documents[spec:]
+            elif name == "$limit":
+                documents = documents[:spec]
+            elif name == "$count":
+                documents = [{spec: len(documents)}] if documents else []
+            elif name == "$unwind":
+                documents = self._unwind(documents, spec)
+            elif name == "$lookup" and "localField" in spec and self.database is not None:
+                foreign = self.database[spec["from"]]._documents
+                for doc in documents:
+                    local = _resolve(doc, spec["localField"])
+                    locals_ = local if isinstance(local, list) else [local]
+                    doc[spec["as"]] = [
+                        copy.deepcopy(other)
+                        for other in foreign
+                        if _resolve(other, spec["foreignField"]) in locals_
+                    ]
+            else:
+                raise NotImplementedError(f"Unsupported aggregation stage: {name}")
+        return documents
+
+    @staticmethod
+    def _unwind(documents: list[dict[str, Any]], spec: Any) -> list[dict[str, Any]]:
+        if isinstance(spec, str):
+            spec = {"path": spec}
+        field = spec["path"].lstrip("$")
+        unwound = []
+        for doc in documents:
+            values = doc.get(field)
+            if isinstance(values, list) and values:
+                unwound.extend({**doc, field: value} for value in values)
+            elif values is not None and not isinstance(values, list):
+                unwound.append(doc)
+            elif spec.get("preserveNullAndEmptyArrays"):
+                unwound.append({key: value for key, value in doc.items() if key != field})
+        return unwound
 
 
 class InMemoryDatabase:
@@ -281,6 +616,20 @@ class InMemoryDatabase:
         self.user_settings = InMemoryCollection()
         self.audit_logs = InMemoryCollection()
         self.system_events = InMemoryCollection()
+        self.report_snapshots = InMemoryCollection()
+        self.report_snapshot_rows = InMemoryCollection()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if isinstance(value, InMemoryCollection):
+            value.database = self
+            value.name = name
+        super().__setattr__(name, value)
+
+    def __getitem__(self, name: str) -> InMemoryCollection:
+        """Support ``db[name]`` access, creating collections on first use."""
+        if not hasattr(self, name):
+            setattr(self, name, InMemoryCollection())
+        return getattr(self, name)
 
     async def command(self, *_args, **_kwargs):
         """Simulate db.command('ping')."""
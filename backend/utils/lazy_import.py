@@ -0,0 +1,67 @@
+"""
+Lazy Imports
+Defer heavy optional dependencies (pandas, numpy, reportlab) until first use,
+so importing the application does not pay for libraries a worker may never
+touch.
+"""
+
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule(ModuleType):
+    """
+    Module proxy that imports the real module on first attribute access.
+
+    Usage::
+
+        pd = lazy_module("pandas")
+        ...
+        df = pd.DataFrame(rows)  # pandas is imported here
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_name"] = name
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module: Optional[ModuleType] = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__dict__["_lazy_name"])
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module {self.__dict__['_lazy_name']!r} ({state})>"
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_lazy_module"] is not None
+
+
+def lazy_module(name: str) -> ModuleType:
+    """
+    Return ``name`` if it is already imported, otherwise a :class:`LazyModule`.
+
+    Import errors surface on first use, where callers already handle
+    missing optional dependencies.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
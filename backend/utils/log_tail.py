@@ -0,0 +1,139 @@
+"""
+Log Tail Utilities
+Read the end of large log files without loading them into memory.
+
+``tail_lines`` seeks to the end of the file and walks backwards in fixed-size
+blocks until it has collected enough matching lines. ``read_since`` continues
+from a byte offset returned by an earlier call, so a poller only reads bytes
+appended since its last request. ``read_since`` only returns complete
+(newline-terminated) lines; a line still being written is picked up by the
+next call. ``tail_lines`` also returns a final line without a newline once the
+file has stopped growing for ``settle_seconds``.
+"""
+
+import os
+import time
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+# A file unmodified for this long is no longer being written to
+DEFAULT_SETTLE_SECONDS = 2.0
+
+LineFilter = Callable[[str], bool]
+
+
+@dataclass
+class TailResult:
+    """Lines read from a log file and where to continue from."""
+
+    lines: list[str] = field(default_factory=list)
+    # Byte offset to pass as ``since`` on the next call
+    offset: int = 0
+    # The file shrank below ``since`` (rotated or truncated); read from the tail
+    reset: bool = False
+    # More matching lines were appended than ``limit``; the oldest were skipped
+    truncated: bool = False
+
+
+def _complete_end(fh: BinaryIO, size: int) -> int:
+    """Offset just past the last newline, excluding a partially written line."""
+    pos = size
+    while pos > 0:
+        start = max(0, pos - DEFAULT_BLOCK_SIZE)
+        fh.seek(start)
+        block = fh.read(pos - start)
+        newline = block.rfind(b"\n")
+        if newline != -1:
+            return start + newline + 1
+        pos = start
+    return 0
+
+
+def _iter_lines_reverse(fh: BinaryIO, end: int, block_size: int) -> Iterator[bytes]:
+    """Yield lines ending before ``end``, last line first."""
+    pos = end
+    remainder = b""
+    while pos > 0:
+        read = min(block_size, pos)
+        pos -= read
+        fh.seek(pos)
+        parts = (fh.read(read) + remainder).split(b"\n")
+        # The first part may continue in the previous block
+        remainder = parts[0]
+        yield from reversed(parts[1:])
+    if remainder:
+        yield remainder
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="ignore").strip()
+
+
+def tail_lines(
+    path: Path,
+    limit: int,
+    match: Optional[LineFilter] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+) -> TailResult:
+    """
+    Return the last ``limit`` non-empty lines accepted by ``match``, oldest first.
+
+    A final line without a newline is included only when the file has not been
+    modified for ``settle_seconds``; otherwise it may still be half written.
+    """
+    with open(path, "rb") as fh:
+        stat = os.fstat(fh.fileno())
+        size = stat.st_size
+        if time.time() - stat.st_mtime >= settle_seconds:
+            end = size
+        else:
+            end = _complete_end(fh, size)
+        lines: list[str] = []
+        for raw in _iter_lines_reverse(fh, end, block_size):
+            if len(lines) >= limit:
+                break
+            line = _decode(raw)
+            if line and (match is None or match(line)):
+                lines.append(line)
+    lines.reverse()
+    return TailResult(lines=lines, offset=end)
+
+
+def read_since(
+    path: Path,
+    since: int,
+    limit: int,
+    match: Optional[LineFilter] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> TailResult:
+    """
+    Return lines appended after byte offset ``since`` (at most the newest
+    ``limit`` matches). Falls back to ``tail_lines`` if the file was rotated.
+    """
+    size = path.stat().st_size
+    if since > size:
+        result = tail_lines(path, limit, match, block_size)
+        result.reset = True
+        return result
+
+    kept: deque[str] = deque(maxlen=limit)
+    matched = 0
+    offset = since
+    with open(path, "rb", buffering=block_size) as fh:
+        fh.seek(since)
+        # Stop at the size seen on entry so a fast writer cannot keep us reading
+        while offset < size:
+            raw = fh.readline()
+            if not raw.endswith(b"\n"):
+                break
+            offset += len(raw)
+            line = _decode(raw)
+            if line and (match is None or match(line)):
+                matched += 1
+                kept.append(line)
+    return TailResult(lines=list(kept), offset=offset, truncated=matched > limit)
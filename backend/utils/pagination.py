@@ -5,13 +5,32 @@ Based on fastapi-pagination patterns from awesome-fastapi best practices.
 Provides consistent pagination across all API endpoints with proper typing.
 """
 
-from typing import Any, Generic, Optional, TypeVar
-
+import base64
+import hashlib
+import hmac
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Generic, Optional, TypeVar
+
+from bson import json_util
+from bson.json_util import JSONMode, JSONOptions
 from fastapi import Query
 from pydantic import BaseModel, Field
 
+if TYPE_CHECKING:
+    from backend.services.count_service import CountResult
+
 T = TypeVar("T")
 
+# Cursor payloads keep BSON types (datetime, ObjectId) intact across the round trip
+_CURSOR_JSON_OPTIONS = JSONOptions(json_mode=JSONMode.CANONICAL, tz_aware=False)
+_CURSOR_VERSION = 1
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed, tampered with or reused
+    against a different sort/filter."""
+
 
 class PaginationParams:
     """
@@ -209,6 +228,36 @@ def cursor_paginate(
     )
 
 
+def offset_pagination(
+    page: int, page_size: int, total: Optional["CountResult"], returned: int
+) -> dict[str, Any]:
+    """
+    Legacy ``pagination`` block for page/page_size responses.
+
+    ``total`` may be None when the caller skipped counting; ``has_next`` is
+    then inferred from whether the page came back full.
+    """
+    if total is None:
+        return {
+            "page": page,
+            "page_size": page_size,
+            "total": None,
+            "total_pages": None,
+            "has_next": returned == page_size,
+            "has_prev": page > 1,
+            "total_accuracy": None,
+        }
+    return {
+        "page": page,
+        "page_size": page_size,
+        "total": total.value,
+        "total_pages": (total.value + page_size - 1) // page_size,
+        "has_next": (page - 1) * page_size + page_size < total.value,
+        "has_prev": page > 1,
+        "total_accuracy": total.accuracy,
+    }
+
+
 # Helper functions for MongoDB queries
 async def get_paginated_mongo(
     collection,
@@ -216,7 +265,8 @@ async def get_paginated_mongo(
     params: PaginationParams,
     sort: Optional[list[tuple[str, int]]] = None,
     projection: Optional[dict] = None,
-) -> tuple[list[dict], int]:
+    include_total: bool = True,
+) -> tuple[list[dict], Optional[int]]:
     """
     Execute paginated MongoDB query.
 
@@ -227,11 +277,13 @@ async def get_paginated_mongo(
         sort: Sort specification (e.g., [("created_at", -1)])
         projection: Fields to include/exclude
 
+        include_total: Count matching documents (cached; unfiltered queries
+            use the collection's estimated count)
+
     Returns:
-        Tuple of (items, total_count)
+        Tuple of (items, total_count); total_count is None when not requested
     """
-    # Get total count
-    total = await collection.count_documents(query)
+    total = (await count_total(collection, query)).value if include_total else None
 
     # Build cursor
     cursor = collection.find(query, projection)
@@ -245,3 +297,272 @@ async def get_paginated_mongo(
     items = await cursor.to_list(length=params.limit)
 
     return items, total
+
+
+# Keyset (seek) pagination
+#
+# A cursor encodes the (sort value, _id) of the last row returned. The next
+# page is fetched with a range predicate on that pair, so every page costs the
+# same index seek regardless of depth, unlike skip() which walks all earlier
+# rows. Cursors are HMAC-signed so clients cannot forge arbitrary predicates.
+
+
+def _cursor_secret() -> bytes:
+    try:
+        from backend.config import settings
+
+        secret = getattr(settings, "PAGINATION_CURSOR_SECRET", None) or getattr(
+            settings, "JWT_SECRET", None
+        )
+    except Exception:
+        secret = None
+    secret = secret or os.getenv("PAGINATION_CURSOR_SECRET") or os.getenv("JWT_SECRET")
+    if not secret:
+        # Cursors stay valid for the lifetime of this process only
+        secret = _process_secret
+    return secret.encode() if isinstance(secret, str) else secret
+
+
+_process_secret = base64.urlsafe_b64encode(os.urandom(32)).decode()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def query_fingerprint(query: Optional[dict]) -> str:
+    """Short stable hash of a filter, used to bind cursors to their query."""
+    canonical = json_util.dumps(
+        query or {}, sort_keys=True, json_options=_CURSOR_JSON_OPTIONS
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def encode_cursor(
+    sort_field: str,
+    direction: int,
+    last_value: Any,
+    last_id: Any,
+    query: Optional[dict] = None,
+) -> str:
+    """Build an opaque, signed cursor pointing just after (last_value, last_id)."""
+    payload = {
+        "v": _CURSOR_VERSION,
+        "s": sort_field,
+        "d": direction,
+        "k": [last_value, last_id],
+        "q": query_fingerprint(query),
+    }
+    body = json_util.dumps(payload, json_options=_CURSOR_JSON_OPTIONS).encode()
+    signature = hmac.new(_cursor_secret(), body, hashlib.sha256).digest()[:16]
+    return f"{_b64encode(body)}.{_b64encode(signature)}"
+
+
+def decode_cursor(
+    cursor: str,
+    sort_field: str,
+    direction: int,
+    query: Optional[dict] = None,
+) -> tuple[Any, Any]:
+    """
+    Verify a cursor and return its (last_value, last_id).
+
+    Raises:
+        InvalidCursorError: bad encoding or signature, or the cursor was
+            issued for a different sort order or filter
+    """
+    try:
+        body_part, signature_part = cursor.split(".", 1)
+        body = _b64decode(body_part)
+        signature = _b64decode(signature_part)
+    except Exception as e:
+        raise InvalidCursorError("Malformed pagination cursor") from e
+
+    expected = hmac.new(_cursor_secret(), body, hashlib.sha256).digest()[:16]
+    if not hmac.compare_digest(signature, expected):
+        raise InvalidCursorError("Pagination cursor signature mismatch")
+
+    try:
+        payload = json_util.loads(body, json_options=_CURSOR_JSON_OPTIONS)
+        last_value, last_id = payload["k"]
+    except Exception as e:
+        raise InvalidCursorError("Malformed pagination cursor") from e
+
+    if payload.get("v") != _CURSOR_VERSION:
+        raise InvalidCursorError("Unsupported pagination cursor version")
+    if payload.get("s") != sort_field or payload.get("d") != direction:
+        raise InvalidCursorError("Pagination cursor was issued for a different sort")
+    if payload.get("q") != query_fingerprint(query):
+        raise InvalidCursorError("Pagination cursor was issued for a different filter")
+    return last_value, last_id
+
+
+def keyset_filter(
+    sort_field: str, direction: int, last_value: Any, last_id: Any
+) -> dict[str, Any]:
+    """
+    Range predicate selecting rows strictly after (last_value, last_id) in
+    ``[(sort_field, direction), ("_id", direction)]`` order.
+    """
+    op = "$lt" if direction < 0 else "$gt"
+    if sort_field == "_id":
+        return {"_id": {op: last_id}}
+
+    if last_value is None:
+        # Missing/null values sort before everything else
+        same_value = {sort_field: None, "_id": {op: last_id}}
+        if direction < 0:
+            return same_value
+        return {"$or": [{sort_field: {"$ne": None}}, same_value]}
+
+    after = [
+        {sort_field: {op: last_value}},
+        {sort_field: last_value, "_id": {op: last_id}},
+    ]
+    if direction < 0:
+        # Descending order reaches the missing/null values last
+        after.append({sort_field: None})
+    return {"$or": after}
+
+
+async def count_total(
+    collection, query: Optional[dict], exact: bool = False
+) -> "CountResult":
+    """
+    Total for a listing via the shared count cache: filtered counts are
+    memoised briefly, unfiltered totals come from the collection metadata
+    unless ``exact`` is set.
+    """
+    from backend.services.count_service import count_service
+
+    return await count_service.count(collection, query, exact=exact)
+
+
+@dataclass
+class KeysetPage:
+    """One page of a keyset-paginated query."""
+
+    items: list[dict]
+    limit: int
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    total: Optional[int] = None
+    total_accuracy: Optional[str] = None
+
+    @property
+    def total_is_estimate(self) -> bool:
+        return self.total_accuracy == "estimated"
+
+    def pagination(self) -> dict[str, Any]:
+        return {
+            "mode": "cursor",
+            "limit": self.limit,
+            "returned": len(self.items),
+            "next_cursor": self.next_cursor,
+            "has_more": self.has_more,
+            "total": self.total,
+            "total_accuracy": self.total_accuracy,
+            "total_is_estimate": self.total_is_estimate,
+        }
+
+
+def _keyset_projection(
+    projection: Optional[dict], sort_field: str
+) -> tuple[Optional[dict], set[str]]:
+    """
+    Make sure the sort key and ``_id`` come back from the query.
+
+    Returns the adjusted projection and the fields to strip from results
+    again so callers see exactly the projection they asked for.
+    """
+    if not projection:
+        return projection, set()
+
+    adjusted = dict(projection)
+    strip: set[str] = set()
+    if not adjusted.get("_id", 1):
+        del adjusted["_id"]
+        strip.add("_id")
+
+    inclusive = any(v for k, v in adjusted.items() if k != "_id")
+    if inclusive and sort_field != "_id" and not adjusted.get(sort_field):
+        adjusted[sort_field] = 1
+        strip.add(sort_field)
+    elif not inclusive and sort_field in adjusted:
+        del adjusted[sort_field]
+        strip.add(sort_field)
+    return adjusted or None, strip
+
+
+def _sort_value(document: dict, field: str) -> Any:
+    value: Any = document
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+async def cursor_paginate_mongo(
+    collection,
+    query: dict,
+    *,
+    sort_field: str,
+    direction: int = -1,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    projection: Optional[dict] = None,
+    include_total: bool = False,
+) -> KeysetPage:
+    """
+    Execute a keyset-paginated MongoDB query ordered by (sort_field, _id).
+
+    Pass ``cursor=None`` (or an empty string) for the first page and the
+    returned ``next_cursor`` for subsequent ones. The compound index
+    ``(<equality filters>, sort_field, _id)`` makes each page a single seek.
+
+    Raises:
+        InvalidCursorError: if ``cursor`` cannot be verified for this query
+    """
+    find_query = query
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, sort_field, direction, query)
+        seek = keyset_filter(sort_field, direction, last_value, last_id)
+        find_query = {"$and": [query, seek]} if query else seek
+
+    fetch_projection, strip = _keyset_projection(projection, sort_field)
+    sort_spec = [(sort_field, direction)]
+    if sort_field != "_id":
+        sort_spec.append(("_id", direction))
+
+    db_cursor = (
+        collection.find(find_query, fetch_projection).sort(sort_spec).limit(limit + 1)
+    )
+    items = await db_cursor.to_list(length=limit + 1)
+
+    has_more = len(items) > limit
+    items = items[:limit]
+    next_cursor = None
+    if has_more and items:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            sort_field, direction, _sort_value(last, sort_field), last.get("_id"), query
+        )
+
+    if strip:
+        for item in items:
+            for key in strip:
+                item.pop(key, None)
+
+    page = KeysetPage(
+        items=items, limit=limit, next_cursor=next_cursor, has_more=has_more
+    )
+    if include_total:
+        counted = await count_total(collection, query)
+        page.total = counted.value
+        page.total_accuracy = counted.accuracy
+    return page